@@ -0,0 +1,109 @@
+"""
+Benchmark the commented-out code rule on files with thousands of inline comments.
+
+Usage:
+    python -m benchmarks.bench_commented_code_rule [--sizes N ...] [--code RATIO]
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+import random
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from src.data_types import CommentData, CommentScope, CommentType
+from src.density_calculation.checker.rules.commented_code_rule import CommentedCodeRule
+
+RUN_LENGTHS = (1, 6)
+CODE_LINES = (
+    "value = compute({number})",
+    "items.append(value * {number})",
+    "if value > {number}:",
+    "return value + {number}",
+    "for item in range({number}):",
+    "result = {{'key': {number}, 'other': [1, 2]}}",
+    "print(f'value={{value}}', {number})",
+)
+PROSE_LINES = (
+    "Compute the value of the next step ({number} at most)",
+    "This keeps the cache warm between calls",
+    "TODO: remove once version {number} is released",
+    "Note that the order of the items matters here",
+    "See issue {number} for the details",
+)
+PRAGMA_LINES = ("noqa: E501", "type: ignore[arg-type]", "pragma: no cover")
+
+
+def comments(count: int, code: float, generator: random.Random) -> list[CommentData]:
+    """
+    Generate the inline comments of one file: runs of adjacent comments separated by code lines.
+
+    Args:
+        count (int): The number of comments.
+        code (float): The share of runs that are commented-out code; the others are prose or pragmas.
+        generator (random.Random): The random generator.
+
+    Returns:
+        list[CommentData]: The comments, in source order.
+    """
+    path = Path("module.py")
+    generated: list[CommentData] = []
+    line = 1
+    while len(generated) < count:
+        roll = generator.random()
+        templates = CODE_LINES if roll < code else PRAGMA_LINES if roll > 0.95 else PROSE_LINES
+        column = generator.choice((1, 5, 9))
+        for _ in range(min(generator.randint(*RUN_LENGTHS), count - len(generated))):
+            text = generator.choice(templates).format(number=generator.randrange(1000))
+            generated.append(
+                CommentData(
+                    path, [text], line, line, column, column + len(text) + 2, CommentType.INLINE, CommentScope.FUNCTION
+                )
+            )
+            line += 1
+        line += 1
+    return generated
+
+
+def main() -> None:
+    """
+    Check files of growing numbers of comments and print the time of a first check, of a check
+    of the unchanged file, which only hits the verdict cache, and of a check after a one-line edit.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000, 80_000])
+    parser.add_argument("--code", type=float, default=0.3, help="The share of runs of commented-out code.")
+    args = parser.parse_args()
+
+    print(f"{'comments':>8} {'first s':>8} {'us/comment':>10} {'unchanged ms':>12} {'edited ms':>9} {'reported':>8}")
+    for size in args.sizes:
+        generator = random.Random(size)
+        file_comments = comments(size, args.code, generator)
+        edited = list(file_comments)
+        index = generator.randrange(size)
+        edited[index] = replace(edited[index], text=[f"value = compute({size})"])
+        rule = CommentedCodeRule()
+
+        started = time.perf_counter()
+        reported = len(rule.check_file(file_comments))
+        first_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        unchanged = len(rule.check_file(file_comments))
+        unchanged_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        rule.check_file(edited)
+        edited_seconds = time.perf_counter() - started
+        if unchanged != reported:
+            raise SystemExit(f"{size} comments: {reported} runs reported first, {unchanged} from the cache")
+
+        print(
+            f"{size:>8} {first_seconds:>8.2f} {first_seconds / size * 1e6:>10.1f}"
+            f" {unchanged_seconds * 1e3:>12.1f} {edited_seconds * 1e3:>9.1f} {reported:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
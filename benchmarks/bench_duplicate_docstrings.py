@@ -0,0 +1,90 @@
+"""
+Benchmark the near-duplicate docstring rule: the run time should grow near-linearly with the number of docstrings.
+
+Usage:
+    python -m benchmarks.bench_duplicate_docstrings [--sizes N ...] [--duplicates RATIO]
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from src.data_types import CommentData, CommentScope, CommentType
+from src.density_calculation.checker.rules.duplicate_docstring_rule import DuplicateDocstringRule
+
+DOCSTRINGS_PER_FILE = 20
+VOCABULARY_SIZE = 5000
+WORDS_PER_DOCSTRING = (8, 40)
+
+
+def docstrings(count: int, duplicates: float, generator: random.Random) -> list[str]:
+    """
+    Generate random docstrings, a share of them near-copies of earlier ones with one word changed.
+
+    Args:
+        count (int): The number of docstrings.
+        duplicates (float): The share of near-copies.
+        generator (random.Random): The random generator.
+
+    Returns:
+        list[str]: The docstrings.
+    """
+    vocabulary = [f"word{index}" for index in range(VOCABULARY_SIZE)]
+    texts: list[str] = []
+    for _ in range(count):
+        if texts and generator.random() < duplicates:
+            words = generator.choice(texts).split()
+            words[generator.randrange(len(words))] = generator.choice(vocabulary)
+        else:
+            words = generator.choices(vocabulary, k=generator.randint(*WORDS_PER_DOCSTRING))
+        texts.append(" ".join(words))
+    return texts
+
+
+def files(texts: list[str]) -> list[list[CommentData]]:
+    """
+    Group docstrings into files of DOCSTRINGS_PER_FILE docstrings.
+
+    Args:
+        texts (list[str]): The docstrings.
+
+    Returns:
+        list[list[CommentData]]: The comments of every file.
+    """
+    grouped: list[list[CommentData]] = []
+    for start in range(0, len(texts), DOCSTRINGS_PER_FILE):
+        path = Path(f"module_{start // DOCSTRINGS_PER_FILE}.py")
+        grouped.append(
+            [
+                CommentData(path, [text], line, line, 5, 5 + len(text), CommentType.DOCSTRING, CommentScope.FUNCTION)
+                for line, text in enumerate(texts[start : start + DOCSTRINGS_PER_FILE], start=1)
+            ]
+        )
+    return grouped
+
+
+def main() -> None:
+    """
+    Check growing numbers of docstrings and print the time per docstring, which stays flat for a linear run time.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5_000, 10_000, 20_000, 40_000, 80_000, 160_000])
+    parser.add_argument("--duplicates", type=float, default=0.2, help="The share of near-copies.")
+    args = parser.parse_args()
+
+    print(f"{'docstrings':>10} {'seconds':>8} {'us/docstring':>12} {'reported':>8}")
+    for size in args.sizes:
+        comments = files(docstrings(size, args.duplicates, random.Random(size)))
+        rule = DuplicateDocstringRule()
+        started = time.perf_counter()
+        reported = sum(len(rule.check_file(file_comments)) for file_comments in comments)
+        elapsed = time.perf_counter() - started
+        print(f"{size:>10} {elapsed:>8.2f} {elapsed / size * 1e6:>12.1f} {reported:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark the lite engine against the tree-sitter engine and count the files where their comments differ.
+
+Usage:
+    python -m benchmarks.bench_lite_engine [PATH] [--repeat N] [--show N]
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+import sysconfig
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from src.data_types import CommentData, EnginesEnum
+from src.density_calculation.finder.comment_finder import CommentFinder
+
+
+def timed(finder: CommentFinder, sources: dict[Path, bytes], repeat: int) -> float:
+    """
+    Extract the comments of every source and return the best total time over the repetitions.
+
+    The comments are dropped as soon as they are found, as in a run, so the garbage collector
+    does not walk the results of the other engine or of the previous files.
+
+    Args:
+        finder (CommentFinder): The finder with the engine to measure.
+        sources (dict[pathlib.Path, bytes]): The content of every file.
+        repeat (int): The number of repetitions.
+
+    Returns:
+        float: The seconds of the fastest repetition.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for path, source in sources.items():
+            finder.find_in_bytes(path, source)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    """
+    Time both engines on a directory of Python files and print the files where their comments differ.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", type=Path, nargs="?", default=Path(sysconfig.get_paths()["stdlib"]))
+    parser.add_argument("--repeat", type=int, default=1, help="Keep the best of N runs.")
+    parser.add_argument("--show", type=int, default=10, help="Print the first N differing files.")
+    args = parser.parse_args()
+    logger.disable("src")
+
+    paths = sorted(args.path.rglob("*.py")) if args.path.is_dir() else [args.path]
+    sources = {path: path.read_bytes() for path in paths}
+    tree_sitter, lite = CommentFinder(EnginesEnum.TREE_SITTER), CommentFinder(EnginesEnum.LITE)
+    tree_sitter_seconds = timed(tree_sitter, sources, args.repeat)
+    lite_seconds = timed(lite, sources, args.repeat)
+
+    comments = 0
+    differing: list[tuple[Path, list[CommentData], list[CommentData]]] = []
+    for path, source in sources.items():
+        expected, actual = tree_sitter.find_in_bytes(path, source), lite.find_in_bytes(path, source)
+        comments += len(expected)
+        if actual != expected:
+            differing.append((path, expected, actual))
+
+    print(f"{len(paths)} files, {comments} comments")
+    print(f"tree-sitter: {tree_sitter_seconds:8.2f} s")
+    print(f"       lite: {lite_seconds:8.2f} s")
+    print(f"{len(differing)} file(s) differ")
+    for path, expected, actual in differing[: args.show]:
+        mismatch = next(
+            (pair for pair in zip(expected, actual, strict=False) if pair[0] != pair[1]),
+            (f"{len(expected)} comment(s)", f"{len(actual)} comment(s)"),
+        )
+        print(f"{path}\n  tree-sitter: {mismatch[0]}\n         lite: {mismatch[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark the language server: the cost of applying an edit to an open document and of publishing its diagnostics.
+
+Usage:
+    python -m benchmarks.bench_lsp [FILE] [--edits N]
+
+Without FILE the `_pydecimal.py` module of the running Python (about 6.4k lines) is used.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+import random
+import statistics
+import sysconfig
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.lsp.document import TextDocument
+
+DEFAULT_FILE = Path(sysconfig.get_paths()["stdlib"]) / "_pydecimal.py"
+TYPED = "x"
+
+
+def main() -> None:
+    """
+    Type characters at random places of a document and print the percentiles of the edit and publish times.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file", nargs="?", type=Path, default=DEFAULT_FILE, help="The Python file to edit.")
+    parser.add_argument("--edits", type=int, default=200, help="The number of edits.")
+    args = parser.parse_args()
+    logger.disable("src")
+
+    text = args.file.read_text(encoding="utf-8")
+    lines = text.splitlines()
+    started = time.perf_counter()
+    document = TextDocument(args.file.as_uri(), args.file, text, CommentChecker())
+    document.diagnostics()
+    print(f"{args.file.name}: {len(lines)} lines, opened in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    generator = random.Random(0)
+    edit_times: list[float] = []
+    publish_times: list[float] = []
+    for _ in range(args.edits):
+        line = generator.randrange(len(lines))
+        character = generator.randint(0, len(lines[line]))
+        position = {"line": line, "character": character}
+        lines[line] = lines[line][:character] + TYPED + lines[line][character:]
+
+        started = time.perf_counter()
+        document.apply_changes([{"range": {"start": position, "end": position}, "text": TYPED}])
+        edit_times.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        document.diagnostics()
+        publish_times.append((time.perf_counter() - started) * 1000)
+
+    for name, times in (("edit", edit_times), ("publish", publish_times)):
+        quantiles = statistics.quantiles(times, n=20)
+        print(
+            f"{name:>8}: p50 {statistics.median(times):6.2f} ms  p95 {quantiles[18]:6.2f} ms  max {max(times):6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark opening and querying compiled word lists against loading the words into a set.
+
+Usage:
+    python -m benchmarks.bench_word_list [--sizes N ...] [--lookups N]
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from src.density_calculation.checker.word_list import WordList, compile_word_list
+
+WORD_LENGTHS = (3, 14)
+
+
+def random_words(count: int, generator: random.Random) -> list[str]:
+    """
+    Generate distinct random lower-case words.
+
+    Args:
+        count (int): The number of words.
+        generator (random.Random): The random generator.
+
+    Returns:
+        list[str]: The words.
+    """
+    words: set[str] = set()
+    while len(words) < count:
+        words.add("".join(generator.choices(string.ascii_lowercase, k=generator.randint(*WORD_LENGTHS))))
+    return sorted(words)
+
+
+def main() -> None:
+    """
+    Compile word lists of growing size and print the time to open them and the time per lookup.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=200_000, help="Lookups per size, half of them misses.")
+    args = parser.parse_args()
+
+    print(f"{'words':>9} {'compile s':>9} {'open ms':>8} {'set load ms':>11} {'ns/lookup':>9} {'set ns':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            generator = random.Random(size)
+            words = random_words(size, generator)
+            text_path, dictionary_path = Path(directory, "words.txt"), Path(directory, "words.cdsdict")
+            text_path.write_text("\n".join(words), encoding="utf-8")
+            queries = [
+                generator.choice(words) if index % 2 else "".join(generator.choices(string.ascii_uppercase, k=8))
+                for index in range(args.lookups)
+            ]
+
+            started = time.perf_counter()
+            compile_word_list(words, dictionary_path)
+            compile_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            word_list = WordList(dictionary_path)
+            open_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            found = sum(query in word_list for query in queries)
+            lookup_seconds = time.perf_counter() - started
+            word_list.close()
+
+            started = time.perf_counter()
+            word_set = set(text_path.read_text(encoding="utf-8").lower().split())
+            set_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            set_found = sum(query.lower() in word_set for query in queries)
+            set_lookup_seconds = time.perf_counter() - started
+            if found != set_found:
+                raise SystemExit(f"{size} words: the word list found {found} words, the set {set_found}")
+
+            print(
+                f"{size:>9} {compile_seconds:>9.2f} {open_seconds * 1e3:>8.3f} {set_seconds * 1e3:>11.1f}"
+                f" {lookup_seconds / args.lookups * 1e9:>9.0f} {set_lookup_seconds / args.lookups * 1e9:>7.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
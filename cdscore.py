@@ -1,10 +1,21 @@
 import sys
 
-from src import CDSApp
+from src import CDSApp, DictionaryApp, HistoryApp, LspApp, StatsApp
+
+COMMANDS: dict[str, type[DictionaryApp | HistoryApp | LspApp | StatsApp]] = {
+    "dictionary": DictionaryApp,
+    "history": HistoryApp,
+    "lsp": LspApp,
+    "stats": StatsApp,
+}
 
 
 def main() -> int:
-    app = CDSApp(sys.argv[1:])
+    argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:]).run()
+
+    app = CDSApp(argv)
     return app.run()
 
 
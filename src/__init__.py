@@ -1,3 +1,8 @@
 from src.cds_app import CDSApp
+from src.density_calculation.results import iter_results
+from src.dictionary_app import DictionaryApp
+from src.history_app import HistoryApp
+from src.lsp_app import LspApp
+from src.stats_app import StatsApp
 
-__all__ = ["CDSApp"]
+__all__ = ["CDSApp", "DictionaryApp", "HistoryApp", "LspApp", "StatsApp", "iter_results"]
@@ -6,11 +6,33 @@ License: MIT License (see LICENSE file for details)
 """
 
 import argparse
+import io
+import os
+from collections.abc import Iterator
 from pathlib import Path
 
-from src.density_calculation import DensitySearcher
+from src.config import load_config
+from src.data_types import EnginesEnum, RuleCost, SampleEstimate
+from src.density_calculation import CommentStatistics, DensitySearcher, Quarantine, RuleProfiler, TopKTracker
+from src.density_calculation.baseline import Baseline, BaselineWriter
+from src.density_calculation.checkpoint import Checkpoint, checkpoint_fingerprint
+from src.density_calculation.finder.archive_reader import is_archive
+from src.density_calculation.finder.file_list import iter_listed_paths
+from src.density_calculation.output_formatter import MICROSECONDS, OutputFormatter
+from src.density_calculation.quarantine import DEFAULT_QUARANTINE_FILE
+from src.exceptions import (
+    ArchiveError,
+    BaselineError,
+    CheckpointError,
+    ConfigError,
+    DictionaryError,
+    GitError,
+    StatisticsError,
+    StoreError,
+)
 from src.logging_setup import setup_logging
 from src.output.cli_output import CLIOutput
+from src.output.sqlite_store import SQLiteStore
 
 
 class ArgsParser:
@@ -30,22 +52,208 @@ class ArgsParser:
             epilog="Example: cdscore.py ./my_project --min-cds 0.5",
         )
 
-        parser.add_argument("path", type=Path, help="Path to the code base to be analyzed.")
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            type=Path,
+            metavar="path",
+            help="Paths to the code base to be analyzed; wheels, sdists, zip files and tarballs are read without"
+            " extracting them.",
+        )
+        parser.add_argument(
+            "--files-from",
+            type=argparse.FileType("rb"),
+            default=None,
+            metavar="FILE",
+            help="Also analyze the files and directories listed in FILE, or in the standard input with `-`,"
+            " separated by NUL or newline, e.g. the output of `git ls-files -z`; analysis starts before the list ends.",
+        )
         parser.add_argument("--min-cds", type=float, default=float(0), help="Minimum CDS threshold.")
+        parser.add_argument(
+            "--engine",
+            choices=[engine.value for engine in EnginesEnum],
+            default=EnginesEnum.TREE_SITTER.value,
+            help="Comment extraction engine: full tree-sitter parse or a lightweight lexer pass.",
+        )
+        parser.add_argument(
+            "--rev",
+            default=None,
+            help="Analyze this git revision straight from the object store instead of the working tree.",
+        )
+        parser.add_argument(
+            "-j", "--jobs", type=int, default=1, help="Number of parser threads; more than 1 runs a threaded pipeline."
+        )
+        parser.add_argument(
+            "--time-budget",
+            type=float,
+            default=None,
+            metavar="SECONDS",
+            help="Processing time allowed per file; files over budget are skipped and quarantined.",
+        )
+        parser.add_argument(
+            "--quarantine",
+            type=Path,
+            default=DEFAULT_QUARANTINE_FILE,
+            metavar="FILE",
+            help=f"File listing the quarantined files, skipped by later runs (default: {DEFAULT_QUARANTINE_FILE}).",
+        )
+        parser.add_argument(
+            "--retry-quarantined",
+            action="store_true",
+            help="Analyze quarantined files again; files finishing within the budget leave the quarantine.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            default=None,
+            metavar="FILE",
+            help="Journal the results of every checked file, so that an interrupted run can be resumed.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Reuse the results journaled in the --checkpoint file for the files that did not change.",
+        )
+        parser.add_argument(
+            "--sqlite",
+            type=Path,
+            default=None,
+            metavar="FILE",
+            help="Append the files, findings and metadata of the run to this SQLite database.",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=None,
+            metavar="FILE",
+            help="Leave the findings recorded in this baseline out of the report and of the --min-cds gate.",
+        )
+        parser.add_argument(
+            "--write-baseline",
+            type=Path,
+            default=None,
+            metavar="FILE",
+            help="Record every finding of the run in this baseline, so that later runs report only new findings.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print the distribution of comment lengths per comment type and scope at the end of the run.",
+        )
+        parser.add_argument(
+            "--stats-file",
+            type=Path,
+            default=None,
+            metavar="FILE",
+            help="Save the comment length sketches to this JSON file, to be merged with `cdscore.py stats`.",
+        )
+        parser.add_argument(
+            "--profile-rules",
+            action="store_true",
+            help="Measure every rule and print a table of their costs at the end of the run.",
+        )
+        parser.add_argument(
+            "--rule-budget",
+            type=float,
+            default=None,
+            metavar="MICROSECONDS",
+            help="Fail the run if a rule costs more than this per comment on average; implies --profile-rules.",
+        )
+        sampling = parser.add_mutually_exclusive_group()
+        sampling.add_argument(
+            "--sample",
+            type=float,
+            default=None,
+            metavar="FRACTION",
+            help="Analyze a stratified random sample of this fraction of the files and estimate the total CDS.",
+        )
+        sampling.add_argument(
+            "--sample-files",
+            type=int,
+            default=None,
+            metavar="N",
+            help="Analyze a stratified random sample of N files and estimate the total CDS.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the random sample (default: 0).")
+        parser.add_argument(
+            "--target-width",
+            type=float,
+            default=None,
+            metavar="SCORE",
+            help="Stop sampling once the 95%% confidence interval of the estimate is narrower than this.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=None,
+            metavar="K",
+            help="Print the K worst files and directories by total penalty and by penalty per line,"
+            " and the K functions with the most comment lines per line of code.",
+        )
         parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output.")
 
         self.args = parser.parse_args(argv)
+        self._validate_paths(parser)
+        self._validate_sampling(parser)
+        if self.top is not None and self.top < 1:
+            parser.error("--top must be at least 1")
+        if self.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        if self.time_budget is not None and self.time_budget <= 0:
+            parser.error("--time-budget must be greater than 0")
+        if self.rule_budget is not None and self.rule_budget <= 0:
+            parser.error("--rule-budget must be greater than 0")
+        if self.resume and self.checkpoint_path is None:
+            parser.error("--resume requires --checkpoint")
 
     @property
     def path(self) -> Path:
         """
-        Return the path to the code base to be analyzed.
+        Return the root of the analysis, where the configuration is looked up.
+
+        Returns:
+            pathlib.Path: The only path, the common directory of several paths, or the current
+                directory for a file list.
+        """
+        paths = self.paths
+        if self.files_from is not None:
+            return Path.cwd()
+        if len(paths) == 1:
+            return paths[0]
+        return Path(os.path.commonpath([path.absolute() for path in paths]))
+
+    @property
+    def paths(self) -> list[Path]:
+        """
+        Return the paths given on the command line.
+
+        Returns:
+            list[pathlib.Path]: The files and directories to analyze.
+        """
+        paths: list[Path] = self.args.paths
+        return paths
+
+    @property
+    def files_from(self) -> io.BufferedReader | None:
+        """
+        Return the stream listing the files to analyze.
 
         Returns:
-            pathlib.Path: The root path for analysis.
+            io.BufferedReader | None: The opened list, or the binary standard input for `-`;
+                None if no list is given.
         """
-        path: Path = self.args.path
-        return path
+        files_from: io.BufferedReader | None = self.args.files_from
+        return files_from
+
+    @property
+    def listed(self) -> bool:
+        """
+        Return the flag to analyze several paths or a file list in one pipeline.
+
+        Returns:
+            bool: True if more than one path or a file list is given.
+        """
+        return len(self.paths) > 1 or self.files_from is not None
 
     @property
     def min_cds_threshold(self) -> float:
@@ -58,6 +266,235 @@ class ArgsParser:
         min_cds: float = self.args.min_cds
         return min_cds
 
+    @property
+    def engine(self) -> EnginesEnum:
+        """
+        Return the selected comment extraction engine.
+
+        Returns:
+            EnginesEnum: The engine used to find comments.
+        """
+        return EnginesEnum(self.args.engine)
+
+    @property
+    def revision(self) -> str | None:
+        """
+        Return the git revision to analyze.
+
+        Returns:
+            str | None: The revision, or None to analyze the files on disk.
+        """
+        revision: str | None = self.args.rev
+        return revision
+
+    @property
+    def jobs(self) -> int:
+        """
+        Return the number of parser threads.
+
+        Returns:
+            int: The number of parser/extractor threads.
+        """
+        jobs: int = self.args.jobs
+        return jobs
+
+    @property
+    def time_budget(self) -> float | None:
+        """
+        Return the processing time allowed per file.
+
+        Returns:
+            float | None: The budget in seconds, or None for no limit.
+        """
+        time_budget: float | None = self.args.time_budget
+        return time_budget
+
+    @property
+    def quarantine_path(self) -> Path:
+        """
+        Return the path of the quarantine file.
+
+        Returns:
+            pathlib.Path: The JSON file listing the quarantined files.
+        """
+        quarantine_path: Path = self.args.quarantine
+        return quarantine_path
+
+    @property
+    def retry_quarantined(self) -> bool:
+        """
+        Return the flag to analyze quarantined files again.
+
+        Returns:
+            bool: True if quarantined files are analyzed instead of skipped.
+        """
+        retry_quarantined: bool = self.args.retry_quarantined
+        return retry_quarantined
+
+    @property
+    def checkpoint_path(self) -> Path | None:
+        """
+        Return the path of the checkpoint journal.
+
+        Returns:
+            pathlib.Path | None: The journal file, or None if no checkpoint is kept.
+        """
+        checkpoint_path: Path | None = self.args.checkpoint
+        return checkpoint_path
+
+    @property
+    def resume(self) -> bool:
+        """
+        Return the flag to resume from the checkpoint journal.
+
+        Returns:
+            bool: True if journaled results are reused.
+        """
+        resume: bool = self.args.resume
+        return resume
+
+    @property
+    def sqlite_path(self) -> Path | None:
+        """
+        Return the path of the SQLite results database.
+
+        Returns:
+            pathlib.Path | None: The database file, or None if the results are not stored.
+        """
+        sqlite_path: Path | None = self.args.sqlite
+        return sqlite_path
+
+    @property
+    def baseline_path(self) -> Path | None:
+        """
+        Return the path of the baseline of known findings.
+
+        Returns:
+            pathlib.Path | None: The baseline file, or None if every finding is reported.
+        """
+        baseline_path: Path | None = self.args.baseline
+        return baseline_path
+
+    @property
+    def write_baseline_path(self) -> Path | None:
+        """
+        Return the path of the baseline to write.
+
+        Returns:
+            pathlib.Path | None: The baseline file, or None if no baseline is written.
+        """
+        write_baseline_path: Path | None = self.args.write_baseline
+        return write_baseline_path
+
+    @property
+    def stats(self) -> bool:
+        """
+        Return the flag to print the comment statistics.
+
+        Returns:
+            bool: True if the statistics are printed.
+        """
+        stats: bool = self.args.stats
+        return stats
+
+    @property
+    def stats_path(self) -> Path | None:
+        """
+        Return the path of the comment statistics file.
+
+        Returns:
+            pathlib.Path | None: The JSON file, or None if the statistics are not saved.
+        """
+        stats_path: Path | None = self.args.stats_file
+        return stats_path
+
+    @property
+    def sampling(self) -> bool:
+        """
+        Return the flag to estimate the CDS from a sample of the files.
+
+        Returns:
+            bool: True if a sample size or a target interval width is given.
+        """
+        return any(option is not None for option in (self.sample_fraction, self.sample_files, self.target_width))
+
+    @property
+    def sample_fraction(self) -> float | None:
+        """
+        Return the fraction of files to sample.
+
+        Returns:
+            float | None: The fraction, or None if not given.
+        """
+        sample_fraction: float | None = self.args.sample
+        return sample_fraction
+
+    @property
+    def sample_files(self) -> int | None:
+        """
+        Return the number of files to sample.
+
+        Returns:
+            int | None: The number of files, or None if not given.
+        """
+        sample_files: int | None = self.args.sample_files
+        return sample_files
+
+    @property
+    def seed(self) -> int:
+        """
+        Return the seed of the random sample.
+
+        Returns:
+            int: The seed.
+        """
+        seed: int = self.args.seed
+        return seed
+
+    @property
+    def target_width(self) -> float | None:
+        """
+        Return the confidence interval width at which sampling stops.
+
+        Returns:
+            float | None: The width in score units, or None to analyze the whole sample.
+        """
+        target_width: float | None = self.args.target_width
+        return target_width
+
+    @property
+    def top(self) -> int | None:
+        """
+        Return the number of worst files and directories to report.
+
+        Returns:
+            int | None: The number of entries per table, or None for no report.
+        """
+        top: int | None = self.args.top
+        return top
+
+    @property
+    def profile_rules(self) -> bool:
+        """
+        Return the flag to measure the cost of every rule.
+
+        Returns:
+            bool: True if rules are profiled, either explicitly or because a rule budget is set.
+        """
+        profile_rules: bool = self.args.profile_rules
+        return profile_rules or self.rule_budget is not None
+
+    @property
+    def rule_budget(self) -> float | None:
+        """
+        Return the average cost allowed per rule and comment.
+
+        Returns:
+            float | None: The budget in microseconds, or None for no limit.
+        """
+        rule_budget: float | None = self.args.rule_budget
+        return rule_budget
+
     @property
     def verbose(self) -> bool:
         """
@@ -69,6 +506,38 @@ class ArgsParser:
         verbose: bool = self.args.verbose
         return verbose
 
+    def _validate_paths(self, parser: argparse.ArgumentParser) -> None:
+        """
+        Reject missing or unsupported combinations of paths; exits through the parser on error.
+
+        Args:
+            parser (argparse.ArgumentParser): The parser reporting the error.
+        """
+        if not self.paths and self.files_from is None:
+            parser.error("a path or --files-from is required")
+        if self.listed and self.revision is not None:
+            parser.error("--rev accepts a single path")
+        if self.listed and self.sampling:
+            parser.error("sampling accepts a single path")
+        if any(is_archive(path) for path in self.paths) and (self.revision is not None or self.sampling):
+            parser.error("--rev and sampling do not accept archives")
+
+    def _validate_sampling(self, parser: argparse.ArgumentParser) -> None:
+        """
+        Reject invalid sampling options; exits through the parser on error.
+
+        Args:
+            parser (argparse.ArgumentParser): The parser reporting the error.
+        """
+        if self.sample_fraction is not None and not 0 < self.sample_fraction <= 1:
+            parser.error("--sample must be greater than 0 and at most 1")
+        if self.sample_files is not None and self.sample_files < 1:
+            parser.error("--sample-files must be at least 1")
+        if self.target_width is not None and self.target_width <= 0:
+            parser.error("--target-width must be greater than 0")
+        if self.sampling and self.revision is not None:
+            parser.error("sampling cannot be combined with --rev")
+
 
 class CDSApp:
     """
@@ -77,7 +546,7 @@ class CDSApp:
 
     def __init__(self, argv: list[str]) -> None:
         """
-        Initialize the application, parse arguments, setup logging, and configure the searcher.
+        Initialize the application, parse arguments, and setup logging.
 
         Args:
             argv (list[str]): The command-line arguments.
@@ -85,13 +554,67 @@ class CDSApp:
         self._args_parser = ArgsParser(argv)
         self.root_path = self._args_parser.path
         self.min_cds_threshold = self._args_parser.min_cds_threshold
+        self.revision = self._args_parser.revision
         self._verbose = self._args_parser.verbose
         setup_logging(self._verbose)
 
         self._output = CLIOutput()
+        self._quarantine: Quarantine | None = None
+        self._checkpoint: Checkpoint | None = None
+        self._store: SQLiteStore | None = None
+        self._baseline: Baseline | None = None
+        self._baseline_writer: BaselineWriter | None = None
+        self._baseline_written: int | None = None
+        self._profiler = RuleProfiler() if self._args_parser.profile_rules else None
+        self._top_k = TopKTracker(self._args_parser.top) if self._args_parser.top is not None else None
+        collect_statistics = self._args_parser.stats or self._args_parser.stats_path is not None
+        self._statistics = CommentStatistics() if collect_statistics else None
+
+    def create_searcher(self) -> DensitySearcher:
+        """
+        Load the `[tool.cdscore]` configuration for the analyzed path and create the searcher.
+
+        Returns:
+            DensitySearcher: The searcher with the CLI output subscribed.
 
-        self._searcher = DensitySearcher()
-        self._searcher.subscribe_output(self._output)
+        Raises:
+            ConfigError: If the configuration is invalid.
+            CheckpointError: If the checkpoint journal cannot be opened.
+            StoreError: If the results database cannot be opened.
+            BaselineError: If the baseline cannot be opened.
+        """
+        config = load_config(self.root_path)
+        self._quarantine = Quarantine(self._args_parser.quarantine_path, self._args_parser.retry_quarantined)
+        checkpoint_path = self._args_parser.checkpoint_path
+        if checkpoint_path is not None:
+            fingerprint = checkpoint_fingerprint(config, self._args_parser.engine)
+            self._checkpoint = Checkpoint(checkpoint_path, fingerprint, self._args_parser.resume)
+        sqlite_path = self._args_parser.sqlite_path
+        if sqlite_path is not None:
+            self._store = SQLiteStore(sqlite_path)
+            self._store.start_run(self.root_path, self._args_parser.engine, self.revision)
+        baseline_path = self._args_parser.baseline_path
+        if baseline_path is not None:
+            self._baseline = Baseline(baseline_path, self.root_path)
+        write_baseline_path = self._args_parser.write_baseline_path
+        if write_baseline_path is not None:
+            self._baseline_writer = BaselineWriter(write_baseline_path, self.root_path)
+        searcher = DensitySearcher(
+            self._args_parser.engine,
+            self._args_parser.jobs,
+            config,
+            self._args_parser.time_budget,
+            self._quarantine,
+            self._profiler,
+            self._top_k,
+            self._checkpoint,
+            self._store,
+            self._statistics,
+            self._baseline,
+            self._baseline_writer,
+        )
+        searcher.subscribe_output(self._output)
+        return searcher
 
     def run(self) -> int:
         """
@@ -100,10 +623,68 @@ class CDSApp:
         Returns:
             int: The application exit code.
         """
-        self._output.message(f"Path analyze: {self.root_path}")
+        if self._args_parser.paths:
+            self._output.message(f"Path analyze: {', '.join(str(path) for path in self._args_parser.paths)}")
+        if self._args_parser.files_from is not None:
+            self._output.message(f"Files from: {self._args_parser.files_from.name}")
+        if self.revision is not None:
+            self._output.message(f"Revision: {self.revision}")
         self._output.message(f"Minimal CDS threshold: {self.min_cds_threshold}\n")
 
-        final_score = self._searcher.start_analysis(self.root_path)
+        estimate: SampleEstimate | None = None
+        final_score: float
+        try:
+            searcher = self.create_searcher()
+            if self._args_parser.sampling:
+                estimate = searcher.start_sample_analysis(
+                    self.root_path,
+                    self._args_parser.sample_fraction,
+                    self._args_parser.sample_files,
+                    self._args_parser.seed,
+                    self._args_parser.target_width,
+                )
+                final_score = estimate.score
+            elif self._args_parser.listed:
+                final_score = searcher.start_listed_analysis(self._iter_listed_paths())
+            elif self.revision is None:
+                final_score = searcher.start_analysis(self.root_path)
+            else:
+                final_score = searcher.start_revision_analysis(self.root_path, self.revision)
+            if self._store is not None:
+                self._store.finish_run(round(final_score))
+            if self._statistics is not None and self._args_parser.stats_path is not None:
+                self._statistics.save(self._args_parser.stats_path)
+            if self._baseline_writer is not None:
+                self._baseline_written = self._baseline_writer.close()
+        except (
+            ArchiveError,
+            BaselineError,
+            CheckpointError,
+            ConfigError,
+            DictionaryError,
+            GitError,
+            StatisticsError,
+            StoreError,
+        ) as error:
+            self._output.message(f"Error: {error}")
+            return 1
+        finally:
+            if self._baseline is not None:
+                self._baseline.close()
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+            if self._store is not None:
+                self._close_store(self._store)
+
+        self._report_quarantine()
+        self._report_checkpoint()
+        self._report_baseline()
+        self._report_top_k()
+        self._report_statistics()
+        rules_over_budget = self._report_rule_costs()
+        if estimate is not None:
+            self._report_estimate(estimate)
+        self._report_density(searcher)
         self._output.message(f"Final CDS: {final_score}")
 
         if final_score < self.min_cds_threshold:
@@ -111,4 +692,155 @@ class CDSApp:
 
             return 1
 
+        if rules_over_budget:
+            rules = ", ".join(
+                f"{cost.rule} ({cost.seconds_per_comment * MICROSECONDS:.2f}us)" for cost in rules_over_budget
+            )
+            self._output.message(
+                f"Error: rule(s) over the budget of {self._args_parser.rule_budget:g}us per comment: {rules}"
+            )
+            return 1
+
         return 0
+
+    def _iter_listed_paths(self) -> Iterator[Path]:
+        """
+        Yield the paths given on the command line, then the paths of the file list as they are read.
+
+        Yields:
+            pathlib.Path: Every file or directory to analyze.
+        """
+        yield from self._args_parser.paths
+        files_from = self._args_parser.files_from
+        if files_from is not None:
+            with files_from:
+                yield from iter_listed_paths(files_from)
+
+    def _close_store(self, store: SQLiteStore) -> None:
+        """
+        Close the results database, reporting the rows that could not be written.
+
+        Args:
+            store (SQLiteStore): The results database.
+        """
+        try:
+            store.close()
+        except StoreError as error:
+            self._output.message(f"Error: {error}")
+
+    def _report_quarantine(self) -> None:
+        """
+        Report the files skipped because of the time budget, if any.
+        """
+        if self._quarantine is None:
+            return
+
+        if self._quarantine.added:
+            self._output.message(
+                f"Quarantined {len(self._quarantine.added)} file(s) over the time budget in '{self._quarantine.path}'."
+            )
+        if self._quarantine.skipped:
+            self._output.message(
+                f"Skipped {len(self._quarantine.skipped)} quarantined file(s); use --retry-quarantined to analyze them."
+            )
+
+    def _report_checkpoint(self) -> None:
+        """
+        Report the files whose results were restored from the checkpoint, if any.
+        """
+        if self._checkpoint is not None and self._checkpoint.restored:
+            self._output.message(
+                f"Restored {self._checkpoint.restored} unchanged file(s) from the checkpoint '{self._checkpoint.path}'."
+            )
+
+    def _report_baseline(self) -> None:
+        """
+        Report the findings left out because of the baseline and the findings written to a new one, if any.
+        """
+        if self._baseline is not None and self._baseline.suppressed:
+            self._output.message(
+                f"Left out {self._baseline.suppressed} finding(s) recorded in the baseline '{self._baseline.path}'."
+            )
+        if self._baseline_writer is not None and self._baseline_written is not None:
+            self._output.message(
+                f"Recorded {self._baseline_written} finding(s) in the baseline '{self._baseline_writer.path}'."
+            )
+
+    def _report_top_k(self) -> None:
+        """
+        Print the tables of the worst files, directories and functions, if requested.
+        """
+        if self._top_k is None:
+            return
+
+        formatter = OutputFormatter()
+        tables = (
+            ("Worst files by penalty", self._top_k.files_by_penalty()),
+            ("Worst files by penalty per line", self._top_k.files_by_penalty_per_line()),
+            ("Worst directories by penalty", self._top_k.directories_by_penalty()),
+            ("Worst directories by penalty per line", self._top_k.directories_by_penalty_per_line()),
+        )
+        for title, hotspots in tables:
+            self._output.message(formatter.hotspots_generation(title, hotspots) + "\n")
+        densest_functions = formatter.functions_generation("Densest functions", self._top_k.densest_functions())
+        self._output.message(densest_functions + "\n")
+
+    def _report_statistics(self) -> None:
+        """
+        Print the comment statistics, if requested.
+        """
+        if self._statistics is not None and self._args_parser.stats:
+            self._output.message(OutputFormatter().statistics_generation(self._statistics.distributions()) + "\n")
+
+    def _report_density(self, searcher: DensitySearcher) -> None:
+        """
+        Print the size of the checked code and the penalty per thousand lines of code.
+
+        Args:
+            searcher (DensitySearcher): The searcher that ran the analysis.
+        """
+        metrics = searcher.code_metrics
+        self._output.message(
+            f"Code: {metrics.lines} lines ({metrics.code_lines} code, {metrics.comment_lines} comment, "
+            f"{metrics.blank_lines} blank), {metrics.functions} functions, {metrics.classes} classes"
+        )
+        penalty_per_kloc = searcher.penalty_per_kloc
+        if penalty_per_kloc is not None:
+            self._output.message(f"Penalty per KLOC: {penalty_per_kloc:.2f}")
+
+    def _report_estimate(self, estimate: SampleEstimate) -> None:
+        """
+        Report the sample and the estimated total score with its confidence interval.
+
+        Args:
+            estimate (SampleEstimate): The estimate of the sampled analysis.
+        """
+        self._output.message(
+            f"Sampled {estimate.sampled} of {estimate.population} file(s) "
+            f"in {estimate.strata} strata (seed {self._args_parser.seed})."
+        )
+        if estimate.stopped_early:
+            self._output.message(
+                f"Stopped early: the confidence interval is narrower than {self._args_parser.target_width:g}."
+            )
+        self._output.message(
+            f"Estimated CDS: {estimate.score:.0f} +/- {estimate.margin:.0f} "
+            f"(95% CI: {estimate.lower:.0f} .. {estimate.upper:.0f})"
+        )
+
+    def _report_rule_costs(self) -> list[RuleCost]:
+        """
+        Print the table of rule costs, if profiling is enabled, and check them against the rule budget.
+
+        Returns:
+            list[RuleCost]: The rules over the budget; empty without a budget.
+        """
+        if self._profiler is None:
+            return []
+
+        self._output.message(OutputFormatter().rule_costs_generation(self._profiler.costs()) + "\n")
+
+        rule_budget = self._args_parser.rule_budget
+        if rule_budget is None:
+            return []
+        return self._profiler.over_budget(rule_budget / MICROSECONDS)
@@ -14,7 +14,7 @@ def parse_language(filepath: Path) -> LanguagesEnum:
     Returns:
         LanguagesEnum: The detected programming language. Defaults to PYTHON.
     """
-    suffix_language: dict[str, LanguagesEnum] = {".py": LanguagesEnum.PYTHON}
+    suffix_language: dict[str, LanguagesEnum] = {".py": LanguagesEnum.PYTHON, ".ipynb": LanguagesEnum.PYTHON}
 
     suffix = filepath.suffix
     language = suffix_language.get(suffix)
@@ -0,0 +1,370 @@
+"""
+Define the configuration read from the `[tool.cdscore]` table of `pyproject.toml`.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from __future__ import annotations
+
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from src.data_types import CommentScope, CommentType
+from src.exceptions import ConfigError
+
+PYPROJECT_NAME = "pyproject.toml"
+SPELLING_RULE_ID = 105
+FUNCTION_DENSITY_RULE_ID = 107
+
+
+@dataclass(frozen=True)
+class TextRuleConfig:
+    """
+    Represent one declarative text rule.
+
+    Attributes:
+        rule_id (int): The unique identifier of the rule.
+        score (int): The score applied when the rule is violated.
+        max_len (int | None): The maximum length of every normalized line.
+        min_len (int | None): The minimum length of every normalized line.
+        forbidden (tuple[str, ...]): Regular expressions no line may match.
+        required_prefixes (tuple[str, ...]): The first line must start with one of these prefixes.
+        comment_types (frozenset[CommentType]): The comment types the rule applies to.
+        scopes (frozenset[CommentScope]): The scopes the rule applies to.
+        message (str | None): A custom message template; the default depends on the violated condition.
+    """
+
+    rule_id: int
+    score: int
+    max_len: int | None = None
+    min_len: int | None = None
+    forbidden: tuple[str, ...] = ()
+    required_prefixes: tuple[str, ...] = ()
+    comment_types: frozenset[CommentType] = frozenset(CommentType)
+    scopes: frozenset[CommentScope] = frozenset(CommentScope)
+    message: str | None = None
+
+
+@dataclass(frozen=True)
+class SpellingConfig:
+    """
+    Represent the configuration of the spelling rule.
+
+    Attributes:
+        dictionary (pathlib.Path): The dictionary compiled with `cdscore.py dictionary`.
+        allow (frozenset[str]): Lower-cased project words accepted in addition to the dictionary.
+        score (int): The score applied to a comment with unknown words.
+        rule_id (int): The unique identifier of the rule.
+    """
+
+    dictionary: Path
+    allow: frozenset[str] = frozenset()
+    score: int = -1
+    rule_id: int = SPELLING_RULE_ID
+
+
+@dataclass(frozen=True)
+class FunctionDensityConfig:
+    """
+    Represent the configuration of the function density rule.
+
+    Attributes:
+        max_ratio (float): The largest accepted number of inline comment lines per line of code.
+        min_lines (int): Functions with fewer comment and code lines are not checked.
+        score (int): The score applied to an over-commented function.
+        rule_id (int): The unique identifier of the rule.
+    """
+
+    max_ratio: float = 1.0
+    min_lines: int = 5
+    score: int = -2
+    rule_id: int = FUNCTION_DENSITY_RULE_ID
+
+
+DEFAULT_TEXT_RULES = (
+    TextRuleConfig(rule_id=101, score=-5, max_len=120),
+    TextRuleConfig(rule_id=102, score=-1, min_len=4),
+)
+
+
+@dataclass(frozen=True)
+class CDSConfig:
+    """
+    Represent the tool configuration.
+
+    Attributes:
+        text_rules (tuple[TextRuleConfig, ...]): The declarative text rules, compiled into one fused pass.
+        spelling (SpellingConfig | None): The spelling rule, enabled by a `[tool.cdscore.spelling]` table.
+        function_density (FunctionDensityConfig | None): The function density rule, tuned by a
+            `[tool.cdscore.function_density]` table; None once disabled.
+        source (pathlib.Path | None): The file the configuration was read from, if any.
+    """
+
+    text_rules: tuple[TextRuleConfig, ...] = DEFAULT_TEXT_RULES
+    spelling: SpellingConfig | None = None
+    function_density: FunctionDensityConfig | None = FunctionDensityConfig()
+    source: Path | None = field(default=None, compare=False)
+
+
+def find_pyproject(path: Path) -> Path | None:
+    """
+    Find the nearest `pyproject.toml` in the given directory or its parents.
+
+    Args:
+        path (pathlib.Path): The analyzed file or directory.
+
+    Returns:
+        pathlib.Path | None: The path to `pyproject.toml`, or None if there is none.
+    """
+    start = path.resolve()
+    if not start.is_dir():
+        start = start.parent
+
+    for directory in (start, *start.parents):
+        candidate = directory / PYPROJECT_NAME
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def load_config(path: Path) -> CDSConfig:
+    """
+    Load the `[tool.cdscore]` configuration that applies to the analyzed path.
+
+    User rules with the ID of a default rule replace it, other rules are added,
+    and `disable` removes rules by ID. A `[tool.cdscore.spelling]` table enables
+    the spelling rule; its paths are relative to the directory of `pyproject.toml`.
+    A `[tool.cdscore.function_density]` table tunes the function density rule.
+
+    Args:
+        path (pathlib.Path): The analyzed file or directory.
+
+    Returns:
+        CDSConfig: The configuration, or the defaults if no configuration is found.
+
+    Raises:
+        ConfigError: If the configuration is invalid.
+    """
+    pyproject = find_pyproject(path)
+    if pyproject is None:
+        return CDSConfig()
+
+    try:
+        with open(pyproject, "rb") as pyproject_file:
+            document = tomllib.load(pyproject_file)
+    except tomllib.TOMLDecodeError as error:
+        raise ConfigError(f"Cannot read {pyproject}: {error}") from error
+
+    table = document.get("tool", {}).get("cdscore")
+    if table is None:
+        return CDSConfig()
+
+    logger.debug("Configuration loaded from {}", pyproject)
+    raw_rules = table.get("rules", [])
+    if not isinstance(raw_rules, list) or not all(isinstance(raw_rule, dict) for raw_rule in raw_rules):
+        raise ConfigError("'rules' must be a list of tables ([[tool.cdscore.rules]])")
+    rules = {rule.rule_id: rule for rule in DEFAULT_TEXT_RULES}
+    for raw_rule in raw_rules:
+        rule = _parse_text_rule(raw_rule)
+        rules[rule.rule_id] = rule
+    disabled = _parse_disable(table.get("disable", []))
+    for rule_id in disabled:
+        rules.pop(rule_id, None)
+
+    spelling = None
+    if "spelling" in table:
+        spelling = _parse_spelling(table["spelling"], pyproject.parent)
+        if spelling.rule_id in disabled:
+            spelling = None
+
+    function_density: FunctionDensityConfig | None = _parse_function_density(table.get("function_density", {}))
+    if FUNCTION_DENSITY_RULE_ID in disabled:
+        function_density = None
+
+    return CDSConfig(
+        text_rules=tuple(rules.values()), spelling=spelling, function_density=function_density, source=pyproject
+    )
+
+
+def _parse_text_rule(raw_rule: dict[str, Any]) -> TextRuleConfig:
+    """
+    Convert one `[[tool.cdscore.rules]]` table into a text rule.
+
+    Args:
+        raw_rule (dict[str, Any]): The TOML table.
+
+    Returns:
+        TextRuleConfig: The text rule.
+
+    Raises:
+        ConfigError: If a key is unknown or a value has a wrong type.
+    """
+    known_keys = {"id", "score", "max_len", "min_len", "forbidden", "required_prefix", "types", "scopes", "message"}
+    unknown_keys = set(raw_rule) - known_keys
+    if unknown_keys:
+        raise ConfigError(f"Unknown key(s) in rule {raw_rule.get('id')}: {', '.join(sorted(unknown_keys))}")
+    if not _is_integer(raw_rule.get("id")):
+        raise ConfigError(f"Rule without an integer 'id': {raw_rule}")
+    for key in ("max_len", "min_len"):
+        if key in raw_rule and (not _is_integer(raw_rule[key]) or raw_rule[key] < 0):
+            raise ConfigError(f"Invalid value in rule {raw_rule['id']}: '{key}' must be an integer of at least 0")
+    for key in ("forbidden", "required_prefix", "types", "scopes"):
+        if key in raw_rule and not _is_string_list(raw_rule[key]):
+            raise ConfigError(f"Invalid value in rule {raw_rule['id']}: '{key}' must be a string or a list of strings")
+    if "message" in raw_rule and not isinstance(raw_rule["message"], str):
+        raise ConfigError(f"Invalid value in rule {raw_rule['id']}: 'message' must be a string")
+
+    try:
+        return TextRuleConfig(
+            rule_id=raw_rule["id"],
+            score=int(raw_rule.get("score", -1)),
+            max_len=raw_rule.get("max_len"),
+            min_len=raw_rule.get("min_len"),
+            forbidden=tuple(_as_list(raw_rule.get("forbidden", []))),
+            required_prefixes=tuple(_as_list(raw_rule.get("required_prefix", []))),
+            comment_types=frozenset(CommentType[name.upper()] for name in _as_list(raw_rule.get("types", [])))
+            or frozenset(CommentType),
+            scopes=frozenset(CommentScope[name.upper()] for name in _as_list(raw_rule.get("scopes", [])))
+            or frozenset(CommentScope),
+            message=raw_rule.get("message"),
+        )
+    except (KeyError, TypeError, ValueError) as error:
+        raise ConfigError(f"Invalid value in rule {raw_rule['id']}: {error}") from error
+
+
+def _parse_disable(raw_disable: Any) -> set[int]:
+    """
+    Convert the `disable` list into the set of disabled rule IDs.
+
+    Args:
+        raw_disable (Any): The TOML value.
+
+    Returns:
+        set[int]: The IDs of the disabled rules.
+
+    Raises:
+        ConfigError: If the value is not a list of integers.
+    """
+    if not isinstance(raw_disable, list) or not all(_is_integer(rule_id) for rule_id in raw_disable):
+        raise ConfigError(f"'disable' must be a list of rule IDs: {raw_disable!r}")
+    return set(raw_disable)
+
+
+def _is_integer(value: Any) -> bool:
+    """
+    Check that a TOML value is an integer; booleans are rejected although Python treats them as integers.
+
+    Args:
+        value (Any): The TOML value.
+
+    Returns:
+        bool: True if the value is an integer.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_string_list(value: Any) -> bool:
+    """
+    Check that a TOML value is a string or a list of strings.
+
+    Args:
+        value (Any): The TOML value.
+
+    Returns:
+        bool: True if the value is accepted by `_as_list`.
+    """
+    return isinstance(value, str) or (isinstance(value, list) and all(isinstance(item, str) for item in value))
+
+
+def _parse_spelling(raw_spelling: dict[str, Any], base: Path) -> SpellingConfig:
+    """
+    Convert the `[tool.cdscore.spelling]` table into the spelling rule configuration.
+
+    Args:
+        raw_spelling (dict[str, Any]): The TOML table.
+        base (pathlib.Path): The directory relative paths are resolved against.
+
+    Returns:
+        SpellingConfig: The spelling rule configuration.
+
+    Raises:
+        ConfigError: If a key is unknown, a value has a wrong type or the allow-list file cannot be read.
+    """
+    unknown_keys = set(raw_spelling) - {"dictionary", "allow", "allow_file", "score"}
+    if unknown_keys:
+        raise ConfigError(f"Unknown key(s) in spelling: {', '.join(sorted(unknown_keys))}")
+    if not isinstance(raw_spelling.get("dictionary"), str):
+        raise ConfigError("Spelling without a 'dictionary' path")
+
+    allow_words = _as_list(raw_spelling.get("allow", []))
+    if not all(isinstance(word, str) for word in allow_words):
+        raise ConfigError("Spelling 'allow' must be a list of strings")
+    allow = {word.lower() for word in allow_words}
+    if "allow_file" in raw_spelling:
+        allow_file = base / raw_spelling["allow_file"]
+        try:
+            allow.update(line.strip().lower() for line in allow_file.read_text(encoding="utf-8").splitlines())
+        except (OSError, UnicodeDecodeError) as error:
+            raise ConfigError(f"Cannot read the spelling allow-list {allow_file}: {error}") from error
+    allow.discard("")
+
+    try:
+        return SpellingConfig(
+            dictionary=base / raw_spelling["dictionary"],
+            allow=frozenset(allow),
+            score=int(raw_spelling.get("score", -1)),
+        )
+    except (TypeError, ValueError) as error:
+        raise ConfigError(f"Invalid value in spelling: {error}") from error
+
+
+def _parse_function_density(raw_density: Any) -> FunctionDensityConfig:
+    """
+    Convert the `[tool.cdscore.function_density]` table into the function density rule configuration.
+
+    Args:
+        raw_density (Any): The TOML table.
+
+    Returns:
+        FunctionDensityConfig: The function density rule configuration, with defaults for missing keys.
+
+    Raises:
+        ConfigError: If the value is not a table, a key is unknown, a value has a wrong type
+            or the ratio or the line count is negative.
+    """
+    if not isinstance(raw_density, dict):
+        raise ConfigError(f"'function_density' must be a table: {raw_density!r}")
+    unknown_keys = set(raw_density) - {"max_ratio", "min_lines", "score"}
+    if unknown_keys:
+        raise ConfigError(f"Unknown key(s) in function_density: {', '.join(sorted(unknown_keys))}")
+
+    default = FunctionDensityConfig()
+    try:
+        density = FunctionDensityConfig(
+            max_ratio=float(raw_density.get("max_ratio", default.max_ratio)),
+            min_lines=int(raw_density.get("min_lines", default.min_lines)),
+            score=int(raw_density.get("score", default.score)),
+        )
+    except (TypeError, ValueError) as error:
+        raise ConfigError(f"Invalid value in function_density: {error}") from error
+    if density.max_ratio < 0 or density.min_lines < 0:
+        raise ConfigError("Invalid value in function_density: 'max_ratio' and 'min_lines' must be at least 0")
+    return density
+
+
+def _as_list(value: str | list[str]) -> list[str]:
+    """
+    Accept a single string where a list of strings is expected.
+
+    Args:
+        value (str | list[str]): The TOML value.
+
+    Returns:
+        list[str]: The value as a list.
+    """
+    return [value] if isinstance(value, str) else list(value)
@@ -11,6 +11,53 @@ from enum import Enum, auto
 from pathlib import Path
 
 
+@dataclass(frozen=True)
+class DefinitionData:
+    """
+    Represent the signature of the function that owns a docstring.
+
+    Extractors keep this summary instead of the syntax node, so rules can compare a docstring
+    with its function while no syntax tree outlives the extraction of its file.
+
+    Attributes:
+        name (str): The name of the function.
+        parameters (tuple[str, ...]): The parameter names in order, with `*` or `**` for variadic parameters.
+    """
+
+    name: str
+    parameters: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ScopeSpan:
+    """
+    Represent the innermost function or class definition enclosing a comment.
+
+    The comments of one definition hold equal spans, usually the same instance.
+
+    Attributes:
+        name (str): The dotted name of the definition within its file, e.g. `Parser.parse`.
+        kind (CommentScope): FUNCTION or CLASS.
+        start_line (int): The line of the `def` or `class` keyword (1-based).
+        end_line (int): The last line of the definition body (1-based).
+    """
+
+    name: str
+    kind: CommentScope
+    start_line: int
+    end_line: int
+
+    @property
+    def lines(self) -> int:
+        """
+        Return the number of lines of the definition.
+
+        Returns:
+            int: The number of lines from the header to the end of the body.
+        """
+        return self.end_line - self.start_line + 1
+
+
 @dataclass(frozen=True)
 class CommentData:
     """
@@ -25,6 +72,10 @@ class CommentData:
         column_end (int): The ending column number (0-based).
         comment_type (str): The type of the comment node (e.g., 'comment', 'string').
         scope (CommentScope): The context (function, class, module) where the comment was found.
+        definition (DefinitionData | None): The signature of the function, for the docstring of a function.
+        cell (int | None): The position (1-based) of the notebook cell holding the comment, whose
+            line numbers are then relative to the cell; None outside notebooks.
+        owner (ScopeSpan | None): The innermost function or class enclosing the comment; None at module level.
     """
 
     file_path: Path
@@ -37,6 +88,21 @@ class CommentData:
 
     comment_type: CommentType
     scope: CommentScope
+    definition: DefinitionData | None = None
+    cell: int | None = None
+    owner: ScopeSpan | None = None
+
+    @property
+    def location(self) -> str:
+        """
+        Return the position of the comment for messages.
+
+        Returns:
+            str: `path:line`, or `path:cell N:line` in a notebook.
+        """
+        if self.cell is None:
+            return f"{self.file_path}:{self.start_line_number}"
+        return f"{self.file_path}:cell {self.cell}:{self.start_line_number}"
 
 
 @dataclass(frozen=True)
@@ -58,6 +124,336 @@ class CheckerData:
     rule_id: int
 
 
+@dataclass(frozen=True)
+class FunctionDensity:
+    """
+    Represent the comment density of one function.
+
+    Attributes:
+        name (str): The dotted name of the function within its file.
+        start_line (int): The line of the `def` keyword (1-based).
+        comment_lines (int): The lines holding inline comments of the function (not of nested definitions).
+        code_lines (int): The other lines of the function, including its header.
+        cell (int | None): The notebook cell of the function; None outside notebooks.
+    """
+
+    name: str
+    start_line: int
+    comment_lines: int
+    code_lines: int
+    cell: int | None = None
+
+    @property
+    def ratio(self) -> float:
+        """
+        Return the number of comment lines per line of code.
+
+        Returns:
+            float: The ratio of comment lines to code lines.
+        """
+        return self.comment_lines / max(self.code_lines, 1)
+
+
+@dataclass(frozen=True)
+class CodeMetrics:
+    """
+    Represent the size of a file or of a set of files, measured while its comments are extracted.
+
+    Every physical line is exactly one of code, comment or blank: a line is blank if it holds
+    only whitespace, a comment line if a comment or docstring starting its line covers it,
+    and a code line otherwise, so a line of code with a trailing comment is code. Metrics of
+    several files are summed with `+`.
+
+    Attributes:
+        lines (int): The physical lines.
+        code_lines (int): The lines holding code.
+        comment_lines (int): The non-blank lines holding only comments or docstrings.
+        blank_lines (int): The lines holding only whitespace.
+        functions (int): The function definitions, including methods and nested functions.
+        classes (int): The class definitions.
+    """
+
+    lines: int = 0
+    code_lines: int = 0
+    comment_lines: int = 0
+    blank_lines: int = 0
+    functions: int = 0
+    classes: int = 0
+
+    def __add__(self, other: CodeMetrics) -> CodeMetrics:
+        """
+        Return the metrics of two files or sets of files together.
+
+        Args:
+            other (CodeMetrics): The other metrics.
+
+        Returns:
+            CodeMetrics: The sums of all counts.
+        """
+        return CodeMetrics(
+            self.lines + other.lines,
+            self.code_lines + other.code_lines,
+            self.comment_lines + other.comment_lines,
+            self.blank_lines + other.blank_lines,
+            self.functions + other.functions,
+            self.classes + other.classes,
+        )
+
+
+@dataclass(frozen=True)
+class FileResult:
+    """
+    Represent the check results for a single analyzed file.
+
+    Attributes:
+        file_path (pathlib.Path): The path to the analyzed file.
+        findings (list[CheckerData]): All rule results for the comments of the file.
+        lines (int): The number of lines of the file.
+        functions (tuple[FunctionDensity, ...]): The comment density of the functions with inline comments.
+        metrics (CodeMetrics | None): The size of the file; None if it was not measured.
+    """
+
+    file_path: Path
+    findings: list[CheckerData]
+    lines: int = 0
+    functions: tuple[FunctionDensity, ...] = ()
+    metrics: CodeMetrics | None = None
+
+    @property
+    def score(self) -> int:
+        """
+        Return the total score of the file.
+
+        Returns:
+            int: The sum of the scores of all findings.
+        """
+        return sum(finding.score for finding in self.findings)
+
+    @property
+    def penalty(self) -> int:
+        """
+        Return the total penalty of the file.
+
+        Returns:
+            int: The sum of the negative scores, as a positive number.
+        """
+        return -sum(finding.score for finding in self.findings if finding.score < 0)
+
+
+@dataclass(frozen=True)
+class RestoredFile:
+    """
+    Represent a file whose results were restored from a checkpoint instead of being analyzed again.
+
+    Attributes:
+        file_result (FileResult): The results recorded by the interrupted run.
+        comments (list[CommentData]): The comments of the file, for file rules that keep state across files.
+    """
+
+    file_result: FileResult
+    comments: list[CommentData]
+
+
+@dataclass(frozen=True)
+class HistoryPoint:
+    """
+    Represent the comment density of one commit in a history series.
+
+    Attributes:
+        commit (str): The commit SHA.
+        timestamp (int): The committer timestamp (seconds since the epoch).
+        score (int): The total score of the commit.
+        violations (int): The number of findings with a negative score.
+        files (int): The number of analyzed files.
+    """
+
+    commit: str
+    timestamp: int
+    score: int
+    violations: int
+    files: int
+
+
+@dataclass(frozen=True)
+class Hotspot:
+    """
+    Represent a file or directory ranked by its penalty.
+
+    Attributes:
+        path (pathlib.Path): The path of the file or directory.
+        penalty (int): The total penalty of its findings.
+        lines (int): The number of lines its penalty was counted over.
+        error (int): The largest amount by which `penalty` may overestimate the true penalty;
+            0 for exact counts.
+    """
+
+    path: Path
+    penalty: int
+    lines: int
+    error: int = 0
+
+    @property
+    def penalty_per_line(self) -> float:
+        """
+        Return the penalty per line, counting only the penalty known for certain.
+
+        Returns:
+            float: The guaranteed penalty divided by the lines, 0.0 for an empty file.
+        """
+        return (self.penalty - self.error) / self.lines if self.lines else 0.0
+
+
+@dataclass(frozen=True)
+class RuleCost:
+    """
+    Represent the measured cost of one rule over a run.
+
+    Attributes:
+        rule (str): The rule ID, or the IDs of the declarative text rules evaluated in one fused pass.
+        name (str): The name of the rule class.
+        invocations (int): The number of times the rule ran; verdicts taken from the cache are not counted.
+        hits (int): The number of results the rule produced.
+        comments (int): The number of comments the rule looked at.
+        total_seconds (float): The total time spent in the rule.
+        p50_seconds (float): The median latency of one invocation.
+        p99_seconds (float): The 99th percentile latency of one invocation.
+    """
+
+    rule: str
+    name: str
+    invocations: int
+    hits: int
+    comments: int
+    total_seconds: float
+    p50_seconds: float
+    p99_seconds: float
+
+    @property
+    def seconds_per_comment(self) -> float:
+        """
+        Return the average cost of the rule per checked comment.
+
+        Returns:
+            float: The time in seconds, 0.0 if the rule saw no comment.
+        """
+        return self.total_seconds / self.comments if self.comments else 0.0
+
+
+@dataclass(frozen=True)
+class QuantileSummary:
+    """
+    Represent the distribution of one measure of a set of comments, estimated by a quantile sketch.
+
+    Attributes:
+        count (int): The number of comments.
+        p50 (float): The estimated median.
+        p95 (float): The estimated 95th percentile.
+        p99 (float): The estimated 99th percentile.
+        maximum (float): The exact maximum.
+    """
+
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    maximum: float
+
+
+@dataclass(frozen=True)
+class CommentDistribution:
+    """
+    Represent the size distribution of the comments of one type and scope.
+
+    Attributes:
+        comment_type (CommentType): The type of the comments.
+        scope (CommentScope): The scope of the comments.
+        length (QuantileSummary): The length of the normalized text, in characters.
+        lines (QuantileSummary): The number of normalized lines.
+        length_histogram (tuple[int, ...]): The number of comments per length bucket: 0, 1, 2-3, 4-7, ...
+    """
+
+    comment_type: CommentType
+    scope: CommentScope
+    length: QuantileSummary
+    lines: QuantileSummary
+    length_histogram: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class SampleEstimate:
+    """
+    Represent the total score of a tree estimated from a stratified random sample of its files.
+
+    Attributes:
+        score (float): The estimated total score.
+        margin (float): Half the width of the 95% confidence interval; 0.0 if every file was analyzed,
+            infinite if too few files were analyzed to tell.
+        sampled (int): The number of analyzed files.
+        planned (int): The number of files selected for the sample.
+        population (int): The number of files in the tree.
+        strata (int): The number of strata the files were divided into.
+        stopped_early (bool): True if the analysis stopped once the interval was narrow enough.
+    """
+
+    score: float
+    margin: float
+    sampled: int
+    planned: int
+    population: int
+    strata: int
+    stopped_early: bool = False
+
+    @property
+    def lower(self) -> float:
+        """
+        Return the lower bound of the confidence interval.
+
+        Returns:
+            float: The lowest plausible total score.
+        """
+        return self.score - self.margin
+
+    @property
+    def upper(self) -> float:
+        """
+        Return the upper bound of the confidence interval.
+
+        Returns:
+            float: The highest plausible total score.
+        """
+        return self.score + self.margin
+
+    @property
+    def width(self) -> float:
+        """
+        Return the width of the confidence interval.
+
+        Returns:
+            float: The distance between the bounds.
+        """
+        return 2 * self.margin
+
+
+@dataclass(frozen=True)
+class QuarantineEntry:
+    """
+    Represent a file that exceeded its time budget and is skipped by later runs.
+
+    Attributes:
+        size (int): The size of the file content in bytes.
+        digest (str): The BLAKE2b digest of the file content; a changed file is analyzed again.
+        stage (str): The analysis stage that was running when the budget ran out.
+        elapsed (float): The processing time spent on the file in seconds.
+        budget (float): The time budget in seconds.
+    """
+
+    size: int
+    digest: str
+    stage: str
+    elapsed: float
+    budget: float
+
+
 class LanguagesEnum(Enum):
     """
     Define supported programming languages.
@@ -66,6 +462,15 @@ class LanguagesEnum(Enum):
     PYTHON = auto()
 
 
+class EnginesEnum(Enum):
+    """
+    Define the available comment extraction engines.
+    """
+
+    TREE_SITTER = "tree-sitter"
+    LITE = "lite"
+
+
 class CommentScope(Enum):
     """
     Define the structural scope where a comment resides within the code.
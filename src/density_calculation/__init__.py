@@ -1,6 +1,25 @@
 from src.density_calculation.cds_scoring_manager import CDSScoringManager
 from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.checker.rule_profiler import RuleProfiler
+from src.density_calculation.comment_statistics import CommentStatistics
 from src.density_calculation.density_searcher import DensitySearcher
 from src.density_calculation.finder.comment_finder import CommentFinder
+from src.density_calculation.quarantine import Quarantine
+from src.density_calculation.results import iter_file_results, iter_listed_results, iter_results
+from src.density_calculation.sampling import StratifiedSample
+from src.density_calculation.top_k import TopKTracker
 
-__all__ = ["CDSScoringManager", "CommentFinder", "CommentChecker", "DensitySearcher"]
+__all__ = [
+    "CDSScoringManager",
+    "CommentFinder",
+    "CommentChecker",
+    "CommentStatistics",
+    "DensitySearcher",
+    "Quarantine",
+    "RuleProfiler",
+    "StratifiedSample",
+    "TopKTracker",
+    "iter_file_results",
+    "iter_listed_results",
+    "iter_results",
+]
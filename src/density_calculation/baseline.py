@@ -0,0 +1,285 @@
+"""
+Define the memory-mapped baseline of known findings, so that only new findings are reported.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import dataclasses
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+
+from src.data_types import CheckerData, FileResult
+from src.exceptions import BaselineError
+
+MAGIC = b"CDSBASE1"
+HEADER = struct.Struct("=8sII")
+FINGERPRINT_SIZE = 8
+COUNT_SIZE = 4
+MAX_LOAD_FACTOR = 0.5
+
+
+def finding_fingerprint(finding: CheckerData, path: str) -> int:
+    """
+    Return the fingerprint of a finding, which survives line shifts and reformatting.
+
+    It hashes the rule, the path, the scope and the comment text with its whitespace
+    collapsed; positions are left out, so a finding keeps its fingerprint when code is
+    added above its comment or the comment is re-indented.
+
+    Args:
+        finding (CheckerData): The finding.
+        path (str): The path of the file, relative to the root of the analysis.
+
+    Returns:
+        int: A non-zero 64-bit fingerprint.
+    """
+    comment = finding.comment_data
+    text = " ".join(" ".join(comment.text).split())
+    key = f"{finding.rule_id}\0{path}\0{comment.scope.name}\0{text}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=FINGERPRINT_SIZE).digest(), "little") or 1
+
+
+class Baseline:
+    """
+    Remove the findings recorded by `BaselineWriter` from the results of a run.
+
+    The file is an open-addressing hash table of 64-bit fingerprints followed by the number
+    of findings recorded for every fingerprint. It is memory-mapped, so opening costs the same
+    for any baseline size and a lookup reads about one slot; only the fingerprints matched
+    during the run are kept as Python objects. A fingerprint recorded N times suppresses N
+    findings, so a copy of a known violation in the same file is reported as new. Only findings
+    with a negative score are recorded and suppressed. Numbers are stored in the native byte
+    order: write the baseline on the platform using it.
+
+    Usage:
+        with Baseline(Path("cds-baseline.bin"), root) as baseline:
+            file_result = baseline.filter(file_result)
+    """
+
+    def __init__(self, path: Path, root: Path) -> None:
+        """
+        Memory-map a baseline.
+
+        Args:
+            path (pathlib.Path): The baseline file.
+            root (pathlib.Path): The root of the analysis; fingerprints hold paths relative to it.
+
+        Raises:
+            BaselineError: If the file cannot be read or is not a baseline.
+        """
+        self.path = path
+        self.suppressed = 0
+        self._root = _directory(root)
+        self._matched: dict[int, int] = {}
+        try:
+            with open(path, "rb") as baseline_file:
+                self._map = mmap.mmap(baseline_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            raise BaselineError(f"Cannot open the baseline '{path}': {error}") from error
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise BaselineError(f"'{path}' is not a baseline")
+        magic, slot_count, finding_count = HEADER.unpack_from(self._map)
+        counts_offset = HEADER.size + slot_count * FINGERPRINT_SIZE
+        valid_size = len(self._map) == counts_offset + slot_count * COUNT_SIZE
+        if magic != MAGIC or not slot_count or slot_count & (slot_count - 1) or not valid_size:
+            self.close()
+            raise BaselineError(f"'{path}' is not a baseline")
+
+        self.finding_count: int = finding_count
+        self._mask = slot_count - 1
+        self._fingerprints = memoryview(self._map)[HEADER.size : counts_offset].cast("Q")
+        self._counts = memoryview(self._map)[counts_offset:].cast("I")
+
+    def filter(self, file_result: FileResult) -> FileResult:
+        """
+        Remove the findings of a file that the baseline records.
+
+        Args:
+            file_result (FileResult): The results of a checked file.
+
+        Returns:
+            FileResult: The results without the recorded findings; the same object if none is recorded.
+        """
+        path = _relative_path(file_result.file_path, self._root)
+        findings = [finding for finding in file_result.findings if not self._suppresses(finding, path)]
+        if len(findings) == len(file_result.findings):
+            return file_result
+        self.suppressed += len(file_result.findings) - len(findings)
+        return dataclasses.replace(file_result, findings=findings)
+
+    def __len__(self) -> int:
+        """
+        Return the number of recorded findings.
+
+        Returns:
+            int: The number of findings written to the baseline.
+        """
+        return self.finding_count
+
+    def __enter__(self) -> "Baseline":
+        """
+        Return the baseline.
+
+        Returns:
+            Baseline: This baseline.
+        """
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """
+        Unmap the baseline.
+
+        Args:
+            *exc_info (object): The exception information, ignored.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the baseline; lookups are no longer possible.
+        """
+        if hasattr(self, "_counts"):
+            self._fingerprints.release()
+            self._counts.release()
+        self._map.close()
+
+    def _suppresses(self, finding: CheckerData, path: str) -> bool:
+        """
+        Check whether a finding is recorded and not yet matched as many times as recorded.
+
+        Args:
+            finding (CheckerData): The finding.
+            path (str): The relative path of its file.
+
+        Returns:
+            bool: True if the finding is known and must not be reported.
+        """
+        if finding.score >= 0:
+            return False
+        fingerprint = finding_fingerprint(finding, path)
+        fingerprints, mask = self._fingerprints, self._mask
+        index = fingerprint & mask
+        # The load factor stays at most MAX_LOAD_FACTOR, so an empty slot always ends the probe.
+        while stored := fingerprints[index]:
+            if stored == fingerprint:
+                matched = self._matched.get(fingerprint, 0)
+                if matched >= self._counts[index]:
+                    return False
+                self._matched[fingerprint] = matched + 1
+                return True
+            index = (index + 1) & mask
+        return False
+
+
+class BaselineWriter:
+    """
+    Record the findings of a run and write them as a baseline for `Baseline`.
+
+    Only the fingerprints are kept in memory, 8 bytes per finding, until `close` writes the file.
+
+    Usage:
+        writer = BaselineWriter(Path("cds-baseline.bin"), root)
+        writer.add(file_result)
+        writer.close()
+    """
+
+    def __init__(self, path: Path, root: Path) -> None:
+        """
+        Initialize an empty baseline.
+
+        Args:
+            path (pathlib.Path): The baseline file to write.
+            root (pathlib.Path): The root of the analysis; fingerprints hold paths relative to it.
+        """
+        self.path = path
+        self._root = _directory(root)
+        self._fingerprints = array("Q")
+
+    def add(self, file_result: FileResult) -> None:
+        """
+        Record the findings with a negative score of a checked file.
+
+        Args:
+            file_result (FileResult): The results of a checked file.
+        """
+        path = _relative_path(file_result.file_path, self._root)
+        self._fingerprints.extend(
+            finding_fingerprint(finding, path) for finding in file_result.findings if finding.score < 0
+        )
+
+    def close(self) -> int:
+        """
+        Write the baseline atomically.
+
+        Returns:
+            int: The number of recorded findings.
+
+        Raises:
+            BaselineError: If the file cannot be written.
+        """
+        counts_by_fingerprint: dict[int, int] = {}
+        for fingerprint in self._fingerprints:
+            counts_by_fingerprint[fingerprint] = counts_by_fingerprint.get(fingerprint, 0) + 1
+
+        slot_count = 1
+        while slot_count * MAX_LOAD_FACTOR < max(1, len(counts_by_fingerprint)):
+            slot_count *= 2
+        fingerprints = array("Q", bytes(slot_count * FINGERPRINT_SIZE))
+        counts = array("I", bytes(slot_count * COUNT_SIZE))
+        mask = slot_count - 1
+        for fingerprint, count in counts_by_fingerprint.items():
+            index = fingerprint & mask
+            while fingerprints[index]:
+                index = (index + 1) & mask
+            fingerprints[index] = fingerprint
+            counts[index] = count
+
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            with open(temporary_path, "wb") as baseline_file:
+                baseline_file.write(HEADER.pack(MAGIC, slot_count, len(self._fingerprints)))
+                baseline_file.write(fingerprints.tobytes())
+                baseline_file.write(counts.tobytes())
+            os.replace(temporary_path, self.path)
+        except OSError as error:
+            raise BaselineError(f"Cannot write the baseline '{self.path}': {error}") from error
+
+        return len(self._fingerprints)
+
+
+def _directory(root: Path) -> Path:
+    """
+    Return the directory that fingerprint paths are relative to.
+
+    Args:
+        root (pathlib.Path): The root of the analysis, a directory or a single file.
+
+    Returns:
+        pathlib.Path: The root, or the directory of a single file.
+    """
+    return root.parent if root.is_file() else root
+
+
+def _relative_path(file_path: Path, root: Path) -> str:
+    """
+    Return the path of a file relative to the root of the analysis, so that a baseline
+    matches wherever the tree is checked out.
+
+    Args:
+        file_path (pathlib.Path): The path reported for the file.
+        root (pathlib.Path): The directory of the analysis.
+
+    Returns:
+        str: The relative POSIX path, or the reported path if the file is outside the root.
+    """
+    try:
+        return file_path.relative_to(root).as_posix()
+    except ValueError:
+        return file_path.as_posix()
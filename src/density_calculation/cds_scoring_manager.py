@@ -5,15 +5,22 @@ Author: Petr Lavrishchev
 License: MIT License (see LICENSE file for details)
 """
 
+from src.data_types import CodeMetrics
+
+LINES_PER_KLOC = 1000
+
 
 class CDSScoringManager:
     """
-    Manage and calculate the total comment density score (CDS).
+    Manage and calculate the total comment density score (CDS), and the size of the code it was
+    computed on, so that the penalty can be reported per thousand lines of code.
     """
 
     def __init__(self) -> None:
         """Initialize the manager with a zero score."""
         self._score = 0
+        self._penalty = 0
+        self._metrics = CodeMetrics()
 
     def add(self, score: int) -> None:
         """
@@ -33,3 +40,37 @@ class CDSScoringManager:
             int: The current total score.
         """
         return self._score
+
+    def add_file(self, penalty: int, metrics: CodeMetrics | None) -> None:
+        """
+        Add the penalty and the size of a file to the totals.
+
+        Args:
+            penalty (int): The penalty of the file, as a positive number.
+            metrics (CodeMetrics | None): The size of the file; None if it was not measured.
+        """
+        self._penalty += penalty
+        if metrics is not None:
+            self._metrics += metrics
+
+    @property
+    def metrics(self) -> CodeMetrics:
+        """
+        Return the total size of the scored files.
+
+        Returns:
+            CodeMetrics: The sums of the metrics of all files.
+        """
+        return self._metrics
+
+    @property
+    def penalty_per_kloc(self) -> float | None:
+        """
+        Return the total penalty per thousand lines of code.
+
+        Returns:
+            float | None: The density of the penalty, or None if no line of code was scored.
+        """
+        if not self._metrics.code_lines:
+            return None
+        return self._penalty * LINES_PER_KLOC / self._metrics.code_lines
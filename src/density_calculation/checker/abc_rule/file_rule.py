@@ -0,0 +1,108 @@
+"""
+Define the base class of rules that check all comments of a file at once.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+from src.data_types import CheckerData, CommentData
+
+
+class FileRule(ABC):
+    """
+    Represent a rule that needs the context of the whole file, for example to look at
+    neighbouring comments or to batch expensive work over all comments of the file.
+
+    File rules are registered with the `@rule` decorator like comment rules and run by
+    `CommentChecker.check_file` after the comment rules. Their verdicts are never cached.
+
+    Attributes:
+        cross_file (bool): True if the verdicts for a file depend on the files checked before it,
+            so they cannot be memoized per file content. Such rules must only depend on the
+            comments of the files and their order.
+    """
+
+    cross_file: bool = False
+
+    def __init__(self) -> None:
+        """
+        Initialize the rule with its unique ID.
+        """
+        self.code = self._set_code()
+
+    @abstractmethod
+    def check_file(self, comments: Sequence[CommentData]) -> list[CheckerData]:
+        """
+        Check all comments of a single file.
+
+        Args:
+            comments (Sequence[CommentData]): The comments of the file, in the order of the extractor.
+
+        Returns:
+            list[CheckerData]: The violations found in the file.
+        """
+        ...
+
+    def restore_file(self, comments: Sequence[CommentData]) -> None:  # noqa: B027 - an optional hook
+        """
+        Account a file whose results were restored from a checkpoint instead of being checked.
+
+        Rules whose verdicts depend on the files checked before override this to update their
+        state as `check_file` would; the default does nothing.
+
+        Args:
+            comments (Sequence[CommentData]): The comments of the restored file.
+        """
+
+    def forget_file(self, file_path: Path) -> None:  # noqa: B027 - an optional hook
+        """
+        Drop the state kept for a file, before it is checked again.
+
+        `check_file` cannot tell the file of an empty list of comments, so a caller that checks
+        a file again, e.g. an edited document, calls this when the file has no comment left.
+        Rules that keep state across files override it; the default does nothing.
+
+        Args:
+            file_path (pathlib.Path): The file.
+        """
+
+    def order_files(self, key: Callable[[Path], Any]) -> None:  # noqa: B027 - an optional hook
+        """
+        Rank the files by a key of their path instead of by the order they are checked in.
+
+        A cross-file rule then gives every file the verdicts it would get if each file was checked
+        once in that order, however often and in whatever order the files are checked; the files
+        whose verdicts change later are reported by `refresh_stale_files`. Cross-file rules
+        override it; the default does nothing.
+
+        Args:
+            key (Callable[[pathlib.Path], Any]): Returns the sort key of a file.
+        """
+
+    def refresh_stale_files(self) -> dict[Path, list[CheckerData]]:
+        """
+        Check again the files whose verdicts may have changed since they were checked.
+
+        A cross-file rule keeps track of the files whose verdicts depend on a file checked or
+        forgotten after them, and recomputes their violations from its own state, without their
+        comments. The default reports no file.
+
+        Returns:
+            dict[pathlib.Path, list[CheckerData]]: The current violations of every such file still known to the rule.
+        """
+        return {}
+
+    @abstractmethod
+    def _set_code(self) -> int:
+        """
+        Set and return the unique identifier code for the rule.
+
+        Returns:
+            int: The rule's unique code.
+        """
+        ...
@@ -0,0 +1,76 @@
+"""
+Define the registry of rule classes collected by the `@rule` decorator.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import threading
+
+from src.density_calculation.checker.abc_rule.file_rule import FileRule
+from src.density_calculation.checker.abc_rule.rule import CheckerRule
+
+
+class RuleRegistry:
+    """
+    Keep the rule classes registered by the `@rule` decorator.
+
+    The registry is only written while rule modules are imported; loading is guarded
+    by a lock, and readers get an immutable snapshot, so checkers running in parallel
+    threads never share mutable state.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._rule_classes: list[type[CheckerRule]] = []
+        self._file_rule_classes: list[type[FileRule]] = []
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def register(self, rule_class: type[CheckerRule] | type[FileRule]) -> None:
+        """
+        Add a rule class to the registry.
+
+        Args:
+            rule_class (type[CheckerRule] | type[FileRule]): The comment or file rule class to be registered.
+        """
+        if issubclass(rule_class, FileRule):
+            if rule_class not in self._file_rule_classes:
+                self._file_rule_classes.append(rule_class)
+        elif rule_class not in self._rule_classes:
+            self._rule_classes.append(rule_class)
+
+    def rule_classes(self) -> tuple[type[CheckerRule], ...]:
+        """
+        Return all registered comment rule classes, importing the rule modules on first use.
+
+        Returns:
+            tuple[type[CheckerRule], ...]: A snapshot of the registered rule classes.
+        """
+        with self._lock:
+            self._load()
+            return tuple(self._rule_classes)
+
+    def file_rule_classes(self) -> tuple[type[FileRule], ...]:
+        """
+        Return all registered file rule classes, importing the rule modules on first use.
+
+        Returns:
+            tuple[type[FileRule], ...]: A snapshot of the registered file rule classes.
+        """
+        with self._lock:
+            self._load()
+            return tuple(self._file_rule_classes)
+
+    def _load(self) -> None:
+        """
+        Import the rule modules once; the caller must hold the lock.
+        """
+        if not self._loaded:
+            from src.density_calculation.checker.rules.loader import rule_loader
+
+            rule_loader()
+            self._loaded = True
+
+
+rule_registry = RuleRegistry()
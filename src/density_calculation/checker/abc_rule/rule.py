@@ -16,8 +16,15 @@ class CheckerRule(ABC):
     """
     Represent a single rule for checking comment quality, defined by a Specification
     for identifying issues and a Strategy for generating the corresponding error data.
+
+    Attributes:
+        cacheable (bool): True if the verdict depends only on the comment text, type and scope,
+            so CommentChecker may reuse it for repeated comments. Rules that look at the comment
+            position or file must set it to False.
     """
 
+    cacheable: bool = True
+
     def __init__(self) -> None:
         """
         Initialize the checking rule with a unique ID, a specification, and a strategy.
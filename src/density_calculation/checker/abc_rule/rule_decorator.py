@@ -1,28 +1,30 @@
+from src.density_calculation.checker.abc_rule.file_rule import FileRule
+from src.density_calculation.checker.abc_rule.registry import rule_registry
 from src.density_calculation.checker.abc_rule.rule import CheckerRule
-from src.density_calculation.checker.comment_checker import CommentChecker
 
 
-def rule(cls: type[CheckerRule]) -> type[CheckerRule]:
+def rule[RuleClass: (type[CheckerRule], type[FileRule])](cls: RuleClass) -> RuleClass:
     """
-    Register a rule class automatically in CommentChecker.
+    Register a rule class automatically in the rule registry.
 
-    Decorator to automatically register the rule class in `CommentChecker`.
+    Decorator to automatically register the rule class in `rule_registry`,
+    from which every `CommentChecker` takes its rules.
     Usage:
         @rule
         class MyAwesomeRule(CheckerRule):
             ...
 
     Args:
-        cls (type[CheckerRule]): The class inheriting from CheckerRule to be registered.
+        cls (type[CheckerRule] | type[FileRule]): The comment or file rule class to be registered.
 
     Returns:
-        type[CheckerRule]: The decorated class.
+        type[CheckerRule] | type[FileRule]: The decorated class.
 
     Raises:
-        TypeError: If the decorated class does not inherit from CheckerRule.
+        TypeError: If the decorated class does not inherit from CheckerRule or FileRule.
     """
-    if not issubclass(cls, CheckerRule):
-        raise TypeError(f"Класс {cls.__name__} должен наследоваться от CheckerRule")
+    if not issubclass(cls, (CheckerRule, FileRule)):
+        raise TypeError(f"Класс {cls.__name__} должен наследоваться от CheckerRule или FileRule")
 
-    CommentChecker.register_rule_class(cls)
+    rule_registry.register(cls)
     return cls
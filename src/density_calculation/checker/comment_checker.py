@@ -1,54 +1,111 @@
-from src.data_types import CheckerData, CommentData
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import replace
+from pathlib import Path
+
+from src.config import CDSConfig
+from src.data_types import CheckerData, CommentData, CommentScope, CommentType
+from src.density_calculation.checker.abc_rule.file_rule import FileRule
+from src.density_calculation.checker.abc_rule.registry import rule_registry
 from src.density_calculation.checker.abc_rule.rule import CheckerRule
+from src.density_calculation.checker.function_density import FunctionDensityRule
+from src.density_calculation.checker.rule_profiler import RuleProfiler
+from src.density_calculation.checker.spelling import SpellingRule
+from src.density_calculation.checker.text_rules import FusedTextRules
+from src.density_calculation.time_budget import CHECK_INTERVAL, TimeBudget
+
+VERDICT_CACHE_SIZE = 4096
+
+verdict_key_type = tuple[tuple[str, ...], CommentType, CommentScope, int]
 
 
 class CommentChecker:
     """
     Take a single comment and run it against a defined set of validation rules.
 
+    Declarative text rules from the configuration run first, in one fused pass, followed
+    by the spelling rule when a dictionary is configured; then every rule class registered
+    with the `@rule` decorator runs. File rules, including the configured function density
+    rule, see all comments of a file at once and only run in `check_file`.
+
     This class collects and returns all resulting errors or warnings from the rule checks.
-    """
+    Verdicts of cacheable rules are memoized in a bounded LRU cache, so repeated comments
+    (`# noqa`, license headers, boilerplate docstrings) are checked only once.
 
-    _rule_classes: list[type[CheckerRule]] = []
-    _rules_loaded: bool = False
+    With a RuleProfiler every rule invocation is timed; the fused text rules are timed
+    as one entry, since they share a single pass over the comment.
 
-    @classmethod
-    def register_rule_class(cls, rule_class: type[CheckerRule]) -> None:
-        """
-        Add a rule class to the registry.
+    Every checker owns its rule instances and cache; use one checker per thread.
+    """
 
-        This method is automatically called by the `@rule` decorator.
+    def __init__(
+        self,
+        config: CDSConfig | None = None,
+        rule_classes: Sequence[type[CheckerRule]] | None = None,
+        file_rule_classes: Sequence[type[FileRule]] | None = None,
+        cache_size: int = VERDICT_CACHE_SIZE,
+        profiler: RuleProfiler | None = None,
+    ) -> None:
+        """
+        Initialize the checker with its own rule instances and an empty verdict cache.
 
         Args:
-            rule_class (type[CheckerRule]): The class inheriting from CheckerRule to be registered.
+            config (CDSConfig | None): The tool configuration. Defaults to the built-in configuration.
+            rule_classes (Sequence[type[CheckerRule]] | None): The rules to run.
+                Defaults to all rules registered with the `@rule` decorator.
+            file_rule_classes (Sequence[type[FileRule]] | None): The file rules to run.
+                Defaults to all file rules registered with the `@rule` decorator.
+            cache_size (int): The maximum number of cached verdicts; 0 disables the cache.
+                Defaults to VERDICT_CACHE_SIZE.
+            profiler (RuleProfiler | None): Records the cost of every rule invocation. Defaults to None.
         """
-        if rule_class not in cls._rule_classes:
-            cls._rule_classes.append(rule_class)
+        if config is None:
+            config = CDSConfig()
+        if rule_classes is None:
+            rule_classes = rule_registry.rule_classes()
+        if file_rule_classes is None:
+            file_rule_classes = rule_registry.file_rule_classes()
+
+        self._text_rules = FusedTextRules(config.text_rules)
+        self._spelling = SpellingRule(config.spelling) if config.spelling is not None else None
+        self._function_density = (
+            FunctionDensityRule(config.function_density) if config.function_density is not None else None
+        )
+        self._rules: list[CheckerRule] = [rule_class() for rule_class in rule_classes]
+        self._file_rules: list[FileRule] = [rule_class() for rule_class in file_rule_classes]
+        self.fingerprint = hash(
+            (
+                self._text_rules.fingerprint,
+                self._spelling.fingerprint if self._spelling is not None else None,
+                tuple((rule.code, type(rule).__qualname__) for rule in self._rules if rule.cacheable),
+            )
+        )
+        self._cache_size = cache_size
+        self._verdicts: OrderedDict[verdict_key_type, list[CheckerData]] = OrderedDict()
+
+        self._profiler = profiler
+        self._text_rules_id = ",".join(str(rule_id) for rule_id in self._text_rules.rule_ids)
 
-    @classmethod
-    def get_rules(cls) -> list[CheckerRule]:
+    @property
+    def rules(self) -> list[CheckerRule]:
         """
-        Create instances of all registered rules.
+        Return the rule instances used by this checker.
 
         Returns:
-            list[CheckerRule]: A list of initialized rule objects.
+            list[CheckerRule]: The initialized rule objects.
         """
-        return [rule_class() for rule_class in cls._rule_classes]
+        return self._rules
 
-    @classmethod
-    def load_all_rules(cls) -> None:
+    @property
+    def file_rules(self) -> list[FileRule]:
         """
-        Ensure all rule modules are imported and registered.
+        Return the file rule instances used by this checker.
 
-        Imports all rule modules using `rule_loader` only if they haven't been loaded yet.
+        Returns:
+            list[FileRule]: The initialized file rule objects.
         """
-        if cls._rules_loaded:
-            return
-
-        from src.density_calculation.checker.rules.loader import rule_loader
-
-        rule_loader()
-        cls._rules_loaded = True
+        return self._file_rules
 
     def check(self, comment: CommentData) -> list[CheckerData]:
         """
@@ -56,7 +113,8 @@ class CommentChecker:
 
         The method iterates through the list of rules and delegates the validation
         task to each rule's `check` method. It collects the structured results
-        (CheckerData) for all detected violations.
+        (CheckerData) for all detected violations. Results of cacheable rules are
+        taken from the verdict cache when the same text was already checked.
 
         Args:
             comment (CommentData): Comment details.
@@ -66,12 +124,166 @@ class CommentChecker:
                                a specific rule violation found in the comment.
                                Returns an empty list if no errors are found.
         """
-        self.load_all_rules()
+        result_datas = self._cached_check(comment)
+        for rule in self._rules:
+            if not rule.cacheable:
+                error_data = self._run_rule(rule, comment)
+                if error_data:
+                    result_datas.append(error_data)
+
+        return result_datas
+
+    def check_file(self, comments: list[CommentData], budget: TimeBudget | None = None) -> list[CheckerData]:
+        """
+        Validate all comments of a single file with the comment rules and then the file rules.
+
+        Args:
+            comments (list[CommentData]): The comments found in the file.
+            budget (TimeBudget | None): The time budget of the file. Defaults to None (no limit).
+
+        Returns:
+            list[CheckerData]: The violations found in the file.
+
+        Raises:
+            TimeBudgetError: If the budget runs out.
+        """
+        result_datas: list[CheckerData] = []
+        for index, comment in enumerate(comments):
+            if budget is not None and index % CHECK_INTERVAL == 0:
+                budget.check("rules")
+            result_datas.extend(self.check(comment))
+        result_datas.extend(self.check_file_rules(comments, budget))
+
+        return result_datas
+
+    def check_file_rules(self, comments: Sequence[CommentData], budget: TimeBudget | None = None) -> list[CheckerData]:
+        """
+        Validate all comments of a single file with the file rules only.
 
+        Args:
+            comments (Sequence[CommentData]): The comments found in the file.
+            budget (TimeBudget | None): The time budget of the file, checked before every file rule.
+                Defaults to None (no limit).
+
+        Returns:
+            list[CheckerData]: The violations found by the file rules.
+
+        Raises:
+            TimeBudgetError: If the budget runs out.
+        """
         result_datas: list[CheckerData] = []
-        for rule in self.get_rules():
-            error_data = rule.check(comment)
+        file_rules: list[FileRule | FunctionDensityRule] = list(self._file_rules)
+        if self._function_density is not None:
+            file_rules.append(self._function_density)
+        for file_rule in file_rules:
+            if budget is not None:
+                budget.check("file rules")
+            if self._profiler is None:
+                result_datas.extend(file_rule.check_file(comments))
+                continue
+
+            started = time.perf_counter_ns()
+            file_datas = file_rule.check_file(comments)
+            elapsed = time.perf_counter_ns() - started
+            rule_name = type(file_rule).__name__
+            self._profiler.record(str(file_rule.code), rule_name, elapsed, len(file_datas), len(comments))
+            result_datas.extend(file_datas)
+
+        return result_datas
+
+    def forget_file(self, file_path: Path) -> None:
+        """
+        Make the file rules that keep state across files forget a file that is checked again.
+
+        Args:
+            file_path (pathlib.Path): The file.
+        """
+        for file_rule in self._file_rules:
+            file_rule.forget_file(file_path)
+
+    def restore_file(self, comments: Sequence[CommentData]) -> None:
+        """
+        Show the comments of a file restored from a checkpoint to the file rules that keep state across files.
+
+        Args:
+            comments (Sequence[CommentData]): The comments of the restored file.
+        """
+        for file_rule in self._file_rules:
+            file_rule.restore_file(comments)
+
+    def _cached_check(self, comment: CommentData) -> list[CheckerData]:
+        """
+        Run the cacheable rules, reusing a memoized verdict for an already seen comment text.
+
+        On a cache hit the stored CheckerData are re-bound to the new comment location
+        without running the rules' specifications and strategies. The rule-set fingerprint
+        is part of every key, so verdicts of a different set of rules are never reused.
+
+        Args:
+            comment (CommentData): Comment details.
+
+        Returns:
+            list[CheckerData]: The violations of the cacheable rules.
+        """
+        key = (tuple(comment.text), comment.comment_type, comment.scope, self.fingerprint)
+        cached = self._verdicts.get(key) if self._cache_size > 0 else None
+        if cached is not None:
+            self._verdicts.move_to_end(key)
+            return [replace(error_data, comment_data=comment) for error_data in cached]
+
+        result_datas = self._run_text_rules(comment)
+        if self._spelling is not None:
+            error_data = self._run_rule(self._spelling, comment)
             if error_data:
                 result_datas.append(error_data)
+        for rule in self._rules:
+            if rule.cacheable:
+                error_data = self._run_rule(rule, comment)
+                if error_data:
+                    result_datas.append(error_data)
+
+        if self._cache_size > 0:
+            self._verdicts[key] = list(result_datas)
+            if len(self._verdicts) > self._cache_size:
+                self._verdicts.popitem(last=False)
 
         return result_datas
+
+    def _run_text_rules(self, comment: CommentData) -> list[CheckerData]:
+        """
+        Run the fused declarative text rules, timing them when profiling.
+
+        Args:
+            comment (CommentData): Comment details.
+
+        Returns:
+            list[CheckerData]: The violations of the text rules.
+        """
+        if self._profiler is None or not self._text_rules_id:
+            return self._text_rules.check(comment)
+
+        started = time.perf_counter_ns()
+        result_datas = self._text_rules.check(comment)
+        elapsed = time.perf_counter_ns() - started
+        self._profiler.record(self._text_rules_id, type(self._text_rules).__name__, elapsed, len(result_datas))
+        return result_datas
+
+    def _run_rule(self, rule: CheckerRule | SpellingRule, comment: CommentData) -> CheckerData | None:
+        """
+        Run one comment rule, timing it when profiling.
+
+        Args:
+            rule (CheckerRule | SpellingRule): The rule.
+            comment (CommentData): Comment details.
+
+        Returns:
+            CheckerData | None: The violation, if any.
+        """
+        if self._profiler is None:
+            return rule.check(comment)
+
+        started = time.perf_counter_ns()
+        error_data = rule.check(comment)
+        elapsed = time.perf_counter_ns() - started
+        self._profiler.record(str(rule.code), type(rule).__name__, elapsed, int(error_data is not None))
+        return error_data
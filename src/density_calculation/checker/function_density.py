@@ -0,0 +1,123 @@
+"""
+Define the per-function comment density and the rule that reports over-commented functions.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import bisect
+from collections.abc import Sequence
+
+from src.config import FunctionDensityConfig
+from src.data_types import CheckerData, CommentData, CommentScope, CommentType, FunctionDensity, ScopeSpan
+
+MESSAGE = (
+    "Function '{name}' has {comments} comment line(s) for {code} line(s) of code "
+    "({ratio:.2f} per line, max {max_ratio:g})."
+)
+
+
+def function_densities(comments: Sequence[CommentData]) -> list[FunctionDensity]:
+    """
+    Measure the comment density of every function holding inline comments.
+
+    The comment lines of a function are the lines of its own inline comments, not those of
+    nested definitions; its code lines are the other lines of its span that no comment or
+    docstring covers, so blank lines count as code and a line of code with a trailing comment
+    counts as a comment line. Lines are matched per notebook cell.
+
+    Args:
+        comments (Sequence[CommentData]): All comments of a file, with their owners.
+
+    Returns:
+        list[FunctionDensity]: The functions in order of their first inline comment.
+    """
+    return [density for density, _ in _measure(comments)]
+
+
+class FunctionDensityRule:
+    """
+    Rule to report functions with more inline comment lines per line of code than configured,
+    which usually narrate the code instead of explaining it.
+
+    Functions with fewer comment and code lines than configured are not checked. The finding is
+    attached to the first inline comment of the function. The rule needs all comments of a
+    file at once, so CommentChecker runs it in `check_file`.
+    """
+
+    def __init__(self, config: FunctionDensityConfig) -> None:
+        """
+        Initialize the rule.
+
+        Args:
+            config (FunctionDensityConfig): The function density configuration.
+        """
+        self.code = config.rule_id
+        self.fingerprint = config
+        self._config = config
+
+    def check_file(self, comments: Sequence[CommentData]) -> list[CheckerData]:
+        """
+        Check the functions of a file.
+
+        Args:
+            comments (Sequence[CommentData]): All comments of the file.
+
+        Returns:
+            list[CheckerData]: One violation per over-commented function.
+        """
+        config = self._config
+        result_datas = []
+        for density, first_comment in _measure(comments):
+            if density.comment_lines + density.code_lines < config.min_lines or density.ratio <= config.max_ratio:
+                continue
+            message = MESSAGE.format(
+                name=density.name,
+                comments=density.comment_lines,
+                code=density.code_lines,
+                ratio=density.ratio,
+                max_ratio=config.max_ratio,
+            )
+            result_datas.append(
+                CheckerData(score=config.score, comment_data=first_comment, error_string=message, rule_id=self.code)
+            )
+        return result_datas
+
+
+def _measure(comments: Sequence[CommentData]) -> list[tuple[FunctionDensity, CommentData]]:
+    """
+    Measure the functions holding inline comments; see `function_densities`.
+
+    Args:
+        comments (Sequence[CommentData]): All comments of a file, with their owners.
+
+    Returns:
+        list[tuple[FunctionDensity, CommentData]]: Every function with its first inline comment.
+    """
+    own_rows: dict[ScopeSpan, tuple[CommentData, set[int]]] = {}
+    covered: dict[int, set[int]] = {}
+    for comment in comments:
+        rows = range(comment.start_line_number, comment.end_line_number + 1)
+        covered.setdefault(comment.cell or 0, set()).update(rows)
+        owner = comment.owner
+        if owner is None or owner.kind is not CommentScope.FUNCTION or comment.comment_type is not CommentType.INLINE:
+            continue
+        entry = own_rows.get(owner)
+        if entry is None:
+            entry = own_rows[owner] = (comment, set())
+        entry[1].update(rows)
+
+    covered_rows = {cell: sorted(rows) for cell, rows in covered.items()}
+    measured = []
+    for owner, (first_comment, comment_rows) in own_rows.items():
+        cell_rows = covered_rows[first_comment.cell or 0]
+        covered_count = bisect.bisect_right(cell_rows, owner.end_line) - bisect.bisect_left(cell_rows, owner.start_line)
+        density = FunctionDensity(
+            name=owner.name,
+            start_line=owner.start_line,
+            comment_lines=len(comment_rows),
+            code_lines=owner.lines - covered_count,
+            cell=first_comment.cell,
+        )
+        measured.append((density, first_comment))
+    return measured
@@ -1,5 +1,3 @@
 from src.density_calculation.checker.rules.loader import rule_loader
-from src.density_calculation.checker.rules.max_len_rule import MaxLenRule
-from src.density_calculation.checker.rules.min_len_rule import MinLenRule
 
-__all__ = ["MaxLenRule", "MinLenRule", "rule_loader"]
+__all__ = ["rule_loader"]
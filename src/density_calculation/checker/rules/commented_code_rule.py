@@ -0,0 +1,381 @@
+"""
+Define the rule that detects commented-out code.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import functools
+import keyword
+import re
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+
+import tree_sitter
+
+from src.data_types import CheckerData, CommentData, CommentType, LanguagesEnum
+from src.density_calculation.checker.abc_rule.file_rule import FileRule
+from src.density_calculation.checker.abc_rule.rule_decorator import rule
+from src.density_calculation.finder.syntax_analyzer import SyntaxAnalyzer
+
+RULE_ID = 103
+SCORE = -5
+
+MAX_ERROR_DENSITY = 0.25
+VERDICT_CACHE_SIZE = 4096
+PROSE_CACHE_SIZE = 16384
+
+PRAGMA = re.compile(r"^(noqa|type:|pragma|pylint:|mypy:|pyright:|fmt:|isort:|nosec|!|-\*-)", re.IGNORECASE)
+STRING_LITERAL = re.compile(r"""[rbuRBUfF]{0,2}("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')""")
+ADJACENT_WORDS = re.compile(r"([A-Za-z_]\w*)\s+(?=([A-Za-z_]\w*|\())")
+KEYWORDS = frozenset([*keyword.kwlist, *keyword.softkwlist])
+
+CONTINUATION_KEYWORDS = ("else", "elif", "except", "finally", "case")
+BRACKETS = {"(": ")", "[": "]", "{": "}"}
+BRACKET_CHARS = re.compile(r"[()\[\]{}]")
+DEFINITIONS = frozenset({"function_definition", "class_definition", "decorated_definition"})
+CODE_EXPRESSIONS = frozenset({"assignment", "augmented_assignment", "call", "await", "yield"})
+
+
+@dataclass(eq=False)
+class _Block:
+    """
+    A run of adjacent inline comments that may be commented-out code.
+
+    Attributes:
+        comments (list[CommentData]): The comments of the run, in source order.
+        source (list[str]): The lines of the run that are parsed.
+        prose (int): The number of lines rejected as prose without parsing.
+        first_row (int): The first row of the run in the synthetic buffer.
+    """
+
+    comments: list[CommentData]
+    source: list[str] = field(default_factory=list)
+    prose: int = 0
+    first_row: int = 0
+
+
+@rule
+class CommentedCodeRule(FileRule):
+    """
+    Rule to detect runs of adjacent inline comments that are valid Python code.
+
+    All candidate runs of a file are joined into one synthetic buffer that is parsed
+    once with the cached tree-sitter parser of the current thread. A run counts as code
+    when at most MAX_ERROR_DENSITY of its lines are prose or contain syntax errors and
+    at least one line holds a real statement, not just a name or literal.
+
+    Error recovery may join neighbouring runs into one node; only such runs are parsed
+    again on their own. Verdicts are memoized per run text in a bounded LRU cache, so
+    re-checking a file after a small edit only parses the runs that changed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the rule, its syntax analyzer and an empty verdict cache.
+        """
+        super().__init__()
+        self._analyzer = SyntaxAnalyzer()
+        self._verdicts: OrderedDict[tuple[tuple[str, ...], int], bool] = OrderedDict()
+
+    def check_file(self, comments: Sequence[CommentData]) -> list[CheckerData]:
+        """
+        Find the runs of commented-out code in a file.
+
+        Args:
+            comments (Sequence[CommentData]): The comments of the file.
+
+        Returns:
+            list[CheckerData]: One result per run of commented-out code.
+        """
+        blocks = [block for block in self._candidate_blocks(comments) if self._density(block, 0) <= MAX_ERROR_DENSITY]
+
+        verdicts: dict[_Block, bool] = {}
+        unknown: list[_Block] = []
+        for block in blocks:
+            key = (tuple(block.source), block.prose)
+            cached = self._verdicts.get(key)
+            if cached is None:
+                unknown.append(block)
+            else:
+                self._verdicts.move_to_end(key)
+                verdicts[block] = cached
+
+        if unknown:
+            code_blocks = set(self._find_code(unknown, batched=True))
+            for block in unknown:
+                verdicts[block] = block in code_blocks
+                self._remember((tuple(block.source), block.prose), verdicts[block])
+
+        return [self._checker_data(block) for block in blocks if verdicts[block]]
+
+    def _remember(self, key: tuple[tuple[str, ...], int], verdict: bool) -> None:
+        """
+        Store the verdict of a run in the bounded LRU cache.
+
+        Args:
+            key (tuple[tuple[str, ...], int]): The parsed lines and the number of prose lines of the run.
+            verdict (bool): True if the run is code.
+        """
+        self._verdicts[key] = verdict
+        self._verdicts.move_to_end(key)
+        if len(self._verdicts) > VERDICT_CACHE_SIZE:
+            self._verdicts.popitem(last=False)
+
+    def _find_code(self, blocks: list[_Block], batched: bool) -> list[_Block]:
+        """
+        Parse the runs in one synthetic buffer and select the runs that are code.
+
+        Args:
+            blocks (list[_Block]): The candidate runs.
+            batched (bool): True if runs joined by error recovery may still be parsed on their own.
+
+        Returns:
+            list[_Block]: The runs of commented-out code, in source order.
+        """
+        buffer: list[str] = []
+        row_blocks: list[int | None] = []
+        for index, block in enumerate(blocks):
+            block.first_row = len(buffer)
+            buffer.extend(block.source)
+            row_blocks.extend([index] * len(block.source))
+            buffer.append("")
+            row_blocks.append(None)
+
+        tree = self._analyzer.parse("\n".join(buffer).encode(), LanguagesEnum.PYTHON)
+
+        error_rows: set[int] = set()
+        code_rows: set[int] = set()
+        joined: set[int] = set()
+        for node in tree.root_node.children:
+            end_row = node.end_point.row
+            if node.end_point.column == 0 and end_row > node.start_point.row:
+                end_row -= 1
+            rows = range(node.start_point.row, min(end_row, len(row_blocks) - 1) + 1)
+
+            owners = {row_blocks[row] for row in rows} - {None}
+            if len(owners) > 1:
+                joined.update(index for index in owners if index is not None)
+            elif node.type == "comment":
+                continue
+            elif self._is_error(node):
+                error_rows.update(rows)
+            elif self._is_code(node):
+                code_rows.update(rows)
+
+        code_blocks: list[_Block] = []
+        for index, block in enumerate(blocks):
+            if index in joined:
+                if batched:
+                    code_blocks.extend(self._find_code([block], batched=False))
+                continue
+
+            rows = range(block.first_row, block.first_row + len(block.source))
+            errors = sum(1 for row in rows if row in error_rows)
+            if self._density(block, errors) <= MAX_ERROR_DENSITY and any(row in code_rows for row in rows):
+                code_blocks.append(block)
+
+        return code_blocks
+
+    def _candidate_blocks(self, comments: Sequence[CommentData]) -> list[_Block]:
+        """
+        Group adjacent inline comments that start in the same column into candidate runs.
+
+        Extractors do not guarantee any order, so the comments are sorted by position first.
+        Pragmas such as `noqa` or `type: ignore` end a run and are never part of one. Runs
+        with unbalanced brackets or triple quotes are dropped, so that they cannot swallow
+        the runs that follow them in the synthetic buffer.
+
+        Args:
+            comments (Sequence[CommentData]): The comments of the file.
+
+        Returns:
+            list[_Block]: The candidate runs with their lines to parse.
+        """
+        blocks: list[_Block] = []
+        current: _Block | None = None
+        for comment in sorted(comments, key=_position):
+            if comment.comment_type is not CommentType.INLINE or not comment.text or not comment.text[0]:
+                current = None
+                continue
+            if PRAGMA.match(comment.text[0]):
+                current = None
+                continue
+
+            previous = current.comments[-1] if current else None
+            if (
+                current is not None
+                and previous is not None
+                and comment.cell == previous.cell
+                and comment.start_line_number == previous.end_line_number + 1
+                and comment.column_start == previous.column_start
+            ):
+                current.comments.append(comment)
+            else:
+                current = _Block([comment])
+                blocks.append(current)
+
+        candidates: list[_Block] = []
+        for block in blocks:
+            if not self._is_isolated(block):
+                continue
+            for comment in block.comments:
+                line = comment.text[0]
+                if _is_prose(line):
+                    block.prose += 1
+                elif line.split(maxsplit=1)[0].rstrip(":") not in CONTINUATION_KEYWORDS:
+                    block.source.append(f"{line} ..." if line.endswith(":") else line)
+            if block.source:
+                candidates.append(block)
+
+        return candidates
+
+    @staticmethod
+    def _is_isolated(block: _Block) -> bool:
+        """
+        Check that a run has balanced brackets and no unterminated triple-quoted string.
+
+        Args:
+            block (_Block): The candidate run.
+
+        Returns:
+            bool: True if the run can be parsed independently of its neighbours.
+        """
+        text = "\n".join(comment.text[0] for comment in block.comments)
+        if text.count('"""') % 2 or text.count("'''") % 2:
+            return False
+
+        stack: list[str] = []
+        for char in BRACKET_CHARS.findall(text):
+            if char in BRACKETS:
+                stack.append(BRACKETS[char])
+            elif not stack or stack.pop() != char:
+                return False
+
+        return not stack
+
+    @staticmethod
+    def _density(block: _Block, errors: int) -> float:
+        """
+        Return the share of lines of a run that are prose or contain syntax errors.
+
+        Args:
+            block (_Block): The candidate run.
+            errors (int): The number of parsed lines with syntax errors.
+
+        Returns:
+            float: The error density, from 0 to 1.
+        """
+        return (block.prose + errors) / (block.prose + len(block.source))
+
+    @staticmethod
+    def _is_error(node: tree_sitter.Node) -> bool:
+        """
+        Check whether a top-level node of the synthetic buffer is a syntax error.
+
+        When error recovery fails at the top level, bare tokens become children of the root,
+        so everything that is not a statement or a definition counts as an error.
+
+        Args:
+            node (tree_sitter.Node): A top-level node.
+
+        Returns:
+            bool: True if the node is an error.
+        """
+        if node.type == "ERROR" or node.has_error:
+            return True
+        return not (node.type.endswith("_statement") or node.type in DEFINITIONS)
+
+    @staticmethod
+    def _is_code(node: tree_sitter.Node) -> bool:
+        """
+        Check whether a statement is code rather than prose that happens to parse, such as `TODO` or `Note: x`.
+
+        Args:
+            node (tree_sitter.Node): A valid top-level statement.
+
+        Returns:
+            bool: True for every statement except bare expressions, calls without arguments that
+                  usually name an API (`dict.popitem()`), and annotations without a value.
+        """
+        if node.type != "expression_statement":
+            return True
+        if node.named_child_count != 1:
+            return False
+
+        expression = node.named_children[0]
+        if expression.type == "assignment":
+            return expression.child_by_field_name("right") is not None
+        if expression.type == "call":
+            arguments = expression.child_by_field_name("arguments")
+            return arguments is not None and arguments.named_child_count > 0
+        return expression.type in CODE_EXPRESSIONS
+
+    @staticmethod
+    def _checker_data(block: _Block) -> CheckerData:
+        """
+        Generate CheckerData for a run of commented-out code.
+
+        Args:
+            block (_Block): The run of comments.
+
+        Returns:
+            CheckerData: The error data structure, covering all lines of the run.
+        """
+        first, last = block.comments[0], block.comments[-1]
+        comment = replace(
+            first,
+            text=[line for comment in block.comments for line in comment.text],
+            end_line_number=last.end_line_number,
+            column_end=last.column_end,
+        )
+        lines = len(block.comments)
+        error_msg = f"Commented-out code ({lines} line{'s' if lines > 1 else ''}). Remove it or restore it."
+
+        return CheckerData(
+            score=SCORE,
+            comment_data=comment,
+            error_string=error_msg,
+            rule_id=RULE_ID,
+        )
+
+    def _set_code(self) -> int:
+        """
+        Set the unique identifier code for the rule.
+
+        Returns:
+            int: The rule's unique code (RULE_ID).
+        """
+        return RULE_ID
+
+
+@functools.lru_cache(maxsize=PROSE_CACHE_SIZE)
+def _is_prose(line: str) -> bool:
+    """
+    Check whether a line is prose: two adjacent words outside string literals, neither of them a keyword,
+    or a word followed by a parenthesized remark.
+
+    This cheap lexical test keeps most explanatory comments out of the synthetic buffer.
+
+    Args:
+        line (str): The normalized comment line.
+
+    Returns:
+        bool: True if the line cannot be Python code.
+    """
+    code = STRING_LITERAL.sub("_", line)
+    return any(first not in KEYWORDS and second not in KEYWORDS for first, second in ADJACENT_WORDS.findall(code))
+
+
+def _position(comment: CommentData) -> tuple[int, int, int]:
+    """
+    Return the sort key placing a comment in its file.
+
+    Args:
+        comment (CommentData): The comment.
+
+    Returns:
+        tuple[int, int, int]: The notebook cell (0 outside notebooks), the line and the column.
+    """
+    return comment.cell or 0, comment.start_line_number, comment.column_start
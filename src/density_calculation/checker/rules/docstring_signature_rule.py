@@ -0,0 +1,296 @@
+"""
+Define the rule that detects function docstrings whose documented parameters differ from the signature.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import re
+from dataclasses import dataclass
+
+from src.data_types import CheckerData, CommentData, CommentType
+from src.density_calculation.checker.abc_rule.rule import CheckerRule
+from src.density_calculation.checker.abc_rule.rule_decorator import rule
+from src.density_calculation.checker.abc_rule.specification import Spec
+from src.density_calculation.checker.abc_rule.strategy import Strategy
+
+RULE_ID = 106
+SCORE = -3
+
+MAX_REPORTED_NAMES = 5
+IMPLICIT_PARAMETERS = ("self", "cls")
+
+GOOGLE_SECTIONS = frozenset({"args:", "arguments:", "parameters:", "params:"})
+NUMPY_SECTIONS = frozenset({"parameters", "params", "arguments"})
+NUMPY_UNDERLINE = re.compile(r"^-{3,}\s*$")
+GOOGLE_ENTRY = re.compile(r"^(\\?\*{0,2}\w+)\s*(\(.*\))?\s*:")
+NUMPY_ENTRY = re.compile(r"^(\\?\*{0,2}\w+(?:\s*,\s*\\?\*{0,2}\w+)*)\s*(:.*)?$")
+REST_FIELD = re.compile(r"^:(?:param|parameter|arg|argument)(?:\s+[^:]*?)?\s+(\\?\*{0,2}\w+)\s*:")
+
+
+@dataclass(frozen=True)
+class _Mismatch:
+    """
+    The difference between the documented and the actual parameters of a function.
+
+    Attributes:
+        undocumented (tuple[str, ...]): Parameters of the signature missing from the docstring.
+        unknown (tuple[str, ...]): Documented parameters the signature does not have.
+    """
+
+    undocumented: tuple[str, ...] = ()
+    unknown: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        """
+        Return True if the docstring and the signature differ.
+
+        Returns:
+            bool: True for a mismatch.
+        """
+        return bool(self.undocumented or self.unknown)
+
+
+class DocstringSignatureSpec(Spec):
+    """
+    Specification of a function docstring whose parameter section disagrees with the signature.
+    """
+
+    def find_error(self, comment: CommentData) -> bool:
+        """
+        Compare the documented parameters of a function docstring with the signature.
+
+        Args:
+            comment (CommentData): Comment details.
+
+        Returns:
+            bool: True if the docstring has a parameter section that differs from the signature.
+        """
+        return bool(_mismatch(comment))
+
+
+class DocstringSignatureStrategy(Strategy):
+    """
+    Strategy generating the error data naming the undocumented and unknown parameters.
+    """
+
+    def generate_error_data(self, comment: CommentData) -> CheckerData:
+        """
+        Generate CheckerData for a docstring that disagrees with the signature.
+
+        Args:
+            comment (CommentData): Comment details.
+
+        Returns:
+            CheckerData: The error data structure.
+        """
+        mismatch = _mismatch(comment)
+        name = comment.definition.name if comment.definition is not None else "?"
+        problems = []
+        if mismatch.undocumented:
+            problems.append(f"undocumented {_names(mismatch.undocumented)}")
+        if mismatch.unknown:
+            problems.append(f"no parameter {_names(mismatch.unknown)}")
+
+        return CheckerData(
+            score=SCORE,
+            comment_data=comment,
+            error_string=f"Docstring does not match the signature of '{name}': {'; '.join(problems)}.",
+            rule_id=RULE_ID,
+        )
+
+
+@rule
+class DocstringSignatureRule(CheckerRule):
+    """
+    Rule to detect function docstrings that document parameters the function no longer has,
+    or miss parameters it gained.
+
+    The parameter sections of Google (`Args:`), NumPy (`Parameters` underlined with dashes)
+    and reST (`:param name:`) docstrings are compared with the parameters of the function,
+    which the extractor summarizes from the syntax tree it already parsed (see DefinitionData).
+    Docstrings without a parameter section are not checked, `self` and `cls` need no
+    documentation, and a function with `**kwargs` may document extra keyword names.
+
+    The verdict depends on the signature, not only on the docstring text, so it is not cached.
+    """
+
+    cacheable: bool = False
+
+    def _create_specification(self) -> Spec:
+        """
+        Create the specification of the rule.
+
+        Returns:
+            Spec: The docstring/signature specification.
+        """
+        return DocstringSignatureSpec()
+
+    def _create_strategy(self) -> Strategy:
+        """
+        Create the strategy of the rule.
+
+        Returns:
+            Strategy: The docstring/signature strategy.
+        """
+        return DocstringSignatureStrategy()
+
+    def _set_code(self) -> int:
+        """
+        Set the unique identifier code for the rule.
+
+        Returns:
+            int: The rule's unique code (RULE_ID).
+        """
+        return RULE_ID
+
+
+def _mismatch(comment: CommentData) -> _Mismatch:
+    """
+    Compare the documented parameters of a docstring with the signature of its function.
+
+    Args:
+        comment (CommentData): Comment details.
+
+    Returns:
+        _Mismatch: The difference, empty if the comment is not a function docstring with a parameter section.
+    """
+    if comment.comment_type is not CommentType.DOCSTRING or comment.definition is None:
+        return _Mismatch()
+    documented = _documented_parameters(comment.text)
+    if documented is None:
+        return _Mismatch()
+
+    actual = [parameter.lstrip("*") for parameter in comment.definition.parameters]
+    required = actual[1:] if actual and actual[0] in IMPLICIT_PARAMETERS else actual
+    accepts_keywords = any(parameter.startswith("**") for parameter in comment.definition.parameters)
+    return _Mismatch(
+        undocumented=tuple(name for name in required if name not in documented),
+        unknown=() if accepts_keywords else tuple(name for name in documented if name not in actual),
+    )
+
+
+def _documented_parameters(lines: list[str]) -> list[str] | None:
+    """
+    Collect the parameter names documented in the Google, NumPy and reST sections of a docstring.
+
+    The normalizer drops blank lines, so sections end at the indentation of their header
+    (Google) or at the next underlined header (NumPy).
+
+    Args:
+        lines (list[str]): The normalized docstring lines.
+
+    Returns:
+        list[str] | None: The documented names without `*` prefixes, in order,
+            or None if the docstring has no parameter section.
+    """
+    names: list[str] = []
+    found_section = False
+    index = 0
+    while index < len(lines):
+        stripped = lines[index].strip()
+        underlined = index + 1 < len(lines) and NUMPY_UNDERLINE.match(lines[index + 1].strip())
+
+        rest_field = REST_FIELD.match(stripped)
+        if rest_field:
+            found_section = True
+            names.append(rest_field.group(1))
+        elif stripped.lower() in GOOGLE_SECTIONS:
+            found_section = True
+            index = _read_google_section(lines, index, names)
+            continue
+        elif underlined and stripped.lower() in NUMPY_SECTIONS:
+            found_section = True
+            index = _read_numpy_section(lines, index, names)
+            continue
+        index += 1
+
+    if not found_section:
+        return None
+    return [name.lstrip("\\*") for name in names]
+
+
+def _read_google_section(lines: list[str], header: int, names: list[str]) -> int:
+    """
+    Read the entries of a Google `Args:` section: the least indented lines below the header.
+
+    Args:
+        lines (list[str]): The normalized docstring lines.
+        header (int): The index of the section header.
+        names (list[str]): Receives the documented names.
+
+    Returns:
+        int: The index of the first line after the section.
+    """
+    header_indent = _indent(lines[header])
+    entry_indent: int | None = None
+    index = header + 1
+    while index < len(lines) and _indent(lines[index]) > header_indent:
+        indent = _indent(lines[index])
+        if entry_indent is None:
+            entry_indent = indent
+        if indent == entry_indent:
+            entry = GOOGLE_ENTRY.match(lines[index].strip())
+            if entry:
+                names.append(entry.group(1))
+        index += 1
+    return index
+
+
+def _read_numpy_section(lines: list[str], header: int, names: list[str]) -> int:
+    """
+    Read the entries of a NumPy `Parameters` section: the lines at the header indentation
+    up to the next underlined header.
+
+    Args:
+        lines (list[str]): The normalized docstring lines.
+        header (int): The index of the section header.
+        names (list[str]): Receives the documented names.
+
+    Returns:
+        int: The index of the first line after the section.
+    """
+    header_indent = _indent(lines[header])
+    index = header + 2
+    while index < len(lines):
+        if index + 1 < len(lines) and NUMPY_UNDERLINE.match(lines[index + 1].strip()):
+            break
+        indent = _indent(lines[index])
+        if indent < header_indent:
+            break
+        if indent == header_indent:
+            entry = NUMPY_ENTRY.match(lines[index].strip())
+            if entry is None:
+                break
+            names.extend(name.strip() for name in entry.group(1).split(","))
+        index += 1
+    return index
+
+
+def _indent(line: str) -> int:
+    """
+    Return the indentation of a line.
+
+    Args:
+        line (str): The line.
+
+    Returns:
+        int: The number of leading whitespace characters.
+    """
+    return len(line) - len(line.lstrip())
+
+
+def _names(names: tuple[str, ...]) -> str:
+    """
+    Format parameter names for a message.
+
+    Args:
+        names (tuple[str, ...]): The names.
+
+    Returns:
+        str: Up to MAX_REPORTED_NAMES quoted names, with the count of the others.
+    """
+    listed = ", ".join(f"'{name}'" for name in names[:MAX_REPORTED_NAMES])
+    if len(names) > MAX_REPORTED_NAMES:
+        listed += f" and {len(names) - MAX_REPORTED_NAMES} more"
+    return listed
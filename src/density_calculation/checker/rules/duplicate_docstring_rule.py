@@ -0,0 +1,489 @@
+"""
+Define the rule that detects near-duplicate docstrings across the files of a run.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import itertools
+import re
+import zlib
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.data_types import CheckerData, CommentData, CommentType
+from src.density_calculation.checker.abc_rule.file_rule import FileRule
+from src.density_calculation.checker.abc_rule.rule_decorator import rule
+
+RULE_ID = 104
+SCORE = -2
+
+SIMILARITY_THRESHOLD = 0.8
+MIN_WORDS = 8
+SHINGLE_WORDS = 3
+
+BIN_BITS = 5
+SIGNATURE_SIZE = 1 << BIN_BITS
+BANDS = 8
+ROWS = SIGNATURE_SIZE // BANDS
+MAX_BUCKET_SIZE = 32
+
+MIX = 0x9E3779B97F4A7C15
+MASK = (1 << 64) - 1
+VALUE_SHIFT = 64 - BIN_BITS - 32
+VALUE_MASK = (1 << 32) - 1
+EMPTY_BIN = 1 << 32
+
+WORD = re.compile(r"\w+")
+
+
+@dataclass
+class _Docstring:
+    """
+    A docstring known to the index.
+
+    Attributes:
+        comment (CommentData): The docstring.
+        text (tuple[str, ...]): The lines of the docstring, to recognize it when its file is checked again.
+        shingles (array): The distinct shingle hashes, for the exact similarity of candidates.
+        signature (bytes): The MinHash signature, empty if the docstring is too short to be indexed.
+        rank (tuple[Any, int]): The rank of the file and the position of the docstring in it;
+            a docstring is compared with the docstrings of a lower rank.
+        matches (list[tuple[int, float]] | None): The ID and similarity of every match, the earliest first,
+            or None until they are computed again.
+    """
+
+    comment: CommentData
+    text: tuple[str, ...]
+    shingles: array
+    signature: bytes
+    rank: tuple[Any, int] = (0, 0)
+    matches: list[tuple[int, float]] | None = None
+
+
+@rule
+class DuplicateDocstringRule(FileRule):
+    """
+    Rule to detect docstrings that are near-identical to a docstring seen earlier in the run,
+    typically copy-pasted and no longer describing their function.
+
+    Every docstring of at least MIN_WORDS words is split into shingles of SHINGLE_WORDS words,
+    whose hashes form a MinHash signature of SIGNATURE_SIZE values. Signatures are indexed in BANDS locality-sensitive
+    hashing buckets of ROWS hashes, so only docstrings sharing a bucket are compared, with the
+    exact Jaccard similarity of their shingles. The work per docstring is bounded, since
+    a bucket stops growing at MAX_BUCKET_SIZE members, and the run stays linear in the
+    number of docstrings.
+
+    The index lives as long as the rule instance, that is one analysis run. A docstring is
+    reported when it matches docstrings of a lower rank: those of the files checked before
+    its file, or of the files earlier in the order set with `order_files`, and those above it
+    in its own file. The message names the earliest of them, which identifies the cluster.
+    With more than one job the order of files, and so which copy is reported, is not deterministic.
+
+    Checking a file again replaces its docstrings, so re-analysis of an edited file never
+    matches its own previous version. Docstrings whose text did not change keep their signature
+    and their matches, so only the edited docstrings, and the ones similar to them, are hashed
+    or compared again; other files whose matches change are reported by `refresh_stale_files`.
+    """
+
+    cross_file: bool = True
+
+    def __init__(self) -> None:
+        """
+        Initialize the rule with an empty index.
+        """
+        super().__init__()
+        self._docstrings: dict[int, _Docstring] = {}
+        self._next_id = 0
+        self._buckets: dict[tuple[int, bytes], list[int]] = {}
+        self._by_file: dict[Path, list[int]] = {}
+        self._file_ranks: dict[Path, Any] = {}
+        self._order: Callable[[Path], Any] | None = None
+        self._checked = 0
+        self._last_file: Path | None = None
+        self._stale: set[Path] = set()
+
+    def check_file(self, comments: Sequence[CommentData]) -> list[CheckerData]:
+        """
+        Index the docstrings of a file and report those that duplicate a docstring of a lower rank.
+
+        Args:
+            comments (Sequence[CommentData]): The comments of the file.
+
+        Returns:
+            list[CheckerData]: One result per near-duplicate docstring.
+        """
+        if not comments:
+            return []
+
+        return self._findings(self._update(comments))
+
+    def forget_file(self, file_path: Path) -> None:
+        """
+        Drop the docstrings of a file, e.g. before it is checked again without any comment.
+
+        Args:
+            file_path (pathlib.Path): The file.
+        """
+        for doc_id in self._by_file.pop(file_path, []):
+            self._unlink(doc_id)
+            del self._docstrings[doc_id]
+        self._file_ranks.pop(file_path, None)
+        self._stale.discard(file_path)
+        if self._last_file == file_path:
+            self._last_file = None
+
+    def restore_file(self, comments: Sequence[CommentData]) -> None:
+        """
+        Index the docstrings of a file restored from a checkpoint without reporting them.
+
+        Args:
+            comments (Sequence[CommentData]): The comments of the file.
+        """
+        if comments:
+            self._update(comments)
+
+    def order_files(self, key: Callable[[Path], Any]) -> None:
+        """
+        Rank the files by a key of their path instead of by the order they are checked in.
+
+        Args:
+            key (Callable[[pathlib.Path], Any]): Returns the sort key of a file.
+        """
+        self._order = key
+
+    def refresh_stale_files(self) -> dict[Path, list[CheckerData]]:
+        """
+        Report again the files whose docstrings gained or lost a match of a lower rank since they were checked.
+
+        Returns:
+            dict[pathlib.Path, list[CheckerData]]: The current results of every such file.
+        """
+        stale, self._stale = self._stale, set()
+        return {
+            file_path: self._findings(self._by_file[file_path]) for file_path in stale if file_path in self._by_file
+        }
+
+    def _update(self, comments: Sequence[CommentData]) -> list[int]:
+        """
+        Replace the docstrings of a file in the index, keeping the ones whose text did not change.
+
+        Args:
+            comments (Sequence[CommentData]): The comments of the file, at least one.
+
+        Returns:
+            list[int]: The IDs of the docstrings of the file, in source order.
+        """
+        file_path = comments[0].file_path
+        old_ids = self._by_file.pop(file_path, [])
+        reusable: dict[tuple[str, ...], list[int]] = {}
+        for doc_id in reversed(old_ids):
+            reusable.setdefault(self._docstrings[doc_id].text, []).append(doc_id)
+
+        ids: list[int] = []
+        kept: list[int] = []
+        added: list[int] = []
+        for comment in comments:
+            if comment.comment_type is not CommentType.DOCSTRING:
+                continue
+            text = tuple(comment.text)
+            same_text = reusable.get(text)
+            if same_text:
+                doc_id = same_text.pop()
+                self._docstrings[doc_id].comment = comment
+                kept.append(doc_id)
+            else:
+                doc_id = self._next_id
+                self._next_id += 1
+                self._docstrings[doc_id] = _docstring(comment, text)
+                added.append(doc_id)
+            ids.append(doc_id)
+
+        for same_text in reusable.values():
+            for doc_id in same_text:
+                self._unlink(doc_id)
+                del self._docstrings[doc_id]
+
+        file_rank = self._file_rank(file_path)
+        positions = {doc_id: position for position, doc_id in enumerate(old_ids)}
+        reordered = self._file_ranks.get(file_path) != file_rank or any(
+            positions[first] > positions[second] for first, second in itertools.pairwise(kept)
+        )
+        if reordered:
+            for doc_id in kept:
+                self._unlink(doc_id)
+        for position, doc_id in enumerate(ids):
+            self._docstrings[doc_id].rank = (file_rank, position)
+        for doc_id in [*kept, *added] if reordered else added:
+            self._docstrings[doc_id].matches = None
+            self._link(doc_id)
+
+        self._file_ranks[file_path] = file_rank
+        self._by_file[file_path] = ids
+        self._stale.discard(file_path)
+        return ids
+
+    def _file_rank(self, file_path: Path) -> Any:
+        """
+        Return the rank of a file being checked.
+
+        Args:
+            file_path (pathlib.Path): The file.
+
+        Returns:
+            Any: The key of the file in the order set with `order_files`; otherwise a number
+                above the rank of every other file, unless the file was the last one checked.
+        """
+        if self._order is not None:
+            return self._order(file_path)
+        if file_path != self._last_file or file_path not in self._file_ranks:
+            self._checked += 1
+            self._last_file = file_path
+            return self._checked
+        return self._file_ranks[file_path]
+
+    def _findings(self, ids: list[int]) -> list[CheckerData]:
+        """
+        Report the near-duplicates among the docstrings of a file.
+
+        Args:
+            ids (list[int]): The IDs of the docstrings of the file.
+
+        Returns:
+            list[CheckerData]: One result per near-duplicate docstring.
+        """
+        result_datas: list[CheckerData] = []
+        for doc_id in ids:
+            docstring = self._docstrings[doc_id]
+            if not docstring.signature:
+                continue
+            matches = self._matches(doc_id, docstring)
+            if matches:
+                result_datas.append(self._checker_data(docstring.comment, matches))
+
+        return result_datas
+
+    def _matches(self, doc_id: int, docstring: _Docstring) -> list[tuple[int, float]]:
+        """
+        Find the indexed docstrings of a lower rank similar to a docstring, reusing the last result if still valid.
+
+        Args:
+            doc_id (int): The ID of the docstring.
+            docstring (_Docstring): The docstring.
+
+        Returns:
+            list[tuple[int, float]]: The ID and similarity of every match, the earliest first.
+        """
+        if docstring.matches is not None and all(
+            match_id in self._docstrings and self._docstrings[match_id].rank < docstring.rank
+            for match_id, _ in docstring.matches
+        ):
+            return docstring.matches
+
+        ranked: list[tuple[tuple[Any, int], int, float]] = []
+        for candidate_id in self._candidates(docstring.signature):
+            candidate = self._docstrings[candidate_id]
+            if candidate_id == doc_id or candidate.rank >= docstring.rank:
+                continue
+            similarity = _jaccard(docstring.shingles, candidate.shingles)
+            if similarity >= SIMILARITY_THRESHOLD:
+                ranked.append((candidate.rank, candidate_id, similarity))
+
+        docstring.matches = [(candidate_id, similarity) for _, candidate_id, similarity in sorted(ranked)]
+        return docstring.matches
+
+    def _candidates(self, signature: bytes) -> set[int]:
+        """
+        Return the IDs of the indexed docstrings sharing a bucket with a signature.
+
+        Args:
+            signature (bytes): The MinHash signature.
+
+        Returns:
+            set[int]: The IDs.
+        """
+        candidates: set[int] = set()
+        for band in range(BANDS):
+            candidates.update(self._buckets.get(_band_key(signature, band), ()))
+        return candidates
+
+    def _link(self, doc_id: int) -> None:
+        """
+        Add a docstring to the LSH buckets and invalidate the matches of the similar docstrings above it.
+
+        Args:
+            doc_id (int): The ID of the docstring.
+        """
+        docstring = self._docstrings[doc_id]
+        if not docstring.signature:
+            return
+
+        self._invalidate(doc_id, docstring)
+        for band in range(BANDS):
+            bucket = self._buckets.setdefault(_band_key(docstring.signature, band), [])
+            if len(bucket) < MAX_BUCKET_SIZE:
+                bucket.append(doc_id)
+
+    def _unlink(self, doc_id: int) -> None:
+        """
+        Remove a docstring from the LSH buckets and invalidate the matches of the similar docstrings above it.
+
+        Args:
+            doc_id (int): The ID of the docstring.
+        """
+        docstring = self._docstrings[doc_id]
+        if not docstring.signature:
+            return
+
+        for band in range(BANDS):
+            key = _band_key(docstring.signature, band)
+            bucket = self._buckets.get(key)
+            if bucket is not None and doc_id in bucket:
+                bucket.remove(doc_id)
+                if not bucket:
+                    del self._buckets[key]
+        self._invalidate(doc_id, docstring)
+
+    def _invalidate(self, doc_id: int, docstring: _Docstring) -> None:
+        """
+        Drop the matches of the indexed docstrings of a higher rank similar to a docstring that is added or removed.
+
+        Their files, other than the file of the docstring, become stale.
+
+        Args:
+            doc_id (int): The ID of the docstring.
+            docstring (_Docstring): The docstring.
+        """
+        for candidate_id in self._candidates(docstring.signature):
+            candidate = self._docstrings[candidate_id]
+            if candidate_id == doc_id or candidate.rank <= docstring.rank:
+                continue
+            if _jaccard(docstring.shingles, candidate.shingles) >= SIMILARITY_THRESHOLD:
+                candidate.matches = None
+                if candidate.comment.file_path != docstring.comment.file_path:
+                    self._stale.add(candidate.comment.file_path)
+
+    def _checker_data(self, comment: CommentData, matches: list[tuple[int, float]]) -> CheckerData:
+        """
+        Generate CheckerData for a near-duplicate docstring.
+
+        Args:
+            comment (CommentData): The docstring.
+            matches (list[tuple[int, float]]): The ID and similarity of every match, the earliest first.
+
+        Returns:
+            CheckerData: The error data structure.
+        """
+        first_id, _ = matches[0]
+        first = self._docstrings[first_id].comment
+        similarity = max(similarity for _, similarity in matches)
+        others = f" and {len(matches) - 1} other(s)" if len(matches) > 1 else ""
+        error_msg = f"Near-duplicate docstring ({similarity:.0%}) of {first.location}{others}."
+
+        return CheckerData(
+            score=SCORE,
+            comment_data=comment,
+            error_string=error_msg,
+            rule_id=RULE_ID,
+        )
+
+    def _set_code(self) -> int:
+        """
+        Set the unique identifier code for the rule.
+
+        Returns:
+            int: The rule's unique code (RULE_ID).
+        """
+        return RULE_ID
+
+
+def _docstring(comment: CommentData, text: tuple[str, ...]) -> _Docstring:
+    """
+    Hash the shingles of SHINGLE_WORDS consecutive lower-cased words of a docstring and compute its signature.
+
+    Words are hashed once with CRC-32; the hash of a shingle combines the hashes of its words
+    and mixes them with a multiplicative hash, so no shingle string is ever built.
+
+    Args:
+        comment (CommentData): The docstring.
+        text (tuple[str, ...]): The lines of the docstring.
+
+    Returns:
+        _Docstring: The docstring, without shingles and signature if it has fewer than MIN_WORDS words.
+    """
+    words = WORD.findall(" ".join(text).lower())
+    if len(words) < MIN_WORDS:
+        return _Docstring(comment, text, array("Q"), b"")
+
+    word_hashes = list(map(zlib.crc32, map(str.encode, words)))
+    shingle_hashes = {
+        (((first << 42) ^ (second << 21) ^ third) * MIX) & MASK
+        for first, second, third in zip(word_hashes, word_hashes[1:], word_hashes[2:], strict=False)
+    }
+    return _Docstring(comment, text, array("Q", shingle_hashes), _signature(shingle_hashes))
+
+
+def _signature(shingle_hashes: Iterable[int]) -> bytes:
+    """
+    Return the MinHash signature of a set of shingle hashes with one permutation hashing.
+
+    The top BIN_BITS bits of a hash choose one of SIGNATURE_SIZE bins and every bin keeps its
+    smallest value, so a signature costs one pass over the shingles. Empty bins borrow the value
+    of the next non-empty bin together with the distance to it (densification by rotation),
+    which keeps the probability that two signatures agree in a bin equal to their similarity.
+
+    Args:
+        shingle_hashes (Iterable[int]): The 64-bit hash of every shingle.
+
+    Returns:
+        bytes: SIGNATURE_SIZE 64-bit values.
+    """
+    minimums = [EMPTY_BIN] * SIGNATURE_SIZE
+    for shingle_hash in shingle_hashes:
+        bin_index = shingle_hash >> (64 - BIN_BITS)
+        value = (shingle_hash >> VALUE_SHIFT) & VALUE_MASK
+        if value < minimums[bin_index]:
+            minimums[bin_index] = value
+
+    signature = list(minimums)
+    for bin_index, value in enumerate(minimums):
+        if value != EMPTY_BIN:
+            continue
+        distance = 1
+        while minimums[(bin_index + distance) % SIGNATURE_SIZE] == EMPTY_BIN:
+            distance += 1
+        signature[bin_index] = minimums[(bin_index + distance) % SIGNATURE_SIZE] | (distance << 32)
+
+    return array("Q", signature).tobytes()
+
+
+def _band_key(signature: bytes, band: int) -> tuple[int, bytes]:
+    """
+    Return the LSH bucket key of one band of a signature.
+
+    Args:
+        signature (bytes): The MinHash signature.
+        band (int): The band number.
+
+    Returns:
+        tuple[int, bytes]: The band number and its ROWS values.
+    """
+    return band, signature[8 * ROWS * band : 8 * ROWS * (band + 1)]
+
+
+def _jaccard(first: array, second: array) -> float:
+    """
+    Return the Jaccard similarity of two sets of shingle hashes.
+
+    Args:
+        first (array): The distinct shingle hashes of the first docstring.
+        second (array): The distinct shingle hashes of the second docstring.
+
+    Returns:
+        float: The size of the intersection divided by the size of the union.
+    """
+    common = len(set(first).intersection(second))
+    return common / (len(first) + len(second) - common)
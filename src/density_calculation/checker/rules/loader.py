@@ -11,8 +11,8 @@ def rule_loader() -> None:
 
     This function iterates through all modules in the 'rules' package
     to ensure that all rules decorated with `@rule` are registered
-    within `CommentChecker`. This is typically called once upon
-    the first access to `CommentChecker`.
+    within the rule registry. This is called once upon the first
+    access to the registered rule classes.
     """
     package = "src.density_calculation.checker.rules"
     package_path = Path(__file__).parent
@@ -0,0 +1,143 @@
+"""
+Define the rule that reports misspelled words in comments and docstrings.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import re
+from collections import OrderedDict
+from collections.abc import Iterator
+
+from src.config import SpellingConfig
+from src.data_types import CheckerData, CommentData
+from src.density_calculation.checker.word_list import WordList
+
+MIN_WORD_LENGTH = 3
+MAX_REPORTED_WORDS = 5
+WORD_CACHE_SIZE = 65536
+
+CODE_SPAN = re.compile(r"`[^`]*`")
+URL = re.compile(r"\b[a-z][a-z0-9+.-]*://\S*|\S+@\S+\.\S+", re.IGNORECASE)
+EDGE_PUNCTUATION = "\"'.,;:!?()[]{}<>*«»“”‘’"
+WORD = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?")
+POSSESSIVE = re.compile(r"'s$", re.IGNORECASE)
+
+MESSAGE = "Unknown word(s): {words}."
+
+
+class SpellingRule:
+    """
+    Rule to report comments with words found neither in the compiled dictionary nor in the
+    project allow-list.
+
+    Comments are split on whitespace and only plain words are checked: code spans in
+    backticks, URLs and e-mail addresses are removed first, and tokens that look like
+    identifiers or code (with underscores, digits, dots, operators, inner capitals as
+    in camelCase, or all capitals as in acronyms) are skipped. Hyphenated words are
+    checked part by part.
+
+    The dictionary is memory-mapped (see WordList), and verdicts per word are kept in a
+    bounded cache, since the same words recur in most comments. The verdict depends only
+    on the comment text, so CommentChecker caches it like other cacheable rules.
+    """
+
+    cacheable: bool = True
+
+    def __init__(self, config: SpellingConfig) -> None:
+        """
+        Open the dictionary of the rule.
+
+        Args:
+            config (SpellingConfig): The spelling configuration.
+
+        Raises:
+            DictionaryError: If the dictionary cannot be opened.
+        """
+        self.code = config.rule_id
+        self.fingerprint = config
+        self._score = config.score
+        self._allow = config.allow
+        self._words = WordList(config.dictionary)
+        self._known: OrderedDict[str, bool] = OrderedDict()
+
+    def check(self, comment: CommentData) -> CheckerData | None:
+        """
+        Check the words of a comment.
+
+        Args:
+            comment (CommentData): Comment details.
+
+        Returns:
+            CheckerData | None: The violation listing the unknown words, if any.
+        """
+        unknown: dict[str, None] = {}
+        for line in comment.text:
+            for word in _words(line):
+                if not self._is_known(word):
+                    unknown[word] = None
+
+        if not unknown:
+            return None
+
+        listed = ", ".join(f"'{word}'" for word in list(unknown)[:MAX_REPORTED_WORDS])
+        if len(unknown) > MAX_REPORTED_WORDS:
+            listed += f" and {len(unknown) - MAX_REPORTED_WORDS} more"
+        return CheckerData(
+            score=self._score,
+            comment_data=comment,
+            error_string=MESSAGE.format(words=listed),
+            rule_id=self.code,
+        )
+
+    def _is_known(self, word: str) -> bool:
+        """
+        Check a word against the allow-list and the dictionary, using the bounded word cache.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            bool: True if the word is spelled correctly.
+        """
+        lowered = word.lower()
+        known = self._known.get(lowered)
+        if known is None:
+            known = lowered in self._allow or lowered in self._words
+            self._known[lowered] = known
+            if len(self._known) > WORD_CACHE_SIZE:
+                self._known.popitem(last=False)
+        return known
+
+
+def _words(line: str) -> Iterator[str]:
+    """
+    Yield the plain words of a comment line, skipping code, identifiers and short words.
+
+    Args:
+        line (str): The normalized comment line.
+
+    Yields:
+        str: Every word to check, without possessive suffix.
+    """
+    line = URL.sub(" ", CODE_SPAN.sub(" ", line))
+    for token in line.split():
+        for part in token.strip(EDGE_PUNCTUATION).split("-"):
+            if not WORD.fullmatch(part) or not _is_prose_case(part):
+                continue
+            word = POSSESSIVE.sub("", part)
+            if len(word) >= MIN_WORD_LENGTH:
+                yield word
+
+
+def _is_prose_case(word: str) -> bool:
+    """
+    Check that a word is lower-case or capitalized, unlike camelCase identifiers and acronyms.
+
+    Args:
+        word (str): The word.
+
+    Returns:
+        bool: True if no letter after the first one is upper-case.
+    """
+    return word[1:] == word[1:].lower()
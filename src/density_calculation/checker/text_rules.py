@@ -0,0 +1,316 @@
+"""
+Define the evaluator that runs all declarative text rules in a single fused pass.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import math
+import re
+from collections.abc import Iterable
+
+from src.config import TextRuleConfig
+from src.data_types import CheckerData, CommentData, CommentScope, CommentType
+from src.exceptions import ConfigError
+
+MAX_SCANNED_LINE = 4096
+
+MAX_LEN_MESSAGE = "The comment is too long ({length}). Maximum length: {max_len}."
+MIN_LEN_MESSAGE = "The comment too short ({length}). Minimum length: {min_len}."
+FORBIDDEN_MESSAGE = "The comment contains a forbidden pattern '{match}'."
+PREFIX_MESSAGE = "The comment must start with one of: {prefixes}."
+
+GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+GROUP_NUMBERS = frozenset("123456789")
+QUANTIFIERS = ("*", "+", "{")
+
+
+class FusedTextRules:
+    """
+    Compile declarative text rules into one evaluator that scans every normalized line once.
+
+    For each line the length is computed once and compared with all length bounds, and
+    all forbidden regular expressions are combined into a single expression, so adding
+    a text rule does not add another loop over the comment text. Expressions that refer to
+    their own groups, whose numbers and names would change in the combined expression, are
+    compiled and searched on their own.
+    """
+
+    def __init__(self, rules: Iterable[TextRuleConfig]) -> None:
+        """
+        Compile the rules.
+
+        Args:
+            rules (Iterable[TextRuleConfig]): The declarative text rules.
+
+        Raises:
+            ConfigError: If a regular expression or a message template is invalid.
+        """
+        self._rules = tuple(rules)
+        self.fingerprint = self._rules
+
+        self._max_lens = [(index, rule.max_len) for index, rule in enumerate(self._rules) if rule.max_len is not None]
+        self._min_lens = [(index, rule.min_len) for index, rule in enumerate(self._rules) if rule.min_len is not None]
+        self._shortest_max = min((max_len for _, max_len in self._max_lens), default=math.inf)
+        self._longest_min = max((min_len for _, min_len in self._min_lens), default=-math.inf)
+        self._prefixes = [
+            (index, rule.required_prefixes) for index, rule in enumerate(self._rules) if rule.required_prefixes
+        ]
+
+        self._group_rules: dict[str, int] = {}
+        self._separate: list[tuple[int, re.Pattern[str]]] = []
+        self._forbidden = self._compile_forbidden()
+        self._applicable: dict[tuple[CommentType, CommentScope], frozenset[int]] = {
+            (comment_type, scope): frozenset(
+                index
+                for index, rule in enumerate(self._rules)
+                if comment_type in rule.comment_types and scope in rule.scopes
+            )
+            for comment_type in CommentType
+            for scope in CommentScope
+        }
+
+        for rule in self._rules:
+            self._validate_message(rule)
+
+    @property
+    def rule_ids(self) -> list[int]:
+        """
+        Return the IDs of the compiled rules.
+
+        Returns:
+            list[int]: The rule IDs in configuration order.
+        """
+        return [rule.rule_id for rule in self._rules]
+
+    def check(self, comment: CommentData) -> list[CheckerData]:
+        """
+        Check a comment against all text rules in one pass over its lines.
+
+        Args:
+            comment (CommentData): Comment details.
+
+        Returns:
+            list[CheckerData]: One result per violated rule, in configuration order.
+        """
+        applicable = self._applicable[(comment.comment_type, comment.scope)]
+        if not applicable:
+            return []
+
+        violations: dict[int, dict[str, object]] = {}
+        for line in comment.text:
+            length = len(line)
+            if length > self._shortest_max:
+                for index, max_len in self._max_lens:
+                    if length > max_len and index in applicable and index not in violations:
+                        violations[index] = {"length": length, "max_len": max_len, "template": MAX_LEN_MESSAGE}
+            if length < self._longest_min:
+                for index, min_len in self._min_lens:
+                    if length < min_len and index in applicable and index not in violations:
+                        violations[index] = {"length": length, "min_len": min_len, "template": MIN_LEN_MESSAGE}
+            if self._forbidden is not None:
+                for match in self._forbidden.finditer(line, 0, MAX_SCANNED_LINE):
+                    for group, index in self._group_rules.items():
+                        matched = match.group(group)
+                        if matched is not None and index in applicable and index not in violations:
+                            violations[index] = {"match": matched, "template": FORBIDDEN_MESSAGE}
+            for index, pattern in self._separate:
+                if index in applicable and index not in violations:
+                    separate_match = pattern.search(line, 0, MAX_SCANNED_LINE)
+                    if separate_match is not None:
+                        violations[index] = {"match": separate_match.group(), "template": FORBIDDEN_MESSAGE}
+
+        first_line = comment.text[0] if comment.text else ""
+        for index, prefixes in self._prefixes:
+            if index in applicable and index not in violations and not first_line.startswith(prefixes):
+                violations[index] = {"prefixes": ", ".join(prefixes), "template": PREFIX_MESSAGE}
+
+        return [self._checker_data(index, violations[index], comment) for index in sorted(violations)]
+
+    def _checker_data(self, index: int, values: dict[str, object], comment: CommentData) -> CheckerData:
+        """
+        Build the result of a violated rule.
+
+        Args:
+            index (int): The index of the rule.
+            values (dict[str, object]): The values describing the violation, including the default template.
+            comment (CommentData): Comment details.
+
+        Returns:
+            CheckerData: The error data structure.
+        """
+        rule = self._rules[index]
+        template = rule.message or str(values["template"])
+        return CheckerData(
+            score=rule.score,
+            comment_data=comment,
+            error_string=template.format_map(_MessageValues(values)),
+            rule_id=rule.rule_id,
+        )
+
+    def _compile_forbidden(self) -> re.Pattern[str] | None:
+        """
+        Combine the forbidden expressions of all rules into a single expression.
+
+        A leading lookahead alternation finds the positions where any expression matches;
+        every expression is then tried there as an optional zero-width lookahead with a
+        named group, so all rules that match at the same position are reported, and matches
+        of different rules that overlap are still found at their own positions.
+
+        An expression with backreferences, conditional groups or named groups cannot be part of
+        the combined expression, since its groups would be renumbered or clash with the groups of
+        another expression; it is compiled on its own instead.
+
+        Returns:
+            re.Pattern[str] | None: The combined expression, or None if no rule forbids anything.
+
+        Raises:
+            ConfigError: If an expression is invalid or prone to catastrophic backtracking.
+        """
+        alternatives: list[str] = []
+        lookaheads: list[str] = []
+        for index, rule in enumerate(self._rules):
+            for number, pattern in enumerate(rule.forbidden):
+                try:
+                    compiled = re.compile(pattern)
+                except re.error as error:
+                    raise ConfigError(f"Invalid pattern '{pattern}' in rule {rule.rule_id}: {error}") from error
+                if _has_nested_quantifier(pattern):
+                    raise ConfigError(
+                        f"Pattern '{pattern}' in rule {rule.rule_id} nests quantifiers and may backtrack "
+                        "catastrophically; use an atomic group or a possessive quantifier."
+                    )
+                if compiled.groupindex or _references_groups(pattern):
+                    self._separate.append((index, compiled))
+                    continue
+
+                group = f"r{index}_{number}"
+                self._group_rules[group] = index
+                alternatives.append(f"(?:{_scope_flags(pattern)})")
+                lookaheads.append(f"(?:(?=(?P<{group}>{_scope_flags(pattern)})))?")
+
+        if not alternatives:
+            return None
+        return re.compile(f"(?={'|'.join(alternatives)}){''.join(lookaheads)}")
+
+    def _validate_message(self, rule: TextRuleConfig) -> None:
+        """
+        Check that a custom message template only uses known fields.
+
+        Args:
+            rule (TextRuleConfig): The rule to validate.
+
+        Raises:
+            ConfigError: If the template is invalid.
+        """
+        if rule.message is None:
+            return
+        try:
+            rule.message.format_map(_MessageValues({}))
+        except (ValueError, IndexError) as error:
+            raise ConfigError(f"Invalid message in rule {rule.rule_id}: {error}") from error
+
+
+class _MessageValues(dict[str, object]):
+    """Values for message templates; fields that do not apply to the violation are left empty."""
+
+    def __missing__(self, key: str) -> str:
+        """
+        Return an empty value for a field without a value.
+
+        Args:
+            key (str): The field name.
+
+        Returns:
+            str: An empty string.
+        """
+        return ""
+
+
+def _scope_flags(pattern: str) -> str:
+    """
+    Turn leading global inline flags into scoped flags, so the pattern can be part of an alternation.
+
+    Args:
+        pattern (str): The regular expression.
+
+    Returns:
+        str: The equivalent expression without global flags.
+    """
+    flags = GLOBAL_FLAGS.match(pattern)
+    if flags is None:
+        return pattern
+    return f"(?{flags.group(1)}:{pattern[flags.end() :]})"
+
+
+def _references_groups(pattern: str) -> bool:
+    """
+    Detect a backreference, such as `\\1` or `(?P=name)`, or a conditional group, such as `(?(1)a|b)`.
+
+    Args:
+        pattern (str): The regular expression.
+
+    Returns:
+        bool: True if the pattern refers to one of its groups.
+    """
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\":
+            if pattern[position + 1 : position + 2] in GROUP_NUMBERS:
+                return True
+            position += 2
+            continue
+        if pattern.startswith(("(?P=", "(?("), position):
+            return True
+        position += 1
+    return False
+
+
+def _has_nested_quantifier(pattern: str) -> bool:
+    """
+    Detect a quantified group that itself contains an unbounded quantifier, such as `(a+)+` or `(\\w*x?)*`.
+
+    Atomic groups and possessive quantifiers do not backtrack and are accepted.
+
+    This is a syntactic check, not a proof that the pattern runs in linear time: it does not see
+    alternatives that overlap under a quantifier, such as `(a|a)*`, adjacent quantifiers over the
+    same characters, such as `\\w*\\w*x`, or bounded inner repetitions, such as `(a{1,50})+`.
+    Scanning stops after `MAX_SCANNED_LINE` characters of a line, which bounds the cost of the
+    patterns it lets through.
+
+    Args:
+        pattern (str): The regular expression.
+
+    Returns:
+        bool: True if the pattern nests quantifiers.
+    """
+    groups: list[list[bool]] = []
+    inside_class = False
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        following = pattern[position + 1 : position + 2]
+        if char == "\\":
+            position += 2
+            continue
+        if inside_class:
+            inside_class = char != "]"
+        elif char == "[":
+            inside_class = True
+        elif char == "(":
+            groups.append([False, pattern.startswith("(?>", position)])
+        elif char == ")" and groups:
+            has_quantifier, atomic = groups.pop()
+            if has_quantifier and not atomic and following in QUANTIFIERS:
+                return True
+            if has_quantifier and not atomic and groups:
+                groups[-1][0] = True
+        elif char in ("*", "+") and following == "+":
+            position += 1
+        elif char in ("*", "+") and groups:
+            groups[-1][0] = True
+        elif char == "{" and groups and re.match(r"\{\d*,\}", pattern[position:]):
+            groups[-1][0] = True
+        position += 1
+    return False
@@ -0,0 +1,175 @@
+"""
+Define the compiled, memory-mapped word list used by the spelling rule.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+
+from src.exceptions import DictionaryError
+
+MAGIC = b"CDSDICT1"
+HEADER = struct.Struct("=8sIII")
+SLOT_SIZE = 4
+MAX_WORD_BYTES = 255
+MAX_LOAD_FACTOR = 0.5
+
+
+class WordList:
+    """
+    Look words up in a dictionary compiled by `compile_word_list` without loading it.
+
+    The file is an open-addressing hash table of 32-bit slots followed by the words,
+    each prefixed by its length. It is memory-mapped, so opening costs the same for any
+    dictionary size, the pages are shared by all processes using it, and a lookup reads
+    about one slot and one word. Words are stored lower-cased; lookups are case-insensitive.
+    Numbers are stored in the native byte order: compile the dictionary on the platform using it.
+
+    Usage:
+        with WordList(Path("words.cdsdict")) as words:
+            "comment" in words
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Memory-map a compiled dictionary.
+
+        Args:
+            path (pathlib.Path): The compiled dictionary.
+
+        Raises:
+            DictionaryError: If the file cannot be read or is not a compiled dictionary.
+        """
+        self.path = path
+        try:
+            with open(path, "rb") as dictionary_file:
+                self._map = mmap.mmap(dictionary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            raise DictionaryError(f"Cannot open the dictionary '{path}': {error}") from error
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise DictionaryError(f"'{path}' is not a compiled dictionary")
+        magic, slot_count, word_count, words_size = HEADER.unpack_from(self._map)
+        self.word_count: int = word_count
+        self._words_offset = HEADER.size + slot_count * SLOT_SIZE
+        valid_size = len(self._map) == self._words_offset + words_size
+        if magic != MAGIC or not slot_count or slot_count & (slot_count - 1) or not valid_size:
+            self.close()
+            raise DictionaryError(f"'{path}' is not a compiled dictionary")
+
+        self._mask = slot_count - 1
+        self._slots = memoryview(self._map)[HEADER.size : self._words_offset].cast("I")
+
+    def __contains__(self, word: str) -> bool:
+        """
+        Check whether a word is in the dictionary.
+
+        Args:
+            word (str): The word, in any case.
+
+        Returns:
+            bool: True if the lower-cased word was compiled into the dictionary.
+        """
+        encoded = word.lower().encode()
+        length = len(encoded)
+        words_map, slots, mask = self._map, self._slots, self._mask
+        index = zlib.crc32(encoded) & mask
+        # The load factor stays at most MAX_LOAD_FACTOR, so an empty slot always ends the probe.
+        while offset := slots[index]:
+            start = self._words_offset + offset
+            if words_map[start] == length and words_map[start + 1 : start + 1 + length] == encoded:
+                return True
+            index = (index + 1) & mask
+        return False
+
+    def __len__(self) -> int:
+        """
+        Return the number of words.
+
+        Returns:
+            int: The number of distinct words in the dictionary.
+        """
+        return self.word_count
+
+    def __enter__(self) -> "WordList":
+        """
+        Return the word list.
+
+        Returns:
+            WordList: This word list.
+        """
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """
+        Unmap the dictionary.
+
+        Args:
+            *exc_info (object): The exception information, ignored.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the dictionary; lookups are no longer possible.
+        """
+        if hasattr(self, "_slots"):
+            self._slots.release()
+        self._map.close()
+
+
+def compile_word_list(words: Iterable[str], output: Path) -> int:
+    """
+    Compile words into a dictionary file for `WordList`.
+
+    Words are lower-cased and deduplicated; empty words and words longer than
+    MAX_WORD_BYTES bytes in UTF-8 are skipped. The file is written atomically.
+
+    Args:
+        words (Iterable[str]): The words.
+        output (pathlib.Path): The dictionary file to write.
+
+    Returns:
+        int: The number of compiled words.
+
+    Raises:
+        DictionaryError: If the file cannot be written.
+    """
+    encoded_words = sorted(
+        {encoded for word in words if 0 < len(encoded := word.strip().lower().encode()) <= MAX_WORD_BYTES}
+    )
+
+    slot_count = 1
+    while slot_count * MAX_LOAD_FACTOR < max(1, len(encoded_words)):
+        slot_count *= 2
+    slots = [0] * slot_count
+    mask = slot_count - 1
+
+    blob = bytearray(b"\0")
+    for encoded in encoded_words:
+        index = zlib.crc32(encoded) & mask
+        while slots[index]:
+            index = (index + 1) & mask
+        slots[index] = len(blob)
+        blob.append(len(encoded))
+        blob.extend(encoded)
+
+    temporary_path = output.with_name(f"{output.name}.tmp")
+    try:
+        with open(temporary_path, "wb") as dictionary_file:
+            dictionary_file.write(HEADER.pack(MAGIC, slot_count, len(encoded_words), len(blob)))
+            dictionary_file.write(array("I", slots).tobytes())
+            dictionary_file.write(blob)
+        os.replace(temporary_path, output)
+    except OSError as error:
+        raise DictionaryError(f"Cannot write the dictionary '{output}': {error}") from error
+
+    return len(encoded_words)
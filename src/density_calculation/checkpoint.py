@@ -0,0 +1,396 @@
+"""
+Define the checkpoint journal that lets an interrupted analysis resume where it stopped.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, astuple
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any
+
+from loguru import logger
+
+from src.config import CDSConfig
+from src.data_types import (
+    CheckerData,
+    CodeMetrics,
+    CommentData,
+    CommentScope,
+    CommentType,
+    DefinitionData,
+    EnginesEnum,
+    FileResult,
+    FunctionDensity,
+    RestoredFile,
+    ScopeSpan,
+)
+from src.density_calculation.checker.abc_rule.registry import rule_registry
+from src.exceptions import CheckpointError
+
+CHECKPOINT_FORMAT_VERSION = 4
+DIGEST_SIZE = 16
+FLUSH_RECORDS = 256
+FLUSH_SECONDS = 5.0
+
+
+class Checkpoint:
+    """
+    Journal the results of every analyzed file, so that a preempted run can be resumed.
+
+    The journal is a JSON Lines file: a header naming the format and the fingerprint of the
+    rules, then one record per file with its size, content digest, code metrics, comments,
+    findings and function densities. Records are only appended and written in batches of FLUSH_RECORDS, or after
+    FLUSH_SECONDS, with an fsync, so an interrupted run loses at most one batch; a torn last
+    line is dropped on load. Only the location of every record is kept in memory; a record is
+    read back from the journal when its file is restored.
+
+    When resuming, a file recorded with the same content is not analyzed again: its recorded
+    results are replayed, and its comments are shown to the file rules that keep state
+    across files, so the report and the score equal those of an uninterrupted run. A journal
+    written with other rules or another engine is discarded. All methods are thread-safe.
+    """
+
+    def __init__(self, path: Path, fingerprint: str, resume: bool = False) -> None:
+        """
+        Open the journal, loading it when resuming and starting a new one otherwise.
+
+        Args:
+            path (pathlib.Path): The journal file.
+            fingerprint (str): Identifies the rules and engine; see `checkpoint_fingerprint`.
+            resume (bool): Reuse the results of the journal instead of overwriting it. Defaults to False.
+
+        Raises:
+            CheckpointError: If the journal cannot be opened for writing.
+        """
+        self.path = path
+        self.restored = 0
+
+        self._fingerprint = fingerprint
+        self._lock = threading.Lock()
+        self._records: dict[str, tuple[int, str, int, int]] = {}
+        self._pending: list[str] = []
+        self._flushed_at = time.monotonic()
+
+        valid_size = self._load() if resume else 0
+        try:
+            self._stream: IO[bytes] = open(path, "r+b" if valid_size else "wb")
+            self._stream.truncate(valid_size)
+            self._stream.seek(valid_size)
+            if not valid_size:
+                self._pending.append(json.dumps({"version": CHECKPOINT_FORMAT_VERSION, "fingerprint": fingerprint}))
+                self._flush()
+        except OSError as error:
+            raise CheckpointError(f"Cannot open the checkpoint '{path}': {error}") from error
+
+    def __len__(self) -> int:
+        """
+        Return the number of files the loaded journal covers.
+
+        Returns:
+            int: The number of recorded files.
+        """
+        return len(self._records)
+
+    def restore(self, filepath: Path, code_bytes: bytes) -> RestoredFile | None:
+        """
+        Return the recorded results of a file if it was recorded with this very content.
+
+        Args:
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The byte content of the file.
+
+        Returns:
+            RestoredFile | None: The recorded results and comments, or None if the file must be analyzed.
+        """
+        with self._lock:
+            location = self._records.get(filepath.as_posix())
+        if location is None:
+            return None
+        size, digest, offset, length = location
+        if size != len(code_bytes) or digest != _digest(code_bytes):
+            return None
+
+        try:
+            record = json.loads(os.pread(self._stream.fileno(), length, offset))
+            owners: dict[tuple[Any, ...], ScopeSpan] = {}
+            comments = [_comment_from_json(filepath, raw_comment, owners) for raw_comment in record["comments"]]
+            findings = [
+                _finding_from_json(filepath, raw_finding, comments, owners) for raw_finding in record["findings"]
+            ]
+            functions = tuple(FunctionDensity(*raw_function) for raw_function in record["functions"])
+            metrics = CodeMetrics(*record["metrics"])
+            file_result = FileResult(filepath, findings, metrics.lines, functions, metrics)
+        except (OSError, ValueError, TypeError, KeyError, IndexError) as error:
+            logger.warning("Analyzing '{}' again: invalid checkpoint record: {}", filepath, error)
+            return None
+
+        with self._lock:
+            self.restored += 1
+        return RestoredFile(file_result, comments)
+
+    def record(self, file_result: FileResult, code_bytes: bytes, comments: list[CommentData]) -> None:
+        """
+        Append the results of an analyzed file to the journal.
+
+        Args:
+            file_result (FileResult): The results of the file.
+            code_bytes (bytes): The byte content of the file.
+            comments (list[CommentData]): The comments of the file.
+        """
+        comment_indexes = {id(comment): index for index, comment in enumerate(comments)}
+        record = {
+            "path": file_result.file_path.as_posix(),
+            "size": len(code_bytes),
+            "digest": _digest(code_bytes),
+            "metrics": list(astuple(file_result.metrics or CodeMetrics(file_result.lines))),
+            "comments": [_comment_to_json(comment) for comment in comments],
+            "findings": [_finding_to_json(finding, comment_indexes) for finding in file_result.findings],
+            "functions": [
+                [function.name, function.start_line, function.comment_lines, function.code_lines, function.cell]
+                for function in file_result.functions
+            ],
+        }
+        with self._lock:
+            self._pending.append(json.dumps(record, separators=(",", ":")))
+            self._flush_if_due()
+
+    def close(self) -> None:
+        """
+        Write the pending records and close the journal.
+        """
+        with self._lock:
+            if self._stream.closed:
+                return
+            self._flush()
+            self._stream.close()
+
+    def _load(self) -> int:
+        """
+        Read the records of an existing journal.
+
+        A missing journal, or one with another format or fingerprint, is reported and replaced
+        by a new one. Reading stops at the first invalid line, normally a line torn by the interruption.
+
+        Returns:
+            int: The size in bytes of the valid part of the journal, 0 if it must be started anew.
+        """
+        try:
+            with open(self.path, "rb") as stream:
+                header = json.loads(stream.readline())
+                if header.get("version") != CHECKPOINT_FORMAT_VERSION:
+                    raise ValueError(f"unsupported version {header.get('version')!r}")
+                if header.get("fingerprint") != self._fingerprint:
+                    logger.warning("Ignoring the checkpoint '{}': written with other rules or engine", self.path)
+                    return 0
+
+                valid_size = stream.tell()
+                for line in stream:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                        location = (record["size"], record["digest"], valid_size, len(line))
+                        self._records[record["path"]] = location
+                    except (ValueError, TypeError, KeyError):
+                        break
+                    valid_size += len(line)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, AttributeError) as error:
+            logger.warning("Ignoring the invalid checkpoint '{}': {}", self.path, error)
+            return 0
+
+        logger.debug("Checkpoint '{}' covers {} file(s)", self.path, len(self._records))
+        return valid_size
+
+    def _flush_if_due(self) -> None:
+        """
+        Write the pending records once the batch is full or old enough; the caller must hold the lock.
+        """
+        if len(self._pending) >= FLUSH_RECORDS or time.monotonic() - self._flushed_at >= FLUSH_SECONDS:
+            self._flush()
+
+    def _flush(self) -> None:
+        """
+        Append the pending records to the journal and sync it to disk; the caller must hold the lock.
+        """
+        self._flushed_at = time.monotonic()
+        if not self._pending:
+            return
+        data = "".join(f"{line}\n" for line in self._pending).encode("utf-8")
+        self._pending.clear()
+        try:
+            self._stream.write(data)
+            self._stream.flush()
+            os.fsync(self._stream.fileno())
+        except OSError as error:
+            logger.error("Cannot write the checkpoint '{}': {}", self.path, error)
+
+
+def checkpoint_fingerprint(config: CDSConfig, engine: EnginesEnum) -> str:
+    """
+    Identify everything that decides the results of a file besides its content: the configuration,
+    the version of the spelling dictionary, the engine and the registered rule classes.
+
+    Args:
+        config (CDSConfig): The rule configuration.
+        engine (EnginesEnum): The comment extraction engine.
+
+    Returns:
+        str: The hexadecimal digest of the configuration, the engine and the rules.
+    """
+    spelling = function_density = None
+    if config.function_density is not None:
+        function_density = asdict(config.function_density)
+    if config.spelling is not None:
+        dictionary = config.spelling.dictionary
+        dictionary_stat = dictionary.stat() if dictionary.is_file() else None
+        spelling = {
+            **asdict(config.spelling),
+            "dictionary_version": [dictionary_stat.st_size, dictionary_stat.st_mtime_ns] if dictionary_stat else None,
+        }
+    data = {
+        "text_rules": [asdict(text_rule) for text_rule in config.text_rules],
+        "spelling": spelling,
+        "function_density": function_density,
+        "engine": engine.value,
+        "rules": sorted(
+            f"{rule_class.__module__}.{rule_class.__qualname__}"
+            for rule_class in (*rule_registry.rule_classes(), *rule_registry.file_rule_classes())
+        ),
+    }
+    encoded = json.dumps(data, sort_keys=True, default=_jsonable).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def _jsonable(value: Any) -> Any:
+    """
+    Convert the values of the configuration that JSON does not support.
+
+    Args:
+        value (Any): A path, enumeration member or set.
+
+    Returns:
+        Any: A stable JSON-compatible representation.
+    """
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (set, frozenset)):
+        return sorted(_jsonable(item) if isinstance(item, Enum) else item for item in value)
+    return str(value)
+
+
+def _comment_to_json(comment: CommentData) -> list[Any]:
+    """
+    Serialize a comment without its file path.
+
+    Args:
+        comment (CommentData): The comment.
+
+    Returns:
+        list[Any]: The position, text, type, scope, definition, notebook cell and owner of the comment.
+    """
+    definition = comment.definition
+    owner = comment.owner
+    return [
+        comment.start_line_number,
+        comment.end_line_number,
+        comment.column_start,
+        comment.column_end,
+        comment.text,
+        comment.comment_type.name,
+        comment.scope.name,
+        None if definition is None else [definition.name, list(definition.parameters)],
+        comment.cell,
+        None if owner is None else [owner.name, owner.kind.name, owner.start_line, owner.end_line],
+    ]
+
+
+def _comment_from_json(filepath: Path, raw_comment: list[Any], owners: dict[tuple[Any, ...], ScopeSpan]) -> CommentData:
+    """
+    Rebuild a comment serialized by `_comment_to_json`.
+
+    Args:
+        filepath (pathlib.Path): The path of the file.
+        raw_comment (list[Any]): The serialized comment.
+        owners (dict[tuple[Any, ...], ScopeSpan]): The owners rebuilt for the file so far, so that
+            the comments of one definition share it again.
+
+    Returns:
+        CommentData: The comment.
+    """
+    start_line, end_line, column_start, column_end, text, comment_type, scope, definition, cell, owner = raw_comment
+    if owner is not None:
+        name, kind, owner_start, owner_end = owner
+        owner = owners.get(tuple(owner)) or owners.setdefault(
+            tuple(owner), ScopeSpan(name, CommentScope[kind], owner_start, owner_end)
+        )
+    return CommentData(
+        file_path=filepath,
+        text=text,
+        start_line_number=start_line,
+        end_line_number=end_line,
+        column_start=column_start,
+        column_end=column_end,
+        comment_type=CommentType[comment_type],
+        scope=CommentScope[scope],
+        definition=None if definition is None else DefinitionData(definition[0], tuple(definition[1])),
+        cell=cell,
+        owner=owner,
+    )
+
+
+def _finding_to_json(finding: CheckerData, comment_indexes: dict[int, int]) -> list[Any]:
+    """
+    Serialize a finding, referring to its comment by index when it is one of the comments of the file.
+
+    Args:
+        finding (CheckerData): The finding.
+        comment_indexes (dict[int, int]): The index of every comment of the file by object identity.
+
+    Returns:
+        list[Any]: The comment (index or serialized), score, rule ID and message.
+    """
+    comment_index = comment_indexes.get(id(finding.comment_data))
+    comment = comment_index if comment_index is not None else _comment_to_json(finding.comment_data)
+    return [comment, finding.score, finding.rule_id, finding.error_string]
+
+
+def _finding_from_json(
+    filepath: Path, raw_finding: list[Any], comments: list[CommentData], owners: dict[tuple[Any, ...], ScopeSpan]
+) -> CheckerData:
+    """
+    Rebuild a finding serialized by `_finding_to_json`.
+
+    Args:
+        filepath (pathlib.Path): The path of the file.
+        raw_finding (list[Any]): The serialized finding.
+        comments (list[CommentData]): The restored comments of the file.
+        owners (dict[tuple[Any, ...], ScopeSpan]): The owners rebuilt for the file so far.
+
+    Returns:
+        CheckerData: The finding.
+    """
+    comment, score, rule_id, error_string = raw_finding
+    comment_data = comments[comment] if isinstance(comment, int) else _comment_from_json(filepath, comment, owners)
+    return CheckerData(score=score, comment_data=comment_data, error_string=error_string, rule_id=rule_id)
+
+
+def _digest(code_bytes: bytes) -> str:
+    """
+    Return the digest identifying a file content.
+
+    Args:
+        code_bytes (bytes): The byte content of the file.
+
+    Returns:
+        str: The hexadecimal BLAKE2b digest.
+    """
+    return hashlib.blake2b(code_bytes, digest_size=DIGEST_SIZE).hexdigest()
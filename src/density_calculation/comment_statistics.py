@@ -0,0 +1,522 @@
+"""
+Define the mergeable streaming sketches that summarize the distribution of comment lengths.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from src.data_types import CommentData, CommentDistribution, CommentScope, CommentType, QuantileSummary
+from src.exceptions import StatisticsError
+
+STATISTICS_FORMAT_VERSION = 1
+DEFAULT_K = 200
+CAPACITY_RATIO = 2 / 3
+MIN_CAPACITY = 2
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class KLLSketch:
+    """
+    Estimate the quantiles of a stream of numbers with the KLL sketch of Karnin, Lang and Liberty.
+
+    Items are kept in a stack of compactors; the items of level h stand for 2^h items of the
+    stream. A full level is sorted and every other item is promoted to the next level, the
+    first or the second one alternately. The top levels hold K items and lower levels
+    geometrically fewer (CAPACITY_RATIO), so the sketch keeps O(K) items however long the
+    stream is, and the rank of an estimated quantile is off by about 1.7/K of the count
+    (under 1% with the default K). Sketches with the same K merge level by level into
+    the sketch of the concatenated streams. The minimum and maximum are exact.
+
+    Usage:
+        sketch = KLLSketch()
+        sketch.update([3, 1, 4, 1, 5])
+        median = sketch.quantile(0.5)
+    """
+
+    def __init__(self, k: int = DEFAULT_K) -> None:
+        """
+        Initialize an empty sketch.
+
+        Args:
+            k (int): The capacity of the top level, which sets the accuracy. Defaults to DEFAULT_K.
+        """
+        self.k = k
+        self.count = 0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self._levels: list[list[float]] = [[]]
+        self._offsets = 0
+        self._size = 0
+        self._capacity = self._total_capacity()
+
+    def update(self, values: Iterable[float]) -> None:
+        """
+        Add numbers to the sketch.
+
+        Args:
+            values (Iterable[float]): The numbers.
+        """
+        level = self._levels[0]
+        size = len(level)
+        level.extend(values)
+        added = len(level) - size
+        if not added:
+            return
+
+        new_values = level[size:]
+        low, high = min(new_values), max(new_values)
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        self.count += added
+        self._size += added
+        if self._size >= self._capacity:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """
+        Add the stream summarized by another sketch.
+
+        Args:
+            other (KLLSketch): A sketch with the same K.
+
+        Raises:
+            StatisticsError: If the sketches have a different K.
+        """
+        if other.k != self.k:
+            raise StatisticsError(f"Cannot merge sketches with K={self.k} and K={other.k}")
+        if not other.count:
+            return
+
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self.count += other.count
+        self._size += other._size
+        if other.minimum is not None:
+            self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        if other.maximum is not None:
+            self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self._capacity = self._total_capacity()
+        self._compress()
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Estimate the value below which the given fraction of the numbers fall.
+
+        Args:
+            fraction (float): The fraction, between 0 and 1.
+
+        Returns:
+            float: The estimated quantile; 0 for an empty sketch.
+        """
+        if not self.count or self.minimum is None or self.maximum is None:
+            return 0
+        if fraction <= 0:
+            return self.minimum
+        if fraction >= 1:
+            return self.maximum
+
+        weighted = sorted((item, 1 << level) for level, items in enumerate(self._levels) for item in items)
+        total = sum(weight for _, weight in weighted)
+        rank = fraction * total
+        seen = 0
+        for item, weight in weighted:
+            seen += weight
+            if seen >= rank:
+                return item
+        return self.maximum
+
+    def to_json(self) -> dict[str, Any]:
+        """
+        Serialize the sketch.
+
+        Returns:
+            dict[str, Any]: The JSON-compatible state of the sketch.
+        """
+        return {
+            "k": self.k,
+            "count": self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+            "offsets": self._offsets,
+            "levels": self._levels,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "KLLSketch":
+        """
+        Rebuild a sketch serialized by `to_json`.
+
+        Args:
+            data (dict[str, Any]): The serialized sketch.
+
+        Returns:
+            KLLSketch: The sketch.
+
+        Raises:
+            StatisticsError: If the data is not a valid sketch.
+        """
+        try:
+            sketch = cls(int(data["k"]))
+            sketch.count = int(data["count"])
+            sketch.minimum = data["min"]
+            sketch.maximum = data["max"]
+            sketch._offsets = int(data["offsets"])
+            sketch._levels = [list(items) for items in data["levels"]] or [[]]
+        except (KeyError, TypeError, ValueError) as error:
+            raise StatisticsError(f"Invalid sketch: {error}") from error
+        if sketch.k < MIN_CAPACITY:
+            raise StatisticsError(f"Invalid sketch: K={sketch.k}")
+        sketch._size = sum(len(items) for items in sketch._levels)
+        sketch._capacity = sketch._total_capacity()
+        return sketch
+
+    def _compress(self) -> None:
+        """
+        Compact full levels, from the bottom up, until the sketch fits its capacity.
+        """
+        levels = self._levels
+        while self._size >= self._capacity:
+            for level, items in enumerate(levels):
+                if len(items) < self._level_capacity(level):
+                    continue
+                if level + 1 == len(levels):
+                    levels.append([])
+                    self._capacity = self._total_capacity()
+
+                items.sort()
+                kept = [items.pop()] if len(items) % 2 else []
+                offset = (self._offsets >> level) & 1
+                self._offsets ^= 1 << level
+                promoted = items[offset::2]
+                levels[level + 1].extend(promoted)
+                levels[level] = kept
+                self._size -= len(items) - len(promoted)
+                break
+            else:
+                return
+
+    def _level_capacity(self, level: int) -> int:
+        """
+        Return the number of items a level holds before it is compacted.
+
+        Args:
+            level (int): The level, 0 for the items of the stream.
+
+        Returns:
+            int: The capacity: K for the top level, geometrically less below it.
+        """
+        depth = len(self._levels) - level - 1
+        return max(MIN_CAPACITY, int(self.k * CAPACITY_RATIO**depth))
+
+    def _total_capacity(self) -> int:
+        """
+        Return the number of items the sketch holds before it is compressed.
+
+        Returns:
+            int: The sum of the capacities of all levels.
+        """
+        return sum(self._level_capacity(level) for level in range(len(self._levels)))
+
+
+class PowerOfTwoHistogram:
+    """
+    Count non-negative integers in buckets doubling in width: 0, 1, 2-3, 4-7, 8-15, ...
+
+    Histograms merge by adding their counts.
+    """
+
+    def __init__(self, counts: list[int] | None = None) -> None:
+        """
+        Initialize the histogram.
+
+        Args:
+            counts (list[int] | None): The counts of the buckets. Defaults to None (empty).
+        """
+        self.counts: list[int] = list(counts or [])
+
+    def update(self, values: Iterable[int]) -> None:
+        """
+        Count numbers.
+
+        Args:
+            values (Iterable[int]): The non-negative integers.
+        """
+        counts = self.counts
+        for value in values:
+            bucket = int(value).bit_length()
+            if bucket >= len(counts):
+                counts.extend([0] * (bucket + 1 - len(counts)))
+            counts[bucket] += 1
+
+    def merge(self, other: "PowerOfTwoHistogram") -> None:
+        """
+        Add the counts of another histogram.
+
+        Args:
+            other (PowerOfTwoHistogram): The histogram.
+        """
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for bucket, count in enumerate(other.counts):
+            self.counts[bucket] += count
+
+
+def bucket_label(bucket: int) -> str:
+    """
+    Return the range of values counted by a bucket of PowerOfTwoHistogram.
+
+    Args:
+        bucket (int): The bucket index.
+
+    Returns:
+        str: The label, e.g. `4-7`.
+    """
+    if bucket < 2:
+        return str(bucket)
+    return f"{1 << (bucket - 1)}-{(1 << bucket) - 1}"
+
+
+class _GroupStatistics:
+    """
+    The sketches of the comments of one type and scope.
+    """
+
+    def __init__(self, k: int) -> None:
+        """
+        Initialize empty sketches.
+
+        Args:
+            k (int): The accuracy parameter of the quantile sketches.
+        """
+        self.length = KLLSketch(k)
+        self.lines = KLLSketch(k)
+        self.length_histogram = PowerOfTwoHistogram()
+
+    def merge(self, other: "_GroupStatistics") -> None:
+        """
+        Add the sketches of another group.
+
+        Args:
+            other (_GroupStatistics): The group.
+        """
+        self.length.merge(other.length)
+        self.lines.merge(other.lines)
+        self.length_histogram.merge(other.length_histogram)
+
+
+class CommentStatistics:
+    """
+    Summarize the length, in characters and in lines, of the normalized text of every comment,
+    per comment type and scope, in constant memory however many comments are seen.
+
+    Quantiles come from KLL sketches and the shape of the length distribution from
+    power-of-two histograms. Statistics are saved as JSON, and statistics saved by other
+    runs or by the shards of one run merge into the statistics of all of them.
+
+    Statistics are not thread-safe; the analysis feeds them from the thread checking comments.
+
+    Usage:
+        statistics = CommentStatistics()
+        statistics.add(comments)
+        statistics.save(Path("shard-1.json"))
+        merged = CommentStatistics.load(Path("shard-1.json"))
+        merged.merge(CommentStatistics.load(Path("shard-2.json")))
+    """
+
+    def __init__(self, k: int = DEFAULT_K) -> None:
+        """
+        Initialize empty statistics.
+
+        Args:
+            k (int): The accuracy parameter of the quantile sketches. Defaults to DEFAULT_K.
+        """
+        self.k = k
+        self._groups: dict[tuple[CommentType, CommentScope], _GroupStatistics] = {}
+
+    @property
+    def count(self) -> int:
+        """
+        Return the number of summarized comments.
+
+        Returns:
+            int: The number of comments.
+        """
+        return sum(group.length.count for group in self._groups.values())
+
+    def add(self, comments: Iterable[CommentData]) -> None:
+        """
+        Add the comments of a file.
+
+        Args:
+            comments (Iterable[CommentData]): The comments.
+        """
+        lengths: dict[tuple[CommentType, CommentScope], tuple[list[int], list[int]]] = {}
+        for comment in comments:
+            key = (comment.comment_type, comment.scope)
+            values = lengths.get(key)
+            if values is None:
+                values = lengths[key] = ([], [])
+            values[0].append(sum(len(line) for line in comment.text) + max(len(comment.text) - 1, 0))
+            values[1].append(len(comment.text))
+
+        for key, (characters, lines) in lengths.items():
+            group = self._group(key)
+            group.length.update(characters)
+            group.lines.update(lines)
+            group.length_histogram.update(characters)
+
+    def merge(self, other: "CommentStatistics") -> None:
+        """
+        Add the statistics of another run or shard.
+
+        Args:
+            other (CommentStatistics): The statistics, with the same K.
+
+        Raises:
+            StatisticsError: If the statistics have a different K.
+        """
+        if other.k != self.k:
+            raise StatisticsError(f"Cannot merge statistics with K={self.k} and K={other.k}")
+        for key, group in other._groups.items():
+            self._group(key).merge(group)
+
+    def distributions(self) -> list[CommentDistribution]:
+        """
+        Return the distributions of every comment type and scope seen.
+
+        Returns:
+            list[CommentDistribution]: The distributions, ordered by type and scope.
+        """
+        return [
+            CommentDistribution(
+                comment_type=comment_type,
+                scope=scope,
+                length=_summary(group.length),
+                lines=_summary(group.lines),
+                length_histogram=tuple(group.length_histogram.counts),
+            )
+            for (comment_type, scope), group in sorted(
+                self._groups.items(), key=lambda item: (item[0][0].value, item[0][1].value)
+            )
+        ]
+
+    def to_json(self) -> dict[str, Any]:
+        """
+        Serialize the statistics.
+
+        Returns:
+            dict[str, Any]: The JSON-compatible state of the statistics.
+        """
+        return {
+            "version": STATISTICS_FORMAT_VERSION,
+            "k": self.k,
+            "groups": [
+                {
+                    "type": comment_type.name,
+                    "scope": scope.name,
+                    "length": group.length.to_json(),
+                    "lines": group.lines.to_json(),
+                    "length_histogram": group.length_histogram.counts,
+                }
+                for (comment_type, scope), group in self._groups.items()
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "CommentStatistics":
+        """
+        Rebuild statistics serialized by `to_json`.
+
+        Args:
+            data (dict[str, Any]): The serialized statistics.
+
+        Returns:
+            CommentStatistics: The statistics.
+
+        Raises:
+            StatisticsError: If the data is not valid statistics.
+        """
+        version = data.get("version") if isinstance(data, dict) else None
+        if version != STATISTICS_FORMAT_VERSION:
+            raise StatisticsError(f"Unsupported statistics format version {version!r}")
+        try:
+            statistics = cls(int(data["k"]))
+            for raw_group in data["groups"]:
+                group = statistics._group((CommentType[raw_group["type"]], CommentScope[raw_group["scope"]]))
+                group.length = KLLSketch.from_json(raw_group["length"])
+                group.lines = KLLSketch.from_json(raw_group["lines"])
+                group.length_histogram = PowerOfTwoHistogram(list(raw_group["length_histogram"]))
+        except (KeyError, TypeError, ValueError) as error:
+            raise StatisticsError(f"Invalid statistics: {error}") from error
+        return statistics
+
+    def save(self, path: Path) -> None:
+        """
+        Write the statistics to a JSON file.
+
+        Args:
+            path (pathlib.Path): The file.
+
+        Raises:
+            StatisticsError: If the file cannot be written.
+        """
+        try:
+            path.write_text(json.dumps(self.to_json(), separators=(",", ":")), encoding="utf-8")
+        except OSError as error:
+            raise StatisticsError(f"Cannot write the statistics '{path}': {error}") from error
+
+    @classmethod
+    def load(cls, path: Path) -> "CommentStatistics":
+        """
+        Read statistics written by `save`.
+
+        Args:
+            path (pathlib.Path): The file.
+
+        Returns:
+            CommentStatistics: The statistics.
+
+        Raises:
+            StatisticsError: If the file cannot be read or holds no valid statistics.
+        """
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as error:
+            raise StatisticsError(f"Cannot read the statistics '{path}': {error}") from error
+        return cls.from_json(data)
+
+    def _group(self, key: tuple[CommentType, CommentScope]) -> _GroupStatistics:
+        """
+        Return the sketches of a comment type and scope, creating them on first use.
+
+        Args:
+            key (tuple[CommentType, CommentScope]): The comment type and scope.
+
+        Returns:
+            _GroupStatistics: The sketches.
+        """
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _GroupStatistics(self.k)
+        return group
+
+
+def _summary(sketch: KLLSketch) -> QuantileSummary:
+    """
+    Summarize a sketch by its count, reported quantiles and maximum.
+
+    Args:
+        sketch (KLLSketch): The sketch.
+
+    Returns:
+        QuantileSummary: The summary.
+    """
+    p50, p95, p99 = (sketch.quantile(fraction) for fraction in QUANTILES)
+    return QuantileSummary(count=sketch.count, p50=p50, p95=p95, p99=p99, maximum=sketch.maximum or 0)
@@ -5,34 +5,84 @@ Author: Petr Lavrishchev
 License: MIT License (see LICENSE file for details)
 """
 
+from collections.abc import Iterable
 from pathlib import Path
 
-from src.data_types import CheckerData, CommentData
+from src.config import CDSConfig
+from src.data_types import CodeMetrics, EnginesEnum, FileResult, SampleEstimate
+from src.density_calculation.baseline import Baseline, BaselineWriter
 from src.density_calculation.cds_scoring_manager import CDSScoringManager
-from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.checker.rule_profiler import RuleProfiler
+from src.density_calculation.checkpoint import Checkpoint
+from src.density_calculation.comment_statistics import CommentStatistics
 from src.density_calculation.finder.comment_finder import CommentFinder
 from src.density_calculation.output_formatter import OutputFormatter
-from src.output import AbstractOutput
+from src.density_calculation.quarantine import Quarantine
+from src.density_calculation.results import iter_file_results, iter_listed_results, iter_results
+from src.density_calculation.sampling import StratifiedSample
+from src.density_calculation.top_k import TopKTracker
+from src.output import AbstractOutput, SQLiteStore
 
 
 class DensitySearcher:
     """
-    Orchestrate the comment density analysis process:
-    finds comments, checks them against rules, scores them, and notifies outputs.
+    Orchestrate the comment density analysis process: consumes the results of
+    `iter_results`, scores them, and notifies outputs.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        engine: EnginesEnum = EnginesEnum.TREE_SITTER,
+        jobs: int = 1,
+        config: CDSConfig | None = None,
+        time_budget: float | None = None,
+        quarantine: Quarantine | None = None,
+        profiler: RuleProfiler | None = None,
+        top_k: TopKTracker | None = None,
+        checkpoint: Checkpoint | None = None,
+        store: SQLiteStore | None = None,
+        statistics: CommentStatistics | None = None,
+        baseline: Baseline | None = None,
+        baseline_writer: BaselineWriter | None = None,
+    ) -> None:
         """
-        Initialize the searcher, setup components, and connect the finder's action
-        to the internal check method.
+        Initialize the searcher and setup components.
+
+        With more than one job the analysis runs in a threaded pipeline; otherwise
+        files are found, checked and reported one after another in the calling thread.
+
+        Args:
+            engine (EnginesEnum): The comment extraction engine. Defaults to TREE_SITTER.
+            jobs (int): The number of parser/extractor threads. Defaults to 1.
+            config (CDSConfig | None): The tool configuration. Defaults to the built-in configuration.
+            time_budget (float | None): The processing time allowed per file in seconds. Defaults to None (no limit).
+            quarantine (Quarantine | None): The list of files to skip and to record. Defaults to None.
+            profiler (RuleProfiler | None): Records the cost of every rule invocation. Defaults to None.
+            top_k (TopKTracker | None): Tracks the worst files and directories. Defaults to None.
+            checkpoint (Checkpoint | None): The journal of checked files to resume from and to record.
+                Defaults to None.
+            store (SQLiteStore | None): Receives the results of every checked file. Defaults to None.
+            statistics (CommentStatistics | None): Receives the comments of every checked file. Defaults to None.
+            baseline (Baseline | None): The known findings, left out of the outputs and the score. Defaults to None.
+            baseline_writer (BaselineWriter | None): Records every finding of the run, before the baseline
+                is applied. Defaults to None.
         """
         self._outputs: set[AbstractOutput] = set()
-        self._checker = CommentChecker()
+        self._config = config or CDSConfig()
         self._output_formatter = OutputFormatter()
         self._scoring_manager = CDSScoringManager()
 
-        self._finder = CommentFinder()
-        self._finder.connect_check_action(self.check)
+        self._engine = engine
+        self._jobs = jobs
+        self._time_budget = time_budget
+        self._quarantine = quarantine
+        self._profiler = profiler
+        self._top_k = top_k
+        self._checkpoint = checkpoint
+        self._store = store
+        self._statistics = statistics
+        self._baseline = baseline
+        self._baseline_writer = baseline_writer
 
     def subscribe_output(self, output: AbstractOutput) -> None:
         """
@@ -43,27 +93,41 @@ class DensitySearcher:
         """
         self._outputs.add(output)
 
-    def check(self, comment: CommentData) -> None:
+    def check(self, file_result: FileResult) -> FileResult:
         """
-        Check a found comment against all defined rules, score it, and notify outputs.
+        Score the results of a checked file, notify outputs and store the results.
+
+        Findings recorded in the baseline are removed first, so they are neither reported nor scored.
 
         Args:
-            comment (CommentData): The data object representing the found comment.
+            file_result (FileResult): The check results of a single file.
+
+        Returns:
+            FileResult: The reported results.
         """
-        checker_datas = self._checker.check(comment)
-        for check_data in checker_datas:
-            self.notify_output(check_data)
-            self.scoring(check_data.score)
+        if self._baseline_writer is not None:
+            self._baseline_writer.add(file_result)
+        if self._baseline is not None:
+            file_result = self._baseline.filter(file_result)
+        self.notify_output(file_result)
+        self.scoring(file_result.score)
+        self._scoring_manager.add_file(file_result.penalty, file_result.metrics)
+        if self._top_k is not None:
+            self._top_k.add(file_result)
+        if self._store is not None:
+            self._store.add(file_result)
+        return file_result
 
-    def notify_output(self, data_from_checker: CheckerData) -> None:
+    def notify_output(self, file_result: FileResult) -> None:
         """
-        Generate and send a message to all subscribed outputs if the score is negative.
+        Generate and send a message to all subscribed outputs if the file has negative results.
 
         Args:
-            data_from_checker (CheckerData): The result data from the comment checker.
+            file_result (FileResult): The check results of a single file.
         """
-        if data_from_checker.score < 0:
-            output_string = self._output_formatter.output_generation(data_from_checker)
+        negative_datas = [checker_data for checker_data in file_result.findings if checker_data.score < 0]
+        if negative_datas:
+            output_string = self._output_formatter.output_generation(file_result.file_path, negative_datas)
             for output in self._outputs:
                 output.message(output_string)
 
@@ -76,6 +140,26 @@ class DensitySearcher:
         """
         self._scoring_manager.add(score)
 
+    @property
+    def code_metrics(self) -> CodeMetrics:
+        """
+        Return the total size of the checked files.
+
+        Returns:
+            CodeMetrics: The sums of the metrics of all checked files.
+        """
+        return self._scoring_manager.metrics
+
+    @property
+    def penalty_per_kloc(self) -> float | None:
+        """
+        Return the reported penalty per thousand lines of code of the checked files.
+
+        Returns:
+            float | None: The density of the penalty, or None if no line of code was checked.
+        """
+        return self._scoring_manager.penalty_per_kloc
+
     def start_analysis(self, path: Path) -> float:
         """
         Start the recursive comment finding and analysis process for the given path.
@@ -86,7 +170,130 @@ class DensitySearcher:
         Returns:
             float: The final calculated comment density score.
         """
-        self._finder.find(path)
+        file_results = iter_results(
+            path,
+            rules=self._config,
+            jobs=self._jobs,
+            engine=self._engine,
+            time_budget=self._time_budget,
+            quarantine=self._quarantine,
+            profiler=self._profiler,
+            checkpoint=self._checkpoint,
+            statistics=self._statistics,
+        )
+        for file_result in file_results:
+            self.check(file_result)
 
         result_score = self._scoring_manager.score
         return result_score
+
+    def start_listed_analysis(self, paths: Iterable[Path]) -> float:
+        """
+        Analyze a stream of files and directories in one pipeline, starting before the stream ends.
+
+        Args:
+            paths (Iterable[pathlib.Path]): The files and directories, e.g. read from `git ls-files -z`.
+
+        Returns:
+            float: The final calculated comment density score.
+        """
+        file_results = iter_listed_results(
+            paths,
+            rules=self._config,
+            jobs=self._jobs,
+            engine=self._engine,
+            time_budget=self._time_budget,
+            quarantine=self._quarantine,
+            profiler=self._profiler,
+            checkpoint=self._checkpoint,
+            statistics=self._statistics,
+        )
+        for file_result in file_results:
+            self.check(file_result)
+
+        result_score = self._scoring_manager.score
+        return result_score
+
+    def start_revision_analysis(self, path: Path, revision: str) -> float:
+        """
+        Analyze the files of a git revision read straight from the object store, without a checkout.
+
+        Findings report repository-relative paths.
+
+        Args:
+            path (pathlib.Path): A path inside the git repository; a subdirectory limits the analysis to it.
+            revision (str): The commit, tag or any tree-ish accepted by git.
+
+        Returns:
+            float: The final calculated comment density score.
+
+        Raises:
+            GitError: If the revision cannot be read.
+        """
+        file_results = iter_results(
+            path,
+            rules=self._config,
+            jobs=self._jobs,
+            engine=self._engine,
+            revision=revision,
+            time_budget=self._time_budget,
+            quarantine=self._quarantine,
+            profiler=self._profiler,
+            checkpoint=self._checkpoint,
+            statistics=self._statistics,
+        )
+        for file_result in file_results:
+            self.check(file_result)
+
+        result_score = self._scoring_manager.score
+        return result_score
+
+    def start_sample_analysis(
+        self,
+        path: Path,
+        fraction: float | None = None,
+        size: int | None = None,
+        seed: int = 0,
+        target_width: float | None = None,
+    ) -> SampleEstimate:
+        """
+        Analyze a stratified random sample of the files under the given path and estimate the total score.
+
+        Findings of the sampled files are reported as usual. With a target width the analysis
+        stops as soon as the confidence interval is narrower, cancelling the files in flight.
+
+        Args:
+            path (pathlib.Path): The starting path (file or directory).
+            fraction (float | None): The fraction of files to analyze. Defaults to None.
+            size (int | None): The number of files to analyze; takes precedence over `fraction`.
+                Defaults to None; without both, every file is analyzed in random order.
+            seed (int): The seed of the random sample. Defaults to 0.
+            target_width (float | None): Stop once the 95% confidence interval is narrower. Defaults to None.
+
+        Returns:
+            SampleEstimate: The estimated total score and its confidence interval.
+        """
+        finder = CommentFinder(self._engine)
+        sample = StratifiedSample(path, finder.iter_files(path), fraction, size, seed)
+        file_results = iter_file_results(
+            sample.files,
+            rules=self._config,
+            jobs=self._jobs,
+            engine=self._engine,
+            time_budget=self._time_budget,
+            quarantine=self._quarantine,
+            profiler=self._profiler,
+            checkpoint=self._checkpoint,
+            statistics=self._statistics,
+        )
+
+        stopped_early = False
+        for file_result in file_results:
+            file_result = self.check(file_result)
+            sample.record(file_result.file_path, file_result.score)
+            if target_width is not None and sample.converged(target_width):
+                stopped_early = True
+                break
+        file_results.close()
+
+        return sample.estimate(stopped_early)
@@ -0,0 +1,176 @@
+"""
+Define the guard that applies the per-file time budget and the quarantine around the analysis stages.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from pathlib import Path
+
+from loguru import logger
+
+from src.data_types import CodeMetrics, CommentData, FileResult, RestoredFile
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.checker.function_density import function_densities
+from src.density_calculation.checkpoint import Checkpoint
+from src.density_calculation.comment_statistics import CommentStatistics
+from src.density_calculation.finder.comment_finder import CommentFinder
+from src.density_calculation.quarantine import Quarantine
+from src.density_calculation.time_budget import TimeBudget
+from src.exceptions import TimeBudgetError
+
+
+class FileGuard:
+    """
+    Run the find and check stages of one file within its time budget.
+
+    A file that is quarantined with unchanged content is skipped before parsing, and a file
+    recorded in the checkpoint with unchanged content is restored instead of being parsed.
+    A file that exceeds its budget in any stage is dropped from the results and quarantined;
+    every other checked file is recorded in the checkpoint and, like every restored file,
+    added to the comment statistics.
+    Both stages share one budget, so a file may be found in one thread and checked in
+    another. The guard holds no per-file state and can be shared by all threads; `check`
+    and `restore` run in the single checker stage.
+    """
+
+    def __init__(
+        self,
+        time_budget: float | None = None,
+        quarantine: Quarantine | None = None,
+        checkpoint: Checkpoint | None = None,
+        statistics: CommentStatistics | None = None,
+    ) -> None:
+        """
+        Initialize the guard.
+
+        Args:
+            time_budget (float | None): The processing time allowed per file in seconds. Defaults to None (no limit).
+            quarantine (Quarantine | None): The list of files to skip and to record. Defaults to None.
+            checkpoint (Checkpoint | None): The journal of checked files to restore and to record. Defaults to None.
+            statistics (CommentStatistics | None): Receives the comments of every checked file. Defaults to None.
+        """
+        self._time_budget = time_budget
+        self._quarantine = quarantine
+        self._checkpoint = checkpoint
+        self._statistics = statistics
+
+    def find(
+        self, finder: CommentFinder, filepath: Path, code_bytes: bytes
+    ) -> tuple[list[CommentData], CodeMetrics, TimeBudget] | RestoredFile | None:
+        """
+        Find the comments of a file and measure it.
+
+        Args:
+            finder (CommentFinder): The finder of the calling thread.
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The byte content of the file.
+
+        Returns:
+            tuple[list[CommentData], CodeMetrics, TimeBudget] | RestoredFile | None: The comments, metrics and
+                budget to pass to `check`, the recorded results to pass to `restore`, or None if the file is skipped.
+        """
+        if self._quarantine is not None and self._quarantine.skips(filepath, code_bytes):
+            return None
+        if self._checkpoint is not None:
+            restored = self._checkpoint.restore(filepath, code_bytes)
+            if restored is not None:
+                return restored
+
+        budget = TimeBudget(self._time_budget)
+        try:
+            with budget:
+                comments, metrics = finder.find_and_measure(filepath, code_bytes, budget)
+        except TimeBudgetError as error:
+            self._exceeded(filepath, code_bytes, budget, error)
+            return None
+
+        return comments, metrics, budget
+
+    def check(
+        self,
+        checker: CommentChecker,
+        filepath: Path,
+        code_bytes: bytes,
+        comments: list[CommentData],
+        metrics: CodeMetrics,
+        budget: TimeBudget,
+    ) -> FileResult | None:
+        """
+        Check the comments of a file with the rest of its budget.
+
+        Args:
+            checker (CommentChecker): The checker of the calling thread.
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The byte content of the file.
+            comments (list[CommentData]): The comments returned by `find`.
+            metrics (CodeMetrics): The metrics returned by `find`.
+            budget (TimeBudget): The budget returned by `find`.
+
+        Returns:
+            FileResult | None: The results of the file, or None if it exceeded its budget.
+        """
+        try:
+            with budget:
+                findings = checker.check_file(comments, budget)
+        except TimeBudgetError as error:
+            self._exceeded(filepath, code_bytes, budget, error)
+            return None
+
+        if self._quarantine is not None and budget.limited:
+            self._quarantine.release(filepath)
+        file_result = FileResult(filepath, findings, metrics.lines, tuple(function_densities(comments)), metrics)
+        if self._checkpoint is not None:
+            self._checkpoint.record(file_result, code_bytes, comments)
+        if self._statistics is not None:
+            self._statistics.add(comments)
+        return file_result
+
+    def restore(self, checker: CommentChecker, restored: RestoredFile) -> FileResult:
+        """
+        Return the recorded results of a file, updating the file rules and statistics that span files.
+
+        Args:
+            checker (CommentChecker): The checker of the calling thread.
+            restored (RestoredFile): The file returned by `find`.
+
+        Returns:
+            FileResult: The recorded results of the file.
+        """
+        checker.restore_file(restored.comments)
+        if self._statistics is not None:
+            self._statistics.add(restored.comments)
+        return restored.file_result
+
+    def _exceeded(self, filepath: Path, code_bytes: bytes, budget: TimeBudget, error: TimeBudgetError) -> None:
+        """
+        Report a file that exceeded its budget with a structured warning and quarantine it.
+
+        The warning carries the fields `event`, `path`, `stage`, `elapsed`, `budget` and `size`
+        in its `extra` record, for sinks that serialize log records.
+
+        Args:
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The byte content of the file.
+            budget (TimeBudget): The spent budget.
+            error (TimeBudgetError): The error that stopped the analysis.
+        """
+        elapsed = round(budget.elapsed, 3)
+        logger.bind(
+            event="time_budget_exceeded",
+            path=filepath.as_posix(),
+            stage=error.stage,
+            elapsed=elapsed,
+            budget=budget.seconds,
+            size=len(code_bytes),
+        ).warning(
+            "Skipped '{}': time budget exceeded (stage={}, elapsed={:.3f}s, budget={:g}s, size={})",
+            filepath,
+            error.stage,
+            elapsed,
+            budget.seconds or 0.0,
+            len(code_bytes),
+        )
+
+        if self._quarantine is not None:
+            self._quarantine.add(filepath, code_bytes, budget, error)
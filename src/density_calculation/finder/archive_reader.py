@@ -0,0 +1,126 @@
+"""
+Define the reader of the files packaged in wheels, sdists, zip files and tarballs, without extracting them.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+
+from loguru import logger
+
+from src.comment_utils import parse_language
+from src.exceptions import ArchiveError, FileTypeError
+
+ZIP_SUFFIXES = (".whl", ".zip", ".egg")
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+MEMBER_SEPARATOR = "!/"
+
+
+def is_archive(path: Path) -> bool:
+    """
+    Check whether a path names an archive whose members can be analyzed.
+
+    Args:
+        path (pathlib.Path): The path given for analysis.
+
+    Returns:
+        bool: True if the path is a file with an archive suffix.
+    """
+    return path.name.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES) and path.is_file()
+
+
+class ArchiveReader:
+    """
+    Stream the analyzable members of an archive in archive order.
+
+    Members are reported as `<archive>!/<member>`, e.g. `dist/pkg-1.0.whl!/pkg/mod.py`.
+    A tarball is opened as a stream, so a compressed tarball is decompressed exactly once
+    and never seeked; the members of a zip file are compressed one by one and are read in
+    the order of its central directory.
+
+    Usage:
+        for filepath, code_bytes in ArchiveReader(Path("dist/pkg-1.0.tar.gz")).iter_sources():
+            ...
+    """
+
+    def __init__(self, archive_path: Path) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            archive_path (pathlib.Path): The wheel, sdist, zip file or tarball.
+        """
+        self.archive_path = archive_path
+
+    def iter_sources(self) -> Iterator[tuple[Path, bytes]]:
+        """
+        Read the content of every member of a supported language.
+
+        Yields:
+            tuple[pathlib.Path, bytes]: The reported path and the content of each member.
+
+        Raises:
+            ArchiveError: If the archive cannot be read.
+        """
+        try:
+            if self.archive_path.name.lower().endswith(ZIP_SUFFIXES):
+                yield from self._iter_zip_sources()
+            else:
+                yield from self._iter_tar_sources()
+        except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as error:
+            raise ArchiveError(f"Cannot read the archive '{self.archive_path}': {error}") from error
+
+    def member_path(self, name: str) -> Path | None:
+        """
+        Return the reported path of a member, or None if its language is not supported.
+
+        Args:
+            name (str): The name of the member inside the archive.
+
+        Returns:
+            pathlib.Path | None: The path `<archive>!/<member>`, or None if the member is skipped.
+        """
+        member = PurePosixPath(name.lstrip("/"))
+        try:
+            parse_language(Path(member.name))
+        except FileTypeError:
+            return None
+        return Path(f"{self.archive_path}{MEMBER_SEPARATOR}{member}")
+
+    def _iter_zip_sources(self) -> Iterator[tuple[Path, bytes]]:
+        """
+        Read the members of a zip file, wheel or egg.
+
+        Yields:
+            tuple[pathlib.Path, bytes]: The reported path and the content of each member.
+        """
+        with zipfile.ZipFile(self.archive_path) as archive:
+            for info in archive.infolist():
+                filepath = None if info.is_dir() else self.member_path(info.filename)
+                if filepath is None:
+                    continue
+                logger.debug("Read '{}' from the archive", filepath)
+                with archive.open(info) as member_file:
+                    yield filepath, member_file.read()
+
+    def _iter_tar_sources(self) -> Iterator[tuple[Path, bytes]]:
+        """
+        Read the members of a tarball in one pass over its decompressed stream.
+
+        Yields:
+            tuple[pathlib.Path, bytes]: The reported path and the content of each member.
+        """
+        with tarfile.open(self.archive_path, "r|*") as archive:
+            for info in archive:
+                filepath = self.member_path(info.name) if info.isfile() else None
+                if filepath is None:
+                    continue
+                member_file = archive.extractfile(info)
+                if member_file is None:
+                    continue
+                logger.debug("Read '{}' from the archive", filepath)
+                yield filepath, member_file.read()
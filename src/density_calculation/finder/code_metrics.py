@@ -0,0 +1,50 @@
+"""
+Define the measure of code, comment and blank lines from the comments found in a source.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections import Counter
+from collections.abc import Sequence
+
+from src.data_types import CodeMetrics, CommentData, CommentScope
+
+
+def measure_code(
+    code_bytes: bytes, comments: Sequence[CommentData], definition_counts: Counter[CommentScope]
+) -> CodeMetrics:
+    """
+    Measure a source from the comments and definitions its extraction found, without parsing it again.
+
+    A comment or docstring covers its lines if nothing but whitespace precedes it on its first
+    line; the lines of a source are split on `\\n` like the rows of the extractors.
+
+    Args:
+        code_bytes (bytes): The source the comments were found in, before notebook cells are remapped.
+        comments (Sequence[CommentData]): The comments of the source.
+        definition_counts (Counter[CommentScope]): The number of function and class definitions.
+
+    Returns:
+        CodeMetrics: The metrics of the source.
+    """
+    lines = code_bytes.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    blank_rows = {row for row, line in enumerate(lines, start=1) if not line.strip()}
+
+    comment_rows: set[int] = set()
+    for comment in comments:
+        row = comment.start_line_number
+        if row <= len(lines) and not lines[row - 1][: comment.column_start - 1].strip():
+            comment_rows.update(range(row, comment.end_line_number + 1))
+    comment_lines = len(comment_rows - blank_rows)
+
+    return CodeMetrics(
+        lines=len(lines),
+        code_lines=len(lines) - len(blank_rows) - comment_lines,
+        comment_lines=comment_lines,
+        blank_lines=len(blank_rows),
+        functions=definition_counts[CommentScope.FUNCTION],
+        classes=definition_counts[CommentScope.CLASS],
+    )
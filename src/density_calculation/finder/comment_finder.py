@@ -5,16 +5,21 @@ Author: Petr Lavrishchev
 License: MIT License (see LICENSE file for details)
 """
 
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 from loguru import logger
 
 from src.comment_utils import parse_language
-from src.data_types import CommentData
+from src.data_types import CodeMetrics, CommentData, CommentScope, EnginesEnum, LanguagesEnum
+from src.density_calculation.finder.code_metrics import measure_code
+from src.density_calculation.finder.lite_extractor import LiteNodeExtractor
 from src.density_calculation.finder.node_extractor import NodeDataExtractor
+from src.density_calculation.finder.notebook import Notebook, is_notebook
 from src.density_calculation.finder.syntax_analyzer import SyntaxAnalyzer
-from src.exceptions import FileTypeError
+from src.density_calculation.time_budget import TimeBudget
+from src.exceptions import FileTypeError, LexerError, NotebookError
 
 
 class CommentFinder:
@@ -23,10 +28,17 @@ class CommentFinder:
     using a syntax analyzer and node extractor.
     """
 
-    def __init__(self) -> None:
-        """Initialize the comment finder."""
+    def __init__(self, engine: EnginesEnum = EnginesEnum.TREE_SITTER) -> None:
+        """
+        Initialize the comment finder.
+
+        Args:
+            engine (EnginesEnum): The extraction engine to use. Defaults to TREE_SITTER.
+        """
+        self.engine = engine
         self.syntax_analyzer = SyntaxAnalyzer()
         self.node_extractor = NodeDataExtractor()
+        self.lite_extractor = LiteNodeExtractor()
 
     def connect_check_action(self, check_action: Callable[[CommentData], None]) -> None:
         """
@@ -37,6 +49,7 @@ class CommentFinder:
                 for each found comment.
         """
         self.node_extractor.connect_action(check_action)
+        self.lite_extractor.connect_action(check_action)
 
     def find(self, path: Path) -> None:
         """
@@ -45,44 +58,193 @@ class CommentFinder:
         Args:
             path (pathlib.Path): The path to the file or directory to search in.
         """
+        for filepath in self.iter_files(path):
+            self.find_in_file(filepath)
+
+    def iter_files(self, path: Path) -> Iterator[Path]:
+        """
+        Recursively walk the given path and yield the files of supported languages.
+
+        Args:
+            path (pathlib.Path): The path to the file or directory to search in.
+
+        Yields:
+            pathlib.Path: The path of every file that can be analyzed.
+        """
         if self._check_exist(path):
             if path.is_dir():
                 for dir_item in path.iterdir():
-                    self.find(dir_item)
+                    yield from self.iter_files(dir_item)
             elif path.is_file():
-                self._find_in_file(path)
+                try:
+                    parse_language(path)
+                except FileTypeError as file_type_error:
+                    logger.debug("Error in get file language: {}", file_type_error)
+                    return
+                yield path
             else:
                 logger.error("'{}' is not a file or folder", path)
         else:
             logger.error("Searching in '{}' is not possible.", path)
 
-    def _find_in_file(self, filepath: Path) -> None:
+    def read_file(self, filepath: Path) -> bytes:
+        """
+        Read the content of a file.
+
+        Args:
+            filepath (pathlib.Path): The path to the file.
+
+        Returns:
+            bytes: The byte content of the file.
+        """
+        with open(filepath, "rb") as file_for_check:
+            return file_for_check.read()
+
+    def find_in_file(self, filepath: Path) -> list[CommentData]:
         """
         Find comments in a single file.
 
         Args:
             filepath (pathlib.Path): The path to the file.
+
+        Returns:
+            list[CommentData]: The comments found in the file.
         """
         logger.debug("Start find in '{}'", filepath.name)
+        return self.find_in_bytes(filepath, self.read_file(filepath))
+
+    def find_in_bytes(self, filepath: Path, code_bytes: bytes, budget: TimeBudget | None = None) -> list[CommentData]:
+        """
+        Find comments in the content of a file that was already read.
+
+        The code cells of a notebook are parsed together, once, and the comments are then
+        moved back into their cells (see Notebook).
+
+        Args:
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The byte content of the file.
+            budget (TimeBudget | None): The time budget of the file. Defaults to None (no limit).
+
+        Returns:
+            list[CommentData]: The comments found in the content.
+
+        Raises:
+            TimeBudgetError: If the budget runs out while parsing or extracting.
+        """
+        return self.find_and_measure(filepath, code_bytes, budget)[0]
+
+    def find_and_measure(
+        self, filepath: Path, code_bytes: bytes, budget: TimeBudget | None = None
+    ) -> tuple[list[CommentData], CodeMetrics]:
+        """
+        Find comments in the content of a file and measure its lines and definitions in the same pass.
+
+        The metrics come from the comments and the definitions the extraction finds; the content is
+        neither read nor parsed again. A notebook is measured on the source of its code cells.
+
+        Args:
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The byte content of the file.
+            budget (TimeBudget | None): The time budget of the file. Defaults to None (no limit).
+
+        Returns:
+            tuple[list[CommentData], CodeMetrics]: The comments found in the content and its metrics.
+
+        Raises:
+            TimeBudgetError: If the budget runs out while parsing or extracting.
+        """
+        if budget is None:
+            budget = TimeBudget()
+        definition_counts: Counter[CommentScope] = Counter()
+
         try:
             language = parse_language(filepath)
         except FileTypeError as file_type_error:
             logger.debug("Error in get file language: {}", file_type_error)
-            return
-        with open(filepath, "rb") as file_for_check:
-            code_bytes = file_for_check.read()
+            return [], measure_code(code_bytes, [], definition_counts)
+
+        if not is_notebook(filepath):
+            comments = self._find_in_source(filepath, code_bytes, language, budget, definition_counts)
+            return comments, measure_code(code_bytes, comments, definition_counts)
+
+        try:
+            notebook = Notebook.from_bytes(code_bytes)
+        except NotebookError as notebook_error:
+            logger.warning("Skipped '{}': {}", filepath, notebook_error)
+            return [], CodeMetrics()
+        comments = self._find_in_source(filepath, notebook.code_bytes, language, budget, definition_counts)
+        return notebook.remap(comments), measure_code(notebook.code_bytes, comments, definition_counts)
+
+    def _find_in_source(
+        self,
+        filepath: Path,
+        code_bytes: bytes,
+        language: LanguagesEnum,
+        budget: TimeBudget,
+        definition_counts: Counter[CommentScope],
+    ) -> list[CommentData]:
+        """
+        Find comments in source code with the selected engine.
 
+        Args:
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The source code.
+            language (LanguagesEnum): The programming language of the source.
+            budget (TimeBudget): The time budget of the file.
+            definition_counts (Counter[CommentScope]): Receives the number of function and class definitions.
+
+        Returns:
+            list[CommentData]: The comments found in the source.
+
+        Raises:
+            TimeBudgetError: If the budget runs out while parsing or extracting.
+        """
+        if self.engine == EnginesEnum.LITE:
+            try:
+                return self.lite_extractor.extract(filepath, code_bytes, language, budget, definition_counts)
+            except LexerError as lexer_error:
+                logger.debug("Falling back to tree-sitter: {}", lexer_error)
+
+        return self._find_with_tree_sitter(filepath, code_bytes, language, budget, definition_counts)
+
+    def _find_with_tree_sitter(
+        self,
+        filepath: Path,
+        code_bytes: bytes,
+        language: LanguagesEnum,
+        budget: TimeBudget,
+        definition_counts: Counter[CommentScope],
+    ) -> list[CommentData]:
+        """
+        Find comments in the file content by building and querying its syntax tree.
+
+        Args:
+            filepath (pathlib.Path): The path to the file.
+            code_bytes (bytes): The byte content of the file.
+            language (LanguagesEnum): The programming language of the file.
+            budget (TimeBudget): The time budget of the file; its remaining time bounds parsing.
+            definition_counts (Counter[CommentScope]): Receives the number of function and class definitions.
+
+        Returns:
+            list[CommentData]: The comments found in the content.
+
+        Raises:
+            TimeBudgetError: If the budget runs out.
+        """
+        budget.check("parse")
         try:
-            tree = self.syntax_analyzer.parse(code_bytes, language)
+            tree = self.syntax_analyzer.parse(code_bytes, language, budget.remaining())
         except FileTypeError as file_type_error:
             logger.debug("Error in file parse: {}", file_type_error)
-            return
+            return []
 
         logger.debug("The tree was created")
+        budget.check("query")
         captures = self.syntax_analyzer.query_captures(tree, language)
+        budget.check("query")
         logger.debug("The captures were received")
 
-        self.node_extractor.extract(filepath, code_bytes, captures)
+        return self.node_extractor.extract(filepath, code_bytes, captures, budget, definition_counts)
 
     def _check_exist(self, path: Path) -> bool:
         """
@@ -0,0 +1,141 @@
+"""
+Define the interval index that finds the innermost function or class enclosing a comment.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import bisect
+
+import tree_sitter
+
+from src.data_types import CommentScope, ScopeSpan
+
+DEFINITION_SCOPES = {"function_definition": CommentScope.FUNCTION, "class_definition": CommentScope.CLASS}
+
+
+class DefinitionIndex:
+    """
+    Index the byte ranges of the function and class definitions of one file.
+
+    The definitions come from the same query as the comments, so the tree is walked once.
+    Definition ranges are either nested or disjoint: they are sorted by start, each one
+    linked to its innermost enclosing definition, and a lookup is a binary search for the
+    last definition starting before the offset followed by a walk up the enclosing
+    definitions until one contains it, which is usually the first.
+
+    Usage:
+        index = DefinitionIndex(captures.get("definition", []), code_bytes)
+        owner = index.owner(comment_node.start_byte)
+    """
+
+    def __init__(self, nodes: list[tree_sitter.Node], code_bytes: bytes) -> None:
+        """
+        Build the index.
+
+        Args:
+            nodes (list[tree_sitter.Node]): The function and class definition nodes, in any order.
+            code_bytes (bytes): The byte content of the file, to read the names of the definitions.
+        """
+        self._code_bytes = code_bytes
+        self._nodes = sorted(set(nodes), key=lambda definition: (definition.start_byte, -definition.end_byte))
+        self._starts = [node.start_byte for node in self._nodes]
+        self._ends = [node.end_byte for node in self._nodes]
+        self._parents: list[int] = []
+        self._spans: dict[int, ScopeSpan] = {}
+
+        open_definitions: list[int] = []
+        for index, start in enumerate(self._starts):
+            while open_definitions and self._ends[open_definitions[-1]] <= start:
+                open_definitions.pop()
+            self._parents.append(open_definitions[-1] if open_definitions else -1)
+            open_definitions.append(index)
+
+    def owner(self, offset: int) -> ScopeSpan | None:
+        """
+        Return the innermost definition enclosing a byte offset.
+
+        Args:
+            offset (int): The byte offset, e.g. the start of a comment.
+
+        Returns:
+            ScopeSpan | None: The definition, or None at module level.
+        """
+        index = bisect.bisect_right(self._starts, offset) - 1
+        while index >= 0 and self._ends[index] <= offset:
+            index = self._parents[index]
+        return self._span(index) if index >= 0 else None
+
+    def _span(self, index: int) -> ScopeSpan:
+        """
+        Return the summary of a definition, created on first use so that definitions without
+        comments cost nothing.
+
+        Args:
+            index (int): The position of the definition in the index.
+
+        Returns:
+            ScopeSpan: The definition, shared by all its comments.
+        """
+        span = self._spans.get(index)
+        if span is None:
+            parent = self._parents[index]
+            span = _definition_span(
+                self._nodes[index], self._code_bytes, self._span(parent).name if parent >= 0 else None
+            )
+            self._spans[index] = span
+        return span
+
+
+def enclosing_definition(
+    root: tree_sitter.Node, offset: int, code_bytes: bytes, spans: dict[int, ScopeSpan]
+) -> ScopeSpan | None:
+    """
+    Return the innermost definition enclosing a byte offset by walking up the tree.
+
+    This suits lookups in a tree that changes between them; DefinitionIndex suits
+    all the comments of a file at once.
+
+    Args:
+        root (tree_sitter.Node): The root node of the tree.
+        offset (int): The byte offset, e.g. the start of a comment.
+        code_bytes (bytes): The byte content of the file.
+        spans (dict[int, ScopeSpan]): The definitions already summarized in this tree, by node ID;
+            receives the new ones.
+
+    Returns:
+        ScopeSpan | None: The definition, or None at module level.
+    """
+    definitions = []
+    span = None
+    node: tree_sitter.Node | None = root.descendant_for_byte_range(offset, offset)
+    while node is not None:
+        if node.type in DEFINITION_SCOPES:
+            span = spans.get(node.id)
+            if span is not None:
+                break
+            definitions.append(node)
+        node = node.parent
+
+    for definition in reversed(definitions):
+        span = spans[definition.id] = _definition_span(definition, code_bytes, span.name if span else None)
+    return span
+
+
+def _definition_span(node: tree_sitter.Node, code_bytes: bytes, parent_name: str | None) -> ScopeSpan:
+    """
+    Summarize a function or class definition node.
+
+    Args:
+        node (tree_sitter.Node): The definition node.
+        code_bytes (bytes): The byte content of the file, to read the name of the definition.
+        parent_name (str | None): The dotted name of the enclosing definition, if any.
+
+    Returns:
+        ScopeSpan: The definition.
+    """
+    name_node = node.child_by_field_name("name")
+    name = code_bytes[name_node.start_byte : name_node.end_byte].decode("utf-8") if name_node else "?"
+    if parent_name is not None:
+        name = f"{parent_name}.{name}"
+    return ScopeSpan(name, DEFINITION_SCOPES[node.type], node.start_point[0] + 1, node.end_point[0] + 1)
@@ -0,0 +1,74 @@
+"""
+Define the reader of file lists streamed by build systems, such as the output of `git ls-files -z`.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import io
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_listed_paths(stream: io.BufferedIOBase) -> Iterator[Path]:
+    """
+    Yield the paths of a NUL- or newline-separated list as soon as each one is complete.
+
+    The separator is the first NUL or newline of the stream; NUL-separated lists may hold
+    any file name, newline-separated ones may end their lines with `\\r`. Empty entries are
+    skipped and names are decoded like the arguments of the command line. The stream is
+    read in chunks as they become available, so the consumer does not wait for the writer
+    of a pipe to finish the list.
+
+    Args:
+        stream (io.BufferedIOBase): The binary stream, e.g. `sys.stdin.buffer`.
+
+    Yields:
+        pathlib.Path: Every listed path, in the order of the list.
+    """
+    separator: bytes | None = None
+    pending = b""
+    while chunk := stream.read1(CHUNK_SIZE):
+        pending += chunk
+        if separator is None:
+            separator = _separator(pending)
+            if separator is None:
+                continue
+        *names, pending = pending.split(separator)
+        yield from _paths(names, separator)
+    yield from _paths([pending], separator)
+
+
+def _separator(head: bytes) -> bytes | None:
+    """
+    Return the separator of a list from its first bytes.
+
+    Args:
+        head (bytes): The bytes read so far.
+
+    Returns:
+        bytes | None: The first NUL or newline, or None if the first entry is not complete yet.
+    """
+    positions = [(head.find(separator), separator) for separator in (b"\0", b"\n") if separator in head]
+    return min(positions)[1] if positions else None
+
+
+def _paths(names: list[bytes], separator: bytes | None) -> Iterator[Path]:
+    """
+    Convert complete entries of a list into paths.
+
+    Args:
+        names (list[bytes]): The entries, without their separators.
+        separator (bytes | None): The separator of the list, or None if it holds a single entry.
+
+    Yields:
+        pathlib.Path: The path of every non-empty entry.
+    """
+    for name in names:
+        if separator != b"\0":
+            name = name.rstrip(b"\r")
+        if name:
+            yield Path(os.fsdecode(name))
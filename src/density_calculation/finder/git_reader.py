@@ -0,0 +1,255 @@
+"""
+Define classes for reading the files of a git revision directly from the object store.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from __future__ import annotations
+
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import IO
+
+from loguru import logger
+
+from src.comment_utils import parse_language
+from src.exceptions import FileTypeError, GitError
+
+BLOB_TYPE = "blob"
+SYMLINK_MODE = "120000"
+SUBMODULE_MODE = "160000"
+NULL_SHA = "0" * 40
+
+
+class GitCatFile:
+    """
+    Wrap one long-lived `git cat-file --batch` process that returns blob contents by object name.
+
+    Usage:
+        with GitCatFile(repo_path) as cat_file:
+            code_bytes = cat_file.read(blob_sha)
+    """
+
+    def __init__(self, repo_path: Path) -> None:
+        """
+        Start the batch process.
+
+        Args:
+            repo_path (pathlib.Path): A path inside the git repository.
+
+        Raises:
+            GitError: If git cannot be started.
+        """
+        try:
+            self._process = subprocess.Popen(
+                ["git", "-C", str(repo_path), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        except OSError as error:
+            raise GitError(f"Cannot start git: {error}") from error
+
+        self._stdin: IO[bytes] = self._process.stdin  # type: ignore[assignment]
+        self._stdout: IO[bytes] = self._process.stdout  # type: ignore[assignment]
+
+    def read(self, object_name: str) -> bytes:
+        """
+        Return the content of an object.
+
+        Args:
+            object_name (str): The object SHA or any name accepted by git.
+
+        Returns:
+            bytes: The raw object content.
+
+        Raises:
+            GitError: If the object does not exist or the process died.
+        """
+        self._stdin.write(f"{object_name}\n".encode())
+        self._stdin.flush()
+
+        header = self._stdout.readline().decode().split()
+        if len(header) != 3:
+            raise GitError(f"Cannot read git object '{object_name}': {' '.join(header) or 'no response'}")
+
+        size = int(header[2])
+        content = self._stdout.read(size)
+        self._stdout.read(1)
+        return content
+
+    def close(self) -> None:
+        """Stop the batch process."""
+        if self._process.poll() is None:
+            self._stdin.close()
+            self._process.wait()
+        self._stdout.close()
+
+    def __enter__(self) -> GitCatFile:
+        """
+        Enter the runtime context.
+
+        Returns:
+            GitCatFile: The batch reader itself.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Stop the batch process when leaving the runtime context.
+
+        Args:
+            exc_type (type[BaseException] | None): The exception type, if any.
+            exc_value (BaseException | None): The exception, if any.
+            traceback (TracebackType | None): The traceback, if any.
+        """
+        self.close()
+
+
+class GitRevisionReader:
+    """
+    List and read the files of a git revision without checking it out.
+    """
+
+    def __init__(self, repo_path: Path) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            repo_path (pathlib.Path): A path inside the git repository. If it is a subdirectory,
+                only files below it are read.
+        """
+        self.repo_path = repo_path
+
+    def list_blobs(self, revision: str) -> Iterator[tuple[Path, str]]:
+        """
+        List the analyzable files of a revision using `git ls-tree -r`.
+
+        Args:
+            revision (str): The commit, tag or any tree-ish accepted by git.
+
+        Yields:
+            tuple[pathlib.Path, str]: The repository-relative path and the blob SHA of each file.
+
+        Raises:
+            GitError: If the revision cannot be listed.
+        """
+        prefix = self._run("rev-parse", "--show-prefix").strip()
+        listing = self._run("ls-tree", "-r", "-z", "--full-tree", revision)
+
+        for entry in listing.split("\0"):
+            if not entry:
+                continue
+            meta, _, name = entry.partition("\t")
+            mode, object_type, object_name = meta.split()
+            if object_type != BLOB_TYPE or mode == SYMLINK_MODE or not name.startswith(prefix):
+                continue
+
+            path = Path(name)
+            try:
+                parse_language(path)
+            except FileTypeError:
+                continue
+            yield path, object_name
+
+    def diff_blobs(self, old_revision: str, new_revision: str) -> Iterator[tuple[Path, str | None, str | None]]:
+        """
+        List the analyzable files that differ between two revisions using `git diff-tree -r`.
+
+        Args:
+            old_revision (str): The earlier commit.
+            new_revision (str): The later commit.
+
+        Yields:
+            tuple[pathlib.Path, str | None, str | None]: The repository-relative path, the old blob SHA
+                (None if the file was added) and the new blob SHA (None if the file was deleted).
+
+        Raises:
+            GitError: If the revisions cannot be compared.
+        """
+        prefix = self._run("rev-parse", "--show-prefix").strip()
+        listing = self._run("diff-tree", "-r", "-z", "--no-renames", old_revision, new_revision)
+
+        fields = iter(listing.split("\0"))
+        for meta in fields:
+            if not meta:
+                continue
+            name = next(fields)
+            old_mode, new_mode, old_name, new_name, _ = meta.lstrip(":").split()
+            if not name.startswith(prefix):
+                continue
+
+            path = Path(name)
+            try:
+                parse_language(path)
+            except FileTypeError:
+                continue
+
+            old_blob = None if old_name == NULL_SHA or old_mode in (SYMLINK_MODE, SUBMODULE_MODE) else old_name
+            new_blob = None if new_name == NULL_SHA or new_mode in (SYMLINK_MODE, SUBMODULE_MODE) else new_name
+            if old_blob or new_blob:
+                yield path, old_blob, new_blob
+
+    def iter_commits(self, revision_range: str) -> Iterator[tuple[str, int]]:
+        """
+        List the commits of a range along the first-parent chain, oldest first.
+
+        Args:
+            revision_range (str): The range, for example 'v1.0..main'.
+
+        Yields:
+            tuple[str, int]: The commit SHA and its committer timestamp.
+
+        Raises:
+            GitError: If the range cannot be listed.
+        """
+        listing = self._run("rev-list", "--reverse", "--first-parent", "--timestamp", revision_range)
+        for line in listing.splitlines():
+            timestamp, commit = line.split()
+            yield commit, int(timestamp)
+
+    def iter_sources(self, revision: str) -> Iterator[tuple[Path, bytes]]:
+        """
+        Stream the content of every analyzable file of a revision through one `git cat-file --batch` process.
+
+        Args:
+            revision (str): The commit, tag or any tree-ish accepted by git.
+
+        Yields:
+            tuple[pathlib.Path, bytes]: The repository-relative path and the content of each file.
+        """
+        with GitCatFile(self.repo_path) as cat_file:
+            for path, object_name in self.list_blobs(revision):
+                logger.debug("Read '{}' ({}) from {}", path, object_name[:10], revision)
+                yield path, cat_file.read(object_name)
+
+    def _run(self, *args: str) -> str:
+        """
+        Run a git command in the repository and return its output.
+
+        Args:
+            *args (str): The git subcommand and its arguments.
+
+        Returns:
+            str: The standard output of the command.
+
+        Raises:
+            GitError: If the command cannot be started or fails.
+        """
+        try:
+            completed = subprocess.run(
+                ["git", "-C", str(self.repo_path), *args], capture_output=True, check=False, text=True
+            )
+        except OSError as error:
+            raise GitError(f"Cannot start git: {error}") from error
+
+        if completed.returncode != 0:
+            raise GitError(f"git {args[0]} failed: {completed.stderr.strip()}")
+        return completed.stdout
@@ -16,7 +16,7 @@ from src.density_calculation.finder.language_data import LanguageData
 class PythonData(LanguageData):
     """
     Represent the language-specific data for Python, including the Tree-sitter language parser
-    and the query string for extracting comments and docstrings.
+    and the query string for extracting comments, docstrings and the definitions enclosing them.
     """
 
     tree_sitter_language = tspython.language()
@@ -37,6 +37,10 @@ class PythonData(LanguageData):
         ;; 4. Capture module Docstrings (root level)
         (module (expression_statement (string) @item))
 
+        ;; 5. Capture definitions, to find the function or class owning every comment
+        (function_definition) @definition
+        (class_definition) @definition
+
         ;; Ensure only nodes captured as @item are returned
         (#match-only item)
     """
@@ -0,0 +1,740 @@
+"""
+Define a lightweight comment extractor built on a single regular-expression pass over the source.
+
+The extractor is an alternative to the tree-sitter engine: it finds inline comments,
+docstrings and their scope without building a concrete syntax tree, and produces the
+same CommentData stream as NodeDataExtractor.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from __future__ import annotations
+
+import io
+import re
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+
+from loguru import logger
+
+from src.data_types import CommentData, CommentScope, CommentType, DefinitionData, LanguagesEnum, ScopeSpan
+from src.density_calculation.finder.node_extractor import NodeDataExtractor
+from src.density_calculation.time_budget import CHECK_INTERVAL, TimeBudget
+from src.exceptions import LexerError
+
+DEFINITION_KEYWORDS = {"def": CommentScope.FUNCTION, "class": CommentScope.CLASS}
+OPEN_BRACKETS = ("(", "[", "{")
+CLOSE_BRACKETS = (")", "]", "}")
+STRING_PREFIX_CHARS = frozenset("rRbBuUfF")
+
+STRING_PATTERN = "|".join(
+    (
+        r"'''(?:[^'\\]|\\.|'(?!''))*'''",
+        r'"""(?:[^"\\]|\\.|"(?!""))*"""',
+        r"'(?:[^'\\\n]|\\.)*'",
+        r'"(?:[^"\\\n]|\\.)*"',
+    )
+)
+# Every alternative starts with a literal character, so `re` skips the code between them without
+# leaving C. A lone quote is an unterminated string; the prefix of a string is read back from the text.
+TOKEN_PATTERN = re.compile(
+    "|".join(
+        (
+            r"\#[^\r\n]*",
+            STRING_PATTERN,
+            r"\n[ \t\f]*",
+            r"\r\n[ \t\f]*",
+            r"\\\r?\n",
+            *(re.escape(char) for char in "()[]{};:'\""),
+        )
+    ),
+    re.DOTALL,
+)
+HEADER_PATTERN = re.compile(r"(?:async(?:[ \t]|\\\r?\n)+)?(def|class)(?!\w)(?:(?:[ \t]|\\\r?\n)*([^\W\d]\w*))?")
+HEADER_TOKEN_PATTERN = re.compile(
+    "|".join((r"\#[^\r\n]*", r"\\\r?\n", f"[rRbBuUfF]{{0,2}}(?:{STRING_PATTERN})", r"\w+", r"\*\*", "->", r"\S")),
+    re.DOTALL,
+)
+FSTRING_FIELD_PATTERN = re.compile(r"[{}#]")
+
+found_type = tuple[int, int, CommentType, CommentScope, DefinitionData | None, "_Frame | None"]
+point_type = tuple[int, int]
+
+
+@dataclass(slots=True)
+class _Frame:
+    """
+    Represent an indented block opened by a compound statement.
+
+    Attributes:
+        kind (CommentScope | None): FUNCTION, CLASS or MODULE for definition bodies, None for other blocks.
+        indent (int): The indentation column of the block body.
+        parent (_Frame | None): The enclosing block.
+        definition (DefinitionData | None): The signature of the function, for a function body.
+        started (bool): True once the block holds a statement, so later strings are not its docstring.
+        name (str | None): The dotted name of the function or class, for a definition body.
+        start (int): The offset of the `def`, `class` or `async` keyword, for a definition body.
+        end (int): The end offset of the last line of code or comment of the block, known once it is closed.
+    """
+
+    kind: CommentScope | None
+    indent: int
+    parent: _Frame | None = None
+    definition: DefinitionData | None = None
+    started: bool = False
+    name: str | None = None
+    start: int = 0
+    end: int = 0
+
+    def scope(self) -> CommentScope:
+        """
+        Return the scope of the innermost definition enclosing this block.
+
+        Returns:
+            CommentScope: The detected scope (FUNCTION, CLASS or MODULE).
+        """
+        frame: _Frame | None = self
+        while frame is not None:
+            if frame.kind is not None:
+                return frame.kind
+            frame = frame.parent
+        return CommentScope.UNKNOWN
+
+    def owner(self) -> _Frame | None:
+        """
+        Return the innermost function or class body enclosing this block.
+
+        Returns:
+            _Frame | None: The definition body, or None at module level.
+        """
+        frame: _Frame | None = self
+        while frame is not None:
+            if frame.name is not None:
+                return frame
+            frame = frame.parent
+        return None
+
+
+@dataclass(slots=True)
+class _PendingComment:
+    """
+    Represent a comment on its own line whose block is not known until the next line of code.
+
+    Attributes:
+        start (int): The offset of the `#`.
+        end (int): The end offset of the comment.
+        column (int): The indentation column of the comment.
+        frame (_Frame): The block the comment currently belongs to.
+        settled (bool): True once no later dedent can move the comment out of its block.
+    """
+
+    start: int
+    end: int
+    column: int
+    frame: _Frame
+    settled: bool = False
+
+
+class LiteNodeExtractor:
+    """
+    Extract comments and docstrings with a single regular-expression pass and notify a callback action.
+    """
+
+    normalizers = NodeDataExtractor.normalizers
+
+    def __init__(self) -> None:
+        """Initialize the extractor with no action connected."""
+        self.callback_found_comment: Callable[[CommentData], None] | None = None
+
+    def connect_action(self, action: Callable[[CommentData], None]) -> None:
+        """
+        Connect a callback function to be executed when a comment is found.
+
+        Args:
+            action (Callable[[CommentData], None]): The function to call
+                for each found comment data.
+        """
+        self.callback_found_comment = action
+
+    def extract(
+        self,
+        filepath: Path,
+        code_bytes: bytes,
+        language: LanguagesEnum,
+        budget: TimeBudget | None = None,
+        definition_counts: Counter[CommentScope] | None = None,
+    ) -> list[CommentData]:
+        """
+        Lex the code and execute the connected action for every comment and docstring.
+
+        Args:
+            filepath (pathlib.Path): The path to the file being processed.
+            code_bytes (bytes): The byte content of the code file.
+            language (LanguagesEnum): The programming language of the code.
+            budget (TimeBudget | None): The time budget of the file. Defaults to None (no limit).
+            definition_counts (Counter[CommentScope] | None): Receives the number of function and
+                class definitions of the file, once the whole file is lexed. Defaults to None.
+
+        Returns:
+            list[CommentData]: The data of all found comments.
+
+        Raises:
+            LexerError: If the code cannot be lexed; callers fall back to the tree-sitter engine.
+            TimeBudgetError: If the budget runs out.
+        """
+        if budget is None:
+            budget = TimeBudget()
+
+        normalizer = self.normalizers.get(language)
+        if normalizer is None:
+            raise LexerError(f"Lite engine does not support {language.name}")
+
+        try:
+            text = code_bytes.decode("utf-8")
+        except UnicodeDecodeError as error:
+            raise LexerError(f"Cannot decode '{filepath.name}': {error}") from error
+        # The scan runs on the text between two newlines, so the first line starts like every
+        # other one and the last one is always terminated; the offsets are shifted by one.
+        padded = f"\n{text}\n"
+        headers: Counter[CommentScope] = Counter()
+        try:
+            found = list(self._scan(padded, budget, headers))
+        except LexerError as error:
+            raise LexerError(f"Cannot lex '{filepath.name}': {error}") from error
+        if definition_counts is not None:
+            definition_counts.update(headers)
+
+        logger.debug("Lite engine found {} comment(s) in '{}'", len(found), filepath.name)
+        lines = io.StringIO(text).readlines()
+        starts = list(accumulate(map(len, lines[:-1]), initial=1))
+        comments: list[CommentData] = []
+        owners: dict[int, ScopeSpan] = {}
+        for start, end, comment_type, scope, definition, owner_frame in found:
+            start_point = self._to_byte_point(lines, starts, start)
+            end_point = self._to_byte_point(lines, starts, end)
+
+            comment_data = CommentData(
+                file_path=filepath,
+                start_line_number=start_point[0],
+                end_line_number=end_point[0],
+                column_start=start_point[1] + 1,
+                column_end=end_point[1],
+                text=normalizer().normalize(padded[start:end], comment_type),
+                comment_type=comment_type,
+                scope=scope,
+                definition=definition,
+                owner=None if owner_frame is None else self._owner_span(owner_frame, starts, owners),
+            )
+            comments.append(comment_data)
+            if self.callback_found_comment:
+                self.callback_found_comment(comment_data)
+
+        return comments
+
+    def _scan(self, text: str, budget: TimeBudget, headers: Counter[CommentScope]) -> Iterator[found_type]:
+        """
+        Match the tokens that shape the code once, tracking blocks, and yield every comment and docstring.
+
+        Only comments, strings, line breaks, brackets, `;` and `:` are matched; the other code is
+        skipped by the regular expression. A line break outside brackets ends the logical line, and
+        the indentation of the next line of code opens or closes blocks the way INDENT and DEDENT
+        tokens do. A def/class header is recognized at the start of a logical line and read again
+        once its colon is found. The comments after code on a logical line are yielded with its
+        docstrings, in source order.
+
+        Args:
+            text (str): The source between a leading and a trailing newline.
+            budget (TimeBudget): The time budget of the file, checked every CHECK_INTERVAL tokens.
+            headers (Counter[CommentScope]): Receives the number of def and class headers.
+
+        Yields:
+            found_type: Start and end offsets in the text, comment type, scope, the signature of the
+                function owning a docstring and the enclosing definition body.
+
+        Raises:
+            LexerError: On unterminated strings or brackets, inconsistent indentation or an
+                f-string the lexer cannot delimit.
+        """
+        frame = _Frame(CommentScope.MODULE, 0)
+        indents, alternates = [0], [0]
+        pending: list[_PendingComment] = []
+        inline: list[found_type] = []
+        docstrings: list[tuple[int, int, int]] = []
+        previous_header: _Frame | None = None
+        header_frame: _Frame | None = None
+        header_kind: CommentScope | None = None
+        header_name = "?"
+        line_empty = True
+        in_header = fresh = False
+        depth = header_start = colon = statement_start = index = last_end = 0
+        candidate = candidate_end = -1
+        limited = budget.limited
+        count = 0
+
+        for match in TOKEN_PATTERN.finditer(text):
+            if limited:
+                count += 1
+                if count % CHECK_INTERVAL == 0:
+                    budget.check("lex")
+            start = match.start()
+            char = text[start]
+
+            if char in "([{":
+                depth += 1
+                continue
+            if char in ")]}":
+                depth -= 1
+                if depth < 0:
+                    raise LexerError(f"unmatched '{char}'")
+                continue
+
+            if char == "\n" or char == "\r":
+                if depth:
+                    continue
+                if not line_empty:
+                    last_end = start
+                    if candidate >= 0 and not text[candidate_end:start].partition("#")[0].strip():
+                        docstrings.append((candidate, candidate_end, index))
+                    header = None
+                    if colon and header_kind is not None:
+                        header = header_frame or self._header(header_kind, header_name, header_start, frame)
+                        headers[header_kind] += 1
+                        if header_kind is CommentScope.FUNCTION:
+                            header.definition = _definition(_header_tokens(text[header_start : colon - 1]))
+                    if inline:
+                        found = [*self._docstrings(docstrings, frame, header, header_kind), *inline]
+                        yield from sorted(found, key=lambda item: item[0])
+                        inline.clear()
+                    elif docstrings:
+                        yield from self._docstrings(docstrings, frame, header, header_kind)
+                    frame.started = True
+                    previous_header = None
+                    if header is not None:
+                        if text[colon:start].partition("#")[0].strip():
+                            header.end = last_end
+                        else:
+                            previous_header = header
+                    line_empty = True
+                    header_frame = header_kind = None
+                    in_header = False
+                    colon = 0
+                    candidate = -1
+                    docstrings.clear()
+
+                end = match.end()
+                following = text[end : end + 1]
+                if following == "\n" or following == "\r" or following == "#":
+                    continue
+                if following == "\\":
+                    raise LexerError("line continuation on an empty line")
+
+                indent = text[text.index("\n", start) + 1 : end]
+                column = alternate = len(indent)
+                if "\t" in indent or "\f" in indent:
+                    column, alternate = _columns(indent)
+                if column > indents[-1]:
+                    if alternate <= alternates[-1]:
+                        raise LexerError("inconsistent use of tabs and spaces in indentation")
+                    indents.append(column)
+                    alternates.append(alternate)
+                    if previous_header is not None:
+                        previous_header.indent = len(indent)
+                        frame = previous_header
+                    else:
+                        frame = _Frame(None, len(indent), frame)
+                    for comment in pending:
+                        if not comment.settled:
+                            comment.frame, comment.settled = frame, True
+                else:
+                    while column < indents[-1]:
+                        indents.pop()
+                        alternates.pop()
+                        frame = self._dedent(frame, pending, last_end)
+                    if column != indents[-1] or alternate != alternates[-1]:
+                        raise LexerError("unindent does not match any outer indentation level")
+                if pending:
+                    yield from self._flush(pending)
+                if not following:
+                    break
+
+                line_empty = False
+                fresh = True
+                statement_start = end
+                index = 0
+                if following in "dca":
+                    header_match = HEADER_PATTERN.match(text, end)
+                    if header_match is not None:
+                        header_kind = DEFINITION_KEYWORDS[header_match[1]]
+                        header_name = header_match[2] or "?"
+                        header_start = end
+                        in_header = True
+                continue
+
+            if char == "'" or char == '"':
+                end = match.end()
+                if end - start == 1:
+                    raise LexerError("unterminated string literal")
+                if text[start - 1] in STRING_PREFIX_CHARS:
+                    start = _string_start(text, start, end)
+                if fresh:
+                    fresh = False
+                    if not text[statement_start:start].strip():
+                        candidate, candidate_end = start, end
+                continue
+
+            if char == ":":
+                if in_header and not depth:
+                    in_header = False
+                    colon = statement_start = match.end()
+                    fresh = True
+                    index = 0
+                continue
+
+            if char == "#":
+                end = match.end()
+                if text[end] == "\r":
+                    end += 1
+                if line_empty:
+                    column = start - text.rindex("\n", 0, start) - 1
+                    pending.append(_PendingComment(start, end, column, frame))
+                elif header_kind is not None:
+                    header_frame = header_frame or self._header(header_kind, header_name, header_start, frame)
+                    inline.append((start, end, CommentType.INLINE, header_kind, None, header_frame))
+                else:
+                    inline.append((start, end, CommentType.INLINE, frame.scope(), None, frame.owner()))
+                continue
+
+            if char == ";":
+                if candidate >= 0 and not text[candidate_end:start].strip():
+                    docstrings.append((candidate, candidate_end, index))
+                candidate = -1
+                index += 1
+                fresh = True
+                statement_start = match.end()
+
+        if depth or not line_empty:
+            raise LexerError("unexpected end of file in a multi-line statement")
+
+    def _dedent(self, frame: _Frame, pending: list[_PendingComment], last_end: int) -> _Frame:
+        """
+        Close the innermost block and return the block that encloses it.
+
+        Args:
+            frame (_Frame): The block closed by the indentation of the next line of code.
+            pending (list[_PendingComment]): Comments waiting for the next line of code, in source order.
+            last_end (int): The end offset of the last logical line.
+
+        Returns:
+            _Frame: The enclosing block.
+        """
+        closed, parent = frame, frame.parent or frame
+        if closed.end < last_end:
+            closed.end = last_end
+        if pending:
+            self._close_block(pending, closed, parent)
+        if parent.end < closed.end:
+            parent.end = closed.end
+        return parent
+
+    def _flush(self, pending: list[_PendingComment]) -> Iterator[found_type]:
+        """
+        Yield the comments on their own lines before a line of code, now that their blocks are known.
+
+        Args:
+            pending (list[_PendingComment]): Comments waiting for the next line of code, in source order.
+
+        Yields:
+            found_type: Start offset, end offset, comment type, scope, no signature and the enclosing definition body.
+        """
+        for comment in pending:
+            yield comment.start, comment.end, CommentType.INLINE, comment.frame.scope(), None, comment.frame.owner()
+        pending.clear()
+
+    def _close_block(self, pending: list[_PendingComment], closed: _Frame, parent: _Frame) -> None:
+        """
+        Move comments that trail a closed block out of it, as the tree-sitter grammar does.
+
+        A comment stays in the closed block while it is indented at least as deep as the block body;
+        the first comment indented less closes the block for every comment that follows it.
+
+        Args:
+            pending (list[_PendingComment]): Comments waiting for the next line of code, in source order.
+            closed (_Frame): The block closed by a dedent.
+            parent (_Frame): The block that encloses the closed one.
+        """
+        left_block = False
+        for comment in pending:
+            if comment.settled or comment.frame is not closed:
+                continue
+            if not left_block and comment.column >= closed.indent:
+                comment.settled = True
+                closed.end = max(closed.end, comment.end)
+            else:
+                comment.frame = parent
+                left_block = True
+
+    def _docstrings(
+        self,
+        docstrings: list[tuple[int, int, int]],
+        frame: _Frame,
+        header: _Frame | None,
+        header_kind: CommentScope | None,
+    ) -> Iterator[found_type]:
+        """
+        Yield the bare string statements of a logical line that sit directly in a definition body.
+
+        Args:
+            docstrings (list[tuple[int, int, int]]): The start and end offsets of every bare string
+                statement of the line, with the index of the statement in the line or in the inline body.
+            frame (_Frame): The block the line belongs to.
+            header (_Frame | None): The body of the def/class the line is the header of.
+            header_kind (CommentScope | None): FUNCTION or CLASS if the line starts a def/class header.
+
+        Yields:
+            found_type: Start offset, end offset, comment type, scope, for the first statement
+                of a function body the signature of the function, and the definition body.
+        """
+        if header is not None:
+            body = header
+        elif header_kind is not None:
+            return
+        else:
+            body = frame
+
+        if body.kind is None:
+            return
+        definition = None if body.started else body.definition
+        owner = body if body.name is not None else None
+
+        for start, end, index in docstrings:
+            yield start, end, CommentType.DOCSTRING, body.kind, definition if index == 0 else None, owner
+
+    def _header(self, kind: CommentScope, name: str, start: int, frame: _Frame) -> _Frame:
+        """
+        Create the body of the def/class a logical line is the header of.
+
+        Args:
+            kind (CommentScope): FUNCTION or CLASS.
+            name (str): The name following `def` or `class`, or "?" if the header is malformed.
+            start (int): The offset of the first keyword of the header.
+            frame (_Frame): The block the header belongs to.
+
+        Returns:
+            _Frame: The definition body; its indentation is set by the line that opens it.
+        """
+        parent = frame.owner()
+        return _Frame(kind, 0, frame, name=name if parent is None else f"{parent.name}.{name}", start=start)
+
+    def _owner_span(self, frame: _Frame, starts: list[int], owners: dict[int, ScopeSpan]) -> ScopeSpan:
+        """
+        Return the summary of a definition body, shared by all its comments.
+
+        Args:
+            frame (_Frame): The closed definition body.
+            starts (list[int]): The offset of every line.
+            owners (dict[int, ScopeSpan]): The summaries already built, by frame identity.
+
+        Returns:
+            ScopeSpan: The definition.
+        """
+        span = owners.get(id(frame))
+        if span is None:
+            kind = frame.kind or CommentScope.UNKNOWN
+            start_line, end_line = bisect_right(starts, frame.start), bisect_right(starts, frame.end)
+            span = owners[id(frame)] = ScopeSpan(frame.name or "?", kind, start_line, end_line)
+        return span
+
+    def _to_byte_point(self, lines: list[str], starts: list[int], offset: int) -> point_type:
+        """
+        Convert an offset in the scanned text into a 1-based line and byte column.
+
+        Args:
+            lines (list[str]): The source split into physical lines.
+            starts (list[int]): The offset of every line.
+            offset (int): The offset in the scanned text.
+
+        Returns:
+            point_type: The 1-based line and 0-based byte column, as reported by tree-sitter.
+        """
+        row = bisect_right(starts, offset)
+        return row, len(lines[row - 1][: offset - starts[row - 1]].encode("utf-8"))
+
+
+def _columns(indent: str) -> tuple[int, int]:
+    """
+    Return the column of an indentation with tabs, as the Python tokenizer measures it.
+
+    Args:
+        indent (str): The whitespace before the first token of a line.
+
+    Returns:
+        tuple[int, int]: The column with tabs stopping every 8 columns and with tabs counting one.
+    """
+    column = alternate = 0
+    for char in indent:
+        if char == " ":
+            column += 1
+            alternate += 1
+        elif char == "\t":
+            column = (column // 8 + 1) * 8
+            alternate += 1
+        else:
+            column = alternate = 0
+    return column, alternate
+
+
+def _string_start(text: str, quote: int, end: int) -> int:
+    """
+    Return the offset of a string literal whose opening quote may follow a prefix such as `rb`.
+
+    Args:
+        text (str): The scanned text.
+        quote (int): The offset of the opening quote.
+        end (int): The end offset of the literal.
+
+    Returns:
+        int: The offset of the prefix, or of the quote if the letters before it end a name.
+
+    Raises:
+        LexerError: If an f-string may hold quotes or comments the lexer cannot delimit.
+    """
+    start = quote
+    while start > quote - 2 and text[start - 1] in STRING_PREFIX_CHARS:
+        start -= 1
+    if f"_{text[start - 1]}".isidentifier():
+        return quote
+    if "f" in text[start:quote].lower() and "{" in text[quote:end]:
+        _check_fstring(text[quote:end])
+    return start
+
+
+def _check_fstring(literal: str) -> None:
+    """
+    Check that the replacement fields of an f-string are balanced and hold no comment.
+
+    Since Python 3.12 a replacement field may hold a string in the quotes of the f-string itself,
+    which ends the literal early and leaves a field open; a comment in a field is a token of its own.
+
+    Args:
+        literal (str): The f-string from its opening to its closing quote.
+
+    Raises:
+        LexerError: If a field is unbalanced or a multi-line field holds a `#`.
+    """
+    depth = 0
+    escaped = -1
+    for match in FSTRING_FIELD_PATTERN.finditer(literal):
+        position = match.start()
+        char = literal[position]
+        if position == escaped:
+            continue
+        if depth == 0 and char != "#":
+            if literal[position + 1 : position + 2] == char:
+                escaped = position + 1
+                continue
+            if char == "}":
+                raise LexerError("unbalanced f-string replacement field")
+            depth = 1
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif depth and "\n" in literal:
+            raise LexerError("comment in an f-string replacement field")
+    if depth:
+        raise LexerError("unbalanced f-string replacement field")
+
+
+def _header_tokens(header: str) -> list[str]:
+    """
+    Split a def/class header into its tokens, without comments and line continuations.
+
+    Args:
+        header (str): The header from its first keyword to the colon, excluded.
+
+    Returns:
+        list[str]: The tokens; names, keywords and numbers are single tokens, and so are strings.
+    """
+    return [token for token in HEADER_TOKEN_PATTERN.findall(header) if token[0] not in "#\\"]
+
+
+def _definition(tokens: list[str]) -> DefinitionData | None:
+    """
+    Read the name and parameters of a function from the tokens of its `def` header.
+
+    Parameter names are the names at the top bracket level of the parameter list that follow
+    the opening bracket, a comma or a `*`/`**` prefix; defaults, annotations and lambda
+    parameters in defaults are skipped.
+
+    Args:
+        tokens (list[str]): The tokens of a closed function header.
+
+    Returns:
+        DefinitionData | None: The signature of the function, or None if the header is malformed.
+    """
+    def_index = next((index for index, token in enumerate(tokens) if token == "def"), None)
+    if def_index is None or def_index + 1 >= len(tokens) or not tokens[def_index + 1].isidentifier():
+        return None
+
+    parameters: list[str] = []
+    depth = 0
+    expect_name = in_lambda = False
+    prefix = ""
+    for token in tokens[_parameters_start(tokens, def_index + 2) :]:
+        if token in OPEN_BRACKETS:
+            depth += 1
+            expect_name = depth == 1
+            continue
+        if token in CLOSE_BRACKETS:
+            depth -= 1
+            if depth == 0:
+                break
+            continue
+        if depth != 1:
+            continue
+
+        if in_lambda:
+            in_lambda = token != ":"
+        elif token == ",":
+            expect_name, prefix = True, ""
+        elif token == "lambda":
+            in_lambda, expect_name = True, False
+        elif expect_name and token in ("*", "**"):
+            prefix = token
+        elif expect_name and token.isidentifier():
+            parameters.append(prefix + token)
+            expect_name = False
+        else:
+            expect_name = False
+
+    return DefinitionData(name=tokens[def_index + 1], parameters=tuple(parameters))
+
+
+def _parameters_start(tokens: list[str], index: int) -> int:
+    """
+    Return the index of the bracket opening a parameter list, skipping a type parameter list.
+
+    Args:
+        tokens (list[str]): The tokens of the header.
+        index (int): The index of the token following the function name.
+
+    Returns:
+        int: The index of the opening parenthesis of the parameters.
+    """
+    if index >= len(tokens) or tokens[index] != "[":
+        return index
+
+    depth = 0
+    for position in range(index, len(tokens)):
+        if tokens[position] in OPEN_BRACKETS:
+            depth += 1
+        elif tokens[position] in CLOSE_BRACKETS:
+            depth -= 1
+            if depth == 0:
+                return position + 1
+    return len(tokens)
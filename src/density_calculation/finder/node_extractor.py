@@ -5,6 +5,7 @@ Author: Petr Lavrishchev
 License: MIT License (see LICENSE file for details)
 """
 
+from collections import Counter
 from collections.abc import Callable
 from pathlib import Path
 
@@ -12,13 +13,17 @@ import tree_sitter
 from loguru import logger
 
 from src.comment_utils import parse_language
-from src.data_types import CommentData, CommentScope, CommentType, LanguagesEnum
+from src.data_types import CommentData, CommentScope, CommentType, DefinitionData, LanguagesEnum
+from src.density_calculation.finder.definition_index import DEFINITION_SCOPES, DefinitionIndex
 from src.density_calculation.finder.lang_normalizers.python_normalizer import PythonNormalizer
 from src.density_calculation.finder.language_data import LanguageNormalizer
+from src.density_calculation.time_budget import CHECK_INTERVAL, TimeBudget
 from src.exceptions import CommentTypeError
 
 INLINE_NODE_TYPES = ("comment", "line_comment", "block_comment")
 DOCSTRING_NODE_TYPES = ("string", "string_literal")
+NAMED_PARAMETER_TYPES = ("identifier", "list_splat_pattern", "dictionary_splat_pattern")
+DEFAULT_PARAMETER_TYPES = ("default_parameter", "typed_default_parameter")
 
 captures_type = dict[str, list[tree_sitter.Node]]
 
@@ -44,7 +49,14 @@ class NodeDataExtractor:
         """
         self.callback_found_comment = action
 
-    def extract(self, filepath: Path, code_bytes: bytes, captures: captures_type) -> None:
+    def extract(
+        self,
+        filepath: Path,
+        code_bytes: bytes,
+        captures: captures_type,
+        budget: TimeBudget | None = None,
+        definition_counts: Counter[CommentScope] | None = None,
+    ) -> list[CommentData]:
         """
         Extract data from the captured nodes and execute the connected action.
 
@@ -52,53 +64,95 @@ class NodeDataExtractor:
             filepath (pathlib.Path): The path to the file being processed.
             code_bytes (bytes): The byte content of the code file.
             captures (dict[str, list[tree_sitter.Node]]): The result of the Tree-sitter query
-                containing captured nodes.
+                containing captured comment nodes (`item`) and definition nodes (`definition`).
+            budget (TimeBudget | None): The time budget of the file. Defaults to None (no limit).
+            definition_counts (Counter[CommentScope] | None): Receives the number of function and
+                class definitions of the file. Defaults to None.
+
+        Returns:
+            list[CommentData]: The data of all found comments.
+
+        Raises:
+            TimeBudgetError: If the budget runs out.
         """
+        comments: list[CommentData] = []
+        if definition_counts is not None:
+            definition_counts.update(DEFINITION_SCOPES[node.type] for node in set(captures.get("definition", [])))
         if "item" in captures:
             logger.debug("Start find comment in '{}'", filepath.name)
-            unique_nodes = set(captures.get("item", []))
+            unique_nodes = sorted(set(captures.get("item", [])), key=lambda item_node: item_node.start_byte)
+            definitions = DefinitionIndex(captures.get("definition", []), code_bytes)
 
-            for node in unique_nodes:
+            for index, node in enumerate(unique_nodes):
+                if budget is not None and index % CHECK_INTERVAL == 0:
+                    budget.check("extract")
                 try:
-                    comment_data = self._comment_data_generation(node, code_bytes, filepath)
+                    comment_data = self._comment_data_generation(node, code_bytes, filepath, definitions)
                 except CommentTypeError as error:
                     logger.error(error)
                     continue
+                comments.append(comment_data)
                 if self.callback_found_comment:
                     self.callback_found_comment(comment_data)
         else:
             logger.debug("Not find comment in '{}'", filepath.name)
 
-    def _get_node_scope(self, node: tree_sitter.Node) -> CommentScope:
+        return comments
+
+    def _get_definition(self, node: tree_sitter.Node, code_bytes: bytes) -> DefinitionData | None:
         """
-        Determine the scope of the node by traversing up the Abstract Syntax Tree (AST).
+        Summarize the function owning a docstring, if the docstring is the first statement of a function body.
+
+        Only names are copied out of the tree, so the summary does not keep the tree alive.
 
         Args:
-            node (tree_sitter.Node): The starting node (the comment node).
+            node (tree_sitter.Node): The docstring node.
+            code_bytes (bytes): The byte content of the file.
 
         Returns:
-            CommentScope: The detected scope (FUNCTION, CLASS, MODULE, or UNKNOWN).
+            DefinitionData | None: The signature of the function, or None for other docstrings.
         """
-        current_node = node
-        while current_node is not None:
-            node_type = current_node.type
-            if node_type == "function_definition":
-                return CommentScope.FUNCTION
-            if node_type == "class_definition":
-                return CommentScope.CLASS
-            if node_type == "module":
-                return CommentScope.MODULE
-            current_node = current_node.parent
-        return CommentScope.UNKNOWN
-
-    def _comment_data_generation(self, node: tree_sitter.Node, code_bytes: bytes, filepath: Path) -> CommentData:
+        statement = node.parent
+        if statement is None or statement.type != "expression_statement":
+            return None
+        block = statement.parent
+        function = block.parent if block is not None else None
+        if block is None or function is None or function.type != "function_definition":
+            return None
+        first_statement = next((child for child in block.named_children if child.type != "comment"), None)
+        name = function.child_by_field_name("name")
+        parameters_node = function.child_by_field_name("parameters")
+        if first_statement != statement or name is None or parameters_node is None:
+            return None
+
+        parameters: list[str] = []
+        for parameter in parameters_node.named_children:
+            if parameter.type in DEFAULT_PARAMETER_TYPES:
+                parameter = parameter.child_by_field_name("name") or parameter
+            elif parameter.type == "typed_parameter":
+                parameter = parameter.named_children[0]
+            if parameter.type in NAMED_PARAMETER_TYPES:
+                parameters.append(code_bytes[parameter.start_byte : parameter.end_byte].decode("utf-8"))
+
+        return DefinitionData(
+            name=code_bytes[name.start_byte : name.end_byte].decode("utf-8"),
+            parameters=tuple(parameters),
+        )
+
+    def _comment_data_generation(
+        self, node: tree_sitter.Node, code_bytes: bytes, filepath: Path, definitions: DefinitionIndex
+    ) -> CommentData:
         """
         Generate a CommentData object from a Tree-sitter node.
 
+        The scope is the kind of the innermost definition enclosing the comment, found in the
+        definition index instead of by walking up the tree from every comment.
+
         Args:
             node (tree_sitter.Node): The Tree-sitter node corresponding to the comment.
             code_bytes (bytes): The byte content of the file.
             filepath (pathlib.Path): The path to the file.
+            definitions (DefinitionIndex): The definitions of the file.
 
         Returns:
             CommentData: The data object containing details about the comment.
@@ -110,6 +164,7 @@ class NodeDataExtractor:
         end = node.end_point
 
         comment_type = self._get_comment_type(node.type)
+        owner = definitions.owner(node.start_byte)
 
         if comment_type:
             return CommentData(
@@ -120,7 +175,9 @@ class NodeDataExtractor:
                 column_end=end[1],
                 text=self._get_comment_text(node, code_bytes, filepath, comment_type),
                 comment_type=comment_type,
-                scope=self._get_node_scope(node),
+                scope=owner.kind if owner is not None else CommentScope.MODULE,
+                definition=self._get_definition(node, code_bytes),
+                owner=owner,
             )
         else:
             raise CommentTypeError()
@@ -0,0 +1,332 @@
+"""
+Define the reader that turns the code cells of a Jupyter notebook into one Python buffer.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import bisect
+import json
+import re
+from collections.abc import Iterator
+from dataclasses import replace
+from pathlib import Path
+
+from src.data_types import CommentData, ScopeSpan
+from src.exceptions import NotebookError
+
+NOTEBOOK_SUFFIX = ".ipynb"
+CODE_CELL = "code"
+MAGIC_PREFIXES = ("%", "!")
+CELL_MAGIC_PREFIX = "%%"
+
+WHITESPACE = re.compile(rb"[ \t\r\n]*")
+STRUCTURE = re.compile(rb'[\[\]{}"]')
+SCALAR_END = re.compile(rb"[,}\]\s]")
+BACKSLASH = 0x5C
+
+
+class Notebook:
+    """
+    The code cells of a notebook, concatenated into one buffer that is parsed once.
+
+    The JSON document is scanned in place: only the keys, the cell types and the sources of
+    the cells are decoded, while outputs, attachments and metadata, which may hold megabytes
+    of embedded images, are skipped without being copied or decoded. Markdown and raw cells
+    are left out, as are cells starting with a cell magic (`%%bash`, ...). Line magics and
+    shell escapes (`%time`, `!pip`) are blanked, so that they neither break the parse nor
+    shift the lines.
+
+    Every code cell starts on a new line of the buffer; `remap` moves the lines of the comments
+    found in the buffer back into their cells. Columns are unchanged.
+
+    Usage:
+        notebook = Notebook.from_bytes(code_bytes)
+        comments = notebook.remap(find_comments(notebook.code_bytes))
+    """
+
+    def __init__(self, code_bytes: bytes, cell_starts: list[int], cell_numbers: list[int]) -> None:
+        """
+        Initialize the notebook buffer.
+
+        Args:
+            code_bytes (bytes): The concatenated source of the code cells.
+            cell_starts (list[int]): The first buffer line (1-based) of every code cell, ascending.
+            cell_numbers (list[int]): The position (1-based) of every code cell among all the cells.
+        """
+        self.code_bytes = code_bytes
+        self._cell_starts = cell_starts
+        self._cell_numbers = cell_numbers
+
+    @classmethod
+    def from_bytes(cls, notebook_bytes: bytes) -> "Notebook":
+        """
+        Read the code cells of a notebook in the nbformat 4 JSON format.
+
+        Args:
+            notebook_bytes (bytes): The content of the `.ipynb` file.
+
+        Returns:
+            Notebook: The concatenated code cells.
+
+        Raises:
+            NotebookError: If the content is not a notebook with a list of cells.
+        """
+        lines: list[str] = []
+        cell_starts: list[int] = []
+        cell_numbers: list[int] = []
+        try:
+            for number, source in enumerate(_iter_cells(notebook_bytes), start=1):
+                if source is None or source.startswith(CELL_MAGIC_PREFIX):
+                    continue
+                cell_starts.append(len(lines) + 1)
+                cell_numbers.append(number)
+                lines.extend(_blank_magic(line) for line in source.splitlines() or [""])
+        except (ValueError, IndexError) as error:
+            raise NotebookError(f"Invalid notebook: {error}") from error
+
+        code_bytes = "".join(f"{line}\n" for line in lines).encode("utf-8")
+        return cls(code_bytes, cell_starts, cell_numbers)
+
+    @property
+    def lines(self) -> int:
+        """
+        Return the number of lines of code in the code cells.
+
+        Returns:
+            int: The number of lines of the buffer.
+        """
+        return self.code_bytes.count(b"\n")
+
+    def remap(self, comments: list[CommentData]) -> list[CommentData]:
+        """
+        Move the comments found in the buffer into the cells they belong to.
+
+        Args:
+            comments (list[CommentData]): The comments with buffer line numbers.
+
+        Returns:
+            list[CommentData]: The comments with their cell and their line numbers within the cell,
+                as are the lines of their enclosing definitions.
+        """
+        remapped = []
+        owners: dict[int, ScopeSpan] = {}
+        for comment in comments:
+            index = max(bisect.bisect_right(self._cell_starts, comment.start_line_number) - 1, 0)
+            offset = self._cell_starts[index] - 1
+            owner = comment.owner
+            if owner is not None:
+                owner = owners.get(id(owner)) or owners.setdefault(
+                    id(owner), replace(owner, start_line=owner.start_line - offset, end_line=owner.end_line - offset)
+                )
+            remapped.append(
+                replace(
+                    comment,
+                    start_line_number=comment.start_line_number - offset,
+                    end_line_number=comment.end_line_number - offset,
+                    cell=self._cell_numbers[index],
+                    owner=owner,
+                )
+            )
+        return remapped
+
+
+def is_notebook(filepath: Path) -> bool:
+    """
+    Check whether a file is a Jupyter notebook.
+
+    Args:
+        filepath (pathlib.Path): The path of the file.
+
+    Returns:
+        bool: True for an `.ipynb` file.
+    """
+    return filepath.suffix == NOTEBOOK_SUFFIX
+
+
+def _iter_cells(data: bytes) -> Iterator[str | None]:
+    """
+    Yield the source of every cell of a notebook, in order.
+
+    Args:
+        data (bytes): The JSON document.
+
+    Yields:
+        str | None: The source of a code cell, or None for any other cell.
+
+    Raises:
+        NotebookError: If the document has no list of cells.
+        ValueError: If the document is not valid JSON.
+    """
+    for key, start, _end in _iter_members(data, _skip_whitespace(data, 0)):
+        if key != "cells":
+            continue
+        if data[start : start + 1] != b"[":
+            raise NotebookError("Invalid notebook: 'cells' is not a list")
+        for cell_start, _ in _iter_elements(data, start):
+            cell_type = source = None
+            for cell_key, value_start, value_end in _iter_members(data, cell_start):
+                if cell_key == "cell_type":
+                    cell_type = json.loads(data[value_start:value_end])
+                elif cell_key == "source":
+                    source = json.loads(data[value_start:value_end])
+            if cell_type != CODE_CELL:
+                yield None
+            else:
+                yield "".join(source) if isinstance(source, list) else source or ""
+        return
+    raise NotebookError("Invalid notebook: no list of cells (only nbformat 4 is supported)")
+
+
+def _iter_members(data: bytes, position: int) -> Iterator[tuple[str, int, int]]:
+    """
+    Yield the members of the JSON object starting at a position, without decoding their values.
+
+    Args:
+        data (bytes): The JSON document.
+        position (int): The offset of the opening brace.
+
+    Yields:
+        tuple[str, int, int]: The decoded key and the offsets of the start and the end of its value.
+
+    Raises:
+        ValueError: If there is no valid object at the position.
+    """
+    if data[position : position + 1] != b"{":
+        raise ValueError(f"expected an object at offset {position}")
+    position = _skip_whitespace(data, position + 1)
+    if data[position : position + 1] == b"}":
+        return
+    while True:
+        key_end = _string_end(data, position)
+        key = json.loads(data[position:key_end])
+        position = _skip_whitespace(data, key_end)
+        if data[position : position + 1] != b":":
+            raise ValueError(f"expected ':' at offset {position}")
+        value_start = _skip_whitespace(data, position + 1)
+        value_end = _value_end(data, value_start)
+        yield key, value_start, value_end
+        position = _skip_whitespace(data, value_end)
+        if data[position : position + 1] == b"}":
+            return
+        if data[position : position + 1] != b",":
+            raise ValueError(f"expected ',' or '}}' at offset {position}")
+        position = _skip_whitespace(data, position + 1)
+
+
+def _iter_elements(data: bytes, position: int) -> Iterator[tuple[int, int]]:
+    """
+    Yield the elements of the JSON array starting at a position, without decoding them.
+
+    Args:
+        data (bytes): The JSON document.
+        position (int): The offset of the opening bracket.
+
+    Yields:
+        tuple[int, int]: The offsets of the start and the end of every element.
+
+    Raises:
+        ValueError: If there is no valid array at the position.
+    """
+    position = _skip_whitespace(data, position + 1)
+    if data[position : position + 1] == b"]":
+        return
+    while True:
+        element_end = _value_end(data, position)
+        yield position, element_end
+        position = _skip_whitespace(data, element_end)
+        if data[position : position + 1] == b"]":
+            return
+        if data[position : position + 1] != b",":
+            raise ValueError(f"expected ',' or ']' at offset {position}")
+        position = _skip_whitespace(data, position + 1)
+
+
+def _value_end(data: bytes, position: int) -> int:
+    """
+    Return the end of the JSON value starting at a position, skipping nested values without decoding them.
+
+    Args:
+        data (bytes): The JSON document.
+        position (int): The offset of the value.
+
+    Returns:
+        int: The offset just after the value.
+
+    Raises:
+        ValueError: If the value is not terminated.
+    """
+    first = data[position : position + 1]
+    if first == b'"':
+        return _string_end(data, position)
+    if first not in (b"{", b"["):
+        scalar_end = SCALAR_END.search(data, position)
+        return scalar_end.start() if scalar_end else len(data)
+
+    depth = 0
+    while match := STRUCTURE.search(data, position):
+        token = match.group()
+        if token == b'"':
+            position = _string_end(data, match.start())
+            continue
+        depth += 1 if token in b"[{" else -1
+        position = match.end()
+        if not depth:
+            return position
+    raise ValueError("unterminated value")
+
+
+def _string_end(data: bytes, position: int) -> int:
+    """
+    Return the end of the JSON string starting at a position.
+
+    Args:
+        data (bytes): The JSON document.
+        position (int): The offset of the opening quote.
+
+    Returns:
+        int: The offset just after the closing quote.
+
+    Raises:
+        ValueError: If there is no terminated string at the position.
+    """
+    if data[position : position + 1] != b'"':
+        raise ValueError(f"expected a string at offset {position}")
+    end = position
+    while True:
+        end = data.find(b'"', end + 1)
+        if end < 0:
+            raise ValueError("unterminated string")
+        backslash = end - 1
+        while data[backslash] == BACKSLASH:
+            backslash -= 1
+        if (end - 1 - backslash) % 2 == 0:
+            return end + 1
+
+
+def _skip_whitespace(data: bytes, position: int) -> int:
+    """
+    Return the offset of the first non-whitespace byte at or after a position.
+
+    Args:
+        data (bytes): The JSON document.
+        position (int): The offset to start from.
+
+    Returns:
+        int: The offset of the next token.
+    """
+    match = WHITESPACE.match(data, position)
+    return match.end() if match else position
+
+
+def _blank_magic(line: str) -> str:
+    """
+    Blank an IPython line magic or shell escape, which is not Python.
+
+    Args:
+        line (str): A line of a code cell.
+
+    Returns:
+        str: An empty line for a magic, the line otherwise.
+    """
+    return "" if line.lstrip().startswith(MAGIC_PREFIXES) else line
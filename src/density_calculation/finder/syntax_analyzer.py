@@ -5,60 +5,146 @@ Author: Petr Lavrishchev
 License: MIT License (see LICENSE file for details)
 """
 
+import functools
+import threading
+import time
+
 import tree_sitter
 
 from src.data_types import LanguagesEnum
 from src.density_calculation.finder.language_data import LanguageData
 from src.density_calculation.finder.languages_formats import PythonData
-from src.exceptions import FileTypeError
+from src.exceptions import FileTypeError, TimeBudgetError
+
+READ_CHUNK_SIZE = 16 * 1024
 
 
 class SyntaxAnalyzer:
     """
     Perform syntax analysis and queries on the syntax tree.
 
-    Analyzes code bytes and builds the AST using tree-sitter.
+    Analyzes code bytes and builds the AST using tree-sitter. Languages and compiled
+    queries are immutable and shared by all threads; a tree-sitter parser is not
+    thread-safe, so every thread gets its own cached parser per language.
     """
 
     query_patterns: dict[LanguagesEnum, type[LanguageData]] = {LanguagesEnum.PYTHON: PythonData}
 
-    def parse(self, code_bytes: bytes, language: LanguagesEnum) -> tree_sitter.Tree:
+    _thread_parsers = threading.local()
+
+    def parse(self, code_bytes: bytes, language: LanguagesEnum, timeout: float | None = None) -> tree_sitter.Tree:
         """
         Perform syntax analysis of code bytes for the given language.
 
         Args:
             code_bytes (bytes): Code as bytes for analysis.
             language (LanguagesEnum): Programming language of the code.
+            timeout (float | None): Give up parsing after this many seconds. Defaults to None (no limit).
 
         Returns:
             tree_sitter.Tree: The generated Abstract Syntax Tree (AST).
+
+        Raises:
+            FileTypeError: If the language is not supported.
+            TimeBudgetError: If parsing does not finish within the timeout.
         """
-        language_data = self.query_patterns.get(language)
-        if language_data:
-            language_object = tree_sitter.Language(language_data.tree_sitter_language)
-            parser = tree_sitter.Parser(language_object)
-            tree = parser.parse(code_bytes)
-
-            return tree
-        else:
+        if language not in self.query_patterns:
             raise FileTypeError()
 
-    def query_captures(self, tree: tree_sitter.Tree, language: LanguagesEnum) -> dict[str, list[tree_sitter.Node]]:
+        parser = self.parser(language)
+        if timeout is None:
+            return parser.parse(code_bytes)
+
+        # The parser reads the source in chunks as it advances; once the deadline passes it is
+        # given the end of the input, so it stops within one chunk. The progress callback of
+        # `parse` would be finer, but it crashes the pinned 0.25 bindings.
+        deadline = time.perf_counter() + timeout
+        source = memoryview(code_bytes)
+        expired = False
+
+        def read(byte_offset: int, _point: tree_sitter.Point) -> memoryview | None:
+            nonlocal expired
+            if time.perf_counter() > deadline:
+                expired = True
+                return None
+            return source[byte_offset : byte_offset + READ_CHUNK_SIZE]
+
+        tree = parser.parse(read)
+        if expired:
+            raise TimeBudgetError(f"Parsing did not finish within {timeout:.3f}s", stage="parse")
+        return tree
+
+    def parser(self, language: LanguagesEnum) -> tree_sitter.Parser:
+        """
+        Return the parser of the current thread for the given language.
+
+        Args:
+            language (LanguagesEnum): Programming language of the code.
+
+        Returns:
+            tree_sitter.Parser: A parser owned by the calling thread.
+        """
+        parsers: dict[LanguagesEnum, tree_sitter.Parser] | None = getattr(self._thread_parsers, "parsers", None)
+        if parsers is None:
+            parsers = {}
+            self._thread_parsers.parsers = parsers
+
+        parser = parsers.get(language)
+        if parser is None:
+            parser = tree_sitter.Parser(self.language_object(language))
+            parsers[language] = parser
+
+        return parser
+
+    def query_captures(
+        self, tree: tree_sitter.Tree, language: LanguagesEnum, byte_range: tuple[int, int] | None = None
+    ) -> dict[str, list[tree_sitter.Node]]:
         """
         Execute a tree-sitter query and get the captured nodes.
 
         Args:
             tree (tree_sitter.Tree): The syntax tree to execute the query on.
             language (LanguagesEnum): The programming language for which to get the query.
+            byte_range (tuple[int, int] | None): Only capture nodes intersecting this range of bytes.
+                Defaults to the whole tree.
 
         Returns:
             dict[str, list[tree_sitter.Node]]: Dictionary where the key is the capture name
                 and the value is a list of corresponding nodes.
         """
-        language_data = self.query_patterns.get(language, PythonData)
-        language_object = tree_sitter.Language(language_data.tree_sitter_language)
-        query = tree_sitter.Query(language_object, language_data.query)
-        query_cursor = tree_sitter.QueryCursor(query)
+        query_cursor = tree_sitter.QueryCursor(self.query(language))
+        if byte_range is not None:
+            query_cursor.set_byte_range(*byte_range)
         captures: dict[str, list[tree_sitter.Node]] = query_cursor.captures(tree.root_node)
 
         return captures
+
+    @classmethod
+    @functools.cache
+    def language_object(cls, language: LanguagesEnum) -> tree_sitter.Language:
+        """
+        Return the shared tree-sitter language object.
+
+        Args:
+            language (LanguagesEnum): The programming language.
+
+        Returns:
+            tree_sitter.Language: The language object, created once per process.
+        """
+        language_data = cls.query_patterns.get(language, PythonData)
+        return tree_sitter.Language(language_data.tree_sitter_language)
+
+    @classmethod
+    @functools.cache
+    def query(cls, language: LanguagesEnum) -> tree_sitter.Query:
+        """
+        Return the shared compiled comment query.
+
+        Args:
+            language (LanguagesEnum): The programming language.
+
+        Returns:
+            tree_sitter.Query: The compiled query, created once per process.
+        """
+        language_data = cls.query_patterns.get(language, PythonData)
+        return tree_sitter.Query(cls.language_object(language), language_data.query)
@@ -0,0 +1,228 @@
+"""
+Define a class for computing the comment density score across a range of commits.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from src.config import CDSConfig
+from src.data_types import CheckerData, EnginesEnum, HistoryPoint
+from src.density_calculation.checker.abc_rule.registry import rule_registry
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.finder.comment_finder import CommentFinder
+from src.density_calculation.finder.git_reader import GitCatFile, GitRevisionReader
+
+
+@dataclass(frozen=True)
+class BlobAggregate:
+    """
+    Represent the analysis totals of a single blob.
+
+    Attributes:
+        score (int): The total score of the blob.
+        violations (int): The number of findings with a negative score.
+    """
+
+    score: int
+    violations: int
+
+
+NO_FINDINGS = BlobAggregate(score=0, violations=0)
+
+
+class HistoryAnalyzer:
+    """
+    Walk a commit range and compute the score of every commit.
+
+    Each distinct blob SHA is analyzed only once. The totals of a commit are derived from
+    the previous commit by subtracting the aggregates of changed or deleted blobs and
+    adding the aggregates of changed or added ones.
+
+    Cross-file rules, whose verdicts for a file depend on the other files, are kept out of
+    the blob aggregates. One instance of each lives for the whole walk, with the files ranked
+    in the order of `git ls-tree`, so every point equals the score of a `--rev` run on its
+    commit. Only the files changed by a commit are checked again, or forgotten, by them; the
+    totals of the other files whose verdicts changed as a result are refreshed from the rules.
+    """
+
+    def __init__(
+        self, repo_path: Path, engine: EnginesEnum = EnginesEnum.TREE_SITTER, config: CDSConfig | None = None
+    ) -> None:
+        """
+        Initialize the analyzer.
+
+        Args:
+            repo_path (pathlib.Path): A path inside the git repository; a subdirectory limits the analysis to it.
+            engine (EnginesEnum): The comment extraction engine. Defaults to TREE_SITTER.
+            config (CDSConfig | None): The tool configuration. Defaults to the built-in configuration.
+        """
+        self._reader = GitRevisionReader(repo_path)
+        self._repo_path = repo_path
+        self._finder = CommentFinder(engine)
+        file_rule_classes = rule_registry.file_rule_classes()
+        self._checker = CommentChecker(
+            config, file_rule_classes=[rule_class for rule_class in file_rule_classes if not rule_class.cross_file]
+        )
+        self._cross_file_rules = [rule_class() for rule_class in file_rule_classes if rule_class.cross_file]
+        for file_rule in self._cross_file_rules:
+            file_rule.order_files(_tree_order)
+        self._aggregates: dict[str, BlobAggregate] = {}
+        self._cross_file_aggregates: dict[tuple[int, Path], BlobAggregate] = {}
+        self._cross_file_totals = NO_FINDINGS
+
+    def iter_history(self, revision_range: str) -> Iterator[HistoryPoint]:
+        """
+        Compute the score of every commit of a range, oldest first.
+
+        Args:
+            revision_range (str): The range, for example 'v1.0..main'.
+
+        Yields:
+            HistoryPoint: The totals of one commit.
+
+        Raises:
+            GitError: If the range cannot be read.
+        """
+        score = violations = files = 0
+        previous: str | None = None
+
+        with GitCatFile(self._repo_path) as cat_file:
+            for commit, timestamp in self._reader.iter_commits(revision_range):
+                for path, old_blob, new_blob in self._changes(previous, commit):
+                    if old_blob is not None:
+                        old = self._aggregates[old_blob]
+                        score, violations, files = score - old.score, violations - old.violations, files - 1
+                    if new_blob is not None:
+                        new = self._aggregate(cat_file, path, new_blob)
+                        score, violations, files = score + new.score, violations + new.violations, files + 1
+                    elif self._cross_file_rules:
+                        self._forget(path)
+
+                cross_file = self._refresh_cross_file()
+                logger.debug("Commit {}: score {}, {} blob(s) analyzed", commit[:10], score, len(self._aggregates))
+                yield HistoryPoint(
+                    commit, timestamp, score + cross_file.score, violations + cross_file.violations, files
+                )
+                previous = commit
+
+    def _changes(self, previous: str | None, commit: str) -> Iterator[tuple[Path, str | None, str | None]]:
+        """
+        List the files that changed since the previous commit of the series.
+
+        Args:
+            previous (str | None): The previous commit, or None for the first commit of the series.
+            commit (str): The current commit.
+
+        Yields:
+            tuple[pathlib.Path, str | None, str | None]: The path, the old blob SHA and the new blob SHA.
+        """
+        if previous is None:
+            for path, blob in self._reader.list_blobs(commit):
+                yield path, None, blob
+        else:
+            yield from self._reader.diff_blobs(previous, commit)
+
+    def _aggregate(self, cat_file: GitCatFile, path: Path, blob: str) -> BlobAggregate:
+        """
+        Return the totals of a blob without the cross-file rules, analyzing it only the first time it is seen.
+
+        The cross-file rules check the blob under its path every time it is stored there,
+        so a blob seen before is parsed again for them, but not checked again by the other rules.
+
+        Args:
+            cat_file (GitCatFile): The batch reader of the repository.
+            path (pathlib.Path): A path the blob is stored under; it selects the language.
+            blob (str): The blob SHA.
+
+        Returns:
+            BlobAggregate: The totals of the blob.
+        """
+        aggregate = self._aggregates.get(blob)
+        if aggregate is not None and not self._cross_file_rules:
+            return aggregate
+
+        comments = self._finder.find_in_bytes(path, cat_file.read(blob))
+        if aggregate is None:
+            aggregate = _aggregate(self._checker.check_file(comments))
+            self._aggregates[blob] = aggregate
+        if not comments:
+            self._forget(path)
+        for index, file_rule in enumerate(self._cross_file_rules):
+            self._store((index, path), _aggregate(file_rule.check_file(comments)))
+        return aggregate
+
+    def _forget(self, path: Path) -> None:
+        """
+        Make the cross-file rules forget a file that was deleted or has no comment left.
+
+        Args:
+            path (pathlib.Path): The file.
+        """
+        for index, file_rule in enumerate(self._cross_file_rules):
+            file_rule.forget_file(path)
+            self._store((index, path), None)
+
+    def _store(self, key: tuple[int, Path], aggregate: BlobAggregate | None) -> None:
+        """
+        Replace the totals of a cross-file rule for a file, keeping the sum over all files up to date.
+
+        Args:
+            key (tuple[int, pathlib.Path]): The index of the rule and the file.
+            aggregate (BlobAggregate | None): The new totals, or None if the file left the tree.
+        """
+        old = self._cross_file_aggregates.pop(key, NO_FINDINGS)
+        new = NO_FINDINGS if aggregate is None else aggregate
+        if aggregate is not None:
+            self._cross_file_aggregates[key] = aggregate
+        totals = self._cross_file_totals
+        self._cross_file_totals = BlobAggregate(
+            totals.score - old.score + new.score, totals.violations - old.violations + new.violations
+        )
+
+    def _refresh_cross_file(self) -> BlobAggregate:
+        """
+        Refresh the totals of the files whose cross-file verdicts changed since they were checked.
+
+        Returns:
+            BlobAggregate: The totals of the cross-file rules over the tree of the commit.
+        """
+        for index, file_rule in enumerate(self._cross_file_rules):
+            for path, findings in file_rule.refresh_stale_files().items():
+                self._store((index, path), _aggregate(findings))
+
+        return self._cross_file_totals
+
+
+def _tree_order(path: Path) -> bytes:
+    """
+    Return the sort key of a file in the order of `git ls-tree`, that is by the bytes of its path.
+
+    Args:
+        path (pathlib.Path): The repository-relative path.
+
+    Returns:
+        bytes: The key.
+    """
+    return path.as_posix().encode()
+
+
+def _aggregate(findings: list[CheckerData]) -> BlobAggregate:
+    """
+    Sum the findings of a file.
+
+    Args:
+        findings (list[CheckerData]): The findings.
+
+    Returns:
+        BlobAggregate: The total score and the number of findings with a negative score.
+    """
+    return BlobAggregate(
+        score=sum(finding.score for finding in findings),
+        violations=sum(1 for finding in findings if finding.score < 0),
+    )
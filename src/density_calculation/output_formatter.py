@@ -7,42 +7,151 @@ License: MIT License (see LICENSE file for details)
 
 from pathlib import Path
 
-from src.data_types import CheckerData
+from src.data_types import CheckerData, CommentDistribution, FunctionDensity, Hotspot, RuleCost
+from src.density_calculation.comment_statistics import bucket_label
+
+MICROSECONDS = 1_000_000
+MILLISECONDS = 1_000
 
 
 class OutputFormatter:
     """
     Format the results of a comment check (CheckerData) into a human-readable
     output string, grouping messages by file.
-    """
 
-    def __init__(self) -> None:
-        """Initialize the formatter and track the currently processed file path."""
-        self._current_file: None | Path = None
+    The formatter keeps no state between calls, so it can be shared by concurrent stages.
+    """
 
-    def output_generation(self, checker_data: CheckerData) -> str:
+    def output_generation(self, file_path: Path, checker_datas: list[CheckerData]) -> str:
         """
-        Generate the complete output message, including the filename if it is new.
+        Generate the complete output message of a file: the filename, the header and one line per result.
 
         Args:
-            checker_data (CheckerData): Comment data and check results from CommentChecker.
+            file_path (pathlib.Path): Path to the file the results belong to.
+            checker_datas (list[CheckerData]): Comment data and check results from CommentChecker.
 
         Returns:
             str: The formatted output message string.
         """
-        comment_data = checker_data.comment_data
-        output_parts: list[str] = []
+        output_parts: list[str] = [f"{str(file_path)}:", self._generate_header_string()]
         SPACE = "    "
 
-        if self._check_current_file(comment_data.file_path):
-            output_parts.append(f"{str(self._current_file)}:\n")
-            header = self._generate_header_string()
-            output_parts.append(f"{header}\n")
+        for checker_data in checker_datas:
+            comment_message = self._generate_comment_string(checker_data)
+            output_parts.append(f"{SPACE}{comment_message}")
+
+        return "\n".join(output_parts)
+
+    def rule_costs_generation(self, costs: list[RuleCost]) -> str:
+        """
+        Generate the table of rule costs, one line per rule in the given order.
+
+        Args:
+            costs (list[RuleCost]): The rule costs from RuleProfiler.
+
+        Returns:
+            str: The formatted table string.
+        """
+        output_parts: list[str] = [
+            "Rule costs:",
+            f"    {'RULE':<8}  {'NAME':<28}  {'CALLS':>9}  {'HITS':>7}  "  # noqa: WPS237
+            f"{'TOTAL ms':>10}  {'AVG/comment us':>14}  {'P50 us':>8}  {'P99 us':>8}",  # noqa: WPS237
+        ]
+        for cost in costs:
+            output_parts.append(
+                f"    {cost.rule:<8}  {cost.name:<28}  {cost.invocations:>9}  {cost.hits:>7}  "
+                f"{cost.total_seconds * MILLISECONDS:>10.1f}  "
+                f"{cost.seconds_per_comment * MICROSECONDS:>14.2f}  "
+                f"{cost.p50_seconds * MICROSECONDS:>8.1f}  "
+                f"{cost.p99_seconds * MICROSECONDS:>8.1f}"
+            )
+
+        return "\n".join(output_parts)
+
+    def hotspots_generation(self, title: str, hotspots: list[Hotspot]) -> str:
+        """
+        Generate a ranked table of files or directories.
+
+        Approximate penalties are prefixed with `~` and followed by their possible overestimation.
+
+        Args:
+            title (str): The title line of the table.
+            hotspots (list[Hotspot]): The entries, the worst first.
+
+        Returns:
+            str: The formatted table string.
+        """
+        output_parts: list[str] = [
+            f"{title}:",
+            f"    {'#':>3}  {'PENALTY':>14}  {'LINES':>8}  {'PER LINE':>8}  {'PATH'}",  # noqa: WPS237
+        ]
+        for rank, hotspot in enumerate(hotspots, start=1):
+            penalty = f"~{hotspot.penalty} (+{hotspot.error})" if hotspot.error else str(hotspot.penalty)
+            output_parts.append(
+                f"    {rank:>3}  {penalty:>14}  {hotspot.lines:>8}  {hotspot.penalty_per_line:>8.3f}  {hotspot.path}"
+            )
+
+        return "\n".join(output_parts)
+
+    def functions_generation(self, title: str, functions: list[tuple[Path, FunctionDensity]]) -> str:
+        """
+        Generate a ranked table of functions by comment density.
+
+        Args:
+            title (str): The title line of the table.
+            functions (list[tuple[pathlib.Path, FunctionDensity]]): The functions with their files, the densest first.
 
-        comment_message = self._generate_comment_string(checker_data)
-        output_parts.append(f"{SPACE}{comment_message}")
+        Returns:
+            str: The formatted table string.
+        """
+        output_parts: list[str] = [
+            f"{title}:",
+            f"    {'#':>3}  {'RATIO':>8}  {'COMMENTS':>8}  {'CODE':>8}  {'FUNCTION'}",  # noqa: WPS237
+        ]
+        for rank, (path, function) in enumerate(functions, start=1):
+            cell = f"[cell {function.cell}] " if function.cell is not None else ""
+            output_parts.append(
+                f"    {rank:>3}  {function.ratio:>8.3f}  {function.comment_lines:>8}  {function.code_lines:>8}  "
+                f"{path}:{function.start_line} {cell}{function.name}"
+            )
+
+        return "\n".join(output_parts)
+
+    def statistics_generation(self, distributions: list[CommentDistribution]) -> str:
+        """
+        Generate the tables of comment sizes: the quantiles of every comment type and scope,
+        then the histogram of their lengths with the empty buckets left out.
 
-        return "".join(output_parts)
+        Args:
+            distributions (list[CommentDistribution]): The distributions from CommentStatistics.
+
+        Returns:
+            str: The formatted tables string.
+        """
+        output_parts: list[str] = [
+            "Comment sizes (estimated quantiles):",
+            f"    {'TYPE':<10}  {'SCOPE':<10}  {'COUNT':>9}  "  # noqa: WPS237
+            f"{'LENGTH P50/P95/P99/MAX':>26}  {'LINES P50/P95/P99/MAX':>24}",  # noqa: WPS237
+        ]
+        for distribution in distributions:
+            length, lines = distribution.length, distribution.lines
+            length_quantiles = f"{length.p50:g}/{length.p95:g}/{length.p99:g}/{length.maximum:g}"
+            lines_quantiles = f"{lines.p50:g}/{lines.p95:g}/{lines.p99:g}/{lines.maximum:g}"
+            output_parts.append(
+                f"    {distribution.comment_type.name:<10}  {distribution.scope.name:<10}  {length.count:>9}  "
+                f"{length_quantiles:>26}  {lines_quantiles:>24}"
+            )
+
+        output_parts.append("Comment length histogram (characters: count):")
+        for distribution in distributions:
+            buckets = "  ".join(
+                f"{bucket_label(bucket)}: {count}"
+                for bucket, count in enumerate(distribution.length_histogram)
+                if count
+            )
+            output_parts.append(f"    {distribution.comment_type.name:<10}  {distribution.scope.name:<10}  {buckets}")
+
+        return "\n".join(output_parts)
 
     def _generate_comment_string(self, checker_data: CheckerData) -> str:
         """
@@ -56,34 +165,18 @@ class OutputFormatter:
         """
         comment_data = checker_data.comment_data
         score = checker_data.score if checker_data.score < 0 else f"-{checker_data.score}"
+        cell = f"[cell {comment_data.cell}] " if comment_data.cell is not None else ""
 
         comment_string = (
             f"{comment_data.start_line_number:>4}:{comment_data.end_line_number:<4}  "  # noqa: WPS226
             f"{comment_data.column_start:>3}:{comment_data.column_end:<3}  "
-            f"{checker_data.error_string:<60}  "
+            f"{cell + checker_data.error_string:<60}  "
             f"{score:<4}  "
             f"CDS{checker_data.rule_id:<3}"
         )
 
         return comment_string
 
-    def _check_current_file(self, filepath: Path) -> bool:
-        """
-        Check if the current file being processed has changed.
-
-        If the file has changed, update the internal state to the new file path.
-
-        Args:
-            filepath (pathlib.Path): Path to the file containing the comment to be checked.
-
-        Returns:
-            bool: True if the file path has changed, False otherwise.
-        """
-        if self._current_file != filepath:
-            self._current_file = filepath
-            return True
-        return False
-
     def _generate_header_string(self) -> str:
         """
         Generate the header string for the output columns.
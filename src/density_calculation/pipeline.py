@@ -0,0 +1,301 @@
+"""
+Define a threaded, staged analysis pipeline connected by bounded queues.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from src.data_types import EnginesEnum, FileResult, RestoredFile
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.file_guard import FileGuard
+from src.density_calculation.finder.archive_reader import ArchiveReader, is_archive
+from src.density_calculation.finder.comment_finder import CommentFinder
+
+QUEUE_SIZE = 64
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    """Internal signal raised in a stage when the pipeline is being shut down."""
+
+
+class AnalysisPipeline:
+    """
+    Run the analysis as a chain of stages connected by bounded queues:
+
+        walker -> reader -> pool of parser/extractor threads -> checker -> consumer
+
+    Every stage owns its components (finder, checker, tree-sitter parser), so no mutable
+    state is shared between threads. Tree-sitter parsing releases the GIL, and on
+    free-threaded builds all stages run in parallel. Bounded queues cap the memory
+    used by in-flight files regardless of the size of the tree.
+
+    A pipeline object runs one analysis at a time.
+    """
+
+    def __init__(
+        self,
+        engine: EnginesEnum = EnginesEnum.TREE_SITTER,
+        jobs: int = 1,
+        queue_size: int = QUEUE_SIZE,
+        checker_factory: Callable[[], CommentChecker] = CommentChecker,
+        guard: FileGuard | None = None,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            engine (EnginesEnum): The comment extraction engine. Defaults to TREE_SITTER.
+            jobs (int): The number of parser/extractor threads. Defaults to 1.
+            queue_size (int): The capacity of every queue between stages. Defaults to QUEUE_SIZE.
+            checker_factory (Callable[[], CommentChecker]): Creates the checker owned by the checker stage.
+            guard (FileGuard | None): Applies the per-file time budget and the quarantine. Defaults to no limit.
+        """
+        self._engine = engine
+        self._jobs = max(1, jobs)
+        self._queue_size = queue_size
+        self._checker_factory = checker_factory
+        self._guard = guard or FileGuard()
+
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def run(self, path: Path) -> Iterator[FileResult]:
+        """
+        Analyze all files under the given path and yield the result of every file as soon as it is checked.
+
+        Args:
+            path (pathlib.Path): The starting path (file or directory).
+
+        Returns:
+            Iterator[FileResult]: The check results of every file. The order of files is not deterministic.
+        """
+        return self.run_paths([path])
+
+    def run_paths(self, roots: Iterable[Path]) -> Iterator[FileResult]:
+        """
+        Analyze all files under several paths in one run.
+
+        The walker stage consumes the paths lazily, so a streamed list is analyzed while it is being written.
+        The reader stage reads the members of an archive in archive order, like `ArchiveReader`.
+
+        Args:
+            roots (Iterable[pathlib.Path]): The starting paths (files, directories or archives).
+
+        Returns:
+            Iterator[FileResult]: The check results of every file. The order of files is not deterministic.
+        """
+        paths: queue.Queue[Any] = queue.Queue(self._queue_size)
+        return self._run([self._thread(self._walk, roots, paths)], paths)
+
+    def run_sources(self, sources: Iterable[tuple[Path, bytes]]) -> Iterator[FileResult]:
+        """
+        Analyze already read file contents, skipping the walker and reader stages.
+
+        Args:
+            sources (Iterable[tuple[pathlib.Path, bytes]]): Pairs of reported path and file content.
+
+        Returns:
+            Iterator[FileResult]: The check results of every file. The order of files is not deterministic.
+        """
+        contents: queue.Queue[Any] = queue.Queue(self._queue_size)
+        return self._run([self._thread(self._feed, sources, contents)], contents, read=False)
+
+    def _run(self, feeders: list[threading.Thread], first: queue.Queue[Any], read: bool = True) -> Iterator[FileResult]:
+        """
+        Start the remaining stages behind the feeder and consume the results.
+
+        Args:
+            feeders (list[threading.Thread]): The not yet started threads feeding the first queue.
+            first (queue.Queue): The queue filled by the feeders.
+            read (bool): True if the first queue holds paths that still have to be read.
+
+        Yields:
+            FileResult: The check results of one file.
+        """
+        self._stop.clear()
+        self._errors.clear()
+
+        contents: queue.Queue[Any] = queue.Queue(self._queue_size) if read else first
+        comments: queue.Queue[Any] = queue.Queue(self._queue_size)
+        results: queue.Queue[Any] = queue.Queue(self._queue_size)
+
+        threads = list(feeders)
+        if read:
+            threads.append(self._thread(self._read, first, contents))
+        threads.extend(self._thread(self._extract, contents, comments) for _ in range(self._jobs))
+        threads.append(self._thread(self._check, comments, results))
+
+        for thread in threads:
+            thread.start()
+        logger.debug("Pipeline started with {} parser thread(s)", self._jobs)
+
+        try:
+            while (item := self._get(results)) is not _DONE:
+                yield item
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+    def _walk(self, roots: Iterable[Path], paths: queue.Queue[Any]) -> None:
+        """
+        Walker stage: put the path of every file and archive to analyze into the queue.
+
+        Args:
+            roots (Iterable[pathlib.Path]): The starting paths (files, directories or archives).
+            paths (queue.Queue): The output queue of file paths.
+        """
+        finder = CommentFinder(self._engine)
+        for root in roots:
+            if is_archive(root):
+                self._put(paths, root)
+                continue
+            for filepath in finder.iter_files(root):
+                self._put(paths, filepath)
+        self._put(paths, _DONE)
+
+    def _feed(self, sources: Iterable[tuple[Path, bytes]], contents: queue.Queue[Any]) -> None:
+        """
+        Feeder stage: put already read file contents into the queue.
+
+        Args:
+            sources (Iterable[tuple[pathlib.Path, bytes]]): Pairs of reported path and file content.
+            contents (queue.Queue): The output queue of file contents.
+        """
+        for source in sources:
+            self._put(contents, source)
+        for _ in range(self._jobs):
+            self._put(contents, _DONE)
+
+    def _read(self, paths: queue.Queue[Any], contents: queue.Queue[Any]) -> None:
+        """
+        Reader stage: read every file, or every member of an archive, and pass its content on.
+
+        Args:
+            paths (queue.Queue): The input queue of file paths.
+            contents (queue.Queue): The output queue of file contents.
+        """
+        finder = CommentFinder(self._engine)
+        while (filepath := self._get(paths)) is not _DONE:
+            if is_archive(filepath):
+                for source in ArchiveReader(filepath).iter_sources():
+                    self._put(contents, source)
+                continue
+            self._put(contents, (filepath, finder.read_file(filepath)))
+        for _ in range(self._jobs):
+            self._put(contents, _DONE)
+
+    def _extract(self, contents: queue.Queue[Any], comments: queue.Queue[Any]) -> None:
+        """
+        Parser/extractor stage: find the comments of every file.
+
+        Args:
+            contents (queue.Queue): The input queue of file contents.
+            comments (queue.Queue): The output queue of the comments of each file, or of its restored results.
+        """
+        finder = CommentFinder(self._engine)
+        while (item := self._get(contents)) is not _DONE:
+            filepath, code_bytes = item
+            found = self._guard.find(finder, filepath, code_bytes)
+            if isinstance(found, RestoredFile):
+                self._put(comments, found)
+            elif found is not None:
+                self._put(comments, (filepath, code_bytes, *found))
+        self._put(comments, _DONE)
+
+    def _check(self, comments: queue.Queue[Any], results: queue.Queue[Any]) -> None:
+        """
+        Checker stage: run the rules over the comments of every file.
+
+        Args:
+            comments (queue.Queue): The input queue of the comments of each file.
+            results (queue.Queue): The output queue of file results.
+        """
+        checker = self._checker_factory()
+        running = self._jobs
+        while running:
+            item = self._get(comments)
+            if item is _DONE:
+                running -= 1
+                continue
+            if isinstance(item, RestoredFile):
+                file_result: FileResult | None = self._guard.restore(checker, item)
+            else:
+                file_result = self._guard.check(checker, *item)
+            if file_result is not None:
+                self._put(results, file_result)
+        self._put(results, _DONE)
+
+    def _thread(self, target: Callable[..., None], *args: Any) -> threading.Thread:
+        """
+        Create a daemon thread running a stage that reports its failure to the pipeline.
+
+        Args:
+            target (Callable[..., None]): The stage function.
+            *args (Any): The stage arguments.
+
+        Returns:
+            threading.Thread: The not yet started thread.
+        """
+
+        def stage() -> None:
+            try:
+                target(*args)
+            except _Cancelled:
+                return
+            except BaseException as error:
+                logger.error("Pipeline stage {} failed: {}", target.__name__, error)
+                self._errors.append(error)
+                self._stop.set()
+
+        return threading.Thread(target=stage, name=f"cdscore{target.__name__}", daemon=True)
+
+    def _put(self, target: queue.Queue[Any], item: Any) -> None:
+        """
+        Put an item into a bounded queue, giving up when the pipeline stops.
+
+        Args:
+            target (queue.Queue): The queue to put the item into.
+            item (Any): The item.
+
+        Raises:
+            _Cancelled: If the pipeline was stopped while waiting for free space.
+        """
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+        raise _Cancelled()
+
+    def _get(self, source: queue.Queue[Any]) -> Any:
+        """
+        Get an item from a queue, returning the end marker when the pipeline stops.
+
+        Args:
+            source (queue.Queue): The queue to take the item from.
+
+        Returns:
+            Any: The item, or the end marker.
+        """
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
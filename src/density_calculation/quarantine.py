@@ -0,0 +1,171 @@
+"""
+Define the persistent quarantine list of files that exceeded their time budget.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+
+from loguru import logger
+
+from src.data_types import QuarantineEntry
+from src.density_calculation.time_budget import TimeBudget
+from src.exceptions import TimeBudgetError
+
+DEFAULT_QUARANTINE_FILE = Path(".cdscore-quarantine.json")
+QUARANTINE_FORMAT_VERSION = 1
+DIGEST_SIZE = 16
+
+
+class Quarantine:
+    """
+    Keep the list of files that exceeded their time budget in a JSON file.
+
+    A quarantined file is skipped before it is parsed, as long as its content is unchanged;
+    an edited file is analyzed again. In retry mode quarantined files are analyzed anyway,
+    and a file that now finishes within the budget leaves the quarantine.
+
+    The list is saved whenever it changes, so an interrupted run keeps what it learned.
+    All methods are thread-safe.
+    """
+
+    def __init__(self, path: Path = DEFAULT_QUARANTINE_FILE, retry: bool = False) -> None:
+        """
+        Initialize the quarantine and load the list if the file exists.
+
+        Args:
+            path (pathlib.Path): The JSON file holding the list. Defaults to DEFAULT_QUARANTINE_FILE.
+            retry (bool): Analyze quarantined files instead of skipping them. Defaults to False.
+        """
+        self.path = path
+        self.retry = retry
+        self.added: list[Path] = []
+        self.skipped: list[Path] = []
+
+        self._lock = threading.Lock()
+        self._entries: dict[str, QuarantineEntry] = self._load()
+
+    def __len__(self) -> int:
+        """
+        Return the number of quarantined files.
+
+        Returns:
+            int: The size of the list.
+        """
+        return len(self._entries)
+
+    def skips(self, filepath: Path, code_bytes: bytes) -> bool:
+        """
+        Decide whether a file must be skipped because it is quarantined with this very content.
+
+        Args:
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The byte content of the file.
+
+        Returns:
+            bool: True if the file must be skipped.
+        """
+        with self._lock:
+            entry = self._entries.get(filepath.as_posix())
+        if entry is None or entry.size != len(code_bytes) or entry.digest != _digest(code_bytes):
+            return False
+
+        if self.retry:
+            logger.debug("Retrying quarantined '{}'", filepath)
+            return False
+
+        logger.debug("Skipping quarantined '{}' (exceeded {:g}s during {})", filepath, entry.budget, entry.stage)
+        with self._lock:
+            self.skipped.append(filepath)
+        return True
+
+    def add(self, filepath: Path, code_bytes: bytes, budget: TimeBudget, error: TimeBudgetError) -> None:
+        """
+        Quarantine a file that exceeded its budget.
+
+        Args:
+            filepath (pathlib.Path): The path reported for the file.
+            code_bytes (bytes): The byte content of the file.
+            budget (TimeBudget): The spent budget of the file.
+            error (TimeBudgetError): The error that stopped the analysis.
+        """
+        entry = QuarantineEntry(
+            size=len(code_bytes),
+            digest=_digest(code_bytes),
+            stage=error.stage,
+            elapsed=round(budget.elapsed, 3),
+            budget=budget.seconds or 0.0,
+        )
+        with self._lock:
+            self._entries[filepath.as_posix()] = entry
+            self.added.append(filepath)
+            self._save()
+
+    def release(self, filepath: Path) -> None:
+        """
+        Remove a file that was analyzed within the budget from the quarantine.
+
+        Args:
+            filepath (pathlib.Path): The path reported for the file.
+        """
+        with self._lock:
+            if self._entries.pop(filepath.as_posix(), None) is None:
+                return
+            logger.debug("'{}' finished within the time budget and left the quarantine", filepath)
+            self._save()
+
+    def _load(self) -> dict[str, QuarantineEntry]:
+        """
+        Read the list from the JSON file.
+
+        An unreadable or invalid file is reported and treated as an empty list; it is
+        overwritten the next time the list changes.
+
+        Returns:
+            dict[str, QuarantineEntry]: The entries by reported path.
+        """
+        if not self.path.is_file():
+            return {}
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != QUARANTINE_FORMAT_VERSION:
+                raise ValueError(f"unsupported version {data.get('version')!r}")
+            return {path: QuarantineEntry(**entry) for path, entry in data["files"].items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as error:
+            logger.warning("Ignoring the invalid quarantine file '{}': {}", self.path, error)
+            return {}
+
+    def _save(self) -> None:
+        """
+        Write the list to the JSON file atomically; the caller must hold the lock.
+        """
+        data = {
+            "version": QUARANTINE_FORMAT_VERSION,
+            "files": {path: asdict(entry) for path, entry in sorted(self._entries.items())},
+        }
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            temporary_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+            os.replace(temporary_path, self.path)
+        except OSError as error:
+            logger.error("Cannot save the quarantine file '{}': {}", self.path, error)
+
+
+def _digest(code_bytes: bytes) -> str:
+    """
+    Return the digest identifying a file content.
+
+    Args:
+        code_bytes (bytes): The byte content of the file.
+
+    Returns:
+        str: The hexadecimal BLAKE2b digest.
+    """
+    return hashlib.blake2b(code_bytes, digest_size=DIGEST_SIZE).hexdigest()
@@ -0,0 +1,290 @@
+"""
+Define the streaming API that yields the structured check results of every analyzed file.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import os
+from collections.abc import Callable, Generator, Iterable, Iterator
+from functools import partial
+from pathlib import Path
+
+from src.config import CDSConfig, load_config
+from src.data_types import EnginesEnum, FileResult, RestoredFile
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.checker.rule_profiler import RuleProfiler
+from src.density_calculation.checkpoint import Checkpoint
+from src.density_calculation.comment_statistics import CommentStatistics
+from src.density_calculation.file_guard import FileGuard
+from src.density_calculation.finder.archive_reader import ArchiveReader, is_archive
+from src.density_calculation.finder.comment_finder import CommentFinder
+from src.density_calculation.finder.git_reader import GitRevisionReader
+from src.density_calculation.pipeline import AnalysisPipeline
+from src.density_calculation.quarantine import Quarantine
+
+PathArgument = str | os.PathLike[str]
+
+
+def iter_results(
+    paths: PathArgument | Iterable[PathArgument],
+    *,
+    rules: CDSConfig | None = None,
+    jobs: int = 1,
+    engine: EnginesEnum = EnginesEnum.TREE_SITTER,
+    revision: str | None = None,
+    time_budget: float | None = None,
+    quarantine: Quarantine | None = None,
+    profiler: RuleProfiler | None = None,
+    checkpoint: Checkpoint | None = None,
+    statistics: CommentStatistics | None = None,
+) -> Generator[FileResult, None, None]:
+    """
+    Analyze files and yield the structured results of every file as soon as it is checked.
+
+    A wheel, sdist, zip file or tarball is analyzed without extracting it: its members are
+    read in archive order and reported as `<archive>!/<member>`.
+
+    Results are produced lazily: nothing is analyzed before the first item is requested,
+    and with more than one job the threaded pipeline holds at most a bounded number of
+    files in flight. Closing the generator, or simply stopping iteration and dropping it,
+    cancels the analysis and stops all worker threads.
+
+    Usage:
+        for file_result in iter_results(["src", "tools"], jobs=4):
+            print(file_result.file_path, file_result.score)
+
+    Args:
+        paths (PathArgument | Iterable[PathArgument]): A file, directory or archive, or several of them.
+        rules (CDSConfig | None): The rule configuration. Defaults to the `[tool.cdscore]` table
+            of the nearest `pyproject.toml` of every path, or the built-in configuration.
+        jobs (int): The number of parser/extractor threads. Defaults to 1.
+        engine (EnginesEnum): The comment extraction engine. Defaults to TREE_SITTER.
+        revision (str | None): Read the files of this git revision from the object store instead
+            of the working tree; findings then report repository-relative paths. Defaults to None.
+        time_budget (float | None): The processing time allowed per file in seconds, covering parsing,
+            extraction and rules. A file over budget is skipped with a warning. Defaults to None (no limit).
+        quarantine (Quarantine | None): Skip the files it lists and record the files over budget.
+            Defaults to None.
+        profiler (RuleProfiler | None): Records the cost of every rule invocation. Defaults to None.
+        checkpoint (Checkpoint | None): Restore the unchanged files it covers and record every checked file.
+            Defaults to None.
+        statistics (CommentStatistics | None): Receives the comments of every checked file. Defaults to None.
+
+    Yields:
+        FileResult: The check results of one file, including findings with a non-negative score.
+            With more than one job the order of files is not deterministic. Skipped files yield nothing.
+
+    Raises:
+        ConfigError: If `rules` is not given and a configuration file is invalid.
+        GitError: If the revision cannot be read.
+        ArchiveError: If an archive cannot be read.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    guard = FileGuard(time_budget, quarantine, checkpoint, statistics)
+    for path_argument in paths:
+        path = Path(path_argument)
+        config = rules if rules is not None else load_config(path)
+        checker_factory = partial(CommentChecker, config, profiler=profiler)
+        if revision is None:
+            yield from _iter_path_results([path], checker_factory, jobs, engine, guard)
+        else:
+            sources = GitRevisionReader(path).iter_sources(revision)
+            yield from _iter_source_results(sources, checker_factory, jobs, engine, guard)
+
+
+def iter_listed_results(
+    paths: Iterable[PathArgument],
+    *,
+    rules: CDSConfig | None = None,
+    jobs: int = 1,
+    engine: EnginesEnum = EnginesEnum.TREE_SITTER,
+    time_budget: float | None = None,
+    quarantine: Quarantine | None = None,
+    profiler: RuleProfiler | None = None,
+    checkpoint: Checkpoint | None = None,
+    statistics: CommentStatistics | None = None,
+) -> Iterator[FileResult]:
+    """
+    Analyze a stream of files and directories in one pipeline and yield the results of every file.
+
+    Unlike `iter_results`, all paths share one configuration and one pipeline, and the stream
+    is consumed as the analysis goes: a file is analyzed as soon as its path arrives, e.g. while
+    `git ls-files -z` is still writing the list. Listed directories are walked, listed archives
+    are read like in `iter_results`, and files that do not exist or are of unsupported languages
+    are skipped, like in a walked directory.
+
+    Usage:
+        with open("files.txt", "rb") as file_list:
+            for file_result in iter_listed_results(iter_listed_paths(file_list), jobs=4):
+                print(file_result.file_path, file_result.score)
+
+    Args:
+        paths (Iterable[PathArgument]): The files, directories and archives to analyze.
+        rules (CDSConfig | None): The rule configuration. Defaults to the built-in configuration.
+        jobs (int): The number of parser/extractor threads. Defaults to 1.
+        engine (EnginesEnum): The comment extraction engine. Defaults to TREE_SITTER.
+        time_budget (float | None): The processing time allowed per file in seconds. Defaults to None (no limit).
+        quarantine (Quarantine | None): Skip the files it lists and record the files over budget.
+            Defaults to None.
+        profiler (RuleProfiler | None): Records the cost of every rule invocation. Defaults to None.
+        checkpoint (Checkpoint | None): Restore the unchanged files it covers and record every checked file.
+            Defaults to None.
+        statistics (CommentStatistics | None): Receives the comments of every checked file. Defaults to None.
+
+    Yields:
+        FileResult: The check results of one file. With more than one job the order of files is not deterministic.
+
+    Raises:
+        ArchiveError: If an archive cannot be read.
+    """
+    checker_factory = partial(CommentChecker, rules or CDSConfig(), profiler=profiler)
+    guard = FileGuard(time_budget, quarantine, checkpoint, statistics)
+    roots = (Path(path) for path in paths)
+    yield from _iter_path_results(roots, checker_factory, jobs, engine, guard)
+
+
+def iter_file_results(
+    filepaths: Iterable[PathArgument],
+    *,
+    rules: CDSConfig | None = None,
+    jobs: int = 1,
+    engine: EnginesEnum = EnginesEnum.TREE_SITTER,
+    time_budget: float | None = None,
+    quarantine: Quarantine | None = None,
+    profiler: RuleProfiler | None = None,
+    checkpoint: Checkpoint | None = None,
+    statistics: CommentStatistics | None = None,
+) -> Generator[FileResult, None, None]:
+    """
+    Analyze an explicit list of files, read in the given order, and yield the results of every file.
+
+    Unlike `iter_results`, the files are not searched for and all of them share one
+    pipeline, so a long list of files runs as one analysis. The generator is lazy and
+    can be closed to cancel the analysis, like `iter_results`.
+
+    Args:
+        filepaths (Iterable[PathArgument]): The files to analyze.
+        rules (CDSConfig | None): The rule configuration. Defaults to the built-in configuration.
+        jobs (int): The number of parser/extractor threads. Defaults to 1.
+        engine (EnginesEnum): The comment extraction engine. Defaults to TREE_SITTER.
+        time_budget (float | None): The processing time allowed per file in seconds. Defaults to None (no limit).
+        quarantine (Quarantine | None): Skip the files it lists and record the files over budget.
+            Defaults to None.
+        profiler (RuleProfiler | None): Records the cost of every rule invocation. Defaults to None.
+        checkpoint (Checkpoint | None): Restore the unchanged files it covers and record every checked file.
+            Defaults to None.
+        statistics (CommentStatistics | None): Receives the comments of every checked file. Defaults to None.
+
+    Yields:
+        FileResult: The check results of one file. With more than one job the order of files is not deterministic.
+    """
+    finder = CommentFinder(engine)
+    sources = ((Path(filepath), finder.read_file(Path(filepath))) for filepath in filepaths)
+    checker_factory = partial(CommentChecker, rules or CDSConfig(), profiler=profiler)
+    guard = FileGuard(time_budget, quarantine, checkpoint, statistics)
+    yield from _iter_source_results(sources, checker_factory, jobs, engine, guard)
+
+
+def _iter_path_results(
+    roots: Iterable[Path],
+    checker_factory: Callable[[], CommentChecker],
+    jobs: int,
+    engine: EnginesEnum,
+    guard: FileGuard,
+) -> Iterator[FileResult]:
+    """
+    Find and check the comments of every file under the given paths.
+
+    Args:
+        roots (Iterable[pathlib.Path]): The starting paths (files, directories or archives).
+        checker_factory (Callable[[], CommentChecker]): Creates the comment checker.
+        jobs (int): The number of parser/extractor threads.
+        engine (EnginesEnum): The comment extraction engine.
+        guard (FileGuard): Applies the time budget, the quarantine and the checkpoint.
+
+    Yields:
+        FileResult: The check results of one file.
+    """
+    if jobs > 1:
+        yield from AnalysisPipeline(engine, jobs, checker_factory=checker_factory, guard=guard).run_paths(roots)
+        return
+
+    finder = CommentFinder(engine)
+    sources = (source for root in roots for source in _iter_root_sources(root, finder))
+    yield from _check_sources(sources, finder, checker_factory(), guard)
+
+
+def _iter_root_sources(root: Path, finder: CommentFinder) -> Iterator[tuple[Path, bytes]]:
+    """
+    Read the files under a starting path, or the members of an archive.
+
+    Args:
+        root (pathlib.Path): The starting path (file, directory or archive).
+        finder (CommentFinder): The comment finder walking directories.
+
+    Yields:
+        tuple[pathlib.Path, bytes]: Pairs of reported path and file content.
+    """
+    if is_archive(root):
+        yield from ArchiveReader(root).iter_sources()
+        return
+    for filepath in finder.iter_files(root):
+        yield filepath, finder.read_file(filepath)
+
+
+def _iter_source_results(
+    sources: Iterable[tuple[Path, bytes]],
+    checker_factory: Callable[[], CommentChecker],
+    jobs: int,
+    engine: EnginesEnum,
+    guard: FileGuard,
+) -> Iterator[FileResult]:
+    """
+    Find and check the comments of already read file contents.
+
+    Args:
+        sources (Iterable[tuple[pathlib.Path, bytes]]): Pairs of reported path and file content.
+        checker_factory (Callable[[], CommentChecker]): Creates the comment checker.
+        jobs (int): The number of parser/extractor threads.
+        engine (EnginesEnum): The comment extraction engine.
+        guard (FileGuard): Applies the time budget, the quarantine and the checkpoint.
+
+    Yields:
+        FileResult: The check results of one file.
+    """
+    if jobs > 1:
+        yield from AnalysisPipeline(engine, jobs, checker_factory=checker_factory, guard=guard).run_sources(sources)
+        return
+
+    yield from _check_sources(sources, CommentFinder(engine), checker_factory(), guard)
+
+
+def _check_sources(
+    sources: Iterable[tuple[Path, bytes]], finder: CommentFinder, checker: CommentChecker, guard: FileGuard
+) -> Iterator[FileResult]:
+    """
+    Find and check the comments of file contents one after another in the calling thread.
+
+    Args:
+        sources (Iterable[tuple[pathlib.Path, bytes]]): Pairs of reported path and file content.
+        finder (CommentFinder): The comment finder.
+        checker (CommentChecker): The comment checker.
+        guard (FileGuard): Applies the time budget, the quarantine and the checkpoint.
+
+    Yields:
+        FileResult: The check results of one file.
+    """
+    for filepath, code_bytes in sources:
+        found = guard.find(finder, filepath, code_bytes)
+        if found is None:
+            continue
+        if isinstance(found, RestoredFile):
+            yield guard.restore(checker, found)
+            continue
+        comments, metrics, budget = found
+        file_result = guard.check(checker, filepath, code_bytes, comments, metrics, budget)
+        if file_result is not None:
+            yield file_result
@@ -0,0 +1,336 @@
+"""
+Define the stratified random sample of files used to estimate the CDS of very large trees.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import heapq
+import math
+import os
+import random
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.data_types import SampleEstimate
+
+SIZE_CLASSES = 4
+MIN_STRATUM_FILES = 20
+MIN_STRATUM_SAMPLE = 2
+MIN_SAMPLE_FILES = 30
+CONFIDENCE_Z = 1.96
+ROOT_DIRECTORY = "."
+POOLED_DIRECTORY = "*"
+
+StratumKey = tuple[str, int]
+
+
+@dataclass
+class _Stratum:
+    """
+    Accumulate the per-file scores observed in one stratum.
+
+    Attributes:
+        population (int): The number of files of the stratum in the tree.
+        planned (int): The number of files selected from the stratum.
+        count (int): The number of analyzed files.
+        total (int): The sum of their scores.
+        squares (int): The sum of their squared scores.
+    """
+
+    population: int
+    planned: int = 0
+    count: int = 0
+    total: int = 0
+    squares: int = 0
+
+    def add(self, score: int) -> None:
+        """
+        Record the score of one analyzed file.
+
+        Args:
+            score (int): The total score of the file.
+        """
+        self.count += 1
+        self.total += score
+        self.squares += score * score
+
+
+class StratifiedSample:
+    """
+    Select a stratified random sample of files and estimate the total score of the tree from it.
+
+    Files are divided into strata by directory and size quartile; directories with fewer
+    than MIN_STRATUM_FILES files are pooled together per size class. Every stratum
+    contributes in proportion to its size and at least MIN_STRATUM_SAMPLE files, the
+    fewest that tell its variance. Files are drawn with a
+    seeded generator, so the same tree and seed always give the same sample.
+
+    The selected files are interleaved across strata, so every prefix of `files` is itself
+    close to a stratified sample and the analysis can stop as soon as the estimate is
+    precise enough. Files that produce no result (quarantined or over their time budget)
+    are treated as missing at random within their stratum.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        filepaths: Iterable[Path],
+        fraction: float | None = None,
+        size: int | None = None,
+        seed: int = 0,
+    ) -> None:
+        """
+        Stratify the files and select the sample.
+
+        Args:
+            root (pathlib.Path): The analyzed path; strata are named after directories relative to it.
+            filepaths (Iterable[pathlib.Path]): Every analyzable file under the root.
+            fraction (float | None): The fraction of files to analyze. Defaults to None.
+            size (int | None): The number of files to analyze; takes precedence over `fraction`.
+                Defaults to None; without both, every file is selected in random order.
+            seed (int): The seed of the random generator. Defaults to 0.
+        """
+        sizes = {filepath: _file_size(filepath) for filepath in filepaths}
+        self.population = len(sizes)
+
+        self._stratum_of = self._stratify(root, sizes)
+        members: dict[StratumKey, list[Path]] = {}
+        for filepath, key in sorted(self._stratum_of.items()):
+            members.setdefault(key, []).append(filepath)
+        self._strata = {key: _Stratum(len(stratum_files)) for key, stratum_files in sorted(members.items())}
+
+        self._allocate(self._sample_size(fraction, size))
+        self.files = self._draw(members, random.Random(seed))
+
+    @property
+    def strata(self) -> int:
+        """
+        Return the number of strata.
+
+        Returns:
+            int: The number of non-empty strata.
+        """
+        return len(self._strata)
+
+    def record(self, filepath: Path, score: int) -> None:
+        """
+        Record the total score of an analyzed file of the sample.
+
+        Args:
+            filepath (pathlib.Path): The path of the file, as listed in `files`.
+            score (int): The total score of the file.
+        """
+        self._strata[self._stratum_of[filepath]].add(score)
+
+    def converged(self, target_width: float) -> bool:
+        """
+        Decide whether the confidence interval is narrow enough to stop the analysis.
+
+        The interval is trusted only after MIN_SAMPLE_FILES files (or the whole sample)
+        were analyzed and every stratum contributed MIN_STRATUM_SAMPLE files or all of its own.
+
+        Args:
+            target_width (float): The largest acceptable width of the confidence interval.
+
+        Returns:
+            bool: True if the analysis can stop.
+        """
+        sampled = sum(stratum.count for stratum in self._strata.values())
+        if sampled < min(MIN_SAMPLE_FILES, len(self.files)):
+            return False
+        if any(stratum.count < min(MIN_STRATUM_SAMPLE, stratum.population) for stratum in self._strata.values()):
+            return False
+        return self.estimate().width <= target_width
+
+    def estimate(self, stopped_early: bool = False) -> SampleEstimate:
+        """
+        Estimate the total score of the tree from the files analyzed so far.
+
+        Uses the stratified estimator: the sum over strata of the stratum size times the mean
+        score of its analyzed files, with the finite population correction in the variance.
+        Strata with fewer than two analyzed files borrow the mean and variance of the whole sample;
+        fully analyzed strata add their exact total.
+
+        Args:
+            stopped_early (bool): Whether the analysis stopped before the whole sample. Defaults to False.
+
+        Returns:
+            SampleEstimate: The estimated score and its 95% confidence interval.
+        """
+        sampled = sum(stratum.count for stratum in self._strata.values())
+        pooled_total = sum(stratum.total for stratum in self._strata.values())
+        pooled_squares = sum(stratum.squares for stratum in self._strata.values())
+        pooled_mean = pooled_total / sampled if sampled else 0.0
+        pooled_variance = _variance(sampled, pooled_total, pooled_squares)
+
+        score = 0.0
+        variance = 0.0
+        for stratum in self._strata.values():
+            if stratum.count == stratum.population:
+                score += stratum.total
+                continue
+            mean = stratum.total / stratum.count if stratum.count else pooled_mean
+            score += stratum.population * mean
+
+            unobserved = 1 - stratum.count / stratum.population
+            stratum_variance = _variance(stratum.count, stratum.total, stratum.squares)
+            if stratum.count < 2:
+                stratum_variance = pooled_variance
+            variance += stratum.population**2 * unobserved * stratum_variance / max(stratum.count, 1)
+
+        return SampleEstimate(
+            score=score,
+            margin=CONFIDENCE_Z * math.sqrt(variance),
+            sampled=sampled,
+            planned=len(self.files),
+            population=self.population,
+            strata=len(self._strata),
+            stopped_early=stopped_early,
+        )
+
+    def _sample_size(self, fraction: float | None, size: int | None) -> int:
+        """
+        Return the number of files to select.
+
+        Args:
+            fraction (float | None): The fraction of files to analyze.
+            size (int | None): The number of files to analyze.
+
+        Returns:
+            int: The sample size, between 1 and the population (0 for an empty tree).
+        """
+        if size is None:
+            size = math.ceil((1.0 if fraction is None else fraction) * self.population)
+        return min(self.population, max(1, size))
+
+    def _allocate(self, sample_size: int) -> None:
+        """
+        Split the sample size between the strata in proportion to their size.
+
+        Fractional quotas are rounded by the largest remainder; every stratum then gets
+        at least MIN_STRATUM_SAMPLE files, which may make the sample larger than requested.
+
+        Args:
+            sample_size (int): The number of files to select.
+        """
+        quotas = {key: sample_size * stratum.population / self.population for key, stratum in self._strata.items()}
+        for key, quota in quotas.items():
+            self._strata[key].planned = int(quota)
+
+        left = sample_size - sum(stratum.planned for stratum in self._strata.values())
+        by_remainder = sorted(quotas, key=lambda key: (int(quotas[key]) - quotas[key], key))
+        for key in by_remainder[:left]:
+            self._strata[key].planned += 1
+
+        for stratum in self._strata.values():
+            stratum.planned = min(stratum.population, max(MIN_STRATUM_SAMPLE, stratum.planned))
+
+    def _draw(self, members: dict[StratumKey, list[Path]], generator: random.Random) -> list[Path]:
+        """
+        Draw the planned number of files from every stratum and interleave them.
+
+        Strata take turns in proportion to their share of the sample, so analysis order
+        stays balanced between strata however early it stops.
+
+        Args:
+            members (dict[StratumKey, list[pathlib.Path]]): The sorted files of every stratum.
+            generator (random.Random): The seeded random generator.
+
+        Returns:
+            list[pathlib.Path]: The selected files in analysis order.
+        """
+        drawn = {key: generator.sample(members[key], stratum.planned) for key, stratum in self._strata.items()}
+
+        turns = [(0.5 / stratum.planned, key) for key, stratum in self._strata.items()]
+        heapq.heapify(turns)
+        taken = Counter[StratumKey]()
+        files: list[Path] = []
+        while turns:
+            _, key = heapq.heappop(turns)
+            files.append(drawn[key][taken[key]])
+            taken[key] += 1
+            planned = self._strata[key].planned
+            if taken[key] < planned:
+                heapq.heappush(turns, ((taken[key] + 0.5) / planned, key))
+        return files
+
+    @staticmethod
+    def _stratify(root: Path, sizes: dict[Path, int]) -> dict[Path, StratumKey]:
+        """
+        Assign every file to a stratum by directory and size quartile.
+
+        Args:
+            root (pathlib.Path): The analyzed path.
+            sizes (dict[pathlib.Path, int]): The size of every file in bytes.
+
+        Returns:
+            dict[pathlib.Path, StratumKey]: The stratum of every file.
+        """
+        ordered_sizes = sorted(sizes.values())
+        boundaries = [
+            ordered_sizes[len(ordered_sizes) * part // SIZE_CLASSES] for part in range(1, SIZE_CLASSES) if ordered_sizes
+        ]
+
+        directories = {filepath: _directory(root, filepath) for filepath in sizes}
+        directory_files = Counter(directories.values())
+        return {
+            filepath: (
+                directory if directory_files[directory] >= MIN_STRATUM_FILES else POOLED_DIRECTORY,
+                bisect_right(boundaries, sizes[filepath]),
+            )
+            for filepath, directory in directories.items()
+        }
+
+
+def _directory(root: Path, filepath: Path) -> str:
+    """
+    Return the directory of a file relative to the root.
+
+    Args:
+        root (pathlib.Path): The analyzed path.
+        filepath (pathlib.Path): The file.
+
+    Returns:
+        str: The relative POSIX path of the directory, ROOT_DIRECTORY for files directly in the root.
+    """
+    try:
+        return filepath.parent.relative_to(root).as_posix()
+    except ValueError:
+        return ROOT_DIRECTORY
+
+
+def _file_size(filepath: Path) -> int:
+    """
+    Return the size of a file, 0 if it cannot be read.
+
+    Args:
+        filepath (pathlib.Path): The file.
+
+    Returns:
+        int: The size in bytes.
+    """
+    try:
+        return os.path.getsize(filepath)
+    except OSError:
+        return 0
+
+
+def _variance(count: int, total: int, squares: int) -> float:
+    """
+    Return the sample variance of a set of scores from their sums.
+
+    Args:
+        count (int): The number of scores.
+        total (int): The sum of the scores.
+        squares (int): The sum of the squared scores.
+
+    Returns:
+        float: The unbiased variance, infinite for fewer than two scores.
+    """
+    if count < 2:
+        return math.inf
+    return max(0.0, (squares - total * total / count) / (count - 1))
@@ -0,0 +1,109 @@
+"""
+Define the per-file time budget that bounds the analysis of pathological inputs.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import time
+from types import TracebackType
+
+from src.exceptions import TimeBudgetError
+
+CHECK_INTERVAL = 256
+
+
+class TimeBudget:
+    """
+    Measure the processing time of one file against a budget.
+
+    The clock only runs inside `with budget:` blocks, so the time a file waits in a pipeline
+    queue between two stages is not charged to it. Long loops call `check` every
+    CHECK_INTERVAL iterations; tree-sitter gets the remaining time as its own timeout.
+    A budget without a limit never expires.
+    """
+
+    def __init__(self, seconds: float | None = None) -> None:
+        """
+        Initialize the budget.
+
+        Args:
+            seconds (float | None): The processing time allowed for the file. Defaults to None (no limit).
+        """
+        self.seconds = seconds
+        self._spent = 0.0
+        self._started: float | None = None
+
+    def __enter__(self) -> "TimeBudget":
+        """
+        Start charging time to the file.
+
+        Returns:
+            TimeBudget: The budget itself.
+        """
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Stop charging time to the file.
+
+        Args:
+            exc_type (type[BaseException] | None): The type of the raised exception, if any.
+            exc_value (BaseException | None): The raised exception, if any.
+            traceback (TracebackType | None): The traceback of the raised exception, if any.
+        """
+        if self._started is not None:
+            self._spent += time.perf_counter() - self._started
+            self._started = None
+
+    @property
+    def limited(self) -> bool:
+        """
+        Return whether the budget has a limit.
+
+        Returns:
+            bool: True if the budget can expire.
+        """
+        return self.seconds is not None
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Return the processing time charged to the file so far.
+
+        Returns:
+            float: The time in seconds.
+        """
+        if self._started is None:
+            return self._spent
+        return self._spent + time.perf_counter() - self._started
+
+    def remaining(self) -> float | None:
+        """
+        Return the processing time left.
+
+        Returns:
+            float | None: The time in seconds (never negative), or None without a limit.
+        """
+        if self.seconds is None:
+            return None
+        return max(0.0, self.seconds - self.elapsed)
+
+    def check(self, stage: str) -> None:
+        """
+        Stop the analysis of the file if its budget is spent.
+
+        Args:
+            stage (str): The running analysis stage, reported in the error.
+
+        Raises:
+            TimeBudgetError: If the budget is spent.
+        """
+        if self.seconds is not None and self.elapsed >= self.seconds:
+            raise TimeBudgetError(f"Time budget of {self.seconds:g}s exceeded during {stage}", stage=stage)
@@ -0,0 +1,207 @@
+"""
+Define the streaming tracker of the worst files and directories of a run.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import heapq
+import itertools
+from pathlib import Path
+
+from src.data_types import FileResult, FunctionDensity, Hotspot
+
+DEFAULT_TOP_K = 50
+DIRECTORY_SLOTS_PER_ENTRY = 4
+
+
+class _BoundedHeap[Entry]:
+    """
+    Keep the K entries with the largest keys in a min-heap of at most K items.
+
+    Among equal keys, the entry seen first is kept.
+    """
+
+    def __init__(self, k: int) -> None:
+        """
+        Initialize an empty heap.
+
+        Args:
+            k (int): The number of entries to keep.
+        """
+        self._k = k
+        self._heap: list[tuple[float, int, Entry]] = []
+        self._sequence = itertools.count()
+
+    def offer(self, key: float, entry: Entry) -> None:
+        """
+        Keep the entry if it ranks among the K largest seen so far.
+
+        Args:
+            key (float): The ranking key.
+            entry (Entry): The entry.
+        """
+        item = (key, -next(self._sequence), entry)
+        if len(self._heap) < self._k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def ranked(self) -> list[Entry]:
+        """
+        Return the kept entries, the largest key first.
+
+        Returns:
+            list[Entry]: At most K entries.
+        """
+        return [entry for *_, entry in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+
+class _SpaceSaving:
+    """
+    Approximate the directories with the largest total penalty with the weighted
+    Space-Saving summary: a fixed number of counters, where a new directory takes
+    over the smallest counter and inherits its count as the overestimation bound.
+
+    Every directory whose true penalty exceeds the total penalty divided by the
+    number of counters is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize an empty summary.
+
+        Args:
+            capacity (int): The number of counters.
+        """
+        self._capacity = capacity
+        self._counters: dict[Path, list[int]] = {}
+
+    def add(self, directory: Path, penalty: int, lines: int) -> None:
+        """
+        Add the penalty and lines of a file to its directory.
+
+        Files without penalty only update directories that are already tracked,
+        so they never evict a counter.
+
+        Args:
+            directory (pathlib.Path): The directory of the file.
+            penalty (int): The penalty of the file.
+            lines (int): The number of lines of the file.
+        """
+        counter = self._counters.get(directory)
+        if counter is None:
+            if not penalty or not self._capacity:
+                return
+            floor = 0
+            if len(self._counters) >= self._capacity:
+                smallest = min(self._counters, key=lambda tracked: self._counters[tracked][0])
+                floor = self._counters.pop(smallest)[0]
+            counter = self._counters[directory] = [floor, 0, floor]
+
+        counter[0] += penalty
+        counter[1] += lines
+
+    def hotspots(self) -> list[Hotspot]:
+        """
+        Return the tracked directories.
+
+        Returns:
+            list[Hotspot]: One entry per counter, with its overestimation bound.
+        """
+        return [
+            Hotspot(directory, penalty, lines, error) for directory, (penalty, lines, error) in self._counters.items()
+        ]
+
+
+class TopKTracker:
+    """
+    Track the K worst files and directories of a run, by total penalty and by penalty per line,
+    and the K functions with the most comment lines per line of code, as file results arrive.
+
+    Files are ranked exactly with bounded heaps. Directories (the parent of every file) are
+    ranked from a Space-Saving summary of DIRECTORY_SLOTS_PER_ENTRY * K counters, so their
+    penalties are upper bounds within the reported error; their penalty per line only counts
+    the penalty and lines seen while the directory was tracked. Memory depends only on K.
+
+    The tracker is not thread-safe; feed it from the thread consuming the results.
+    """
+
+    def __init__(self, k: int = DEFAULT_TOP_K) -> None:
+        """
+        Initialize an empty tracker.
+
+        Args:
+            k (int): The number of files and directories to report. Defaults to DEFAULT_TOP_K.
+        """
+        self.k = k
+        self._files_by_penalty: _BoundedHeap[Hotspot] = _BoundedHeap(k)
+        self._files_by_penalty_per_line: _BoundedHeap[Hotspot] = _BoundedHeap(k)
+        self._densest_functions: _BoundedHeap[tuple[Path, FunctionDensity]] = _BoundedHeap(k)
+        self._directories = _SpaceSaving(DIRECTORY_SLOTS_PER_ENTRY * k)
+
+    def add(self, file_result: FileResult) -> None:
+        """
+        Account the results of one file.
+
+        Args:
+            file_result (FileResult): The check results of a single file.
+        """
+        for function in file_result.functions:
+            self._densest_functions.offer(function.ratio, (file_result.file_path, function))
+
+        penalty = file_result.penalty
+        self._directories.add(file_result.file_path.parent, penalty, file_result.lines)
+        if not penalty:
+            return
+
+        hotspot = Hotspot(file_result.file_path, penalty, file_result.lines)
+        self._files_by_penalty.offer(penalty, hotspot)
+        self._files_by_penalty_per_line.offer(hotspot.penalty_per_line, hotspot)
+
+    def files_by_penalty(self) -> list[Hotspot]:
+        """
+        Return the files with the largest total penalty.
+
+        Returns:
+            list[Hotspot]: At most K files, the worst first.
+        """
+        return self._files_by_penalty.ranked()
+
+    def files_by_penalty_per_line(self) -> list[Hotspot]:
+        """
+        Return the files with the largest penalty per line.
+
+        Returns:
+            list[Hotspot]: At most K files, the worst first.
+        """
+        return self._files_by_penalty_per_line.ranked()
+
+    def densest_functions(self) -> list[tuple[Path, FunctionDensity]]:
+        """
+        Return the functions with the most comment lines per line of code.
+
+        Returns:
+            list[tuple[pathlib.Path, FunctionDensity]]: At most K functions with their files, the densest first.
+        """
+        return self._densest_functions.ranked()
+
+    def directories_by_penalty(self) -> list[Hotspot]:
+        """
+        Return the directories with the largest total penalty.
+
+        Returns:
+            list[Hotspot]: At most K directories, the worst first.
+        """
+        hotspots = sorted(self._directories.hotspots(), key=lambda hotspot: hotspot.penalty, reverse=True)
+        return hotspots[: self.k]
+
+    def directories_by_penalty_per_line(self) -> list[Hotspot]:
+        """
+        Return the tracked directories with the largest penalty per line.
+
+        Returns:
+            list[Hotspot]: At most K directories, the worst first.
+        """
+        hotspots = sorted(self._directories.hotspots(), key=lambda hotspot: hotspot.penalty_per_line, reverse=True)
+        return hotspots[: self.k]
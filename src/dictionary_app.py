@@ -0,0 +1,122 @@
+"""
+Define the command-line argument parser and the application class for the `dictionary` command.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+from collections.abc import Iterator
+from pathlib import Path
+
+from src.density_calculation.checker.word_list import compile_word_list
+from src.exceptions import DictionaryError
+from src.logging_setup import setup_logging
+from src.output.cli_output import CLIOutput
+
+
+class DictionaryArgsParser:
+    """
+    Parse command-line arguments for the `dictionary` command.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        """
+        Initialize the parser and parse the arguments.
+
+        Args:
+            argv (list[str]): The list of arguments following the `dictionary` command.
+        """
+        parser = argparse.ArgumentParser(
+            prog="cdscore.py dictionary",
+            description="Compile word lists (one word per line) into a dictionary for the spelling rule.",
+            epilog="Example: cdscore.py dictionary /usr/share/dict/words project-words.txt -o words.cdsdict",
+        )
+
+        parser.add_argument("word_lists", nargs="+", type=Path, help="Files with one word per line.")
+        parser.add_argument("-o", "--output", type=Path, required=True, help="The compiled dictionary file.")
+        parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output.")
+
+        self.args = parser.parse_args(argv)
+
+    @property
+    def word_lists(self) -> list[Path]:
+        """
+        Return the word list files.
+
+        Returns:
+            list[pathlib.Path]: The files to compile.
+        """
+        word_lists: list[Path] = self.args.word_lists
+        return word_lists
+
+    @property
+    def output_path(self) -> Path:
+        """
+        Return the path of the compiled dictionary.
+
+        Returns:
+            pathlib.Path: The output file.
+        """
+        output_path: Path = self.args.output
+        return output_path
+
+    @property
+    def verbose(self) -> bool:
+        """
+        Return the verbose output flag.
+
+        Returns:
+            bool: True if verbose output is enabled, False otherwise.
+        """
+        verbose: bool = self.args.verbose
+        return verbose
+
+
+class DictionaryApp:
+    """
+    The application class of the `dictionary` command: compiles word lists for the spelling rule.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        """
+        Initialize the application, parse arguments and setup logging.
+
+        Args:
+            argv (list[str]): The command-line arguments following the `dictionary` command.
+        """
+        self._args_parser = DictionaryArgsParser(argv)
+        setup_logging(self._args_parser.verbose)
+
+        self._output = CLIOutput()
+
+    def run(self) -> int:
+        """
+        Compile the dictionary and return the exit code (0 for success, 1 for failure).
+
+        Returns:
+            int: The application exit code.
+        """
+        output_path = self._args_parser.output_path
+        try:
+            word_count = compile_word_list(self._read_words(), output_path)
+        except (OSError, UnicodeDecodeError, DictionaryError) as error:
+            self._output.message(f"Error: {error}")
+            return 1
+
+        self._output.message(f"Compiled {word_count} words into {output_path}")
+        return 0
+
+    def _read_words(self) -> Iterator[str]:
+        """
+        Read the words of every word list, skipping blank lines and `#` comments.
+
+        Yields:
+            str: Every word, as written in its file.
+        """
+        for word_list in self._args_parser.word_lists:
+            with open(word_list, encoding="utf-8") as word_file:
+                for line in word_file:
+                    word = line.strip()
+                    if word and not word.startswith("#"):
+                        yield word
@@ -22,3 +22,162 @@ class FileTypeError(Exception):
     def __init__(self, message: str = "Unknown type of file") -> None:
         self.message = message
         super().__init__(self.message)
+
+
+class LexerError(Exception):
+    """Exception raised when the lightweight engine cannot tokenize a file.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Cannot tokenize file".
+    """
+
+    def __init__(self, message: str = "Cannot tokenize file") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class GitError(Exception):
+    """Exception raised when a git command fails or a revision cannot be read.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Git command failed".
+    """
+
+    def __init__(self, message: str = "Git command failed") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class ConfigError(Exception):
+    """Exception raised when the `[tool.cdscore]` configuration is invalid.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Invalid configuration".
+    """
+
+    def __init__(self, message: str = "Invalid configuration") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class ProtocolError(Exception):
+    """Exception raised when a Language Server Protocol message cannot be read.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Invalid protocol message".
+    """
+
+    def __init__(self, message: str = "Invalid protocol message") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class TimeBudgetError(Exception):
+    """Exception raised when the analysis of a file exceeds its time budget.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Time budget exceeded".
+        stage (str, optional): The analysis stage that was running when the budget ran out.
+            Defaults to "unknown".
+    """
+
+    def __init__(self, message: str = "Time budget exceeded", stage: str = "unknown") -> None:
+        self.message = message
+        self.stage = stage
+        super().__init__(self.message)
+
+
+class DictionaryError(Exception):
+    """Exception raised when a compiled dictionary cannot be read or written.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Invalid dictionary file".
+    """
+
+    def __init__(self, message: str = "Invalid dictionary file") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class CheckpointError(Exception):
+    """Exception raised when the checkpoint journal cannot be opened.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Cannot open the checkpoint".
+    """
+
+    def __init__(self, message: str = "Cannot open the checkpoint") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class StoreError(Exception):
+    """Exception raised when the results database cannot be opened or written.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Cannot write the results database".
+    """
+
+    def __init__(self, message: str = "Cannot write the results database") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class StatisticsError(Exception):
+    """Exception raised when comment statistics cannot be read, written or merged.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Invalid comment statistics".
+    """
+
+    def __init__(self, message: str = "Invalid comment statistics") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class BaselineError(Exception):
+    """Exception raised when a baseline of findings cannot be read or written.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Invalid baseline file".
+    """
+
+    def __init__(self, message: str = "Invalid baseline file") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class NotebookError(Exception):
+    """Exception raised when a Jupyter notebook cannot be read.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Invalid notebook".
+    """
+
+    def __init__(self, message: str = "Invalid notebook") -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class ArchiveError(Exception):
+    """Exception raised when a wheel, sdist, zip file or tarball cannot be read.
+
+    Args:
+        message (str, optional): The error message describing the issue.
+            Defaults to "Invalid archive".
+    """
+
+    def __init__(self, message: str = "Invalid archive") -> None:
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,198 @@
+"""
+Define the command-line argument parser and the application class for the `history` command.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+import csv
+import json
+import sys
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import TextIO
+
+from src.config import load_config
+from src.data_types import EnginesEnum, HistoryPoint
+from src.density_calculation.history import HistoryAnalyzer
+from src.exceptions import ConfigError, DictionaryError, GitError
+from src.logging_setup import setup_logging
+from src.output.cli_output import CLIOutput
+
+HISTORY_FORMATS = ("csv", "json")
+
+
+class HistoryArgsParser:
+    """
+    Parse command-line arguments for the `history` command.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        """
+        Initialize the parser and parse the arguments.
+
+        Args:
+            argv (list[str]): The list of arguments following the `history` command.
+        """
+        parser = argparse.ArgumentParser(
+            prog="cdscore.py history",
+            description="Compute the comment density score of every commit of a range.",
+            epilog="Example: cdscore.py history v1.0..main --format csv --output cds.csv",
+        )
+
+        parser.add_argument("range", help="Commit range to walk along the first-parent chain, e.g. A..B.")
+        parser.add_argument("path", type=Path, nargs="?", default=Path("."), help="Path inside the repository.")
+        parser.add_argument("--format", choices=HISTORY_FORMATS, default="csv", help="Format of the time series.")
+        parser.add_argument("-o", "--output", type=Path, default=None, help="Write the series to a file.")
+        parser.add_argument(
+            "--engine",
+            choices=[engine.value for engine in EnginesEnum],
+            default=EnginesEnum.TREE_SITTER.value,
+            help="Comment extraction engine: full tree-sitter parse or a lightweight lexer pass.",
+        )
+        parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output.")
+
+        self.args = parser.parse_args(argv)
+
+    @property
+    def revision_range(self) -> str:
+        """
+        Return the commit range to walk.
+
+        Returns:
+            str: The range, for example 'A..B'.
+        """
+        revision_range: str = self.args.range
+        return revision_range
+
+    @property
+    def path(self) -> Path:
+        """
+        Return the path inside the repository.
+
+        Returns:
+            pathlib.Path: The repository path.
+        """
+        path: Path = self.args.path
+        return path
+
+    @property
+    def output_format(self) -> str:
+        """
+        Return the format of the time series.
+
+        Returns:
+            str: 'csv' or 'json'.
+        """
+        output_format: str = self.args.format
+        return output_format
+
+    @property
+    def output_path(self) -> Path | None:
+        """
+        Return the file to write the series to.
+
+        Returns:
+            pathlib.Path | None: The output file, or None for the standard output.
+        """
+        output_path: Path | None = self.args.output
+        return output_path
+
+    @property
+    def engine(self) -> EnginesEnum:
+        """
+        Return the selected comment extraction engine.
+
+        Returns:
+            EnginesEnum: The engine used to find comments.
+        """
+        return EnginesEnum(self.args.engine)
+
+    @property
+    def verbose(self) -> bool:
+        """
+        Return the verbose output flag.
+
+        Returns:
+            bool: True if verbose output is enabled, False otherwise.
+        """
+        verbose: bool = self.args.verbose
+        return verbose
+
+
+class HistoryApp:
+    """
+    The application class of the `history` command: walks a commit range and writes a CDS time series.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        """
+        Initialize the application, parse arguments and setup logging.
+
+        Args:
+            argv (list[str]): The command-line arguments following the `history` command.
+        """
+        self._args_parser = HistoryArgsParser(argv)
+        setup_logging(self._args_parser.verbose)
+
+        self._output = CLIOutput()
+
+    def run(self) -> int:
+        """
+        Compute and write the time series and return the exit code (0 for success, 1 for failure).
+
+        Returns:
+            int: The application exit code.
+        """
+        try:
+            config = load_config(self._args_parser.path)
+            analyzer = HistoryAnalyzer(self._args_parser.path, self._args_parser.engine, config)
+        except (ConfigError, DictionaryError) as config_error:
+            self._output.message(f"Error: {config_error}")
+            return 1
+
+        output_path = self._args_parser.output_path
+        stream = open(output_path, "w", newline="", encoding="utf-8") if output_path else sys.stdout
+
+        try:
+            if self._args_parser.output_format == "json":
+                self._write_json(stream, analyzer)
+            else:
+                self._write_csv(stream, analyzer)
+        except GitError as git_error:
+            self._output.message(f"Error: {git_error}")
+            return 1
+        finally:
+            if output_path:
+                stream.close()
+
+        return 0
+
+    def _write_csv(self, stream: TextIO, analyzer: HistoryAnalyzer) -> None:
+        """
+        Write the series as CSV, one row per commit as soon as it is computed.
+
+        Args:
+            stream (TextIO): The destination stream.
+            analyzer (HistoryAnalyzer): The analyzer producing the series.
+        """
+        writer = csv.DictWriter(stream, fieldnames=[field.name for field in fields(HistoryPoint)])
+        writer.writeheader()
+        for point in analyzer.iter_history(self._args_parser.revision_range):
+            writer.writerow(asdict(point))
+            stream.flush()
+
+    def _write_json(self, stream: TextIO, analyzer: HistoryAnalyzer) -> None:
+        """
+        Write the series as a JSON array, one object per commit as soon as it is computed.
+
+        Args:
+            stream (TextIO): The destination stream.
+            analyzer (HistoryAnalyzer): The analyzer producing the series.
+        """
+        separator = "[\n"
+        for point in analyzer.iter_history(self._args_parser.revision_range):
+            stream.write(f"{separator}  {json.dumps(asdict(point))}")
+            separator = ",\n"
+        stream.write("\n]\n" if separator != "[\n" else "[]\n")
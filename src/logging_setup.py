@@ -6,11 +6,12 @@ License: MIT License (see LICENSE file for details)
 """
 
 import sys
+from typing import TextIO
 
 from loguru import logger
 
 
-def setup_logging(verbose: bool = False) -> None:
+def setup_logging(verbose: bool = False, stream: TextIO | None = None) -> None:
     """
     Configure global logging using loguru, setting different levels for verbose and normal modes.
 
@@ -19,15 +20,18 @@ def setup_logging(verbose: bool = False) -> None:
 
     Args:
         verbose (bool): If True, enable detailed DEBUG level logging; otherwise, use INFO level. Defaults to False.
+        stream (TextIO | None): The stream to log to. Defaults to the standard output.
 
     Returns:
         None: The function does not return a value.
     """
     logger.remove()
+    if stream is None:
+        stream = sys.stdout
 
     if verbose:
         logger.add(
-            sys.stdout,
+            stream,
             level="DEBUG",
             format="<level><green>{time:YYYY-MM-DD HH:mm:ss}</green></level> | "
             "<level>{level}</level> | "
@@ -35,4 +39,4 @@ def setup_logging(verbose: bool = False) -> None:
             "{message}",
         )
     else:
-        logger.add(sys.stdout, level="INFO", format="{message}")
+        logger.add(stream, level="INFO", format="{message}")
@@ -0,0 +1,5 @@
+from src.lsp.document import TextDocument
+from src.lsp.json_rpc import JsonRpcStream
+from src.lsp.server import LanguageServer
+
+__all__ = ["JsonRpcStream", "LanguageServer", "TextDocument"]
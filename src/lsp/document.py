@@ -0,0 +1,597 @@
+"""
+Define an open text document that keeps its syntax tree and comments up to date with incremental edits.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import tree_sitter
+
+from src.comment_utils import parse_language
+from src.data_types import CheckerData, CommentData, ScopeSpan
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.finder.definition_index import DEFINITION_SCOPES, enclosing_definition
+from src.density_calculation.finder.node_extractor import NodeDataExtractor
+from src.density_calculation.finder.notebook import is_notebook
+from src.density_calculation.finder.syntax_analyzer import SyntaxAnalyzer
+from src.exceptions import FileTypeError
+
+POSITION_UTF8 = "utf-8"
+POSITION_UTF16 = "utf-16"
+
+SEVERITY_WARNING = 2
+DIAGNOSTIC_SOURCE = "cdscore"
+
+NEWLINE = 0x0A
+CARRIAGE_RETURN = 0x0D
+
+
+@dataclass
+class _TrackedComment:
+    """
+    A comment of the document with its byte range and the findings of the comment rules.
+
+    Attributes:
+        start_byte (int): The offset of the first byte of the comment.
+        end_byte (int): The offset after the last byte of the comment.
+        comment (CommentData): Comment details.
+        findings (list[CheckerData]): The results of the comment rules.
+        owner_start (int): The offset of the first byte of the enclosing definition, or -1 at module level.
+        owner_end (int): The offset after the last byte of the enclosing definition, or -1 at module level.
+        moved (bool): Whether the byte range changed since the line and column numbers were last updated.
+        owner_stale (bool): Whether the enclosing definition may have changed since it was last looked up.
+    """
+
+    start_byte: int
+    end_byte: int
+    comment: CommentData
+    findings: list[CheckerData]
+    owner_start: int = -1
+    owner_end: int = -1
+    moved: bool = False
+    owner_stale: bool = False
+
+
+class TextDocument:
+    """
+    Represent a document opened in the editor.
+
+    The document owns its `tree_sitter.Tree`. Every change is applied to the tree with the
+    incremental edit API and the tree is re-parsed from the edited one. Only comments inside
+    the edited range and the ranges whose syntax changed, plus the docstring of a function
+    whose header was edited, are extracted and checked again;
+    the other comments keep their findings and get their new line and column numbers, and
+    the lines of their enclosing definitions, the next time the comments are read, so a burst
+    of edits pays for the relocation only once. The enclosing definition is only looked up
+    again when it overlaps or encloses an edit, when its bounds are in a range whose syntax
+    changed or when its header was edited; otherwise it moves with the comment.
+    """
+
+    def __init__(
+        self, uri: str, path: Path, text: str, checker: CommentChecker, position_encoding: str = POSITION_UTF16
+    ) -> None:
+        """
+        Parse the document and check all its comments.
+
+        Args:
+            uri (str): The document URI.
+            path (pathlib.Path): The path reported in the findings; its suffix selects the language.
+            text (str): The full text of the document.
+            checker (CommentChecker): The checker running the rules.
+            position_encoding (str): The encoding of LSP character offsets, 'utf-16' or 'utf-8'.
+
+        Raises:
+            FileTypeError: If the language of the document is not supported, or it is a notebook.
+        """
+        if is_notebook(path):
+            raise FileTypeError(f"Notebooks are not analyzed incrementally: {path.name}")
+        self.uri = uri
+        self.path = path
+        self._language = parse_language(path)
+        self._checker = checker
+        self._position_encoding = position_encoding
+
+        self._analyzer = SyntaxAnalyzer()
+        self._extractor = NodeDataExtractor()
+
+        self._source = b""
+        self._line_starts = [0]
+        self._comments: list[_TrackedComment] = []
+        self._replace(text.encode())
+
+    @property
+    def source(self) -> bytes:
+        """
+        Return the current content of the document.
+
+        Returns:
+            bytes: The UTF-8 encoded text.
+        """
+        return self._source
+
+    @property
+    def comments(self) -> list[CommentData]:
+        """
+        Return the comments of the document.
+
+        Returns:
+            list[CommentData]: The comments, in source order.
+        """
+        self._relocate_moved()
+        return [tracked.comment for tracked in self._comments]
+
+    def apply_changes(self, changes: list[dict[str, Any]]) -> None:
+        """
+        Apply the content changes of a `textDocument/didChange` notification in order.
+
+        Args:
+            changes (list[dict[str, Any]]): The changes; a change without a range replaces the whole text.
+        """
+        for change in changes:
+            if "range" in change:
+                self._apply_edit(change["range"], change["text"])
+            else:
+                self._replace(change["text"].encode())
+
+    def diagnostics(self) -> list[dict[str, Any]]:
+        """
+        Build the LSP diagnostics of all findings with a negative score.
+
+        Comment rule findings are kept per comment; only the file rules run over all comments.
+        Rules keeping state across files replace the previous version of the document themselves,
+        reusing what they computed for its unchanged comments; when no comment is left they are
+        told to forget the document instead.
+
+        Returns:
+            list[dict[str, Any]]: The diagnostics.
+        """
+        comments = self.comments
+        findings = [finding for tracked in self._comments for finding in tracked.findings]
+        if not comments:
+            self._checker.forget_file(self.path)
+        findings.extend(self._checker.check_file_rules(comments))
+
+        return [self._diagnostic(finding) for finding in findings if finding.score < 0]
+
+    def offset(self, position: dict[str, int]) -> int:
+        """
+        Convert an LSP position to a byte offset; positions past the end of a line are clamped to it.
+
+        Args:
+            position (dict[str, int]): The position with the zero-based `line` and `character`.
+
+        Returns:
+            int: The byte offset.
+        """
+        line = position["line"]
+        if line >= len(self._line_starts):
+            return len(self._source)
+
+        line_start, line_end = self._line_bounds(line)
+        line_bytes = self._source[line_start:line_end]
+        character = position["character"]
+        if self._position_encoding == POSITION_UTF8 or line_bytes.isascii():
+            return line_start + min(character, len(line_bytes))
+
+        units = 0
+        byte = line_start
+        for char in line_bytes.decode("utf-8", errors="replace"):
+            if units >= character:
+                break
+            units += 2 if ord(char) > 0xFFFF else 1
+            byte += len(char.encode())
+
+        return min(byte, line_end)
+
+    def _replace(self, source: bytes) -> None:
+        """
+        Replace the whole content: parse it from scratch and extract all comments.
+
+        Args:
+            source (bytes): The new content.
+        """
+        self._source = source
+        self._line_starts = _line_starts(source)
+        self._tree = self._analyzer.parse(source, self._language)
+        self._comments = []
+        self._extract(0, len(source))
+
+    def _apply_edit(self, edit_range: dict[str, dict[str, int]], text: str) -> None:
+        """
+        Apply one ranged change incrementally.
+
+        Args:
+            edit_range (dict[str, dict[str, int]]): The replaced LSP range.
+            text (str): The new text of the range.
+        """
+        start = self.offset(edit_range["start"])
+        old_end = max(start, self.offset(edit_range["end"]))
+        new_bytes = text.encode()
+        new_end = start + len(new_bytes)
+
+        start_point = self._point(start)
+        old_end_point = self._point(old_end)
+
+        self._source = self._source[:start] + new_bytes + self._source[old_end:]
+        self._update_line_starts(start, old_end, new_bytes)
+
+        self._tree.edit(
+            start_byte=start,
+            old_end_byte=old_end,
+            new_end_byte=new_end,
+            start_point=start_point,
+            old_end_point=old_end_point,
+            new_end_point=self._point(new_end),
+        )
+        new_tree = self._analyzer.parser(self._language).parse(self._source, self._tree)
+        changed_ranges = [(changed.start_byte, changed.end_byte) for changed in self._tree.changed_ranges(new_tree)]
+        changed_ranges.append((start, new_end))
+        enclosing = _enclosing_definitions(self._tree.root_node, start, new_end)
+        for range_start, range_end in changed_ranges:
+            enclosing.extend(_enclosing_definitions(new_tree.root_node, range_start, range_end))
+        self._tree = new_tree
+
+        self._move_comments(start, old_end, new_end - old_end, changed_ranges, enclosing)
+        docstring_ranges = self._docstring_ranges(start, new_end)
+        for range_start, range_end in _merge_ranges([*changed_ranges, *docstring_ranges]):
+            self._extract(range_start, range_end)
+
+    def _docstring_ranges(self, start: int, end: int) -> list[tuple[int, int]]:
+        """
+        Return the range of the docstring of a function whose signature was edited.
+
+        The docstring itself is unchanged by such an edit, but rules comparing it with the signature
+        must check it again.
+
+        Args:
+            start (int): The start of the edited range.
+            end (int): The end of the edited range after the change.
+
+        Returns:
+            list[tuple[int, int]]: The byte range of the first statement of the function body,
+                or nothing if the edit is outside a function header.
+        """
+        node = self._tree.root_node.descendant_for_byte_range(start, end)
+        while node is not None and node.type != "function_definition":
+            node = node.parent
+        body = node.child_by_field_name("body") if node is not None else None
+        if body is None or start >= body.start_byte:
+            return []
+
+        first_statement = next((child for child in body.named_children if child.type != "comment"), None)
+        return [] if first_statement is None else [(first_statement.start_byte, first_statement.end_byte)]
+
+    def _update_line_starts(self, start: int, old_end: int, new_bytes: bytes) -> None:
+        """
+        Update the offsets of line starts after replacing a range of bytes.
+
+        Args:
+            start (int): The start of the replaced range.
+            old_end (int): The end of the replaced range before the change.
+            new_bytes (bytes): The inserted bytes.
+        """
+        first = bisect_right(self._line_starts, start) - 1
+        last = bisect_right(self._line_starts, old_end) - 1
+        delta = len(new_bytes) - (old_end - start)
+
+        inserted: list[int] = []
+        newline = new_bytes.find(b"\n")
+        while newline != -1:
+            inserted.append(start + newline + 1)
+            newline = new_bytes.find(b"\n", newline + 1)
+
+        following = [line_start + delta for line_start in self._line_starts[last + 1 :]]
+        self._line_starts = self._line_starts[: first + 1] + inserted + following
+
+    def _move_comments(
+        self,
+        start: int,
+        old_end: int,
+        delta: int,
+        changed_ranges: list[tuple[int, int]],
+        enclosing: list[tuple[int, int, bool]],
+    ) -> None:
+        """
+        Drop the comments touched by an edit and shift the byte ranges of the comments after it
+        and of their enclosing definitions.
+
+        The enclosing definition of a comment must be looked up again if it overlapped the edit,
+        encloses it or starts or ends in a range whose syntax changed, since it may have grown,
+        shrunk or been replaced, or if the comment is inside a definition whose header was edited,
+        since it may have been renamed or created by the edit.
+
+        Args:
+            start (int): The start of the edited range.
+            old_end (int): The end of the edited range before the change.
+            delta (int): The change of the document length in bytes.
+            changed_ranges (list[tuple[int, int]]): The ranges whose syntax changed, after the edit.
+            enclosing (list[tuple[int, int, bool]]): The start and end offsets of the definitions enclosing
+                the edit in the tree before and after it, and whether the edit touches their header.
+        """
+        enclosing_starts = {definition_start for definition_start, _, _ in enclosing}
+        edited_headers = [
+            (definition_start, definition_end) for definition_start, definition_end, header in enclosing if header
+        ]
+
+        kept: list[_TrackedComment] = []
+        for tracked in self._comments:
+            if tracked.end_byte < start:
+                kept.append(tracked)
+            elif tracked.start_byte >= old_end:
+                tracked.start_byte += delta
+                tracked.end_byte += delta
+                tracked.moved = True
+                kept.append(tracked)
+            else:
+                continue
+
+            stale = 0 <= tracked.owner_start <= old_end and tracked.owner_end >= start
+            if tracked.owner_start >= old_end:
+                tracked.owner_start += delta
+            if tracked.owner_end >= old_end:
+                tracked.owner_end += delta
+            owner_start, owner_end = tracked.owner_start, tracked.owner_end
+            if (
+                stale
+                or owner_start in enclosing_starts
+                or any(
+                    range_start <= owner_start <= range_end or range_start <= owner_end <= range_end
+                    for range_start, range_end in changed_ranges
+                )
+                or any(header_start <= tracked.start_byte < header_end for header_start, header_end in edited_headers)
+            ):
+                tracked.owner_stale = True
+
+        self._comments = kept
+
+    def _relocate_moved(self) -> None:
+        """
+        Update the line and column numbers of the moved comments and their enclosing definitions,
+        look up the enclosing definitions that may have changed, and update their findings.
+        """
+        line_starts = self._line_starts
+        root = self._tree.root_node
+        spans: dict[int, ScopeSpan] = {}
+        moved_spans: dict[int, ScopeSpan] = {}
+        for tracked in self._comments:
+            if not tracked.moved and not tracked.owner_stale:
+                continue
+            comment = tracked.comment
+            start_line, end_line = comment.start_line_number, comment.end_line_number
+            column_start, column_end = comment.column_start, comment.column_end
+            if tracked.moved:
+                tracked.moved = False
+                start_row = bisect_right(line_starts, tracked.start_byte) - 1
+                end_row = bisect_right(line_starts, tracked.end_byte) - 1
+                start_line, end_line = start_row + 1, end_row + 1
+                column_start = tracked.start_byte - line_starts[start_row] + 1
+                column_end = tracked.end_byte - line_starts[end_row]
+            owner = comment.owner
+            if tracked.owner_stale:
+                tracked.owner_stale = False
+                tracked.owner_start, tracked.owner_end = _definition_range(root, tracked.start_byte)
+                fresh_owner = enclosing_definition(root, tracked.start_byte, self._source, spans)
+                if fresh_owner != owner:
+                    owner = fresh_owner
+            elif owner is not None and tracked.owner_start >= 0:
+                moved_span = moved_spans.get(tracked.owner_start)
+                if moved_span is None:
+                    owner_start_line = bisect_right(line_starts, tracked.owner_start)
+                    owner_end_line = bisect_right(line_starts, tracked.owner_end)
+                    if owner_start_line != owner.start_line or owner_end_line != owner.end_line:
+                        owner = ScopeSpan(owner.name, owner.kind, owner_start_line, owner_end_line)
+                    moved_span = moved_spans[tracked.owner_start] = owner
+                owner = moved_span
+            unchanged = start_line == comment.start_line_number and column_start == comment.column_start
+            if unchanged and owner is comment.owner:
+                continue
+
+            tracked.comment = CommentData(
+                comment.file_path,
+                comment.text,
+                start_line,
+                end_line,
+                column_start,
+                column_end,
+                comment.comment_type,
+                comment.scope,
+                comment.definition,
+                comment.cell,
+                owner,
+            )
+            tracked.findings = [
+                CheckerData(finding.score, tracked.comment, finding.error_string, finding.rule_id)
+                for finding in tracked.findings
+            ]
+
+    def _extract(self, range_start: int, range_end: int) -> None:
+        """
+        Extract and check the comments intersecting a range of bytes, replacing the ones known before.
+
+        The range is widened by one byte on both sides, so comments that only touch it are refreshed too.
+
+        Args:
+            range_start (int): The start of the range.
+            range_end (int): The end of the range.
+        """
+        range_start = max(0, range_start - 1)
+        range_end = min(len(self._source), range_end + 1)
+
+        captures = self._analyzer.query_captures(self._tree, self._language, (range_start, range_end))
+        comments = self._extractor.extract(self.path, self._source, captures)
+
+        self._comments = [
+            tracked for tracked in self._comments if tracked.end_byte <= range_start or tracked.start_byte >= range_end
+        ]
+        known = {tracked.start_byte for tracked in self._comments}
+        root = self._tree.root_node
+        for comment in comments:
+            start_byte = self._line_starts[comment.start_line_number - 1] + comment.column_start - 1
+            if start_byte in known:
+                continue
+            end_byte = self._line_starts[comment.end_line_number - 1] + comment.column_end
+            owner_start, owner_end = _definition_range(root, start_byte) if comment.owner is not None else (-1, -1)
+            findings = self._checker.check(comment)
+            self._comments.append(_TrackedComment(start_byte, end_byte, comment, findings, owner_start, owner_end))
+            known.add(start_byte)
+
+        self._comments.sort(key=lambda tracked: tracked.start_byte)
+
+    def _diagnostic(self, finding: CheckerData) -> dict[str, Any]:
+        """
+        Build the LSP diagnostic of a finding.
+
+        Args:
+            finding (CheckerData): The rule result.
+
+        Returns:
+            dict[str, Any]: The diagnostic.
+        """
+        comment = finding.comment_data
+        return {
+            "range": {
+                "start": self._position(comment.start_line_number - 1, comment.column_start - 1),
+                "end": self._position(comment.end_line_number - 1, comment.column_end),
+            },
+            "severity": SEVERITY_WARNING,
+            "code": f"CDS{finding.rule_id}",
+            "source": DIAGNOSTIC_SOURCE,
+            "message": finding.error_string,
+        }
+
+    def _position(self, line: int, byte_column: int) -> dict[str, int]:
+        """
+        Convert a zero-based line and byte column to an LSP position.
+
+        Args:
+            line (int): The zero-based line.
+            byte_column (int): The zero-based column in bytes.
+
+        Returns:
+            dict[str, int]: The position in the negotiated encoding.
+        """
+        line_start = self._line_starts[min(line, len(self._line_starts) - 1)]
+        prefix = self._source[line_start : line_start + byte_column]
+        if self._position_encoding == POSITION_UTF8 or prefix.isascii():
+            return {"line": line, "character": len(prefix)}
+
+        return {"line": line, "character": len(prefix.decode("utf-8", errors="replace").encode("utf-16-le")) // 2}
+
+    def _point(self, offset: int) -> tuple[int, int]:
+        """
+        Convert a byte offset to a tree-sitter point.
+
+        Args:
+            offset (int): The byte offset.
+
+        Returns:
+            tuple[int, int]: The zero-based row and byte column.
+        """
+        row = bisect_right(self._line_starts, offset) - 1
+        return row, offset - self._line_starts[row]
+
+    def _line_bounds(self, line: int) -> tuple[int, int]:
+        """
+        Return the byte range of a line without its line break.
+
+        Args:
+            line (int): The zero-based line.
+
+        Returns:
+            tuple[int, int]: The offsets of the first byte and after the last byte of the line.
+        """
+        line_start = self._line_starts[line]
+        if line + 1 < len(self._line_starts):
+            line_end = self._line_starts[line + 1] - 1
+            if line_end > line_start and self._source[line_end - 1] == CARRIAGE_RETURN:
+                line_end -= 1
+        else:
+            line_end = len(self._source)
+
+        return line_start, line_end
+
+
+def _line_starts(source: bytes) -> list[int]:
+    """
+    Return the byte offsets of all line starts.
+
+    Args:
+        source (bytes): The content.
+
+    Returns:
+        list[int]: The offsets, starting with 0.
+    """
+    line_starts = [0]
+    newline = source.find(NEWLINE)
+    while newline != -1:
+        line_starts.append(newline + 1)
+        newline = source.find(NEWLINE, newline + 1)
+
+    return line_starts
+
+
+def _enclosing_definitions(root: tree_sitter.Node, start: int, end: int) -> list[tuple[int, int, bool]]:
+    """
+    Return the function and class definitions enclosing a range of bytes.
+
+    Args:
+        root (tree_sitter.Node): The root node of the tree.
+        start (int): The start of the range.
+        end (int): The end of the range.
+
+    Returns:
+        list[tuple[int, int, bool]]: The start and end offsets of every definition, innermost first,
+            and whether the range starts in its header, before its body.
+    """
+    definitions: list[tuple[int, int, bool]] = []
+    node: tree_sitter.Node | None = root.descendant_for_byte_range(start, end)
+    while node is not None:
+        if node.type in DEFINITION_SCOPES:
+            body = node.child_by_field_name("body")
+            definitions.append((node.start_byte, node.end_byte, body is None or start < body.start_byte))
+        node = node.parent
+
+    return definitions
+
+
+def _definition_range(root: tree_sitter.Node, offset: int) -> tuple[int, int]:
+    """
+    Return the byte range of the innermost function or class definition enclosing an offset.
+
+    Args:
+        root (tree_sitter.Node): The root node of the tree.
+        offset (int): The byte offset, e.g. the start of a comment.
+
+    Returns:
+        tuple[int, int]: The start and end offsets of the definition, or (-1, -1) at module level.
+    """
+    node: tree_sitter.Node | None = root.descendant_for_byte_range(offset, offset)
+    while node is not None and node.type not in DEFINITION_SCOPES:
+        node = node.parent
+
+    return (node.start_byte, node.end_byte) if node is not None else (-1, -1)
+
+
+def _merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Merge overlapping or adjacent byte ranges.
+
+    Args:
+        ranges (list[tuple[int, int]]): The ranges.
+
+    Returns:
+        list[tuple[int, int]]: The merged ranges, sorted by start.
+    """
+    merged: list[tuple[int, int]] = []
+    for range_start, range_end in sorted(ranges):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+        else:
+            merged.append((range_start, range_end))
+
+    return merged
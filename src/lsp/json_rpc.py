@@ -0,0 +1,92 @@
+"""
+Define the JSON-RPC stream used by the language server: messages framed by a `Content-Length` header.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import json
+import threading
+from typing import Any, BinaryIO
+
+from src.exceptions import ProtocolError
+
+HEADER_ENCODING = "ascii"
+CONTENT_LENGTH = "content-length"
+
+message_type = dict[str, Any]
+
+
+class JsonRpcStream:
+    """
+    Read and write JSON-RPC messages framed as in the Language Server Protocol base protocol.
+
+    Writing is guarded by a lock, so responses and notifications sent from different
+    threads never interleave.
+    """
+
+    def __init__(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            reader (BinaryIO): The stream the client writes to, usually the standard input.
+            writer (BinaryIO): The stream the client reads, usually the standard output.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._write_lock = threading.Lock()
+
+    def read_message(self) -> message_type | None:
+        """
+        Read the next message.
+
+        Returns:
+            dict[str, Any] | None: The decoded message, or None at the end of the stream.
+
+        Raises:
+            ProtocolError: If the header or the content of the message is invalid.
+        """
+        content_length: int | None = None
+        while True:
+            line = self._reader.readline()
+            if not line:
+                return None
+            header = line.decode(HEADER_ENCODING, errors="replace").strip()
+            if not header:
+                break
+            name, _, value = header.partition(":")
+            if name.strip().lower() == CONTENT_LENGTH:
+                try:
+                    content_length = int(value)
+                except ValueError as error:
+                    raise ProtocolError(f"Invalid Content-Length header: '{header}'") from error
+
+        if content_length is None:
+            raise ProtocolError("Missing Content-Length header")
+
+        content = self._reader.read(content_length)
+        if len(content) < content_length:
+            return None
+
+        try:
+            message = json.loads(content)
+        except ValueError as error:
+            raise ProtocolError(f"Invalid JSON content: {error}") from error
+        if not isinstance(message, dict):
+            raise ProtocolError("A message must be a JSON object")
+
+        return message
+
+    def write_message(self, message: message_type) -> None:
+        """
+        Write a message.
+
+        Args:
+            message (dict[str, Any]): The message; the `jsonrpc` version is added automatically.
+        """
+        content = json.dumps({"jsonrpc": "2.0", **message}, ensure_ascii=False, separators=(",", ":")).encode()
+        header = f"Content-Length: {len(content)}\r\n\r\n".encode(HEADER_ENCODING)
+        with self._write_lock:
+            self._writer.write(header + content)
+            self._writer.flush()
@@ -0,0 +1,335 @@
+"""
+Define the language server that publishes CDS diagnostics for the documents open in an editor.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from loguru import logger
+
+from src.config import CDSConfig, load_config
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.exceptions import ConfigError, DictionaryError, FileTypeError, ProtocolError
+from src.lsp.document import POSITION_UTF8, POSITION_UTF16, TextDocument
+from src.lsp.json_rpc import JsonRpcStream
+
+DEBOUNCE_SECONDS = 0.1
+
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+MESSAGE_TYPE_ERROR = 1
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+handler_type = Callable[[dict[str, Any]], Any]
+
+
+class LanguageServer:
+    """
+    Serve the Language Server Protocol over a JSON-RPC stream.
+
+    Every open document keeps its own syntax tree and comments (see TextDocument), and
+    `didChange` edits are applied incrementally. Diagnostics are published from a timer
+    thread once the document has not changed for the debounce interval; a lock keeps the
+    timer and the message loop from touching the documents at the same time.
+    """
+
+    def __init__(self, stream: JsonRpcStream, debounce: float = DEBOUNCE_SECONDS, config: CDSConfig | None = None):
+        """
+        Initialize the server.
+
+        Args:
+            stream (JsonRpcStream): The stream connected to the client.
+            debounce (float): The quiet time in seconds before diagnostics are published. Defaults to DEBOUNCE_SECONDS.
+            config (CDSConfig | None): The rule configuration. Defaults to the `[tool.cdscore]` table of the
+                workspace root sent by the client, or the built-in configuration.
+        """
+        self._stream = stream
+        self._debounce = debounce
+        self._config = config
+        self._checker: CommentChecker | None = None
+        self._position_encoding = POSITION_UTF16
+
+        self._documents: dict[str, TextDocument] = {}
+        self._versions: dict[str, int | None] = {}
+        self._timers: dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+        self._running = True
+        self._shutdown_requested = False
+
+        self._requests: dict[str, handler_type] = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown,
+        }
+        self._notifications: dict[str, handler_type] = {
+            "exit": self._exit,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didClose": self._did_close,
+        }
+
+    def serve(self) -> int:
+        """
+        Process messages until the client sends `exit` or closes the stream.
+
+        Returns:
+            int: The exit code: 0 if `shutdown` was requested before, 1 otherwise.
+        """
+        while self._running:
+            try:
+                message = self._stream.read_message()
+            except ProtocolError as protocol_error:
+                logger.error("Invalid message: {}", protocol_error)
+                self._stream.write_message({"id": None, "error": {"code": PARSE_ERROR, "message": str(protocol_error)}})
+                continue
+            if message is None:
+                break
+            self._dispatch(message)
+
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+
+        return 0 if self._shutdown_requested else 1
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        """
+        Call the handler of a request or notification and send the response of a request.
+
+        Args:
+            message (dict[str, Any]): The received message.
+        """
+        method = message.get("method")
+        if not isinstance(method, str):
+            return
+        params = message.get("params") or {}
+
+        if "id" not in message:
+            notification_handler = self._notifications.get(method)
+            if notification_handler is None:
+                logger.debug("Ignoring notification '{}'", method)
+                return
+            try:
+                notification_handler(params)
+            except Exception as error:
+                logger.exception("Failed to handle '{}': {}", method, error)
+            return
+
+        request_id = message["id"]
+        request_handler = self._requests.get(method)
+        if self._shutdown_requested:
+            self._send_error(request_id, INVALID_REQUEST, "The server is shutting down")
+        elif request_handler is None:
+            self._send_error(request_id, METHOD_NOT_FOUND, f"Unknown method '{method}'")
+        else:
+            try:
+                self._stream.write_message({"id": request_id, "result": request_handler(params)})
+            except Exception as error:
+                logger.exception("Failed to handle '{}': {}", method, error)
+                self._send_error(request_id, INTERNAL_ERROR, str(error))
+
+    def _initialize(self, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Negotiate the position encoding, load the configuration and announce the capabilities.
+
+        Args:
+            params (dict[str, Any]): The `initialize` parameters.
+
+        Returns:
+            dict[str, Any]: The `initialize` result.
+        """
+        encodings = params.get("capabilities", {}).get("general", {}).get("positionEncodings", [])
+        self._position_encoding = POSITION_UTF8 if POSITION_UTF8 in encodings else POSITION_UTF16
+
+        config = self._config
+        root_uri = params.get("rootUri")
+        folders: list[dict[str, Any]] = params.get("workspaceFolders") or []
+        if not root_uri and folders:
+            root_uri = folders[0].get("uri")
+        if config is None and root_uri:
+            try:
+                config = load_config(_uri_to_path(root_uri))
+            except ConfigError as config_error:
+                logger.error("Using the built-in configuration: {}", config_error)
+                message = f"cdscore: {config_error}"
+                self._send_notification("window/showMessage", {"type": MESSAGE_TYPE_ERROR, "message": message})
+        try:
+            self._checker = CommentChecker(config)
+        except DictionaryError as dictionary_error:
+            logger.error("Disabling the spelling rule: {}", dictionary_error)
+            message = f"cdscore: {dictionary_error}"
+            self._send_notification("window/showMessage", {"type": MESSAGE_TYPE_ERROR, "message": message})
+            self._checker = CommentChecker(replace(config, spelling=None) if config is not None else None)
+
+        return {
+            "capabilities": {
+                "positionEncoding": self._position_encoding,
+                "textDocumentSync": {"openClose": True, "change": TEXT_DOCUMENT_SYNC_INCREMENTAL},
+            },
+            "serverInfo": {"name": "cdscore"},
+        }
+
+    def _shutdown(self, params: dict[str, Any]) -> None:
+        """
+        Prepare to exit; the server only accepts the `exit` notification afterwards.
+
+        Args:
+            params (dict[str, Any]): The `shutdown` parameters (unused).
+        """
+        self._shutdown_requested = True
+
+    def _exit(self, params: dict[str, Any]) -> None:
+        """
+        Stop the message loop.
+
+        Args:
+            params (dict[str, Any]): The `exit` parameters (unused).
+        """
+        self._running = False
+
+    def _did_open(self, params: dict[str, Any]) -> None:
+        """
+        Parse a newly opened document and schedule its diagnostics.
+
+        Args:
+            params (dict[str, Any]): The `textDocument/didOpen` parameters.
+        """
+        text_document = params["textDocument"]
+        uri = text_document["uri"]
+        if self._checker is None:
+            self._checker = CommentChecker(self._config)
+
+        with self._lock:
+            try:
+                path = _uri_to_path(uri)
+                document = TextDocument(uri, path, text_document["text"], self._checker, self._position_encoding)
+            except FileTypeError as file_type_error:
+                logger.debug("Not tracking '{}': {}", uri, file_type_error)
+                return
+            self._documents[uri] = document
+            self._versions[uri] = text_document.get("version")
+            self._schedule(uri)
+
+    def _did_change(self, params: dict[str, Any]) -> None:
+        """
+        Apply the edits of a document incrementally and schedule its diagnostics.
+
+        Args:
+            params (dict[str, Any]): The `textDocument/didChange` parameters.
+        """
+        uri = params["textDocument"]["uri"]
+        started = time.perf_counter()
+        with self._lock:
+            document = self._documents.get(uri)
+            if document is None:
+                return
+            document.apply_changes(params["contentChanges"])
+            self._versions[uri] = params["textDocument"].get("version")
+            self._schedule(uri)
+
+        logger.debug("Applied changes to '{}' in {:.2f} ms", uri, (time.perf_counter() - started) * 1000)
+
+    def _did_close(self, params: dict[str, Any]) -> None:
+        """
+        Forget a closed document and clear its diagnostics.
+
+        Args:
+            params (dict[str, Any]): The `textDocument/didClose` parameters.
+        """
+        uri = params["textDocument"]["uri"]
+        with self._lock:
+            timer = self._timers.pop(uri, None)
+            if timer is not None:
+                timer.cancel()
+            self._versions.pop(uri, None)
+            if self._documents.pop(uri, None) is None:
+                return
+            self._send_notification("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def _schedule(self, uri: str) -> None:
+        """
+        Restart the debounce timer of a document; the caller must hold the lock.
+
+        Args:
+            uri (str): The document URI.
+        """
+        timer = self._timers.get(uri)
+        if timer is not None:
+            timer.cancel()
+
+        timer = threading.Timer(self._debounce, self._publish, args=(uri,))
+        timer.daemon = True
+        self._timers[uri] = timer
+        timer.start()
+
+    def _publish(self, uri: str) -> None:
+        """
+        Publish the diagnostics of a document.
+
+        The notification is sent while holding the lock, so diagnostics of an older version
+        computed by another timer can never arrive after newer ones.
+
+        Args:
+            uri (str): The document URI.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            document = self._documents.get(uri)
+            if document is None:
+                return
+            diagnostics = document.diagnostics()
+            params = {"uri": uri, "version": self._versions.get(uri), "diagnostics": diagnostics}
+            self._send_notification("textDocument/publishDiagnostics", params)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.debug("Published {} diagnostic(s) for '{}' in {:.2f} ms", len(diagnostics), uri, elapsed)
+
+    def _send_notification(self, method: str, params: dict[str, Any]) -> None:
+        """
+        Send a notification to the client.
+
+        Args:
+            method (str): The notification method.
+            params (dict[str, Any]): The notification parameters.
+        """
+        self._stream.write_message({"method": method, "params": params})
+
+    def _send_error(self, request_id: Any, code: int, message: str) -> None:
+        """
+        Send an error response.
+
+        Args:
+            request_id (Any): The ID of the failed request.
+            code (int): The JSON-RPC error code.
+            message (str): The error message.
+        """
+        self._stream.write_message({"id": request_id, "error": {"code": code, "message": message}})
+
+
+def _uri_to_path(uri: str) -> Path:
+    """
+    Convert a document URI to a path.
+
+    Args:
+        uri (str): The URI, usually with the `file` scheme.
+
+    Returns:
+        pathlib.Path: The local path, or the URI path for other schemes.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return Path(url2pathname(unquote(parsed.path)))
+    return Path(unquote(parsed.path))
@@ -0,0 +1,91 @@
+"""
+Define the command-line argument parser and the application class for the `lsp` command.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+import sys
+
+from src.logging_setup import setup_logging
+from src.lsp import JsonRpcStream, LanguageServer
+from src.lsp.server import DEBOUNCE_SECONDS
+
+
+class LspArgsParser:
+    """
+    Parse command-line arguments for the `lsp` command.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        """
+        Initialize the parser and parse the arguments.
+
+        Args:
+            argv (list[str]): The list of arguments following the `lsp` command.
+        """
+        parser = argparse.ArgumentParser(
+            prog="cdscore.py lsp",
+            description="Run a Language Server Protocol server over stdio publishing CDS diagnostics.",
+            epilog="Example: cdscore.py lsp --debounce 150",
+        )
+
+        parser.add_argument(
+            "--debounce",
+            type=int,
+            default=int(DEBOUNCE_SECONDS * 1000),
+            help="Quiet time in milliseconds after the last change before diagnostics are published.",
+        )
+        parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output on stderr.")
+
+        self.args = parser.parse_args(argv)
+
+    @property
+    def debounce(self) -> float:
+        """
+        Return the debounce interval.
+
+        Returns:
+            float: The interval in seconds.
+        """
+        debounce: int = self.args.debounce
+        return max(0, debounce) / 1000
+
+    @property
+    def verbose(self) -> bool:
+        """
+        Return the verbose output flag.
+
+        Returns:
+            bool: True if verbose output is enabled, False otherwise.
+        """
+        verbose: bool = self.args.verbose
+        return verbose
+
+
+class LspApp:
+    """
+    The application class of the `lsp` command: serves LSP on the standard input and output.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        """
+        Initialize the application, parse arguments and setup logging to stderr, keeping stdout for the protocol.
+
+        Args:
+            argv (list[str]): The command-line arguments following the `lsp` command.
+        """
+        self._args_parser = LspArgsParser(argv)
+        setup_logging(self._args_parser.verbose, stream=sys.stderr)
+
+    def run(self) -> int:
+        """
+        Serve until the client exits and return the exit code (0 after a clean shutdown, 1 otherwise).
+
+        Returns:
+            int: The application exit code.
+        """
+        stream = JsonRpcStream(sys.stdin.buffer, sys.stdout.buffer)
+        server = LanguageServer(stream, debounce=self._args_parser.debounce)
+        return server.serve()
@@ -1,4 +1,5 @@
 from src.output.abstract_output import AbstractOutput
 from src.output.cli_output import CLIOutput
+from src.output.sqlite_store import SQLiteStore
 
-__all__ = ["AbstractOutput", "CLIOutput"]
+__all__ = ["AbstractOutput", "CLIOutput", "SQLiteStore"]
@@ -0,0 +1,335 @@
+"""
+Define the SQLite store that keeps the files, comments, findings and metadata of every run.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from src.data_types import EnginesEnum, FileResult
+from src.exceptions import StoreError
+
+SCHEMA_VERSION = 2
+BATCH_ROWS = 50000
+
+SCHEMA = """
+CREATE TABLE runs (
+    id INTEGER PRIMARY KEY,
+    started_at INTEGER NOT NULL,
+    finished_at INTEGER,
+    root TEXT NOT NULL,
+    revision TEXT,
+    engine TEXT NOT NULL,
+    score INTEGER,
+    files INTEGER,
+    findings INTEGER
+);
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    path TEXT NOT NULL,
+    lines INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    penalty INTEGER NOT NULL
+);
+CREATE TABLE comments (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    column_start INTEGER NOT NULL,
+    column_end INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    text TEXT NOT NULL,
+    cell INTEGER
+);
+CREATE TABLE findings (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    comment_id INTEGER NOT NULL REFERENCES comments (id),
+    rule_id INTEGER NOT NULL,
+    scope TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX files_path ON files (path);
+CREATE INDEX files_run ON files (run_id);
+CREATE INDEX findings_rule ON findings (rule_id, scope, run_id);
+CREATE INDEX findings_file ON findings (file_id);
+"""
+
+MIGRATIONS = {
+    1: "ALTER TABLE comments ADD COLUMN cell INTEGER;",
+}
+
+
+class SQLiteStore:
+    """
+    Store the results of runs in a SQLite database, so that they can be queried with SQL.
+
+    Every run appends a row to `runs` and its rows to `files`, `comments` (the comments
+    with findings) and `findings`; existing runs are kept. Rows are buffered and inserted
+    in batches of BATCH_ROWS, one transaction per batch, in a database in WAL mode, so
+    readers such as dashboards are not blocked by a running analysis. Row identifiers are
+    checked per batch inside the transaction, so several runs may append to one database.
+    A run interrupted before `finish_run` keeps its rows, with `finished_at` left NULL.
+    The lines of a comment found in a notebook are relative to its `cell`.
+
+    Files, rules and scopes are indexed; the scope of a comment is repeated in its findings,
+    so that one index serves queries by rule and scope. For example, the findings of rule 101 in
+    functions under `services/`, per run:
+
+        SELECT runs.id, runs.started_at, count(*)
+        FROM findings
+        JOIN runs ON runs.id = findings.run_id
+        JOIN files ON files.id = findings.file_id
+        WHERE findings.rule_id = 101 AND findings.scope = 'FUNCTION'
+          AND files.path >= 'services/' AND files.path < 'services0'
+        GROUP BY runs.id ORDER BY runs.started_at;
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open the database, creating its tables if needed.
+
+        Args:
+            path (pathlib.Path): The database file.
+
+        Raises:
+            StoreError: If the file cannot be opened or holds another schema version.
+        """
+        self.path = path
+        self.run_id: int | None = None
+
+        self._files: list[tuple[int, int, str, int, int, int]] = []
+        self._comments: list[tuple[int, int, int, int, int, int, str, str, str, int | None]] = []
+        self._findings: list[tuple[int, int, int, int, str, int, str]] = []
+        self._batch_file_id = self._next_file_id = 1
+        self._batch_comment_id = self._next_comment_id = 1
+        self._file_count = 0
+        self._finding_count = 0
+
+        try:
+            self._connection = sqlite3.connect(path, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute("PRAGMA busy_timeout = 10000")
+            self._create_schema()
+        except sqlite3.Error as error:
+            raise StoreError(f"Cannot open the results database '{path}': {error}") from error
+
+    def start_run(self, root: Path, engine: EnginesEnum, revision: str | None = None) -> int:
+        """
+        Append a run; the following results belong to it.
+
+        Args:
+            root (pathlib.Path): The analyzed path.
+            engine (EnginesEnum): The comment extraction engine.
+            revision (str | None): The analyzed git revision. Defaults to None (the working tree).
+
+        Returns:
+            int: The identifier of the run.
+
+        Raises:
+            StoreError: If the run cannot be written.
+        """
+        try:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (started_at, root, revision, engine) VALUES (?, ?, ?, ?)",
+                (int(time.time()), root.as_posix(), revision, engine.value),
+            )
+        except sqlite3.Error as error:
+            raise StoreError(f"Cannot write the results database '{self.path}': {error}") from error
+        run_id = cursor.lastrowid
+        if run_id is None:
+            raise StoreError(f"Cannot write the results database '{self.path}': the run was not inserted")
+
+        self.run_id = run_id
+        self._file_count = 0
+        self._finding_count = 0
+        self._batch_file_id = self._next_file_id = self._next_id("files")
+        self._batch_comment_id = self._next_comment_id = self._next_id("comments")
+        return run_id
+
+    def add(self, file_result: FileResult) -> None:
+        """
+        Buffer the results of a file, writing a batch once BATCH_ROWS findings and files are buffered.
+
+        Args:
+            file_result (FileResult): The results of a checked file.
+
+        Raises:
+            StoreError: If no run was started or the batch cannot be written.
+        """
+        run_id = self.run_id
+        if run_id is None:
+            raise StoreError("No run was started in the results database")
+
+        file_id = self._next_file_id
+        self._next_file_id += 1
+        path = file_result.file_path.as_posix()
+        self._files.append((file_id, run_id, path, file_result.lines, file_result.score, file_result.penalty))
+        comments, findings = self._comments, self._findings
+        comment_ids: dict[int, tuple[int, str]] = {}
+        for finding in file_result.findings:
+            comment = finding.comment_data
+            known = comment_ids.get(id(comment))
+            if known is None:
+                known = comment_ids[id(comment)] = (self._next_comment_id, comment.scope.name)
+                self._next_comment_id += 1
+                comments.append(
+                    (
+                        known[0],
+                        file_id,
+                        comment.start_line_number,
+                        comment.end_line_number,
+                        comment.column_start,
+                        comment.column_end,
+                        comment.comment_type.name,
+                        known[1],
+                        "\n".join(comment.text),
+                        comment.cell,
+                    )
+                )
+            findings.append((run_id, file_id, known[0], finding.rule_id, known[1], finding.score, finding.error_string))
+
+        self._file_count += 1
+        self._finding_count += len(file_result.findings)
+        if len(findings) + len(self._files) >= BATCH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows in one transaction.
+
+        The rows are numbered from the identifiers that were free when the batch started;
+        if another run appended rows meanwhile, they are renumbered before being written.
+
+        Raises:
+            StoreError: If the rows cannot be written.
+        """
+        if not self._files:
+            return
+
+        files, comments, findings = self._files, self._comments, self._findings
+        self._files, self._comments, self._findings = [], [], []
+        connection = self._connection
+        file_shift = comment_shift = 0
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                file_shift = self._next_id("files") - self._batch_file_id
+                comment_shift = self._next_id("comments") - self._batch_comment_id
+                if file_shift or comment_shift:
+                    files, comments, findings = _renumber(files, comments, findings, file_shift, comment_shift)
+                connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", files)
+                connection.executemany("INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", comments)
+                connection.executemany(
+                    "INSERT INTO findings (run_id, file_id, comment_id, rule_id, scope, score, message)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    findings,
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        except sqlite3.Error as error:
+            raise StoreError(f"Cannot write the results database '{self.path}': {error}") from error
+        finally:
+            self._batch_file_id = self._next_file_id = self._batch_file_id + file_shift + len(files)
+            self._batch_comment_id = self._next_comment_id = self._batch_comment_id + comment_shift + len(comments)
+
+    def finish_run(self, score: int) -> None:
+        """
+        Write the buffered rows and complete the metadata of the run.
+
+        Args:
+            score (int): The final score of the run.
+
+        Raises:
+            StoreError: If the rows cannot be written.
+        """
+        self.flush()
+        try:
+            self._connection.execute(
+                "UPDATE runs SET finished_at = ?, score = ?, files = ?, findings = ? WHERE id = ?",
+                (int(time.time()), score, self._file_count, self._finding_count, self.run_id),
+            )
+        except sqlite3.Error as error:
+            raise StoreError(f"Cannot write the results database '{self.path}': {error}") from error
+
+    def close(self) -> None:
+        """
+        Write the buffered rows and close the database.
+
+        Raises:
+            StoreError: If the rows cannot be written.
+        """
+        try:
+            self.flush()
+        finally:
+            self._connection.close()
+
+    def _create_schema(self) -> None:
+        """
+        Create the tables of a new database and upgrade the schema of an existing one.
+
+        Raises:
+            StoreError: If the database holds a newer schema version.
+        """
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            self._connection.executescript(f"BEGIN; {SCHEMA} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+        elif version > SCHEMA_VERSION:
+            raise StoreError(f"'{self.path}' holds results of unsupported schema version {version}")
+        elif version < SCHEMA_VERSION:
+            upgrade = "".join(MIGRATIONS[old_version] for old_version in range(version, SCHEMA_VERSION))
+            self._connection.executescript(f"BEGIN; {upgrade} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+
+    def _next_id(self, table: str) -> int:
+        """
+        Return the first free row identifier of a table; the caller must hold the write transaction.
+
+        Args:
+            table (str): The table name.
+
+        Returns:
+            int: One more than the largest identifier of the table.
+        """
+        return int(self._connection.execute(f"SELECT coalesce(max(id), 0) + 1 FROM {table}").fetchone()[0])
+
+
+def _renumber(
+    files: list[tuple[int, int, str, int, int, int]],
+    comments: list[tuple[int, int, int, int, int, int, str, str, str, int | None]],
+    findings: list[tuple[int, int, int, int, str, int, str]],
+    file_shift: int,
+    comment_shift: int,
+) -> tuple[list[Any], list[Any], list[Any]]:
+    """
+    Shift the identifiers of buffered rows past the rows another run appended.
+
+    Args:
+        files (list[tuple]): The buffered files.
+        comments (list[tuple]): The buffered comments.
+        findings (list[tuple]): The buffered findings.
+        file_shift (int): The offset of the file identifiers.
+        comment_shift (int): The offset of the comment identifiers.
+
+    Returns:
+        tuple[list[Any], list[Any], list[Any]]: The renumbered files, comments and findings.
+    """
+    return (
+        [(file_id + file_shift, *rest) for file_id, *rest in files],
+        [(comment_id + comment_shift, file_id + file_shift, *rest) for comment_id, file_id, *rest in comments],
+        [
+            (run_id, file_id + file_shift, comment_id + comment_shift, *rest)
+            for run_id, file_id, comment_id, *rest in findings
+        ],
+    )
@@ -0,0 +1,115 @@
+"""
+Define the command-line argument parser and the application class for the `stats` command.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import argparse
+from pathlib import Path
+
+from src.density_calculation.comment_statistics import CommentStatistics
+from src.density_calculation.output_formatter import OutputFormatter
+from src.exceptions import StatisticsError
+from src.logging_setup import setup_logging
+from src.output.cli_output import CLIOutput
+
+
+class StatsArgsParser:
+    """
+    Parse command-line arguments for the `stats` command.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        """
+        Initialize the parser and parse the arguments.
+
+        Args:
+            argv (list[str]): The list of arguments following the `stats` command.
+        """
+        parser = argparse.ArgumentParser(
+            prog="cdscore.py stats",
+            description="Merge comment statistics saved with --stats-file by several runs or shards and print them.",
+            epilog="Example: cdscore.py stats shard-1.json shard-2.json -o merged.json",
+        )
+
+        parser.add_argument("stats_files", nargs="+", type=Path, help="Files written with --stats-file.")
+        parser.add_argument("-o", "--output", type=Path, default=None, help="Save the merged statistics to this file.")
+        parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output.")
+
+        self.args = parser.parse_args(argv)
+
+    @property
+    def stats_files(self) -> list[Path]:
+        """
+        Return the statistics files.
+
+        Returns:
+            list[pathlib.Path]: The files to merge.
+        """
+        stats_files: list[Path] = self.args.stats_files
+        return stats_files
+
+    @property
+    def output_path(self) -> Path | None:
+        """
+        Return the path of the merged statistics.
+
+        Returns:
+            pathlib.Path | None: The output file, or None if the merged statistics are only printed.
+        """
+        output_path: Path | None = self.args.output
+        return output_path
+
+    @property
+    def verbose(self) -> bool:
+        """
+        Return the verbose output flag.
+
+        Returns:
+            bool: True if verbose output is enabled, False otherwise.
+        """
+        verbose: bool = self.args.verbose
+        return verbose
+
+
+class StatsApp:
+    """
+    The application class of the `stats` command: merges and prints comment statistics.
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        """
+        Initialize the application, parse arguments and setup logging.
+
+        Args:
+            argv (list[str]): The command-line arguments following the `stats` command.
+        """
+        self._args_parser = StatsArgsParser(argv)
+        setup_logging(self._args_parser.verbose)
+
+        self._output = CLIOutput()
+
+    def run(self) -> int:
+        """
+        Merge the statistics and return the exit code (0 for success, 1 for failure).
+
+        Returns:
+            int: The application exit code.
+        """
+        first_path, *other_paths = self._args_parser.stats_files
+        output_path = self._args_parser.output_path
+        try:
+            statistics = CommentStatistics.load(first_path)
+            for path in other_paths:
+                statistics.merge(CommentStatistics.load(path))
+            if output_path is not None:
+                statistics.save(output_path)
+        except StatisticsError as error:
+            self._output.message(f"Error: {error}")
+            return 1
+
+        self._output.message(OutputFormatter().statistics_generation(statistics.distributions()))
+        if output_path is not None:
+            self._output.message(f"\nMerged {statistics.count} comment(s) into {output_path}")
+        return 0
@@ -0,0 +1,65 @@
+"""
+Define the fixtures shared by the tests.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from src.cds_app import CDSApp
+from src.data_types import CommentData, EnginesEnum
+from src.density_calculation.finder.comment_finder import CommentFinder
+
+
+@pytest.fixture(autouse=True)
+def quiet_logger() -> Iterator[None]:
+    """
+    Silence the logger during a test.
+
+    Yields:
+        None: Control to the test.
+    """
+    logger.disable("src")
+    yield
+    logger.enable("src")
+
+
+@pytest.fixture
+def find_comments() -> Callable[..., list[CommentData]]:
+    """
+    Return a helper that extracts the comments of a Python source.
+
+    Returns:
+        Callable[..., list[CommentData]]: Takes the source text and an optional engine.
+    """
+
+    def find(source: str, engine: EnginesEnum = EnginesEnum.TREE_SITTER) -> list[CommentData]:
+        return CommentFinder(engine).find_in_bytes(Path("sample.py"), source.encode("utf-8"))
+
+    return find
+
+
+@pytest.fixture
+def run_app(capsys: pytest.CaptureFixture[str]) -> Callable[[list[str]], tuple[int, str]]:
+    """
+    Return a helper that runs the application with its messages enabled.
+
+    Args:
+        capsys (pytest.CaptureFixture[str]): Captures the standard output the messages are logged to.
+
+    Returns:
+        Callable[[list[str]], tuple[int, str]]: Takes the command-line arguments and returns
+            the exit code and the printed messages.
+    """
+
+    def run(argv: list[str]) -> tuple[int, str]:
+        logger.enable("src")
+        exit_code = CDSApp(argv).run()
+        return exit_code, capsys.readouterr().out
+
+    return run
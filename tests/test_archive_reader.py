@@ -0,0 +1,105 @@
+"""
+Test analyzing the Python files packaged in tarballs, wheels and zip files without extracting them.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import tarfile
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.density_calculation.finder.archive_reader import ArchiveReader
+from src.exceptions import ArchiveError
+
+
+def write_tree(root: Path) -> list[Path]:
+    """
+    Write a package with commented-out code, copied docstrings, a notebook and a file of another type.
+
+    Args:
+        root (pathlib.Path): The directory to fill.
+
+    Returns:
+        list[pathlib.Path]: The written files, in path order.
+    """
+    package = root / "pkg"
+    (package / "sub").mkdir(parents=True)
+    files = {
+        "README.md": "# value = compute(1)\n",
+        "pkg/__init__.py": '"""Parse the configuration file and return the validated settings."""\n',
+        "pkg/core.py": "# value = compute(1)\nvalue = 1\n\n\ndef run(path):\n    # result = read(path)\n    return 1\n",
+        "pkg/sub/tools.py": '"""Parse the configuration file and return the validated settings."""\n# TODO: fix\n',
+        "pkg/sub/notes.ipynb": '{"cells": [{"cell_type": "code", "source": ["# total = value + 2\\n", "x = 1"]}]}',
+    }
+    for name, content in files.items():
+        (root / name).write_text(content, encoding="utf-8")
+    return sorted(root / name for name in files)
+
+
+def report(output: str, prefix: str, directory: Path) -> list[str]:
+    """
+    Return the printed report with the paths of the archive members replaced by the paths in the directory.
+
+    Args:
+        output (str): The printed messages.
+        prefix (str): The path of the archive and its root inside the archive, e.g. `pkg.tar!/pkg-1.0/`.
+        directory (pathlib.Path): The directory the archive was made of.
+
+    Returns:
+        list[str]: The report lines after the analyzed path, in a stable order.
+    """
+    lines = output.replace(prefix, f"{directory}/").splitlines()
+    return sorted(line for line in lines if not line.startswith("Path analyze:"))
+
+
+@pytest.mark.parametrize("suffix", [".tar", ".tar.gz", ".tar.xz", ".whl", ".zip"])
+def test_archive_gives_the_report_of_the_directory(
+    tmp_path: Path, run_app: Callable[[list[str]], tuple[int, str]], suffix: str
+) -> None:
+    tree, archive = tmp_path / "tree", tmp_path / f"pkg-1.0{suffix}"
+    paths = write_tree(tree)
+    prefix = f"{archive}!/"
+    if suffix.endswith((".whl", ".zip")):
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for path in paths:
+                zip_file.write(path, path.relative_to(tree).as_posix())
+    else:
+        with tarfile.open(archive, f"w:{suffix.removeprefix('.tar').lstrip('.')}") as tar_file:
+            tar_file.add(tree, arcname="pkg-1.0")
+        prefix += "pkg-1.0/"
+
+    directory_code, directory_output = run_app([str(tree)])
+    archive_code, archive_output = run_app([str(archive)])
+
+    assert archive_code == directory_code == 1
+    assert prefix in archive_output
+    assert report(archive_output, prefix, tree) == report(directory_output, prefix, tree)
+    assert "README.md" not in archive_output
+
+
+def test_members_of_other_types_are_skipped(tmp_path: Path) -> None:
+    tree, archive = tmp_path / "tree", tmp_path / "pkg.tar.gz"
+    write_tree(tree)
+    with tarfile.open(archive, "w:gz") as tar_file:
+        tar_file.add(tree, arcname="pkg-1.0")
+
+    members = [path.as_posix().split("!/")[1] for path, _ in ArchiveReader(archive).iter_sources()]
+
+    assert sorted(members) == [
+        "pkg-1.0/pkg/__init__.py",
+        "pkg-1.0/pkg/core.py",
+        "pkg-1.0/pkg/sub/notes.ipynb",
+        "pkg-1.0/pkg/sub/tools.py",
+    ]
+
+
+def test_damaged_archive_is_reported(tmp_path: Path) -> None:
+    archive = tmp_path / "pkg.tar.gz"
+    archive.write_bytes(b"\x1f\x8b\x08\x00 not really gzip")
+
+    with pytest.raises(ArchiveError):
+        list(ArchiveReader(archive).iter_sources())
@@ -0,0 +1,59 @@
+"""
+Test writing a baseline of known findings and reporting only the findings it does not record.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.density_calculation.baseline import Baseline
+from src.exceptions import BaselineError
+
+
+def write_tree(root: Path) -> None:
+    """
+    Write two Python files with commented-out code.
+
+    Args:
+        root (pathlib.Path): The directory to fill.
+    """
+    for name in ("first.py", "second.py"):
+        (root / name).write_text("# value = compute(1)\nvalue = 1\n", encoding="utf-8")
+
+
+def test_baseline_of_a_tree_leaves_only_new_findings(
+    tmp_path: Path, run_app: Callable[[list[str]], tuple[int, str]]
+) -> None:
+    tree, baseline = tmp_path / "tree", tmp_path / "cds-baseline.bin"
+    tree.mkdir()
+    write_tree(tree)
+
+    exit_code, output = run_app([str(tree), "--write-baseline", str(baseline)])
+    assert exit_code == 1
+    assert "Recorded 2 finding(s)" in output
+
+    exit_code, output = run_app([str(tree), "--baseline", str(baseline)])
+    assert exit_code == 0
+    assert "Left out 2 finding(s)" in output
+    assert "Final CDS: 0" in output
+
+    (tree / "first.py").write_text(
+        "import os\n\n    # value = compute(1)\nvalue = 1\n# total = value + 2\n", encoding="utf-8"
+    )
+    exit_code, output = run_app([str(tree), "--baseline", str(baseline)])
+    assert exit_code == 1
+    assert "Left out 2 finding(s)" in output
+    assert "first.py:" in output and "second.py:" not in output
+    assert "Final CDS: -5" in output
+
+
+def test_other_files_are_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "cds-baseline.bin"
+    path.write_bytes(b"CDSBASE1 but not a hash table")
+
+    with pytest.raises(BaselineError):
+        Baseline(path, tmp_path)
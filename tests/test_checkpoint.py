@@ -0,0 +1,95 @@
+"""
+Test journaling the results of a run and resuming it after an interruption.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from src.density_calculation.checkpoint import Checkpoint
+
+DOCSTRING = "Parse the configuration file and return the validated settings of the whole application."
+
+
+def write_tree(root: Path, files: int = 12) -> list[Path]:
+    """
+    Write Python files with commented-out code, docstrings copied across files and nested definitions.
+
+    Args:
+        root (pathlib.Path): The directory to fill.
+        files (int): The number of files. Defaults to 12.
+
+    Returns:
+        list[pathlib.Path]: The written files, in path order.
+    """
+    paths = []
+    for index in range(files):
+        path = root / f"module_{index:02}.py"
+        path.write_text(
+            f"# value = compute({index})\n"
+            "class Loader:\n"
+            f"    def load_{index}(self, path):\n"
+            f'        """{DOCSTRING}"""\n'
+            "        # result = read(path)\n"
+            "        def inner():\n"
+            "            # TODO: handle errors\n"
+            "            return path\n"
+            "        return inner\n",
+            encoding="utf-8",
+        )
+        paths.append(path)
+    return paths
+
+
+def report(output: str) -> list[str]:
+    """
+    Return the printed report without the message about the restored files.
+
+    Args:
+        output (str): The printed messages.
+
+    Returns:
+        list[str]: The other lines.
+    """
+    return [line for line in output.splitlines() if not line.startswith("Restored ")]
+
+
+def test_resumed_run_equals_an_uninterrupted_run(
+    tmp_path: Path, run_app: Callable[[list[str]], tuple[int, str]]
+) -> None:
+    tree, journal = tmp_path / "tree", tmp_path / "cds.ckpt"
+    tree.mkdir()
+    paths = write_tree(tree)
+    run_app([str(tree), "--checkpoint", str(journal)])
+
+    lines = journal.read_bytes().splitlines(keepends=True)
+    assert len(lines) == len(paths) + 1
+    journal.write_bytes(b"".join(lines[:6]) + lines[6][: len(lines[6]) // 2])
+    kept = {json.loads(line)["path"] for line in lines[1:6]}
+    paths[0].write_text(paths[0].read_text(encoding="utf-8") + "# other = compute(0)\n", encoding="utf-8")
+    exit_code, expected = run_app([str(tree)])
+
+    resumed_code, resumed = run_app([str(tree), "--checkpoint", str(journal), "--resume"])
+
+    assert f"Restored {len(kept - {paths[0].as_posix()})} unchanged file(s)" in resumed
+    assert resumed_code == exit_code
+    assert report(resumed) == report(expected)
+    journaled = {json.loads(line)["path"] for line in journal.read_bytes().splitlines()[1:]}
+    assert journaled == {path.as_posix() for path in paths}
+
+
+def test_journal_of_other_rules_is_discarded(tmp_path: Path) -> None:
+    journal = tmp_path / "cds.ckpt"
+    Checkpoint(journal, "rules-1").close()
+    journal.write_bytes(journal.read_bytes() + b'{"path": "a.py", "size": 1, "digest": "00"}\n')
+
+    same_rules = Checkpoint(journal, "rules-1", resume=True)
+    same_rules.close()
+    other_rules = Checkpoint(journal, "rules-2", resume=True)
+    other_rules.close()
+
+    assert len(same_rules) == 1
+    assert len(other_rules) == 0
@@ -0,0 +1,61 @@
+"""
+Test measuring the code, comment and blank lines and the definitions of files during extraction.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.data_types import CodeMetrics, EnginesEnum
+from src.density_calculation.finder.comment_finder import CommentFinder
+
+SOURCE = '''"""Module docstring."""
+
+import os  # a trailing comment is code
+
+class Loader:
+    """
+    Load files.
+
+    More details.
+    """
+    \t
+    def load(self, path):
+        # read it
+        def inner():
+            return "# not a comment"
+        return inner
+
+async def main():
+    return None'''
+
+
+@pytest.mark.parametrize("engine", list(EnginesEnum))
+def test_every_line_is_code_comment_or_blank(engine: EnginesEnum) -> None:
+    metrics = CommentFinder(engine).find_and_measure(Path("module.py"), SOURCE.encode())[1]
+
+    assert metrics == CodeMetrics(lines=19, code_lines=8, comment_lines=6, blank_lines=5, functions=3, classes=1)
+
+
+def test_metrics_of_files_add_up() -> None:
+    first = CodeMetrics(10, 6, 2, 2, 1, 0)
+    second = CodeMetrics(5, 5, 0, 0, 0, 1)
+
+    assert first + second == CodeMetrics(15, 11, 2, 2, 1, 1)
+    assert sum((first, second), CodeMetrics()) == first + second
+
+
+def test_run_reports_the_size_and_the_penalty_per_kloc(
+    tmp_path: Path, run_app: Callable[[list[str]], tuple[int, str]]
+) -> None:
+    (tmp_path / "module.py").write_text(SOURCE, encoding="utf-8")
+    (tmp_path / "other.py").write_text("# value = compute(1)\nvalue = 1\n\n", encoding="utf-8")
+
+    output = run_app([str(tmp_path), "--min-cds", "-100"])[1]
+
+    assert "Code: 22 lines (9 code, 7 comment, 6 blank), 3 functions, 1 classes" in output
+    assert "Penalty per KLOC: 555.56" in output
@@ -0,0 +1,196 @@
+"""
+Test the verdict cache of the comment checker for repeated comments.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections import Counter
+from collections.abc import Callable
+
+import pytest
+
+from src.config import CDSConfig, TextRuleConfig
+from src.data_types import CheckerData, CommentData
+from src.density_calculation.checker.abc_rule.rule import CheckerRule
+from src.density_calculation.checker.abc_rule.specification import Spec
+from src.density_calculation.checker.abc_rule.strategy import Strategy
+from src.density_calculation.checker.comment_checker import CommentChecker
+
+SOURCE = '''# value = compute(1)
+value = 1
+
+
+def load(path):
+    """
+    Load a file.
+
+    Args:
+        path (str): The file.
+    """
+    # value = compute(1)
+    return path
+
+
+def read(source):
+    """
+    Load a file.
+
+    Args:
+        path (str): The file.
+    """
+    return source
+
+
+# value = compute(1)
+'''
+
+
+class ComputeSpec(Spec):
+    """
+    Find comments that mention `compute`.
+    """
+
+    def find_error(self, comment: CommentData) -> bool:
+        """
+        Check whether a line of the comment mentions `compute`.
+
+        Args:
+            comment (CommentData): Comment details.
+
+        Returns:
+            bool: True if the comment mentions `compute`.
+        """
+        return any("compute" in line for line in comment.text)
+
+
+class ComputeStrategy(Strategy):
+    """
+    Report comments that mention `compute`.
+    """
+
+    def generate_error_data(self, comment: CommentData) -> CheckerData:
+        """
+        Build the finding of a comment that mentions `compute`.
+
+        Args:
+            comment (CommentData): Comment details.
+
+        Returns:
+            CheckerData: The finding.
+        """
+        return CheckerData(-1, comment, "Comment mentions compute.", 900)
+
+
+class ComputeRule(CheckerRule):
+    """
+    Cacheable rule whose verdict depends only on the comment text.
+    """
+
+    def _create_specification(self) -> Spec:
+        """
+        Create the specification of the rule.
+
+        Returns:
+            Spec: The specification.
+        """
+        return ComputeSpec()
+
+    def _create_strategy(self) -> Strategy:
+        """
+        Create the strategy of the rule.
+
+        Returns:
+            Strategy: The strategy.
+        """
+        return ComputeStrategy()
+
+    def _set_code(self) -> int:
+        """
+        Set the unique identifier code for the rule.
+
+        Returns:
+            int: The rule code.
+        """
+        return 900
+
+
+def count_rule_runs(checker: CommentChecker, monkeypatch: pytest.MonkeyPatch) -> Counter[int]:
+    """
+    Count how often every registered rule of a checker is run.
+
+    Args:
+        checker (CommentChecker): The checker whose rules are counted.
+        monkeypatch (pytest.MonkeyPatch): Wraps the `check` method of every rule.
+
+    Returns:
+        Counter[int]: The number of runs, by rule code; filled while the checker is used.
+    """
+    runs: Counter[int] = Counter()
+    for checker_rule in checker.rules:
+
+        def counted(
+            comment: CommentData,
+            check: Callable[[CommentData], CheckerData | None] = checker_rule.check,
+            code: int = checker_rule.code,
+        ) -> CheckerData | None:
+            runs[code] += 1
+            return check(comment)
+
+        monkeypatch.setattr(checker_rule, "check", counted)
+    return runs
+
+
+def test_cache_hit_is_bound_to_the_new_comment(
+    find_comments: Callable[..., list[CommentData]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first, _, second = [comment for comment in find_comments(SOURCE) if comment.text == ["value = compute(1)"]]
+    checker = CommentChecker(rule_classes=[ComputeRule])
+    runs = count_rule_runs(checker, monkeypatch)
+
+    checker.check(first)
+    findings = checker.check(second)
+
+    assert runs[900] == 1
+    assert [finding.rule_id for finding in findings] == [900]
+    assert findings[0].comment_data is second
+    assert (findings[0].comment_data.start_line_number, findings[0].comment_data.end_line_number) == (26, 26)
+
+
+def test_other_rule_set_misses_the_cache(
+    find_comments: Callable[..., list[CommentData]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    comment = find_comments(SOURCE)[0]
+    config = CDSConfig(text_rules=(TextRuleConfig(rule_id=901, score=-1, forbidden=("value",)),))
+    checker = CommentChecker(rule_classes=[ComputeRule])
+    other = CommentChecker(config, rule_classes=[ComputeRule])
+    runs = count_rule_runs(checker, monkeypatch)
+
+    checker.check(comment)
+    checker.check(comment)
+    assert runs[900] == 1
+    assert other.fingerprint != checker.fingerprint == CommentChecker(rule_classes=[ComputeRule]).fingerprint
+
+    monkeypatch.setattr(checker, "fingerprint", other.fingerprint)
+    checker.check(comment)
+
+    assert runs[900] == 2
+    assert [finding.rule_id for finding in other.check(comment)] == [901, 900]
+
+
+def test_rule_that_is_not_cacheable_runs_for_every_position(
+    find_comments: Callable[..., list[CommentData]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    load, read = [comment for comment in find_comments(SOURCE) if comment.definition is not None]
+    checker = CommentChecker()
+    runs = count_rule_runs(checker, monkeypatch)
+
+    load_findings = checker.check(load)
+    read_findings = checker.check(read)
+
+    assert load.text == read.text
+    assert runs[106] == 2
+    assert 106 not in [finding.rule_id for finding in load_findings]
+    assert [finding.error_string for finding in read_findings if finding.rule_id == 106] == [
+        "Docstring does not match the signature of 'read': undocumented 'source'; no parameter 'path'."
+    ]
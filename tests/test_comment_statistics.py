@@ -0,0 +1,116 @@
+"""
+Test the quantile sketches of comment lengths and merging the statistics of several shards.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import bisect
+import random
+from pathlib import Path
+
+import pytest
+
+from src.data_types import CommentData, CommentScope, CommentType
+from src.density_calculation.comment_statistics import CommentStatistics, KLLSketch
+from src.exceptions import StatisticsError
+
+FRACTIONS = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99)
+
+
+def rank_error(values: list[float], sketch: KLLSketch, fraction: float) -> float:
+    """
+    Return how far the rank of an estimated quantile is from the requested one.
+
+    Args:
+        values (list[float]): The sorted stream.
+        sketch (KLLSketch): The sketch of the stream.
+        fraction (float): The requested quantile.
+
+    Returns:
+        float: The distance between the requested fraction and the range of fractions the estimate has.
+    """
+    estimate = sketch.quantile(fraction)
+    low = bisect.bisect_left(values, estimate) / len(values)
+    high = bisect.bisect_right(values, estimate) / len(values)
+    return max(low - fraction, fraction - high, 0.0)
+
+
+def test_merged_shards_estimate_the_quantiles_of_the_whole_stream() -> None:
+    generator = random.Random(46)
+    values = [generator.lognormvariate(3, 1) for _ in range(100_000)]
+    shards = [KLLSketch() for _ in range(8)]
+    for index, shard in enumerate(shards):
+        shard.update(values[index::8])
+
+    merged = KLLSketch()
+    for shard in shards:
+        merged.merge(shard)
+    values.sort()
+
+    assert merged.count == len(values)
+    assert (merged.minimum, merged.maximum) == (values[0], values[-1])
+    assert sum(len(items) for items in merged.to_json()["levels"]) <= 3 * merged.k
+    assert max(rank_error(values, merged, fraction) for fraction in FRACTIONS) < 0.01
+
+
+def test_merging_an_empty_sketch_changes_nothing_and_k_must_match() -> None:
+    sketch = KLLSketch()
+    sketch.update(range(1000))
+    before = sketch.to_json()
+
+    sketch.merge(KLLSketch())
+
+    assert sketch.to_json() == before
+    with pytest.raises(StatisticsError):
+        sketch.merge(KLLSketch(k=100))
+
+
+def make_comments(count: int, seed: int) -> list[CommentData]:
+    """
+    Build inline comments and docstrings of random lengths.
+
+    Args:
+        count (int): The number of comments.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list[CommentData]: The comments.
+    """
+    generator = random.Random(seed)
+    comments = []
+    for line in range(1, count + 1):
+        comment_type = CommentType.DOCSTRING if line % 4 == 0 else CommentType.INLINE
+        text = ["x" * generator.randint(1, 120) for _ in range(generator.randint(1, 3))]
+        comments.append(CommentData(Path("module.py"), text, line, line, 1, 2, comment_type, CommentScope.FUNCTION))
+    return comments
+
+
+def test_statistics_saved_by_shards_merge_into_the_statistics_of_the_run(tmp_path: Path) -> None:
+    comments = make_comments(3000, seed=46)
+    whole = CommentStatistics()
+    whole.add(comments)
+    for shard in range(3):
+        statistics = CommentStatistics()
+        statistics.add(comments[shard::3])
+        statistics.save(tmp_path / f"shard-{shard}.json")
+
+    merged = CommentStatistics.load(tmp_path / "shard-0.json")
+    for shard in (1, 2):
+        merged.merge(CommentStatistics.load(tmp_path / f"shard-{shard}.json"))
+
+    assert merged.count == whole.count == len(comments)
+    for merged_group, whole_group in zip(merged.distributions(), whole.distributions(), strict=True):
+        assert (merged_group.comment_type, merged_group.scope) == (whole_group.comment_type, whole_group.scope)
+        assert merged_group.length_histogram == whole_group.length_histogram
+        assert merged_group.length.maximum == whole_group.length.maximum
+        assert merged_group.lines.p50 == whole_group.lines.p50
+        assert merged_group.length.p50 == pytest.approx(whole_group.length.p50, rel=0.05)
+
+
+def test_invalid_statistics_file_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "statistics.json"
+    path.write_text('{"version": 1, "k": 200, "groups": [{"type": "INLINE"}]}', encoding="utf-8")
+
+    with pytest.raises(StatisticsError):
+        CommentStatistics.load(path)
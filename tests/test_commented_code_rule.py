@@ -0,0 +1,74 @@
+"""
+Test the commented-out code rule.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections.abc import Callable
+
+import pytest
+import tree_sitter
+
+from src.data_types import CommentData, LanguagesEnum
+from src.density_calculation.checker.rules import commented_code_rule
+from src.density_calculation.checker.rules.commented_code_rule import CommentedCodeRule
+from src.density_calculation.finder.syntax_analyzer import SyntaxAnalyzer
+
+SOURCE = """x = 1
+# result = compute(x)
+# print(result)
+y = 2
+# This explains why the value of y is two.
+z = 3
+# if z > 2:
+#     z = 2
+"""
+
+
+def commented_code(source: str, find_comments: Callable[..., list[CommentData]]) -> list[int]:
+    """
+    Return the first line of every run of commented-out code.
+
+    Args:
+        source (str): The Python source.
+        find_comments (Callable[..., list[CommentData]]): The comment extraction helper.
+
+    Returns:
+        list[int]: The start line of every reported run.
+    """
+    results = CommentedCodeRule().check_file(find_comments(source))
+    return [result.comment_data.start_line_number for result in results]
+
+
+def test_runs_of_code_are_reported_and_prose_is_not(find_comments: Callable[..., list[CommentData]]) -> None:
+    assert commented_code(SOURCE, find_comments) == [2, 7]
+
+
+def test_pragmas_are_not_code(find_comments: Callable[..., list[CommentData]]) -> None:
+    assert commented_code("x = f()  # type: ignore\ny = 1  # noqa: E501\n", find_comments) == []
+
+
+def test_cache_keeps_recently_used_verdicts(
+    find_comments: Callable[..., list[CommentData]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(commented_code_rule, "VERDICT_CACHE_SIZE", 2)
+    rule = CommentedCodeRule()
+    first, second, third = (find_comments(f"# value_{index} = compute()\n") for index in range(3))
+    for comments in (first, second, first, third):
+        rule.check_file(comments)
+
+    parses: list[bytes] = []
+    parse = SyntaxAnalyzer.parse
+
+    def counted(
+        analyzer: SyntaxAnalyzer, code_bytes: bytes, language: LanguagesEnum, timeout: float | None = None
+    ) -> tree_sitter.Tree:
+        parses.append(code_bytes.strip())
+        return parse(analyzer, code_bytes, language, timeout)
+
+    monkeypatch.setattr(SyntaxAnalyzer, "parse", counted)
+    verdicts = [len(rule.check_file(comments)) for comments in (third, first, second)]
+
+    assert verdicts == [1, 1, 1]
+    assert parses == [b"value_1 = compute()"]
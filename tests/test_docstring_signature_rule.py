@@ -0,0 +1,108 @@
+"""
+Test the rule comparing the parameters documented in function docstrings with the signatures.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections.abc import Callable
+
+import pytest
+
+from src.data_types import CommentData, CommentType, EnginesEnum
+from src.density_calculation.checker.rules.docstring_signature_rule import DocstringSignatureRule
+
+SOURCE = '''
+class Parser:
+    def google(self, text, strict=False):
+        """
+        Parse a text.
+
+        Args:
+            text (str): The text.
+            mode (str): The mode.
+
+        Returns:
+            str: The result.
+        """
+
+    def numpy(path, *args, encoding="utf-8"):
+        """
+        Read a file.
+
+        Parameters
+        ----------
+        path : str
+            The file.
+        *args
+            Passed on.
+
+        Returns
+        -------
+        str
+        """
+
+    def rest(cls, name, value):
+        """
+        Set a value.
+
+        :param name: The name.
+        :param str value: The value.
+        """
+
+    def keywords(self, name, **options):
+        """
+        Configure.
+
+        Args:
+            name (str): The name.
+            verbose (bool): Print more.
+            **options: The other options.
+        """
+
+    def undocumented(self, name):
+        """Return the name without a parameter section."""
+'''
+
+
+def messages(comments: list[CommentData]) -> dict[str, str]:
+    """
+    Check the function docstrings and return the message of every violation by function name.
+
+    Args:
+        comments (list[CommentData]): The comments of a file.
+
+    Returns:
+        dict[str, str]: The messages, by name of the documented function.
+    """
+    rule = DocstringSignatureRule()
+    results = {}
+    for comment in comments:
+        if comment.comment_type is CommentType.DOCSTRING and comment.definition is not None:
+            result = rule.check(comment)
+            if result is not None:
+                results[comment.definition.name] = result.error_string
+    return results
+
+
+@pytest.mark.parametrize("engine", list(EnginesEnum))
+def test_parameter_sections_are_compared_with_signatures(
+    find_comments: Callable[..., list[CommentData]], engine: EnginesEnum
+) -> None:
+    assert messages(find_comments(SOURCE, engine)) == {
+        "google": "Docstring does not match the signature of 'google': undocumented 'strict'; no parameter 'mode'.",
+        "numpy": "Docstring does not match the signature of 'numpy': undocumented 'encoding'.",
+    }
+
+
+def test_renamed_parameter_is_reported_until_the_docstring_follows(
+    find_comments: Callable[..., list[CommentData]],
+) -> None:
+    before = 'def load(path):\n    """\n    Load.\n\n    Args:\n        path (str): The file.\n    """\n'
+    renamed = before.replace("load(path)", "load(source)")
+
+    assert messages(find_comments(before)) == {}
+    assert messages(find_comments(renamed)) == {
+        "load": "Docstring does not match the signature of 'load': undocumented 'source'; no parameter 'path'."
+    }
+    assert messages(find_comments(renamed.replace("path (str)", "source (str)"))) == {}
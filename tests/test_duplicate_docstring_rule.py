@@ -0,0 +1,151 @@
+"""
+Test the near-duplicate docstring rule.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import random
+from pathlib import Path
+
+from src.data_types import CheckerData, CommentData, CommentScope, CommentType
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.checker.rules.duplicate_docstring_rule import DuplicateDocstringRule
+from src.lsp.document import TextDocument
+
+DOCSTRING = "Parse the configuration file and return the validated settings of the whole application."
+OTHER_DOCSTRING = "Render the report of every analyzed file as a table sorted by the final score."
+
+
+def source(name: str, docstring: str = DOCSTRING) -> str:
+    """
+    Return the source of a function with a docstring.
+
+    Args:
+        name (str): The function name.
+        docstring (str): The docstring text.
+
+    Returns:
+        str: The source.
+    """
+    return f'def {name}():\n    """{docstring}"""\n    return 1\n'
+
+
+def docstrings(path: str, texts: list[str]) -> list[CommentData]:
+    """
+    Return the comments of a file holding one docstring per line.
+
+    Args:
+        path (str): The file path.
+        texts (list[str]): The docstrings.
+
+    Returns:
+        list[CommentData]: The docstrings, in source order.
+    """
+    return [
+        CommentData(Path(path), [text], line, line, 1, len(text), CommentType.DOCSTRING, CommentScope.FUNCTION)
+        for line, text in enumerate(texts, start=1)
+    ]
+
+
+def summary(results: list[CheckerData]) -> list[tuple[str, int, str]]:
+    """
+    Return the file, line and message of every result.
+
+    Args:
+        results (list[CheckerData]): The results.
+
+    Returns:
+        list[tuple[str, int, str]]: The summaries.
+    """
+    return [
+        (str(result.comment_data.file_path), result.comment_data.start_line_number, result.error_string)
+        for result in results
+    ]
+
+
+def duplicate_codes(document: TextDocument) -> list[str]:
+    """
+    Return the near-duplicate docstring diagnostics of a document.
+
+    Args:
+        document (TextDocument): The document.
+
+    Returns:
+        list[str]: The code of every diagnostic of rule 104.
+    """
+    return [diagnostic["code"] for diagnostic in document.diagnostics() if diagnostic["code"] == "CDS104"]
+
+
+def test_copy_in_another_document_is_reported() -> None:
+    checker = CommentChecker()
+    first = TextDocument("file:///a.py", Path("/a.py"), source("a"), checker)
+    second = TextDocument("file:///b.py", Path("/b.py"), source("b"), checker)
+
+    assert duplicate_codes(first) == []
+    assert duplicate_codes(second) == ["CDS104"]
+
+
+def test_rechecking_a_document_does_not_match_its_previous_version() -> None:
+    checker = CommentChecker()
+    document = TextDocument("file:///a.py", Path("/a.py"), source("a"), checker)
+
+    assert duplicate_codes(document) == []
+    document.apply_changes([{"text": source("renamed")}])
+    assert duplicate_codes(document) == []
+
+
+def test_document_edited_down_to_no_comment_is_forgotten() -> None:
+    checker = CommentChecker()
+    first = TextDocument("file:///a.py", Path("/a.py"), source("a"), checker)
+    second = TextDocument("file:///b.py", Path("/b.py"), source("b"), checker)
+    assert duplicate_codes(first) == []
+
+    first.apply_changes([{"text": "x = 1\n"}])
+    assert duplicate_codes(first) == []
+    assert duplicate_codes(second) == []
+
+
+def test_checking_an_edited_file_again_matches_a_fresh_rule() -> None:
+    generator = random.Random(39)
+    words = DOCSTRING.split() + OTHER_DOCSTRING.split()
+    other = docstrings("/other.py", [DOCSTRING, OTHER_DOCSTRING])
+    texts = [DOCSTRING, OTHER_DOCSTRING, "Short one.", DOCSTRING]
+    incremental = DuplicateDocstringRule()
+    incremental.check_file(other)
+
+    for _ in range(200):
+        action = generator.randrange(4)
+        if action == 0 or not texts:
+            texts.insert(generator.randint(0, len(texts)), generator.choice([DOCSTRING, OTHER_DOCSTRING, *texts]))
+        elif action == 1:
+            texts.pop(generator.randrange(len(texts)))
+        elif action == 2:
+            index = generator.randrange(len(texts))
+            changed = texts[index].split()
+            changed[generator.randrange(len(changed))] = generator.choice(words)
+            texts[index] = " ".join(changed)
+        else:
+            generator.shuffle(texts)
+
+        fresh = DuplicateDocstringRule()
+        fresh.check_file(other)
+        comments = docstrings("/edited.py", texts)
+        if not comments:
+            incremental.forget_file(Path("/edited.py"))
+        assert summary(incremental.check_file(comments)) == summary(fresh.check_file(comments)), texts
+
+
+def test_ordered_files_report_the_files_whose_verdicts_changed() -> None:
+    file_rule = DuplicateDocstringRule()
+    file_rule.order_files(lambda path: path.as_posix())
+
+    assert file_rule.check_file(docstrings("b.py", [DOCSTRING])) == []
+    assert file_rule.check_file(docstrings("a.py", [DOCSTRING])) == []
+    assert summary(file_rule.refresh_stale_files()[Path("b.py")]) == [
+        ("b.py", 1, "Near-duplicate docstring (100%) of a.py:1.")
+    ]
+    assert file_rule.refresh_stale_files() == {}
+
+    file_rule.forget_file(Path("a.py"))
+    assert file_rule.refresh_stale_files() == {Path("b.py"): []}
@@ -0,0 +1,120 @@
+"""
+Test the file lists read from a file or the standard input with `--files-from`.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import io
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.density_calculation.finder.file_list import iter_listed_paths
+
+
+class ChunkedStream(io.BufferedIOBase):
+    """
+    Return a list a few bytes at a time, like a pipe the writer has not finished.
+    """
+
+    def __init__(self, data: bytes, size: int) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            data (bytes): The whole list.
+            size (int): The number of bytes returned by every read.
+        """
+        self._data = data
+        self._size = size
+
+    def read1(self, size: int = -1) -> bytes:
+        """
+        Return the next chunk of the list.
+
+        Args:
+            size (int): The largest chunk the reader accepts.
+
+        Returns:
+            bytes: At most `size` bytes; empty at the end of the list.
+        """
+        chunk, self._data = self._data[: self._size], self._data[self._size :]
+        return chunk
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_newline_separated_list(chunk_size: int) -> None:
+    stream = ChunkedStream(b"a.py\r\nsub dir/b.py\n\nc.py", chunk_size)
+
+    assert list(iter_listed_paths(stream)) == [Path("a.py"), Path("sub dir/b.py"), Path("c.py")]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_nul_separated_list_keeps_newlines_in_names(chunk_size: int) -> None:
+    stream = ChunkedStream(b"a.py\0odd\nname.py\r\0\0", chunk_size)
+
+    assert list(iter_listed_paths(stream)) == [Path("a.py"), Path("odd\nname.py\r")]
+
+
+def write_tree(root: Path) -> list[Path]:
+    """
+    Write two Python files with commented-out code.
+
+    Args:
+        root (pathlib.Path): The directory to fill.
+
+    Returns:
+        list[pathlib.Path]: The written files.
+    """
+    paths = [root / "first.py", root / "second.py"]
+    for path in paths:
+        path.write_text("# value = compute(1)\nvalue = 1\n", encoding="utf-8")
+    return paths
+
+
+def final_score(output: str) -> str:
+    """
+    Return the line of the final score printed by the application.
+
+    Args:
+        output (str): The printed messages.
+
+    Returns:
+        str: The `Final CDS:` line.
+    """
+    return next(line for line in output.splitlines() if line.startswith("Final CDS:"))
+
+
+@pytest.mark.parametrize("separator", ["\n", "\0"])
+def test_files_from_a_file(tmp_path: Path, run_app: Callable[[list[str]], tuple[int, str]], separator: str) -> None:
+    paths = write_tree(tmp_path)
+    expected = final_score(run_app([str(path) for path in paths])[1])
+    file_list = tmp_path / "files.lst"
+    file_list.write_text(separator.join(str(path) for path in paths) + separator, encoding="utf-8")
+
+    output = run_app(["--files-from", str(file_list)])[1]
+
+    assert f"Files from: {file_list}" in output
+    assert final_score(output) == expected
+
+
+@pytest.mark.parametrize("separator", ["\n", "\0"])
+def test_files_from_standard_input(
+    tmp_path: Path,
+    run_app: Callable[[list[str]], tuple[int, str]],
+    monkeypatch: pytest.MonkeyPatch,
+    separator: str,
+) -> None:
+    paths = write_tree(tmp_path)
+    expected = final_score(run_app([str(path) for path in paths])[1])
+    read_end, write_end = os.pipe()
+    os.write(write_end, separator.join(str(path) for path in paths).encode())
+    os.close(write_end)
+    monkeypatch.setattr(sys, "stdin", SimpleNamespace(buffer=open(read_end, "rb")))
+
+    assert final_score(run_app(["--files-from", "-"])[1]) == expected
@@ -0,0 +1,102 @@
+"""
+Test the per-function comment density, its rule and the enclosing definitions kept by edited documents.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import random
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.config import FunctionDensityConfig, load_config
+from src.data_types import CommentData
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.density_calculation.checker.function_density import FunctionDensityRule, function_densities
+from src.exceptions import ConfigError
+from src.lsp.document import TextDocument
+
+SOURCE = """class Parser:
+    def parse(self, text):
+        # split the text
+        # into lines
+        lines = text.split()
+        return lines
+
+    def narrate(self):
+        # first
+        a = 1
+        # second
+        b = 2
+        # third
+        return a + b
+
+
+def helper():
+    # nested definitions own their comments
+    def inner():
+        # inner comment
+        return 1
+    return inner
+"""
+
+SNIPPETS = ["\n", "    ", "# note\n", "def g():\n", "class K:\n", "    x = 1\n", "  # c", "pass\n", "rename", ":"]
+
+
+def test_densities_count_own_comment_lines_and_code_lines(find_comments: Callable[..., list[CommentData]]) -> None:
+    densities = {density.name: density for density in function_densities(find_comments(SOURCE))}
+
+    assert sorted(densities) == ["Parser.narrate", "Parser.parse", "helper", "helper.inner"]
+    assert (densities["Parser.parse"].comment_lines, densities["Parser.parse"].code_lines) == (2, 3)
+    assert (densities["Parser.narrate"].comment_lines, densities["Parser.narrate"].code_lines) == (3, 4)
+    assert densities["helper"].comment_lines == 1
+
+
+def test_rule_reports_only_functions_over_the_ratio(find_comments: Callable[..., list[CommentData]]) -> None:
+    config = FunctionDensityConfig(max_ratio=0.5, min_lines=5)
+
+    results = FunctionDensityRule(config).check_file(find_comments(SOURCE))
+
+    assert [result.comment_data.start_line_number for result in results] == [3, 9]
+    assert all(result.rule_id == config.rule_id and result.score == config.score for result in results)
+    assert "Parser.narrate" in results[1].error_string
+
+
+@pytest.mark.parametrize(
+    "table",
+    [
+        "function_density = 5\n",
+        "[tool.cdscore.function_density]\nmax_ratio = -2\n",
+        "[tool.cdscore.function_density]\nmin_lines = -1\n",
+        '[tool.cdscore.function_density]\nmax_ratio = "high"\n',
+        "[tool.cdscore.function_density]\nratio = 1\n",
+    ],
+)
+def test_invalid_function_density_raises_config_error(tmp_path: Path, table: str) -> None:
+    (tmp_path / "pyproject.toml").write_text(f"[tool.cdscore]\n{table}", encoding="utf-8")
+
+    with pytest.raises(ConfigError):
+        load_config(tmp_path)
+
+
+def test_enclosing_definitions_after_random_edits_equal_a_fresh_parse() -> None:
+    generator = random.Random(45)
+    text = SOURCE * 4
+    document = TextDocument("file:///module.py", Path("/module.py"), text, CommentChecker())
+
+    for _ in range(300):
+        start = generator.randrange(len(text) + 1)
+        end = min(len(text), start + generator.choice([0, 0, 1, 4, 20]))
+        new_text = generator.choice(SNIPPETS) if generator.random() < 0.7 else ""
+        line = text.count("\n", 0, start)
+        position = {"line": line, "character": start - (text.rfind("\n", 0, start) + 1)}
+        end_line = text.count("\n", 0, end)
+        end_position = {"line": end_line, "character": end - (text.rfind("\n", 0, end) + 1)}
+        text = text[:start] + new_text + text[end:]
+        document.apply_changes([{"range": {"start": position, "end": end_position}, "text": new_text}])
+
+        if generator.random() < 0.3:
+            fresh = TextDocument("file:///module.py", Path("/module.py"), text, CommentChecker())
+            assert document.comments == fresh.comments, text
@@ -0,0 +1,118 @@
+"""
+Test that the history of a commit range matches `--rev` runs on its commits.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.density_calculation.history import HistoryAnalyzer
+from src.density_calculation.results import iter_results
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+DOCSTRING = "Parse the configuration file and return the validated settings of the whole application."
+OTHER_DOCSTRING = "Render the report of every analyzed file as a table sorted by the final score."
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+    "HOME": "/nonexistent",
+}
+
+
+def function(name: str, docstring: str) -> str:
+    """
+    Return the source of a function with a docstring.
+
+    Args:
+        name (str): The function name.
+        docstring (str): The docstring text.
+
+    Returns:
+        str: The source.
+    """
+    return f'def {name}():\n    """{docstring}"""\n    # x\n    return 1\n'
+
+
+def commit(repo: Path, files: dict[str, str | None]) -> None:
+    """
+    Write, or delete for None, the given files and commit them.
+
+    Args:
+        repo (pathlib.Path): The repository.
+        files (dict[str, str | None]): The content of every changed file by relative path.
+    """
+    for name, content in files.items():
+        path = repo / name
+        if content is None:
+            path.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "change")
+
+
+def git(repo: Path, *args: str) -> str:
+    """
+    Run git in the repository.
+
+    Args:
+        repo (pathlib.Path): The repository.
+        *args (str): The git subcommand and its arguments.
+
+    Returns:
+        str: The standard output.
+    """
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], env=GIT_ENV, check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """
+    Create a repository whose near-duplicate docstrings appear, move and disappear across commits.
+
+    Args:
+        tmp_path (pathlib.Path): The temporary directory.
+
+    Returns:
+        pathlib.Path: The repository.
+    """
+    git(tmp_path, "init", "-q")
+    commit(tmp_path, {"pkg/a.py": function("a", DOCSTRING)})
+    commit(tmp_path, {"pkg/b.py": function("b", DOCSTRING)})
+    commit(tmp_path, {"pkg/a.py": function("a", OTHER_DOCSTRING)})
+    commit(tmp_path, {"pkg/c.py": function("b", DOCSTRING), "pkg-a.py": function("a", OTHER_DOCSTRING)})
+    commit(tmp_path, {"pkg/b.py": None, "pkg/a.py": function("a", DOCSTRING)})
+    commit(tmp_path, {"pkg/b.py": function("b", DOCSTRING), "pkg/c.py": None})
+    return tmp_path
+
+
+def test_history_matches_revision_runs(repo: Path) -> None:
+    points = list(HistoryAnalyzer(repo).iter_history("HEAD"))
+
+    assert len(points) == 6
+    assert min(point.violations for point in points) < max(point.violations for point in points)
+    for point in points:
+        file_results = list(iter_results(repo, revision=point.commit))
+        findings = [finding for file_result in file_results for finding in file_result.findings]
+        assert point.score == sum(finding.score for finding in findings), point.commit
+        assert point.violations == sum(1 for finding in findings if finding.score < 0), point.commit
+        assert point.files == len(file_results), point.commit
+
+
+def test_history_of_a_later_range_matches_the_full_history(repo: Path) -> None:
+    full = list(HistoryAnalyzer(repo).iter_history("HEAD"))
+    later = list(HistoryAnalyzer(repo).iter_history("HEAD~3..HEAD"))
+
+    assert later == full[-3:]
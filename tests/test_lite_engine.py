@@ -0,0 +1,79 @@
+"""
+Test that the lite engine finds the same comments as the tree-sitter engine.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import sysconfig
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.data_types import CommentData, EnginesEnum, LanguagesEnum
+from src.density_calculation.finder.comment_finder import CommentFinder
+from src.density_calculation.finder.lite_extractor import LiteNodeExtractor
+from src.exceptions import LexerError
+
+SOURCES = {
+    "docstring_with_comment": 'def f(a, *args, b=lambda x: x, **kw):\n    """Doc."""  # trailing\n    return a\n',
+    "comment_after_multiline_docstring": 'class A:\n    """\n    Doc.\n    """# closing line\n    x = 1\n',
+    "one_line_bodies": 'def f(): "doc"; return 1  # c\nclass K: pass\n"""not a docstring"""\n',
+    "comments_leaving_blocks": "if x:\n    def g():\n        pass\n        # in g\n    # in if\n# module\ny = 2\n",
+    "decorated_async_and_nested": (
+        "@decorator\nasync def run(self, /, x: int = (1, 2)) -> None:\n"
+        "    '''Run.'''\n    def inner[T](y: T):\n        # inner\n        return y\n"
+    ),
+    "strings_that_are_not_docstrings": (
+        'def f():\n    "a" "b"\n    ("c")\n    "d".strip()\n    x = "e"\n    "f" \\\n        .upper()\n'
+    ),
+    "prefixes_and_brackets": (
+        "def f():\n    rb'''raw\n    bytes'''\n    if(x):\n        y = [1,  # in brackets\n             2]\n"
+        "    return f'{y!r:>{w}}'\n"
+    ),
+    "tabs_crlf_and_no_trailing_newline": "class T:\r\n\t# tab\r\n\tdef m(self):\r\n\t\t'''Doc.'''\r\n\t\treturn 1",
+    "comment_only_file": "# one\n\n   # two\n",
+}
+
+
+def lite_comments(source: bytes) -> list[CommentData]:
+    """
+    Return the comments the lite extractor finds, without the tree-sitter fallback.
+
+    Args:
+        source (bytes): The Python source.
+
+    Returns:
+        list[CommentData]: The comments, as the engine reports them.
+    """
+    return LiteNodeExtractor().extract(Path("sample.py"), source, LanguagesEnum.PYTHON)
+
+
+@pytest.mark.parametrize("source", SOURCES.values(), ids=SOURCES.keys())
+def test_lite_engine_matches_tree_sitter(source: str, find_comments: Callable[..., list[CommentData]]) -> None:
+    assert lite_comments(source.encode("utf-8")) == find_comments(source)
+
+
+def test_lite_engine_matches_tree_sitter_on_the_email_package() -> None:
+    tree_sitter = CommentFinder(EnginesEnum.TREE_SITTER)
+
+    for path in sorted(Path(sysconfig.get_paths()["stdlib"], "email").rglob("*.py")):
+        source = path.read_bytes()
+        assert LiteNodeExtractor().extract(path, source, LanguagesEnum.PYTHON) == tree_sitter.find_in_bytes(
+            path, source
+        ), path
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["x = f'{', '.join(items)}'\n", "x = (1,\n", "x = 'open\n", "if x:\n        a\n    b\n"],
+    ids=["nested_fstring_quotes", "open_bracket", "open_string", "bad_dedent"],
+)
+def test_lite_engine_falls_back_when_it_cannot_lex(
+    source: str, find_comments: Callable[..., list[CommentData]]
+) -> None:
+    with pytest.raises(LexerError):
+        lite_comments(source.encode("utf-8"))
+
+    assert find_comments(source, EnginesEnum.LITE) == find_comments(source)
@@ -0,0 +1,212 @@
+"""
+Test the `lsp` command with a scripted client speaking LSP over its standard input and output.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import random
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO, cast
+
+import pytest
+
+from src.density_calculation.checker.comment_checker import CommentChecker
+from src.lsp.document import TextDocument
+from src.lsp.json_rpc import JsonRpcStream
+
+ROOT = Path(__file__).resolve().parent.parent
+URI = "file:///workspace/module.py"
+
+SOURCE = "".join(
+    f'''class Model{index}:
+    """Model {index} of the domain."""
+
+    # The cached value of the model, refreshed by load.
+    value = {index}
+
+    def load(self, path):
+        """Load the model from the file at the given path."""
+        # print(path)
+        # TODO: check the path
+        return open(path).read()  # x
+
+'''
+    for index in range(20)
+)
+
+SNIPPETS = ["# note\n", "#", '"""', '"""Docstring text."""\n', "\n", "    ", "def f():\n", "x = 1", "  # why", ":", "'"]
+
+
+class Client:
+    """
+    Drive a `cdscore.py lsp` process through its standard input and output.
+    """
+
+    def __init__(self, process: subprocess.Popen[bytes]) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            process (subprocess.Popen[bytes]): The server process.
+        """
+        assert process.stdin is not None and process.stdout is not None
+        self._stream = JsonRpcStream(cast(BinaryIO, process.stdout), cast(BinaryIO, process.stdin))
+        self._next_id = 0
+
+    def request(self, method: str, params: dict[str, Any]) -> Any:
+        """
+        Send a request and wait for its result.
+
+        Args:
+            method (str): The request method.
+            params (dict[str, Any]): The request parameters.
+
+        Returns:
+            Any: The result.
+        """
+        self._next_id += 1
+        self._stream.write_message({"id": self._next_id, "method": method, "params": params})
+        while True:
+            message = self._stream.read_message()
+            assert message is not None
+            if message.get("id") == self._next_id:
+                return message["result"]
+
+    def notify(self, method: str, params: dict[str, Any]) -> None:
+        """
+        Send a notification.
+
+        Args:
+            method (str): The notification method.
+            params (dict[str, Any]): The notification parameters.
+        """
+        self._stream.write_message({"method": method, "params": params})
+
+    def diagnostics(self, version: int | None) -> list[dict[str, Any]]:
+        """
+        Wait for the diagnostics of a version of the document.
+
+        Args:
+            version (int | None): The document version; None waits for the diagnostics cleared on close.
+
+        Returns:
+            list[dict[str, Any]]: The published diagnostics.
+        """
+        while True:
+            message = self._stream.read_message()
+            assert message is not None
+            if message.get("method") != "textDocument/publishDiagnostics":
+                continue
+            params = message["params"]
+            if params.get("version") == version:
+                diagnostics: list[dict[str, Any]] = params["diagnostics"]
+                return diagnostics
+
+
+@pytest.fixture
+def client() -> Iterator[Client]:
+    """
+    Start the server and shut it down after the test.
+
+    Yields:
+        Client: The client connected to the server.
+    """
+    process = subprocess.Popen(
+        [sys.executable, str(ROOT / "cdscore.py"), "lsp", "--debounce", "0"],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    lsp_client = Client(process)
+    lsp_client.request("initialize", {"capabilities": {}})
+    lsp_client.notify("initialized", {})
+    yield lsp_client
+
+    lsp_client.request("shutdown", {})
+    lsp_client.notify("exit", {})
+    assert process.wait(timeout=10) == 0
+
+
+def fresh_diagnostics(text: str) -> list[dict[str, Any]]:
+    """
+    Return the diagnostics of a text parsed from scratch.
+
+    Args:
+        text (str): The document text.
+
+    Returns:
+        list[dict[str, Any]]: The diagnostics.
+    """
+    return TextDocument(URI, Path("/workspace/module.py"), text, CommentChecker()).diagnostics()
+
+
+def position(text: str, offset: int) -> dict[str, int]:
+    """
+    Return the LSP position of an offset of an ASCII text.
+
+    Args:
+        text (str): The text.
+        offset (int): The offset.
+
+    Returns:
+        dict[str, int]: The zero-based line and character.
+    """
+    line = text.count("\n", 0, offset)
+    return {"line": line, "character": offset - (text.rfind("\n", 0, offset) + 1)}
+
+
+def key(diagnostic: dict[str, Any]) -> tuple[Any, ...]:
+    """
+    Return a sort key of a diagnostic.
+
+    Args:
+        diagnostic (dict[str, Any]): The diagnostic.
+
+    Returns:
+        tuple[Any, ...]: The start, end, code and message.
+    """
+    start, end = diagnostic["range"]["start"], diagnostic["range"]["end"]
+    return start["line"], start["character"], end["line"], end["character"], diagnostic["code"], diagnostic["message"]
+
+
+def test_open_publishes_the_diagnostics_of_a_fresh_parse(client: Client) -> None:
+    client.notify("textDocument/didOpen", {"textDocument": {"uri": URI, "version": 1, "text": SOURCE}})
+
+    diagnostics = client.diagnostics(1)
+
+    assert diagnostics
+    assert sorted(diagnostics, key=key) == sorted(fresh_diagnostics(SOURCE), key=key)
+
+
+def test_diagnostics_after_random_edits_equal_a_fresh_parse(client: Client) -> None:
+    generator = random.Random(34)
+    text = SOURCE
+    client.notify("textDocument/didOpen", {"textDocument": {"uri": URI, "version": 1, "text": text}})
+    client.diagnostics(1)
+
+    for version in range(2, 62):
+        start = generator.randrange(len(text) + 1)
+        end = min(len(text), start + generator.choice([0, 0, 1, 3, 12, 40]))
+        new_text = generator.choice(SNIPPETS) if generator.random() < 0.7 else ""
+        change = {"range": {"start": position(text, start), "end": position(text, end)}, "text": new_text}
+        text = text[:start] + new_text + text[end:]
+        params = {"textDocument": {"uri": URI, "version": version}, "contentChanges": [change]}
+        client.notify("textDocument/didChange", params)
+
+        diagnostics = client.diagnostics(version)
+
+        assert sorted(diagnostics, key=key) == sorted(fresh_diagnostics(text), key=key), version
+
+
+def test_close_clears_the_diagnostics(client: Client) -> None:
+    client.notify("textDocument/didOpen", {"textDocument": {"uri": URI, "version": 1, "text": SOURCE}})
+    assert client.diagnostics(1)
+
+    client.notify("textDocument/didClose", {"textDocument": {"uri": URI}})
+
+    assert client.diagnostics(None) == []
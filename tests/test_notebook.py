@@ -0,0 +1,83 @@
+"""
+Test reading the code cells of notebooks and moving the comments found in them back into their cells.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.data_types import EnginesEnum
+from src.density_calculation.finder.comment_finder import CommentFinder
+from src.density_calculation.finder.notebook import Notebook
+from src.exceptions import NotebookError
+
+
+def make_notebook(*cells: tuple[str, str]) -> bytes:
+    """
+    Build an nbformat 4 notebook with an output and metadata in every code cell.
+
+    Args:
+        *cells (tuple[str, str]): The type and the source of every cell.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    output = {"output_type": "stream", "name": "stdout", "text": ["# printed, not a comment\n"]}
+    return json.dumps(
+        {
+            "cells": [
+                {
+                    "cell_type": cell_type,
+                    "metadata": {"tags": ["# not a comment"]},
+                    "source": source.splitlines(keepends=True),
+                    **({"outputs": [output], "execution_count": 1} if cell_type == "code" else {}),
+                }
+                for cell_type, source in cells
+            ],
+            "metadata": {},
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        },
+        indent=1,
+    ).encode()
+
+
+NOTEBOOK = make_notebook(
+    ("markdown", "# Title\n\nSome text.\n"),
+    ("code", "import os\n%time x = 1\n# first cell comment\n"),
+    ("code", "%%bash\n# a shell comment\necho done\n"),
+    ("raw", "# raw text\n"),
+    ("code", "def run():\n    # value = compute(1)\n    return 1\n\n\n# last cell comment"),
+)
+
+
+@pytest.mark.parametrize("engine", list(EnginesEnum))
+def test_comments_are_moved_back_into_their_cells(engine: EnginesEnum) -> None:
+    comments = CommentFinder(engine).find_in_bytes(Path("analysis.ipynb"), NOTEBOOK)
+
+    assert [(comment.cell, comment.start_line_number, comment.text) for comment in comments] == [
+        (2, 3, ["first cell comment"]),
+        (5, 2, ["value = compute(1)"]),
+        (5, 6, ["last cell comment"]),
+    ]
+    owner = comments[1].owner
+    assert owner is not None
+    assert (owner.name, owner.start_line, owner.end_line) == ("run", 1, 3)
+    assert comments[1].location == "analysis.ipynb:cell 5:2"
+
+
+def test_magics_are_blanked_without_shifting_lines() -> None:
+    notebook = Notebook.from_bytes(NOTEBOOK)
+
+    assert notebook.code_bytes.decode().splitlines()[:3] == ["import os", "", "# first cell comment"]
+    assert notebook.lines == 9
+
+
+@pytest.mark.parametrize("content", [b"[]", b'{"cells": {}}', b'{"metadata": {}}', b'{"cells": [{"source": '])
+def test_other_documents_are_rejected(content: bytes) -> None:
+    with pytest.raises(NotebookError):
+        Notebook.from_bytes(content)
@@ -0,0 +1,116 @@
+"""
+Test the threaded analysis pipeline against the analysis in the calling thread.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.cds_app import CDSApp
+from src.data_types import FileResult
+from src.density_calculation.finder.comment_finder import CommentFinder
+from src.density_calculation.pipeline import AnalysisPipeline
+
+
+def write_tree(root: Path, files: int = 40) -> list[Path]:
+    """
+    Write Python files with commented-out code, task markers and docstrings in nested packages.
+
+    Args:
+        root (pathlib.Path): The directory to fill.
+        files (int): The number of files. Defaults to 40.
+
+    Returns:
+        list[pathlib.Path]: The written files, in path order.
+    """
+    paths = []
+    for index in range(files):
+        path = root / f"pkg_{index % 4}" / f"module_{index:02}.py"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(
+            f"# value = compute({index})\n"
+            f"def load_{index}(path):\n"
+            f'    """Load the file number {index}."""\n'
+            "    # TODO: handle errors\n"
+            "    return path\n" * (index % 3 + 1),
+            encoding="utf-8",
+        )
+        paths.append(path)
+    return sorted(paths)
+
+
+def pipeline_threads() -> list[threading.Thread]:
+    """
+    Return the live threads started by a pipeline.
+
+    Returns:
+        list[threading.Thread]: The threads of the pipeline stages.
+    """
+    return [thread for thread in threading.enumerate() if thread.name.startswith("cdscore")]
+
+
+def by_path(file_results: list[FileResult]) -> dict[Path, FileResult]:
+    """
+    Index file results by the path of their file.
+
+    Args:
+        file_results (list[FileResult]): The results in any order.
+
+    Returns:
+        dict[pathlib.Path, FileResult]: The result of every file.
+    """
+    return {file_result.file_path: file_result for file_result in file_results}
+
+
+def test_threaded_run_gives_the_results_of_a_single_thread(
+    tmp_path: Path, run_app: Callable[[list[str]], tuple[int, str]]
+) -> None:
+    write_tree(tmp_path)
+    single = AnalysisPipeline(jobs=1).run(tmp_path)
+    threaded = AnalysisPipeline(jobs=4).run(tmp_path)
+
+    assert by_path(list(threaded)) == by_path(list(single))
+
+    single_code, single_output = run_app([str(tmp_path)])
+    threaded_code, threaded_output = run_app([str(tmp_path), "--jobs", "4"])
+
+    assert threaded_code == single_code == 1
+    assert sorted(threaded_output.splitlines()) == sorted(single_output.splitlines())
+
+
+def test_failure_of_a_stage_reaches_the_caller(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    paths = write_tree(tmp_path)
+    read_file = CommentFinder.read_file
+
+    def unreadable(finder: CommentFinder, filepath: Path) -> bytes:
+        if filepath == paths[len(paths) // 2]:
+            raise PermissionError(f"Permission denied: '{filepath}'")
+        return read_file(finder, filepath)
+
+    monkeypatch.setattr(CommentFinder, "read_file", unreadable)
+
+    with pytest.raises(PermissionError):
+        list(AnalysisPipeline(jobs=4).run(tmp_path))
+    assert not pipeline_threads()
+
+
+def test_cancelled_run_stops_the_threads(tmp_path: Path) -> None:
+    write_tree(tmp_path, files=400)
+    results = AnalysisPipeline(jobs=4, queue_size=2).run(tmp_path)
+
+    next(results)
+    assert pipeline_threads()
+    results.close()
+
+    assert not pipeline_threads()
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2"])
+def test_jobs_below_one_are_rejected(tmp_path: Path, jobs: str) -> None:
+    with pytest.raises(SystemExit):
+        CDSApp([str(tmp_path), "--jobs", jobs])
@@ -0,0 +1,92 @@
+"""
+Test the per-file time budget and the quarantine list of the files that exceed it.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.cds_app import CDSApp
+from src.density_calculation.quarantine import Quarantine
+
+
+def write_tree(root: Path) -> tuple[Path, Path]:
+    """
+    Write a small and a large Python file with commented-out code.
+
+    Args:
+        root (pathlib.Path): The directory to fill.
+
+    Returns:
+        tuple[pathlib.Path, pathlib.Path]: The small and the large file.
+    """
+    small, large = root / "small.py", root / "large.py"
+    small.write_text("# value = compute(1)\nvalue = 1\n", encoding="utf-8")
+    large.write_text("".join(f"# value = compute({line})\nvalue = {line}\n" for line in range(2000)), encoding="utf-8")
+    return small, large
+
+
+def quarantined(path: Path) -> set[str]:
+    """
+    Read the paths listed in a quarantine file.
+
+    Args:
+        path (pathlib.Path): The quarantine file.
+
+    Returns:
+        set[str]: The quarantined paths.
+    """
+    return set(json.loads(path.read_text(encoding="utf-8"))["files"])
+
+
+def test_files_over_budget_are_skipped_until_edited_or_retried(
+    tmp_path: Path, run_app: Callable[[list[str]], tuple[int, str]]
+) -> None:
+    tree, quarantine = tmp_path / "tree", tmp_path / "quarantine.json"
+    tree.mkdir()
+    small, large = write_tree(tree)
+    options = [str(tree), "--quarantine", str(quarantine)]
+
+    exit_code, output = run_app([*options, "--time-budget", "1e-9"])
+    assert exit_code == 0
+    assert "Quarantined 2 file(s)" in output
+    assert quarantined(quarantine) == {small.as_posix(), large.as_posix()}
+
+    output = run_app(options)[1]
+    assert "Skipped 2 quarantined file(s)" in output
+    assert "Final CDS: 0" in output
+
+    small.write_text("# value = compute(2)\nvalue = 2\n", encoding="utf-8")
+    output = run_app(options)[1]
+    assert "Skipped 1 quarantined file(s)" in output
+    assert "Final CDS: -5" in output
+
+    exit_code, output = run_app([*options, "--retry-quarantined", "--time-budget", "60"])
+    assert exit_code == 1
+    assert "quarantined" not in output
+    assert quarantined(quarantine) == set()
+
+
+def test_invalid_quarantine_file_is_an_empty_list(tmp_path: Path) -> None:
+    path = tmp_path / "quarantine.json"
+    path.write_text('{"version": 99, "files": {}}', encoding="utf-8")
+
+    quarantine = Quarantine(path)
+
+    assert len(quarantine) == 0
+    assert not quarantine.skips(Path("module.py"), b"value = 1\n")
+
+
+@pytest.mark.parametrize("budget", ["0", "-1"])
+def test_budget_that_is_not_positive_is_rejected(tmp_path: Path, budget: str) -> None:
+    quarantine = tmp_path / "quarantine.json"
+    (tmp_path / "module.py").write_text("value = 1\n", encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        CDSApp([str(tmp_path), "--time-budget", budget, "--quarantine", str(quarantine)])
+    assert not quarantine.exists()
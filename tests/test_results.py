@@ -0,0 +1,69 @@
+"""
+Test the laziness and the cancellation of the streaming results API.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.density_calculation.finder.comment_finder import CommentFinder
+from src.density_calculation.results import iter_results
+
+
+def write_tree(root: Path, files: int) -> None:
+    """
+    Write Python files with commented-out code.
+
+    Args:
+        root (pathlib.Path): The directory to fill.
+        files (int): The number of files.
+    """
+    for index in range(files):
+        (root / f"module_{index:03}.py").write_text(f"# value = compute({index})\nvalue = {index}\n", encoding="utf-8")
+
+
+def pipeline_threads() -> list[threading.Thread]:
+    """
+    Return the live threads started by a pipeline.
+
+    Returns:
+        list[threading.Thread]: The threads of the pipeline stages.
+    """
+    return [thread for thread in threading.enumerate() if thread.name.startswith("cdscore")]
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_nothing_is_analyzed_before_the_first_result(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jobs: int
+) -> None:
+    write_tree(tmp_path, files=3)
+    reads: list[Path] = []
+    read_file = CommentFinder.read_file
+
+    def counted(finder: CommentFinder, filepath: Path) -> bytes:
+        reads.append(filepath)
+        return read_file(finder, filepath)
+
+    monkeypatch.setattr(CommentFinder, "read_file", counted)
+
+    results = iter_results(tmp_path, jobs=jobs)
+    assert reads == []
+
+    assert next(results).score == -5
+    assert reads
+    results.close()
+
+
+def test_closed_generator_leaves_no_pipeline_threads(tmp_path: Path) -> None:
+    write_tree(tmp_path, files=300)
+    results = iter_results(tmp_path, jobs=4)
+
+    next(results)
+    assert pipeline_threads()
+    results.close()
+
+    assert not pipeline_threads()
@@ -0,0 +1,52 @@
+"""
+Test the accounting of rule costs and the rule budget.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.cds_app import CDSApp
+from src.density_calculation.checker.rule_profiler import RuleProfiler
+
+
+def test_costs_are_ranked_with_percentiles_within_a_bucket() -> None:
+    profiler = RuleProfiler()
+    for nanoseconds in range(1_000, 101_000, 1_000):
+        profiler.record("101", "SlowRule", nanoseconds, hits=1, comments=2)
+    for _ in range(10):
+        profiler.record("102", "FastRule", 7, hits=0)
+
+    slow, fast = profiler.costs()
+
+    assert (slow.rule, slow.name, slow.invocations, slow.hits, slow.comments) == ("101", "SlowRule", 100, 100, 200)
+    assert slow.total_seconds == pytest.approx(5.05e-3)
+    assert slow.p50_seconds == pytest.approx(50e-6, rel=0.07)
+    assert slow.p99_seconds == pytest.approx(99e-6, rel=0.07)
+    assert (fast.rule, fast.p50_seconds, fast.p99_seconds) == ("102", 7e-9, 7e-9)
+    assert slow.seconds_per_comment == pytest.approx(5.05e-3 / 200)
+    assert profiler.over_budget(1e-6) == [slow]
+    assert profiler.over_budget(1.0) == []
+
+
+def test_rule_budget_fails_the_run(tmp_path: Path, run_app: Callable[[list[str]], tuple[int, str]]) -> None:
+    (tmp_path / "module.py").write_text("# value = compute(1)\nvalue = 1\n", encoding="utf-8")
+
+    exit_code, output = run_app([str(tmp_path), "--min-cds", "-100", "--profile-rules"])
+    assert exit_code == 0
+    assert "Rule costs:" in output
+    assert "CommentedCodeRule" in output
+
+    exit_code, output = run_app([str(tmp_path), "--min-cds", "-100", "--rule-budget", "1e-6"])
+    assert exit_code == 1
+    assert "Error: rule(s) over the budget of 1e-06us per comment" in output
+
+
+@pytest.mark.parametrize("budget", ["0", "-5"])
+def test_rule_budget_that_is_not_positive_is_rejected(tmp_path: Path, budget: str) -> None:
+    with pytest.raises(SystemExit):
+        CDSApp([str(tmp_path), "--rule-budget", budget])
@@ -0,0 +1,69 @@
+"""
+Test the stratified sample of files and the score estimated from it.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from pathlib import Path
+
+from src.density_calculation.density_searcher import DensitySearcher
+from src.density_calculation.sampling import StratifiedSample
+
+
+def make_tree(root: Path, files: int = 60) -> list[Path]:
+    """
+    Write a tree of Python files of varied sizes and commented-out code in two directories.
+
+    Args:
+        root (pathlib.Path): The directory to fill.
+        files (int): The number of files. Defaults to 60.
+
+    Returns:
+        list[pathlib.Path]: The written files.
+    """
+    paths = []
+    for index in range(files):
+        directory = root / ("core" if index % 3 else "tools")
+        directory.mkdir(exist_ok=True)
+        path = directory / f"module_{index}.py"
+        comments = [f"# value = compute({line})" for line in range(index % 5)]
+        path.write_text("\n".join([*comments, "def run():", '    """Run."""', "    return 1", ""]), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_same_seed_selects_the_same_files(tmp_path: Path) -> None:
+    paths = make_tree(tmp_path)
+
+    first = StratifiedSample(tmp_path, paths, fraction=0.3, seed=7).files
+    second = StratifiedSample(tmp_path, reversed(paths), fraction=0.3, seed=7).files
+    other = StratifiedSample(tmp_path, paths, fraction=0.3, seed=8).files
+
+    assert first == second
+    assert first != other
+    assert len(set(first)) == len(first)
+
+
+def test_estimate_of_every_file_is_the_exact_total() -> None:
+    paths = [Path(f"/tree/{directory}/module_{index}.py") for directory in ("a", "b") for index in range(30)]
+    sample = StratifiedSample(Path("/tree"), paths, fraction=1.0)
+    for index, path in enumerate(sample.files):
+        sample.record(path, -(index % 4))
+
+    estimate = sample.estimate()
+
+    assert estimate.score == -sum(index % 4 for index in range(len(paths)))
+    assert estimate.margin == 0.0
+    assert estimate.sampled == estimate.population == len(paths)
+
+
+def test_sampling_every_file_gives_the_score_of_a_full_run(tmp_path: Path) -> None:
+    make_tree(tmp_path)
+
+    exact = DensitySearcher().start_analysis(tmp_path)
+    estimate = DensitySearcher().start_sample_analysis(tmp_path, fraction=1.0, seed=3)
+
+    assert exact != 0
+    assert estimate.score == exact
+    assert estimate.margin == 0.0
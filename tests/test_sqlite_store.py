@@ -0,0 +1,76 @@
+"""
+Test storing the results of several runs in one SQLite database and querying them over time.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import sqlite3
+from pathlib import Path
+
+from src.data_types import CheckerData, CommentData, CommentScope, CommentType, EnginesEnum, FileResult
+from src.output.sqlite_store import SQLiteStore
+
+RULE_BY_SCOPE_QUERY = """
+    SELECT runs.id, count(*)
+    FROM findings
+    JOIN runs ON runs.id = findings.run_id
+    JOIN files ON files.id = findings.file_id
+    WHERE findings.rule_id = 101 AND findings.scope = 'FUNCTION'
+      AND files.path >= 'services/' AND files.path < 'services0'
+    GROUP BY runs.id ORDER BY runs.started_at, runs.id
+"""
+
+
+def make_result(path: str, scopes: list[CommentScope]) -> FileResult:
+    """
+    Build the results of a file with one comment per scope, each found by rules 101 and 102.
+
+    Args:
+        path (str): The path of the file.
+        scopes (list[CommentScope]): The scopes of the comments.
+
+    Returns:
+        FileResult: The results of the file.
+    """
+    findings = []
+    for line, scope in enumerate(scopes, start=1):
+        comment = CommentData(Path(path), [f"# value = compute({line})"], line, line, 1, 20, CommentType.INLINE, scope)
+        findings += [CheckerData(-2, comment, "Commented-out code", 101), CheckerData(-1, comment, "Other", 102)]
+    return FileResult(Path(path), findings, lines=len(scopes) + 10)
+
+
+def test_interleaved_runs_keep_their_rows_consistent(tmp_path: Path) -> None:
+    database = tmp_path / "results.db"
+    first, second = SQLiteStore(database), SQLiteStore(database)
+
+    first_run = first.start_run(tmp_path, EnginesEnum.TREE_SITTER)
+    first.add(make_result("services/api.py", [CommentScope.FUNCTION, CommentScope.MODULE]))
+    first.add(make_result("tools/cli.py", [CommentScope.FUNCTION]))
+    second_run = second.start_run(tmp_path, EnginesEnum.LITE, revision="HEAD")
+    second.add(make_result("services/api.py", [CommentScope.FUNCTION]))
+    second.add(make_result("services/db.py", [CommentScope.FUNCTION, CommentScope.CLASS, CommentScope.FUNCTION]))
+    second.finish_run(-14)
+    second.close()
+    first.finish_run(-9)
+    first.close()
+
+    third = SQLiteStore(database)
+    third_run = third.start_run(tmp_path, EnginesEnum.TREE_SITTER)
+    third.add(make_result("services/api.py", []))
+    third.finish_run(0)
+    third.close()
+
+    connection = sqlite3.connect(database)
+    runs = connection.execute("SELECT id, files, findings, score FROM runs ORDER BY id").fetchall()
+    assert runs == [(first_run, 2, 6, -9), (second_run, 2, 8, -14), (third_run, 1, 0, 0)]
+    assert connection.execute(
+        "SELECT count(*) FROM findings JOIN files ON files.id = findings.file_id WHERE files.run_id != findings.run_id"
+    ).fetchone() == (0,)
+    assert connection.execute(
+        "SELECT count(*) FROM findings JOIN comments ON comments.id = findings.comment_id"
+        " WHERE comments.file_id != findings.file_id OR comments.scope != findings.scope"
+    ).fetchone() == (0,)
+    assert connection.execute("SELECT count(*) FROM comments").fetchone() == (7,)
+    assert connection.execute(RULE_BY_SCOPE_QUERY).fetchall() == [(first_run, 1), (second_run, 3)]
+    connection.close()
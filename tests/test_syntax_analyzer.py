@@ -0,0 +1,40 @@
+"""
+Test the parse timeout of the syntax analyzer.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import warnings
+
+import pytest
+
+from src.data_types import LanguagesEnum
+from src.density_calculation.finder.syntax_analyzer import SyntaxAnalyzer
+from src.exceptions import TimeBudgetError
+
+SOURCE = "".join(
+    f"def function_{index}(value):\n    # comment {index}\n    return value + {index}\n" for index in range(50_000)
+)
+
+
+def test_parse_within_timeout_builds_the_same_tree() -> None:
+    analyzer = SyntaxAnalyzer()
+    code_bytes = SOURCE.encode()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        limited = analyzer.parse(code_bytes, LanguagesEnum.PYTHON, timeout=60)
+
+    assert str(limited.root_node) == str(analyzer.parse(code_bytes, LanguagesEnum.PYTHON).root_node)
+
+
+def test_parse_over_timeout_raises_and_leaves_the_parser_usable() -> None:
+    analyzer = SyntaxAnalyzer()
+
+    with pytest.raises(TimeBudgetError):
+        analyzer.parse(SOURCE.encode(), LanguagesEnum.PYTHON, timeout=0.001)
+
+    tree = analyzer.parse(b"x = 1\n", LanguagesEnum.PYTHON, timeout=60)
+    assert not tree.root_node.has_error
+    assert tree.root_node.end_byte == len(b"x = 1\n")
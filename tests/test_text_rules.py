@@ -0,0 +1,124 @@
+"""
+Test the declarative text rules and their configuration.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from src.config import TextRuleConfig, load_config
+from src.data_types import CommentData
+from src.density_calculation.checker.text_rules import FusedTextRules
+from src.exceptions import ConfigError
+
+
+def rule_ids(rules: FusedTextRules, comment: CommentData) -> list[int]:
+    """
+    Return the IDs of the rules a comment violates.
+
+    Args:
+        rules (FusedTextRules): The compiled rules.
+        comment (CommentData): The comment to check.
+
+    Returns:
+        list[int]: The violated rule IDs.
+    """
+    return [result.rule_id for result in rules.check(comment)]
+
+
+def test_rules_matching_at_the_same_position_are_all_reported(
+    find_comments: Callable[..., list[CommentData]],
+) -> None:
+    rules = FusedTextRules([TextRuleConfig(201, -1, forbidden=("TODO",)), TextRuleConfig(202, -1, forbidden=("TO",))])
+    (comment,) = find_comments("# TODO fix\n")
+
+    assert rule_ids(rules, comment) == [201, 202]
+
+
+def test_overlapping_matches_are_found_at_their_own_positions(
+    find_comments: Callable[..., list[CommentData]],
+) -> None:
+    rules = FusedTextRules(
+        [TextRuleConfig(201, -1, forbidden=("abc",)), TextRuleConfig(202, -1, forbidden=("(?i)BCD",))]
+    )
+    (comment,) = find_comments("# xabcd\n")
+
+    assert rule_ids(rules, comment) == [201, 202]
+    assert [result.error_string for result in rules.check(comment)][1].endswith("'bcd'.")
+
+
+def test_length_bounds_and_prefixes(find_comments: Callable[..., list[CommentData]]) -> None:
+    rules = FusedTextRules(
+        [
+            TextRuleConfig(201, -1, max_len=5),
+            TextRuleConfig(202, -1, min_len=3),
+            TextRuleConfig(203, -1, required_prefixes=("NOTE",)),
+        ]
+    )
+    long_comment, short_comment = find_comments("# a long comment\nx = 1  # ok\n")
+
+    assert rule_ids(rules, long_comment) == [201, 203]
+    assert rule_ids(rules, short_comment) == [202, 203]
+
+
+def test_patterns_referring_to_their_groups_keep_their_meaning(
+    find_comments: Callable[..., list[CommentData]],
+) -> None:
+    rules = FusedTextRules(
+        [
+            TextRuleConfig(201, -1, forbidden=(r"(x)\1",)),
+            TextRuleConfig(202, -1, forbidden=(r"(y)\1",)),
+            TextRuleConfig(203, -1, forbidden=(r"(?P<word>b)(?P=word)",)),
+            TextRuleConfig(204, -1, forbidden=(r"(?P<word>zz)",)),
+        ]
+    )
+    (comment,) = find_comments("# aa yy bb\n")
+
+    assert rule_ids(rules, comment) == [202, 203]
+    assert rules.check(comment)[0].error_string.endswith("'yy'.")
+
+
+def test_nested_quantifiers_are_rejected() -> None:
+    with pytest.raises(ConfigError):
+        FusedTextRules([TextRuleConfig(201, -1, forbidden=("(a+)+",))])
+
+
+@pytest.mark.parametrize(
+    "table",
+    [
+        '[[tool.cdscore.rules]]\nid = 201\nmax_len = "80"\n',
+        "[[tool.cdscore.rules]]\nid = 201\nmin_len = 1.5\n",
+        "[[tool.cdscore.rules]]\nid = 201\nmessage = 3\n",
+        "[[tool.cdscore.rules]]\nid = 201\nmax_len = -1\n",
+        "[[tool.cdscore.rules]]\nid = 201\nmin_len = -3\n",
+        "[[tool.cdscore.rules]]\nid = 201\nforbidden = [1]\n",
+        "[[tool.cdscore.rules]]\nid = 201\nforbidden = 1\n",
+        "[[tool.cdscore.rules]]\nid = 201\nrequired_prefix = [1]\n",
+        "[[tool.cdscore.rules]]\nid = 201\ntypes = [1]\n",
+        '[[tool.cdscore.rules]]\nid = 201\nscopes = ["function", 2]\n',
+        'rules = ["x"]\n',
+        "rules = 5\n",
+        'disable = "101"\n',
+        'disable = ["101"]\n',
+    ],
+)
+def test_invalid_values_raise_config_error(tmp_path: Path, table: str) -> None:
+    (tmp_path / "pyproject.toml").write_text(f"[tool.cdscore]\n{table}", encoding="utf-8")
+
+    with pytest.raises(ConfigError):
+        load_config(tmp_path)
+
+
+def test_disable_removes_rules(tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.cdscore]\ndisable = [201]\n[[tool.cdscore.rules]]\nid = 201\nmax_len = 80\n"
+        "[[tool.cdscore.rules]]\nid = 202\nmin_len = 2\n",
+        encoding="utf-8",
+    )
+
+    assert 201 not in [rule.rule_id for rule in load_config(tmp_path).text_rules]
+    assert 202 in [rule.rule_id for rule in load_config(tmp_path).text_rules]
@@ -0,0 +1,102 @@
+"""
+Test the bounded tracker of the worst files, directories and functions of a run.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import random
+from collections import Counter
+from pathlib import Path
+
+from src.data_types import CheckerData, CommentData, CommentScope, CommentType, FileResult, FunctionDensity
+from src.density_calculation.top_k import DIRECTORY_SLOTS_PER_ENTRY, TopKTracker
+
+
+def make_result(path: Path, penalty: int, lines: int, functions: tuple[FunctionDensity, ...] = ()) -> FileResult:
+    """
+    Build the results of a file with one finding per point of penalty.
+
+    Args:
+        path (pathlib.Path): The path of the file.
+        penalty (int): The penalty of the file.
+        lines (int): The number of lines of the file.
+        functions (tuple[FunctionDensity, ...]): The comment density of its functions. Defaults to none.
+
+    Returns:
+        FileResult: The results of the file.
+    """
+    comment = CommentData(path, ["value = 1"], 1, 1, 1, 12, CommentType.INLINE, CommentScope.MODULE)
+    findings = [CheckerData(-1, comment, "Finding", 101) for _ in range(penalty)]
+    return FileResult(path, findings, lines, functions)
+
+
+def make_results(count: int, seed: int) -> list[FileResult]:
+    """
+    Build the results of files spread over directories of very different penalties.
+
+    Args:
+        count (int): The number of files.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list[FileResult]: The results, in a random order.
+    """
+    generator = random.Random(seed)
+    results = []
+    for index in range(count):
+        directory = int(generator.paretovariate(1.2)) % 200
+        penalty = generator.choice((0, 0, 1, 2, 5, 10, 40)) * (3 if directory < 5 else 1)
+        results.append(make_result(Path(f"pkg_{directory}/module_{index}.py"), penalty, generator.randint(1, 400)))
+    return results
+
+
+def test_files_are_ranked_exactly_with_ties_kept_in_arrival_order() -> None:
+    results = make_results(2000, seed=38)
+    tracker = TopKTracker(k=10)
+    for file_result in results:
+        tracker.add(file_result)
+
+    penalized = [file_result for file_result in results if file_result.penalty]
+    by_penalty = sorted(penalized, key=lambda file_result: file_result.penalty, reverse=True)[:10]
+    by_density = sorted(penalized, key=lambda file_result: file_result.penalty / file_result.lines, reverse=True)[:10]
+
+    assert [hotspot.path for hotspot in tracker.files_by_penalty()] == [result.file_path for result in by_penalty]
+    assert [hotspot.path for hotspot in tracker.files_by_penalty_per_line()] == [
+        result.file_path for result in by_density
+    ]
+    assert all(hotspot.error == 0 for hotspot in tracker.files_by_penalty())
+
+
+def test_heavy_directories_are_tracked_within_their_error_bound() -> None:
+    results = make_results(5000, seed=39)
+    tracker = TopKTracker(k=5)
+    for file_result in results:
+        tracker.add(file_result)
+
+    penalties: Counter[Path] = Counter()
+    for file_result in results:
+        penalties[file_result.file_path.parent] += file_result.penalty
+    threshold = sum(penalties.values()) / (DIRECTORY_SLOTS_PER_ENTRY * tracker.k)
+    directories = tracker.directories_by_penalty()
+
+    assert len(directories) == 5
+    assert {directory for directory, penalty in penalties.items() if penalty > threshold} <= {
+        hotspot.path for hotspot in directories
+    }
+    assert all(
+        penalties[hotspot.path] <= hotspot.penalty <= penalties[hotspot.path] + hotspot.error for hotspot in directories
+    )
+    assert [hotspot.path for hotspot in directories[:3]] == [path for path, _ in penalties.most_common(3)]
+
+
+def test_densest_functions() -> None:
+    tracker = TopKTracker(k=2)
+    tracker.add(make_result(Path("a.py"), 0, 10, (FunctionDensity("run", 1, 1, 10), FunctionDensity("load", 20, 6, 3))))
+    tracker.add(make_result(Path("b.py"), 0, 10, (FunctionDensity("parse", 1, 4, 4),)))
+
+    assert [(path.name, function.name) for path, function in tracker.densest_functions()] == [
+        ("a.py", "load"),
+        ("b.py", "parse"),
+    ]
+    assert tracker.files_by_penalty() == []
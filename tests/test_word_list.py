@@ -0,0 +1,58 @@
+"""
+Test compiling word lists and looking words up in the memory-mapped dictionary.
+
+Author: Petr Lavrishchev
+License: MIT License (see LICENSE file for details)
+"""
+
+import random
+import string
+from pathlib import Path
+
+import pytest
+
+from src.density_calculation.checker.word_list import MAX_WORD_BYTES, WordList, compile_word_list
+from src.exceptions import DictionaryError
+
+
+def test_compiled_words_are_found_case_insensitively(tmp_path: Path) -> None:
+    path = tmp_path / "words.cdsdict"
+    words = ["Comment", "comment", "density", " naïve ", "", "x" * (MAX_WORD_BYTES + 1)]
+
+    assert compile_word_list(words, path) == 3
+
+    with WordList(path) as word_list:
+        assert len(word_list) == 3
+        assert all(word in word_list for word in ("comment", "COMMENT", "Density", "NAÏVE"))
+        assert not any(word in word_list for word in ("", "comments", "densit", "x" * (MAX_WORD_BYTES + 1)))
+
+
+def test_round_trip_of_many_random_words(tmp_path: Path) -> None:
+    generator = random.Random(40)
+    words = {"".join(generator.choices(string.ascii_lowercase, k=generator.randint(1, 12))) for _ in range(5000)}
+    misses = {"".join(generator.choices(string.ascii_lowercase, k=13)) for _ in range(1000)}
+    path = tmp_path / "words.cdsdict"
+    compile_word_list(words, path)
+
+    with WordList(path) as word_list:
+        assert len(word_list) == len(words)
+        assert all(word in word_list for word in words)
+        assert not any(word in word_list for word in misses)
+
+
+def test_empty_word_list(tmp_path: Path) -> None:
+    path = tmp_path / "words.cdsdict"
+    compile_word_list([], path)
+
+    with WordList(path) as word_list:
+        assert len(word_list) == 0
+        assert "word" not in word_list
+
+
+@pytest.mark.parametrize("content", [b"", b"CDSDICT1", b"not a dictionary at all, just text"])
+def test_other_files_are_rejected(tmp_path: Path, content: bytes) -> None:
+    path = tmp_path / "words.cdsdict"
+    path.write_bytes(content)
+
+    with pytest.raises(DictionaryError):
+        WordList(path)